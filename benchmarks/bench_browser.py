@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""Browser benchmarks: per-widget render and interaction timings in headless Chromium.
+
+For every widget type and dataset size, a single-widget report is generated (``offline=True``
+by default, so d3 comes from ``assets/vendor/`` and no network is involved) and loaded with
+Playwright, with ``?perf`` in the URL. The ``dashboard:*`` User Timing measures the page then
+records (``DashboardPerf`` in utils.js) give the dataset decode, ``d3.csvParse``, widget
+constructor and ``update()`` times; year / period / YoY changes are then replayed and timed,
+both as the synchronous handler (``control`` measure) and up to the next frame.
+
+    python benchmarks/bench_browser.py --rows 1000,10000,100000 --output browser.json
+    python benchmarks/bench_browser.py --online --widgets heatmap,sunburst --compress-data
+
+Requires ``playwright`` and ``playwright install chromium``.
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import json
+import os
+import pathlib
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+from datetime import datetime
+
+from playwright.sync_api import sync_playwright
+
+import bench_generator  # noqa: F401 - puts src/ on sys.path
+from bench_generator import HERE, _git_revision, _int_list, _Path
+from dashboard_engine.d3_packages import d3_packages_for, d3_vendor_path, with_d3_dependencies
+from dashboard_engine.generator import VENDOR_D3_SANKEY_MODULE, WIDGET_TYPE_TO_JS_FILE, DashboardGenerator
+
+import synthetic
+
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_ROWS = (1000, 10000, 100000)
+DEFAULT_CARDINALITY = 100
+# Control changes replayed per control (each value is visited, then the initial one restored).
+CONTROL_ROUNDS = 3
+READY_TIMEOUT_MS = 600000
+
+# Every dashboard:* measure recorded so far.
+_READ_MEASURES_JS = """
+() => performance.getEntriesByType('measure')
+    .filter((m) => m.name.startsWith(DashboardPerf.PREFIX))
+    .map((m) => ({ name: m.name, duration: m.duration, detail: m.detail }))
+"""
+
+# True once the widget constructor returned (or threw).
+_WIDGET_READY_JS = """
+() => performance.getEntriesByType('measure').some((m) => m.detail && m.detail.stage === 'widget-construct')
+"""
+
+# Replays control changes on the first widget; returns [{control, frame_ms}] in order.
+_REPLAY_CONTROLS_JS = """
+async (rounds) => {
+    const box = document.querySelector('.chart-box');
+    const nextFrame = () => new Promise((resolve) => requestAnimationFrame(() => setTimeout(resolve, 0)));
+    const timings = [];
+    const fire = async (control, el, apply) => {
+        const start = performance.now();
+        apply(el);
+        el.dispatchEvent(new Event('change'));
+        await nextFrame();
+        timings.push({ control, frame_ms: performance.now() - start });
+    };
+    const cycleSelect = async (control, el) => {
+        if (!el || el.options.length < 2) return;
+        const initial = el.value;
+        const values = Array.from(el.options, (o) => o.value).filter((v) => v !== initial);
+        for (let r = 0; r < rounds; r++) {
+            for (const value of values.slice(0, 3)) await fire(control, el, (s) => { s.value = value; });
+            await fire(control, el, (s) => { s.value = initial; });
+        }
+    };
+    await cycleSelect('year', box.querySelector('[data-testid="widget-year-select"]'));
+    await cycleSelect('period-type', box.querySelector('.ctrl-period-type select'));
+    await cycleSelect('period-value', box.querySelector('.ctrl-period-value select'));
+    const yoy = box.querySelector('.ctrl-yoy input');
+    if (yoy) {
+        for (let r = 0; r < 2 * rounds; r++) await fire('yoy', yoy, (c) => { c.checked = !c.checked; });
+    }
+    return timings;
+}
+"""
+
+
+def _summary(values):
+    if not values:
+        return None
+    return {
+        "count": len(values),
+        "median_ms": statistics.median(values),
+        "max_ms": max(values),
+    }
+
+
+def _stage_ms(measures, stage):
+    return sum(m["duration"] for m in measures if m["detail"] and m["detail"].get("stage") == stage)
+
+
+def measure_report(page, html_path):
+    """Load one report and replay its controls; return the timing record (without metadata)."""
+    # ?perf: the page only records its User Timing measures with it.
+    page.goto(pathlib.Path(html_path).resolve().as_uri() + "?perf")
+    page.wait_for_function(_WIDGET_READY_JS, timeout=READY_TIMEOUT_MS)
+    load = page.evaluate("() => performance.getEntriesByType('navigation')[0].toJSON()")
+    measures = page.evaluate(_READ_MEASURES_JS)
+    error = page.evaluate("() => (document.querySelector('.chart-box .error') || {}).textContent || null")
+    updates = [m["duration"] for m in measures if m["detail"] and m["detail"].get("stage") == "widget-update"]
+    record = {
+        "dom_content_loaded_ms": load.get("domContentLoadedEventEnd"),
+        "dataset_decode_ms": _stage_ms(measures, "dataset-decode"),
+        "csv_parse_ms": _stage_ms(measures, "csv-parse"),
+        "widget_construct_ms": _stage_ms(measures, "widget-construct"),
+        "initial_update_ms": updates[0] if updates else None,
+        "error": error,
+        "controls": {},
+    }
+    if error:
+        return record
+
+    page.evaluate("() => performance.clearMeasures()")
+    frames = page.evaluate(_REPLAY_CONTROLS_JS, CONTROL_ROUNDS)
+    handler_ms = {}
+    for m in page.evaluate(_READ_MEASURES_JS):
+        if m["detail"] and m["detail"].get("stage") == "control":
+            handler_ms.setdefault(m["detail"]["control"], []).append(m["duration"])
+    for control in sorted(set(f["control"] for f in frames)):
+        record["controls"][control] = {
+            "handler": _summary(handler_ms.get(control, [])),
+            "frame": _summary([f["frame_ms"] for f in frames if f["control"] == control]),
+        }
+    return record
+
+
+def missing_vendor_files(widget_types):
+    """``assets/vendor/`` files that ``offline=True`` reports for ``widget_types`` need but lack."""
+    gen = DashboardGenerator()
+    needed = set()
+    for widget_type in widget_types:
+        js_files, include_d3_sankey = gen.collect_js_asset_paths(synthetic.widget_config(widget_type))
+        needed.update(d3_vendor_path(name) for name in with_d3_dependencies(d3_packages_for(js_files)))
+        if include_d3_sankey:
+            needed.add(VENDOR_D3_SANKEY_MODULE[1])
+    return sorted(rel for rel in needed if not os.path.isfile(os.path.join(gen.assets_path, rel)))
+
+
+def run(rows_list, cardinality, widget_types, offline, compress_data, headed, work_dir, on_record):
+    """Measure every (rows, widget type) pair, passing each record to ``on_record``.
+
+    :return: the Chromium version.
+    """
+    gen = DashboardGenerator()
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=not headed)
+        try:
+            for rows in rows_list:
+                csv_path = os.path.join(work_dir, "data_{}.csv".format(rows))
+                csv_bytes = synthetic.write_csv(csv_path, rows, cardinality)
+                for widget_type in widget_types:
+                    html_path = os.path.join(work_dir, "{}_{}.html".format(widget_type, rows))
+                    gen.generate_to_file(
+                        html_path,
+                        synthetic.widget_config(widget_type),
+                        [_Path(csv_path)],
+                        compress_data=compress_data,
+                        offline=offline,
+                    )
+                    page = browser.new_page()
+                    try:
+                        record = measure_report(page, html_path)
+                    finally:
+                        page.close()
+                    record.update({
+                        "widget": widget_type,
+                        "rows": rows,
+                        "cardinality": cardinality,
+                        "csv_bytes": csv_bytes,
+                        "html_bytes": os.path.getsize(html_path),
+                    })
+                    os.remove(html_path)
+                    on_record(record)
+                os.remove(csv_path)
+            return browser.version
+        finally:
+            browser.close()
+
+
+def print_scaling(records):
+    """Per widget: construct time and median year-switch frame at each size (slowest first)."""
+    by_widget = {}
+    for record in records:
+        by_widget.setdefault(record["widget"], []).append(record)
+
+    def largest_construct(widget):
+        return max(r["widget_construct_ms"] for r in by_widget[widget])
+
+    for widget in sorted(by_widget, key=largest_construct, reverse=True):
+        cells = []
+        for r in sorted(by_widget[widget], key=lambda r: r["rows"]):
+            year = (r["controls"].get("year") or {}).get("frame") or {}
+            cells.append("{}: {:.0f}ms/{}".format(
+                r["rows"],
+                r["widget_construct_ms"],
+                "{:.0f}ms".format(year["median_ms"]) if year else "-",
+            ))
+        print("{:<17} construct/year-switch  {}".format(widget, "  ".join(cells)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=_int_list, default=DEFAULT_ROWS, help="comma-separated row counts")
+    parser.add_argument("--cardinality", type=int, default=DEFAULT_CARDINALITY)
+    parser.add_argument(
+        "--widgets", default=",".join(sorted(WIDGET_TYPE_TO_JS_FILE)), help="comma-separated widget types"
+    )
+    parser.add_argument("--online", action="store_true", help="load d3 from the CDN instead of assets/vendor/")
+    parser.add_argument("--compress-data", action="store_true", help="embed datasets gzip + base64")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument(
+        "--output",
+        default=os.path.join(HERE, "results", "browser-{:%Y%m%d-%H%M%S}.json".format(datetime.now())),
+    )
+    args = parser.parse_args(argv)
+
+    widget_types = [w for w in args.widgets.split(",") if w]
+    unknown = sorted(set(widget_types) - set(WIDGET_TYPE_TO_JS_FILE))
+    if unknown:
+        parser.error("unknown widget types: {}".format(", ".join(unknown)))
+    if not args.online:
+        missing = missing_vendor_files(widget_types)
+        if missing:
+            parser.error(
+                "offline reports need the vendored modules {} in src/dashboard_engine/assets/ "
+                "(see assets/vendor/README.md); pass --online to load d3 from jsDelivr".format(", ".join(missing))
+            )
+
+    records = []
+
+    def on_record(record):
+        print(
+            "{widget:<17} rows={rows:<8} decode={dataset_decode_ms:8.1f}ms parse={csv_parse_ms:8.1f}ms "
+            "construct={widget_construct_ms:8.1f}ms{err}".format(
+                err="  ERROR " + record["error"] if record["error"] else "", **record
+            )
+        )
+        records.append(record)
+
+    work_dir = tempfile.mkdtemp(prefix="dashboard-browser-bench-")
+    try:
+        browser_version = run(
+            args.rows,
+            args.cardinality,
+            widget_types,
+            not args.online,
+            args.compress_data,
+            args.headed,
+            work_dir,
+            on_record,
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_scaling(records)
+    results = {
+        "format": RESULTS_FORMAT_VERSION,
+        "created": datetime.now().isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "browser": "chromium " + browser_version,
+        "offline": not args.online,
+        "compress_data": args.compress_data,
+        "results": records,
+    }
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print("Results written to {}".format(args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""Generator benchmarks: throughput, peak memory and output size on synthetic datasets.
+
+Macro: one single-widget dashboard per widget type (``WIDGET_TYPE_TO_JS_FILE``), rendered with
+``generate_to_file()`` from a CSV file path, plain and with ``compress_data=True``, for every
+(rows, cardinality) pair. Micro: ``normalize_dataset_for_template`` and
+``collect_js_asset_paths`` timed with ``timeit``.
+
+Results are written as JSON (one record per measurement plus run metadata). ``--compare``
+prints the change in seconds and output bytes against an earlier results file.
+
+    python benchmarks/bench_generator.py --rows 10000,100000 --output results.json
+    python benchmarks/bench_generator.py --rows 10000000 --widgets evolution --compare results.json
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(HERE)
+for _path in (os.path.join(PROJECT_ROOT, "src"), HERE):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+from dashboard_engine.generator import (  # noqa: E402
+    WIDGET_TYPE_TO_JS_FILE,
+    DashboardGenerator,
+    iter_payload_chunks,
+    normalize_dataset_for_template,
+)
+from dashboard_engine.stats import GenerationStats  # noqa: E402
+
+import synthetic  # noqa: E402
+
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_ROWS = (10000, 100000, 1000000)
+DEFAULT_CARDINALITIES = (10, 10000)
+# Rows of the in-memory CSV used by the micro-benchmarks.
+MICRO_ROWS = 20000
+
+
+def _int_list(text):
+    return tuple(int(v.replace("_", "")) for v in text.split(",") if v)
+
+
+def _git_revision():
+    try:
+        out = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, stderr=subprocess.STDOUT
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.decode("ascii").strip()
+
+
+class _Path(object):
+    """Minimal ``os.PathLike`` (Python 2.7 has no pathlib): streams the CSV via mmap."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __fspath__(self):
+        return self.path
+
+
+def run_macro(rows_list, cardinalities, widget_types, work_dir, trace_memory):
+    """Render every widget type for every dataset size; yield one record per render."""
+    gen = DashboardGenerator()
+    # Warm the asset / bundle cache so the first measured render is not an outlier.
+    for widget_type in widget_types:
+        gen.generate(synthetic.widget_config(widget_type), [synthetic.csv_text(10, 10)])
+    for rows in rows_list:
+        for cardinality in cardinalities:
+            csv_path = os.path.join(work_dir, "data_{}_{}.csv".format(rows, cardinality))
+            csv_bytes = synthetic.write_csv(csv_path, rows, cardinality)
+            for widget_type in widget_types:
+                config = synthetic.widget_config(widget_type)
+                for compress_data in (False, True):
+                    out = os.path.join(work_dir, "out.html")
+                    stats = GenerationStats(trace_memory=trace_memory)
+                    gen.generate_to_file(
+                        out, config, [_Path(csv_path)], compress_data=compress_data, stats=stats
+                    )
+                    report = stats.as_dict()
+                    yield {
+                        "kind": "generate",
+                        "widget": widget_type,
+                        "rows": rows,
+                        "cardinality": cardinality,
+                        "compress_data": compress_data,
+                        "csv_bytes": csv_bytes,
+                        "seconds": report["total_seconds"],
+                        "rows_per_second": rows / report["total_seconds"],
+                        "mb_per_second": csv_bytes / 1e6 / report["total_seconds"],
+                        "peak_bytes": report["peak_bytes"],
+                        "output_bytes": report["output_bytes"],
+                        "phases": dict((p["name"], p["seconds"]) for p in report["phases"]),
+                    }
+            os.remove(csv_path)
+
+
+def run_micro(repeat):
+    """Time the pure helpers on a fixed in-memory CSV; yield one record per case."""
+    text = synthetic.csv_text(MICRO_ROWS, 1000)
+    all_widgets = {
+        "widgets": [synthetic.widget_config(t)["widgets"][0] for t in sorted(WIDGET_TYPE_TO_JS_FILE)]
+    }
+
+    def embed(compress_data, dataset_format="csv"):
+        # Normalise, then consume the payload the way the template does.
+        normalized = normalize_dataset_for_template(text, compress_data, dataset_format)
+        return "".join(iter_payload_chunks(normalized["payload"]))
+
+    cases = [
+        ("normalize_dataset_for_template[plain]", lambda: embed(False), 20),
+        ("normalize_dataset_for_template[gzip]", lambda: embed(True), 3),
+        ("normalize_dataset_for_template[columnar-v1]", lambda: embed(False, "columnar-v1"), 1),
+        ("collect_js_asset_paths[all widgets]", lambda: DashboardGenerator.collect_js_asset_paths(all_widgets), 2000),
+    ]
+    for name, func, number in cases:
+        best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+        yield {"kind": "micro", "name": name, "rows": MICRO_ROWS, "seconds": best}
+
+
+def _record_key(record):
+    if record["kind"] == "micro":
+        return ("micro", record["name"])
+    return ("generate", record["widget"], record["rows"], record["cardinality"], record["compress_data"])
+
+
+def compare(results, baseline):
+    """Print seconds / output size deltas of ``results`` against ``baseline`` (both loaded JSON)."""
+    previous = dict((_record_key(r), r) for r in baseline["results"])
+    print("{:<70} {:>10} {:>10} {:>8}".format("case", "base s", "new s", "delta"))
+    for record in results["results"]:
+        old = previous.get(_record_key(record))
+        if old is None:
+            continue
+        delta = (record["seconds"] - old["seconds"]) / old["seconds"] if old["seconds"] else 0.0
+        label = " ".join(str(part) for part in _record_key(record))
+        line = "{:<70} {:>10.4f} {:>10.4f} {:>+7.1%}".format(label, old["seconds"], record["seconds"], delta)
+        if record.get("output_bytes") != old.get("output_bytes"):
+            line += "  output {} -> {} bytes".format(old.get("output_bytes"), record.get("output_bytes"))
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=_int_list, default=DEFAULT_ROWS, help="comma-separated row counts")
+    parser.add_argument(
+        "--cardinality", type=_int_list, default=DEFAULT_CARDINALITIES,
+        help="comma-separated distinct-label counts of the categorical columns",
+    )
+    parser.add_argument(
+        "--widgets", default=",".join(sorted(WIDGET_TYPE_TO_JS_FILE)), help="comma-separated widget types"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timeit repeats of the micro-benchmarks")
+    parser.add_argument("--no-macro", action="store_true", help="only run the micro-benchmarks")
+    parser.add_argument(
+        "--no-trace-memory", action="store_true", help="skip tracemalloc (faster, no peak_bytes)"
+    )
+    parser.add_argument(
+        "--output",
+        default=os.path.join(HERE, "results", "results-{:%Y%m%d-%H%M%S}.json".format(datetime.now())),
+        help="results JSON path (default: benchmarks/results/results-<timestamp>.json)",
+    )
+    parser.add_argument("--compare", help="earlier results JSON to diff against")
+    args = parser.parse_args(argv)
+
+    widget_types = [w for w in args.widgets.split(",") if w]
+    unknown = sorted(set(widget_types) - set(WIDGET_TYPE_TO_JS_FILE))
+    if unknown:
+        parser.error("unknown widget types: {}".format(", ".join(unknown)))
+
+    records = list(run_micro(args.repeat))
+    if not args.no_macro:
+        work_dir = tempfile.mkdtemp(prefix="dashboard-bench-")
+        try:
+            for record in run_macro(args.rows, args.cardinality, widget_types, work_dir, not args.no_trace_memory):
+                print(
+                    "{widget:<17} rows={rows:<9} card={cardinality:<6} gzip={compress_data!s:<5} "
+                    "{seconds:8.3f}s {output_bytes:>12} B".format(**record)
+                )
+                records.append(record)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {
+        "format": RESULTS_FORMAT_VERSION,
+        "created": datetime.now().isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": records,
+    }
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print("Results written to {}".format(args.output))
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
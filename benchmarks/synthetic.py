@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Synthetic datasets and one-widget configs for the generator benchmarks.
+
+Every dataset shares one schema wide enough for every widget type, so a single CSV per
+(rows, cardinality) pair is written once and reused by all widget configs.
+"""
+from __future__ import unicode_literals
+
+import io
+import random
+
+# Columns of the synthetic CSV; categorical columns draw from ``cardinality`` distinct labels.
+CSV_COLUMNS = (
+    "mois_annee",
+    "category",
+    "source",
+    "target",
+    "type",
+    "l1",
+    "l2",
+    "l3",
+    "x_cat",
+    "y_cat",
+    "x_metric",
+    "y_metric",
+    "r_metric",
+    "amount",
+)
+
+# One widget per type, mapped onto CSV_COLUMNS (keys of WIDGET_TYPE_TO_JS_FILE).
+WIDGET_MAPPINGS = {
+    "sankey": {"date": "mois_annee", "value": "amount", "path": ["l1", "l2", "l3"]},
+    "financial_sankey": {
+        "date": "mois_annee",
+        "source": "source",
+        "target": "target",
+        "value": "amount",
+        "type": "type",
+    },
+    "evolution": {"date": "mois_annee", "value": "amount"},
+    "sunburst": {"date": "mois_annee", "value": "amount", "hierarchy": ["l1", "l2", "l3"]},
+    "horizon": {"date": "mois_annee", "x": "x_metric", "y": "category", "value": "amount"},
+    "nested_treemap": {"date": "mois_annee", "value": "amount", "hierarchy": ["l1", "l2", "l3"]},
+    "stacked_area": {"date": "mois_annee", "value": "amount", "category": "category"},
+    "bubble": {
+        "date": "mois_annee",
+        "x": "x_metric",
+        "y": "y_metric",
+        "r": "r_metric",
+        "category": "category",
+    },
+    "heatmap": {"date": "mois_annee", "x": "x_cat", "y": "y_cat", "value": "amount"},
+    "radial_area": {"date": "mois_annee", "value": "amount"},
+    "directed_chord": {"date": "mois_annee", "source": "source", "target": "target", "value": "amount"},
+    "ribbon_chart": {"date": "mois_annee", "value": "amount", "category": "category"},
+}
+
+# financial_sankey reads flow types from a fixed vocabulary.
+_FLOW_TYPES = ("revenue", "expense", "profit")
+_MONTHS = ["{}-{:02d}".format(year, month) for year in (2023, 2024, 2025) for month in range(1, 13)]
+
+
+def widget_config(widget_type):
+    """Single-widget dashboard config for ``widget_type`` over the synthetic schema."""
+    return {
+        "title": "Benchmark {}".format(widget_type),
+        "widgets": [
+            {
+                "type": widget_type,
+                "title": widget_type,
+                "datasetIndex": 0,
+                "mapping": WIDGET_MAPPINGS[widget_type],
+            }
+        ],
+    }
+
+
+def iter_csv_lines(rows, cardinality, seed=0):
+    """Yield the synthetic CSV line by line (header first), deterministic for a given seed."""
+    rng = random.Random(seed)
+    labels = ["c{}".format(i) for i in range(max(1, cardinality))]
+    small = labels[:max(1, min(len(labels), 20))]
+    yield ",".join(CSV_COLUMNS) + "\n"
+    for i in range(rows):
+        yield "{},{},{},{},{},{},{},{},{},{},{},{:.2f},{:.1f},{:.2f}\n".format(
+            _MONTHS[i % len(_MONTHS)],
+            rng.choice(labels),
+            rng.choice(small),
+            rng.choice(small),
+            _FLOW_TYPES[i % len(_FLOW_TYPES)],
+            rng.choice(small),
+            rng.choice(labels),
+            rng.choice(labels),
+            rng.choice(small),
+            rng.choice(small),
+            rng.randint(0, 365),
+            rng.random() * 1000,
+            rng.random() * 50,
+            rng.random() * 10000,
+        )
+
+
+def csv_text(rows, cardinality, seed=0):
+    """The synthetic CSV as one string (small sizes / micro-benchmarks)."""
+    return "".join(iter_csv_lines(rows, cardinality, seed))
+
+
+def write_csv(path, rows, cardinality, seed=0):
+    """Write the synthetic CSV to ``path`` in bounded batches; return its size in bytes."""
+    batch = []
+    with io.open(path, "w", encoding="utf-8", newline="") as f:
+        for line in iter_csv_lines(rows, cardinality, seed):
+            batch.append(line)
+            if len(batch) >= 10000:
+                f.write("".join(batch))
+                batch = []
+        f.write("".join(batch))
+        return f.tell()
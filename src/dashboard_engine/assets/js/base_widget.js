@@ -1,22 +1,99 @@
-import showdown from "https://cdn.jsdelivr.net/npm/showdown@2.1.0/+esm";
-
 const WIDGET_CONTROL_DOM = {
     YEAR_SELECT_TEST_ID: 'widget-year-select',
 };
 
+/**
+ * `options.renderer` values of widgets with a high-cardinality mark layer. With `auto`, the
+ * layer is painted on a canvas above `options.canvasThreshold` marks (axes and legends stay SVG).
+ */
+const WIDGET_RENDERER = {
+    SVG: 'svg',
+    CANVAS: 'canvas',
+    AUTO: 'auto',
+    DEFAULT_CANVAS_THRESHOLD: 5000,
+};
+
+/** Mark canvas -> `{ width, height, draw }` of its last paint, replayed when its mount resizes. */
+const MARK_CANVAS_PAINTS = new WeakMap();
+
+let canvas2dSupported = null;
+
+/**
+ * Tooltip root (svg node) -> `{ bindings, canvas, hovered, text }` of BaseWidget.bindTooltip: mark
+ * selector -> `text(datum, element)`, the canvas hit-test of bindCanvasTooltip, and the hovered
+ * mark (or canvas datum) with its formatted text.
+ */
+const DELEGATED_TOOLTIPS = new WeakMap();
+
+/** The page-wide tooltip element shared by every widget (created on first use). */
+let widgetTooltipEl = null;
+
+function widgetTooltip() {
+    if (!widgetTooltipEl) {
+        widgetTooltipEl = document.createElement('div');
+        widgetTooltipEl.className = 'widget-tooltip';
+        widgetTooltipEl.setAttribute('role', 'tooltip');
+        widgetTooltipEl.hidden = true;
+        document.body.appendChild(widgetTooltipEl);
+    }
+    return widgetTooltipEl;
+}
+
+function supportsCanvas2d() {
+    if (canvas2dSupported === null) {
+        canvas2dSupported = !!document.createElement('canvas').getContext?.('2d');
+    }
+    return canvas2dSupported;
+}
+
+/**
+ * Size a mark canvas to its svg's box at devicePixelRatio resolution, map the svg viewBox onto it
+ * (default `xMidYMid meet`) and replay its paint callback.
+ */
+function repaintMarkCanvas(canvas) {
+    const paint = MARK_CANVAS_PAINTS.get(canvas);
+    const svg = canvas.nextElementSibling;
+    if (!paint || canvas.hidden || !svg) return;
+
+    const host = canvas.parentNode;
+    const hostBox = host.getBoundingClientRect();
+    const box = svg.getBoundingClientRect();
+    const ratio = window.devicePixelRatio || 1;
+    canvas.style.left = `${box.left - hostBox.left - host.clientLeft}px`;
+    canvas.style.top = `${box.top - hostBox.top - host.clientTop}px`;
+    canvas.style.width = `${box.width}px`;
+    canvas.style.height = `${box.height}px`;
+    // Resizing the backing store also clears it.
+    canvas.width = Math.max(1, Math.round(box.width * ratio));
+    canvas.height = Math.max(1, Math.round(box.height * ratio));
+
+    const scale = Math.min(box.width / paint.width, box.height / paint.height);
+    if (!(scale > 0)) return;
+    const ctx = canvas.getContext('2d');
+    ctx.setTransform(
+        ratio * scale, 0, 0, ratio * scale,
+        ratio * (box.width - paint.width * scale) / 2,
+        ratio * (box.height - paint.height * scale) / 2
+    );
+    paint.draw(ctx);
+}
+
+/**
+ * processData results per source dataset and date column: widgets on the same datasetIndex
+ * share one rows array, hence one Utils.calendarIndex.
+ */
+const PROCESSED_ROWS_CACHE = new WeakMap();
+
 class BaseWidget {
     constructor(container, rawData, config) {
         this.container = container;
         this.config = config;
-
-        this.converter = new showdown.Converter({
-            simpleLineBreaks: true,
-            openLinksInNewWindow: true,
-            emoji: true
-        });
+        // `<type>#<index in config.widgets>` tag of this widget's DashboardPerf measures.
+        this.perfTag = `${config.type}#${container.dataset.widgetIndex ?? ''}`;
 
         this.rawData = this.processData(rawData);
-        this.years = Array.from(new Set(this.rawData.map(d => d.year))).sort((a, b) => a - b);
+        this.calendar = Utils.calendarIndex(this.rawData);
+        this.years = this.calendar.years.slice();
 
         this.state = {
             periodType: 'mois',
@@ -27,14 +104,48 @@ class BaseWidget {
 
         this.initLayout();
         this.renderControls();
-        this.update();
+        this.runUpdate();
+    }
+
+    /** update(), measured as `widget-update:<type>#<index>`. */
+    runUpdate() {
+        DashboardPerf.time('widget-update', this.perfTag, () => this.update(), this.perfDetail());
+    }
+
+    perfDetail(extra) {
+        return { type: this.config.type, index: this.container.dataset.widgetIndex, ...extra };
+    }
+
+    /**
+     * Apply a control change, then re-render; the whole step is measured as
+     * `control:<type>#<index>:<control>` (input latency of the widget).
+     */
+    applyControl(control, change) {
+        DashboardPerf.time('control', `${this.perfTag}:${control}`, () => {
+            change();
+            this.runUpdate();
+        }, this.perfDetail({ control }));
     }
 
     processData(data) {
         const dateCol = this.config?.mapping?.date;
-        return data
+        const indexed = Utils.rowsFromMonthIndex(data, dateCol);
+        if (indexed) return indexed;
+
+        let byColumn = PROCESSED_ROWS_CACHE.get(data);
+        if (!byColumn) PROCESSED_ROWS_CACHE.set(data, (byColumn = new Map()));
+        if (byColumn.has(dateCol)) return byColumn.get(dateCol);
+
+        // With `calendarColumn` set, the source rows carry the year / month of another date
+        // column (annotated in place by Utils.rowsFromMonthIndex): the copies must not keep them.
+        const staleCalendar = !!data.calendarColumn;
+        const rows = data
             .map(d => {
                 const row = { ...d };
+                if (staleCalendar) {
+                    row.year = undefined;
+                    row.month = undefined;
+                }
                 if (dateCol && d[dateCol]) {
                     const parts = String(d[dateCol]).split('-');
                     if (parts.length >= 2) {
@@ -45,6 +156,8 @@ class BaseWidget {
                 return row;
             })
             .filter(d => d.year && d.month);
+        byColumn.set(dateCol, rows);
+        return rows;
     }
 
     initLayout() {
@@ -64,7 +177,8 @@ class BaseWidget {
         h2.textContent = this.config.title;
         titleRow.appendChild(h2);
 
-        if (this.config.description) {
+        // descriptionHtml: Markdown `description` rendered and sanitised at generation time.
+        if (this.config.descriptionHtml) {
             const infoIcon = document.createElement('span');
             infoIcon.className = 'info-icon';
             infoIcon.innerHTML = `<svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="${UI_THEME.primary}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" style="display:block"><circle cx="12" cy="12" r="10"></circle><line x1="12" y1="16" x2="12" y2="12"></line><line x1="12" y1="8" x2="12.01" y2="8"></line></svg>`;
@@ -83,12 +197,10 @@ class BaseWidget {
         header.appendChild(titleRow);
         this.container.appendChild(header);
 
-        if (this.config.description) {
+        if (this.config.descriptionHtml) {
             const descDiv = document.createElement('div');
             descDiv.className = 'widget-description';
-
-            const htmlContent = this.converter.makeHtml(this.config.description);
-            descDiv.innerHTML = htmlContent;
+            descDiv.innerHTML = this.config.descriptionHtml;
 
             descDiv.style.display = 'none';
             this.container.appendChild(descDiv);
@@ -123,21 +235,19 @@ class BaseWidget {
             if (t === this.state.periodType) o.selected = true;
             selType.appendChild(o);
         });
-        selType.onchange = (e) => {
+        selType.onchange = (e) => this.applyControl('period-type', () => {
             this.state.periodType = e.target.value;
             this.refreshPeriodValueSelect(selVal);
-            this.update();
-        };
+        });
         grpPeriod.appendChild(selType);
         c.appendChild(grpPeriod);
 
         const grpVal = document.createElement('div');
         grpVal.className = 'control-group ctrl-period-value';
         const selVal = document.createElement('select');
-        selVal.onchange = (e) => {
+        selVal.onchange = (e) => this.applyControl('period-value', () => {
             this.state.periodValue = +e.target.value;
-            this.update();
-        };
+        });
         grpVal.appendChild(selVal);
         c.appendChild(grpVal);
         this.refreshPeriodValueSelect(selVal);
@@ -154,20 +264,18 @@ class BaseWidget {
             if (y === this.state.year) o.selected = true;
             selYear.appendChild(o);
         });
-        selYear.onchange = (e) => {
+        selYear.onchange = (e) => this.applyControl('year', () => {
             this.state.year = +e.target.value;
-            this.update();
-        };
+        });
         grpYear.appendChild(selYear);
         c.appendChild(grpYear);
 
         const grpYoy = document.createElement('div');
         grpYoy.className = 'control-group ctrl-yoy';
         grpYoy.innerHTML = `<label><input type="checkbox" ${this.state.yoy ? 'checked' : ''}> N-1</label>`;
-        grpYoy.querySelector('input').onchange = (e) => {
+        grpYoy.querySelector('input').onchange = (e) => this.applyControl('yoy', () => {
             this.state.yoy = e.target.checked;
-            this.update();
-        };
+        });
         c.appendChild(grpYoy);
     }
 
@@ -210,15 +318,252 @@ class BaseWidget {
         }
     }
 
+    /**
+     * Rows of `year` in the selected period, from the shared calendar index (read-only).
+     */
     getFilteredData(year) {
         const { periodType, periodValue } = this.state;
-        return this.rawData.filter(d => {
-            if (d.year !== year) return false;
-            if (periodType === 'annee') return true;
-            if (periodType === 'mois') return d.month === periodValue;
-            if (periodType === 'trimestre') return Utils.getQuarter(d.month) === periodValue;
-            if (periodType === 'semestre') return Utils.getSemester(d.month) === periodValue;
-            return false;
+        return this.calendar.rowsForPeriod(year, periodType, periodValue);
+    }
+
+    /**
+     * Every row of `year`, from the shared calendar index (read-only).
+     */
+    getYearData(year) {
+        return this.calendar.rowsForYear(year);
+    }
+
+    /**
+     * Sub-chart panels kept across update() calls, so widgets re-run keyed joins on their
+     * marks instead of rebuilding every node. `create(el)` builds the scaffold (svg, groups,
+     * scales...) of a panel the first time its key is shown; panels whose key is gone and any
+     * other vizWrapper content (empty-state hints) are removed.
+     * @returns {Array<{ key: string, el: HTMLElement, scaffold: * }>} in `keys` order
+     */
+    syncPanels(keys, create) {
+        const panels = this.panels || (this.panels = new Map());
+        panels.forEach((_, key) => {
+            if (!keys.includes(key)) panels.delete(key);
+        });
+        const shown = keys.map((key) => {
+            let panel = panels.get(key);
+            if (!panel) {
+                const el = document.createElement('div');
+                el.className = 'sub-chart';
+                panel = { key, el, scaffold: create(el) };
+                panels.set(key, panel);
+            }
+            return panel;
+        });
+        const current = Array.from(this.vizWrapper.children);
+        if (current.length !== shown.length || shown.some((panel, i) => panel.el !== current[i])) {
+            this.vizWrapper.replaceChildren(...shown.map((panel) => panel.el));
+        }
+        return shown;
+    }
+
+    /**
+     * Common panel scaffold: an `<h4>` title (omitted with `title: false`) and a mount div
+     * (`mountClass`, `mountStyle`) holding a hidden empty-state hint and the svg. Returns
+     * `{ title, mount, hint, svg }`, `svg` as a d3 selection.
+     */
+    createChartPanel(el, { mountClass = '', mountStyle = '', title = true } = {}) {
+        el.innerHTML =
+            `${title ? '<h4></h4>' : ''}<div class="${mountClass}" style="${mountStyle}">` +
+            '<p class="hint" style="text-align:center; padding-top:100px; display:none;"></p></div>';
+        const mount = el.querySelector('div');
+        return {
+            title: el.querySelector('h4'),
+            mount,
+            hint: mount.querySelector('.hint'),
+            svg: d3.select(mount).append('svg'),
+        };
+    }
+
+    /** Panel key of `year` in the YoY layout: 'N' for the anchor year, 'N-1' before it. */
+    yoyPanelKey(year) {
+        return year === this.state.year ? 'N' : `N-${this.state.year - year}`;
+    }
+
+    /** Drop the panels and show a single empty-state hint in vizWrapper. */
+    showVizHint(text) {
+        this.syncPanels([], null);
+        const empty = document.createElement('div');
+        empty.className = 'sub-chart';
+        empty.innerHTML = '<p class="hint" style="text-align:center; padding-top:100px;"></p>';
+        empty.firstChild.textContent = text;
+        this.vizWrapper.appendChild(empty);
+    }
+
+    /**
+     * Show `text` in a panel scaffold's `hint` element in place of its `svg` (d3 selection);
+     * a falsy `text` shows the svg again.
+     */
+    setPanelHint(scaffold, text) {
+        scaffold.hint.textContent = text || '';
+        scaffold.hint.style.display = text ? '' : 'none';
+        scaffold.svg.style('display', text ? 'none' : null);
+        if (text) this.hideMarkCanvas(scaffold.svg.node());
+    }
+
+    /** Show the shared tooltip with `text` (plain text, may span lines) next to the pointer. */
+    showTooltip(event, text) {
+        const tooltip = widgetTooltip();
+        tooltip.textContent = text;
+        tooltip.hidden = false;
+        // Flip to the left / above the pointer near the viewport edges.
+        const { offsetWidth, offsetHeight } = tooltip;
+        const left = event.clientX + 12 + offsetWidth > window.innerWidth
+            ? event.clientX - 12 - offsetWidth
+            : event.clientX + 12;
+        const top = event.clientY + 12 + offsetHeight > window.innerHeight
+            ? event.clientY - 12 - offsetHeight
+            : event.clientY + 12;
+        tooltip.style.left = `${Math.max(0, left)}px`;
+        tooltip.style.top = `${Math.max(0, top)}px`;
+    }
+
+    hideTooltip() {
+        if (widgetTooltipEl) widgetTooltipEl.hidden = true;
+    }
+
+    /**
+     * Shared tooltip for the marks of `root` (svg node or d3 selection) matching `selector`, in
+     * place of a `<title>` per mark. One delegated pointer listener per root formats
+     * `text(datum, element)` for the hovered mark only, once per mark entered. Binding the same
+     * root and selector again replaces `text` (persistent scaffolds re-bind on every update).
+     */
+    bindTooltip(root, selector, text) {
+        const delegate = this.tooltipDelegate(root);
+        // Marks may carry new data: format again on the next move.
+        delegate.hovered = null;
+        delegate.bindings.set(selector, text);
+    }
+
+    /**
+     * Shared tooltip for a mark layer painted by paintMarkCanvas under `root`, where no element
+     * matches a bindTooltip selector: `locate(px, py)` returns the datum at the pointer (svg
+     * viewBox units) or null, and `text(datum)` formats it. A null `locate` removes the hit-test
+     * (the layer is back on svg).
+     */
+    bindCanvasTooltip(root, locate, text) {
+        const delegate = this.tooltipDelegate(root);
+        delegate.hovered = null;
+        delegate.canvas = locate ? { locate, text } : null;
+    }
+
+    /** Delegated tooltip state of `root`, with its pointer listeners attached on first use. */
+    tooltipDelegate(root) {
+        const node = root.node ? root.node() : root;
+        let delegate = DELEGATED_TOOLTIPS.get(node);
+        if (delegate) return delegate;
+
+        delegate = { bindings: new Map(), canvas: null, hovered: null, text: '' };
+        DELEGATED_TOOLTIPS.set(node, delegate);
+        const show = (event, hovered, format) => {
+            if (hovered !== delegate.hovered) {
+                delegate.hovered = hovered;
+                delegate.text = format();
+            }
+            this.showTooltip(event, delegate.text);
+        };
+        node.addEventListener('pointermove', (event) => {
+            for (const [markSelector, format] of delegate.bindings) {
+                const mark = event.target.closest?.(markSelector);
+                if (mark && node.contains(mark)) {
+                    show(event, mark, () => format(d3.select(mark).datum(), mark));
+                    return;
+                }
+            }
+            const datum = delegate.canvas && delegate.canvas.locate(...d3.pointer(event, node));
+            if (datum) {
+                show(event, datum, () => delegate.canvas.text(datum));
+                return;
+            }
+            delegate.hovered = null;
+            this.hideTooltip();
+        });
+        node.addEventListener('pointerleave', () => {
+            delegate.hovered = null;
+            this.hideTooltip();
+        });
+        return delegate;
+    }
+
+    /**
+     * Renderer of a mark layer of `markCount` marks: `options.renderer` when it is 'svg' or
+     * 'canvas'; with 'auto' (default), 'canvas' above `options.canvasThreshold` marks.
+     * Browsers without a 2D canvas context always get 'svg'.
+     */
+    resolveRenderer(markCount) {
+        const options = this.config.options || {};
+        const requested = options.renderer || WIDGET_RENDERER.AUTO;
+        if (requested === WIDGET_RENDERER.SVG || !supportsCanvas2d()) return WIDGET_RENDERER.SVG;
+        if (requested === WIDGET_RENDERER.CANVAS) return WIDGET_RENDERER.CANVAS;
+        const threshold = options.canvasThreshold ?? WIDGET_RENDERER.DEFAULT_CANVAS_THRESHOLD;
+        return markCount > threshold ? WIDGET_RENDERER.CANVAS : WIDGET_RENDERER.SVG;
+    }
+
+    /**
+     * Paint a mark layer on a `<canvas class="mark-canvas">` placed right under `svgNode`
+     * (created on first use, reused afterwards). `draw(ctx)` works in the svg's viewBox units
+     * (`width` x `height`); the canvas follows the svg box at devicePixelRatio resolution and
+     * `draw` is replayed when the mount resizes. The svg keeps axes, labels and legends on top.
+     */
+    paintMarkCanvas(svgNode, width, height, draw) {
+        const host = svgNode.parentNode;
+        let canvas = svgNode.previousElementSibling;
+        if (!canvas || !canvas.classList.contains('mark-canvas')) {
+            canvas = document.createElement('canvas');
+            canvas.className = 'mark-canvas';
+            host.insertBefore(canvas, svgNode);
+            host.classList.add('mark-canvas-host');
+            if (typeof ResizeObserver !== 'undefined') {
+                new ResizeObserver(() => repaintMarkCanvas(canvas)).observe(host);
+            }
+        }
+        canvas.hidden = false;
+        d3.select(svgNode).attr('data-renderer', WIDGET_RENDERER.CANVAS);
+        MARK_CANVAS_PAINTS.set(canvas, { width, height, draw });
+        repaintMarkCanvas(canvas);
+    }
+
+    /** Hide the mark canvas of `svgNode`, if any (svg renderer or empty panel). */
+    hideMarkCanvas(svgNode) {
+        d3.select(svgNode).attr('data-renderer', WIDGET_RENDERER.SVG);
+        const canvas = svgNode.previousElementSibling;
+        if (canvas && canvas.classList.contains('mark-canvas')) {
+            canvas.hidden = true;
+            MARK_CANVAS_PAINTS.delete(canvas);
+        }
+    }
+
+    /**
+     * `compute()` memoised in the page-level AGGREGATION_CACHE. The key is the aggregation
+     * `name`, the dataset, the date column and the mapping `fields` it reads, `year`, the
+     * selected period (unless `period: false`, for year slices) and `extra` (filter, view
+     * option). Widgets reading the same columns share entries; results are read-only.
+     */
+    cachedAggregate(name, year, compute, { fields, period = true, extra = null }) {
+        const mapping = this.config.mapping || {};
+        const { periodType, periodValue } = this.state;
+        return AGGREGATION_CACHE.get([
+            name,
+            this.config.datasetIndex || 0,
+            mapping.date,
+            fields.map((field) => mapping[field] ?? null),
+            year,
+            period ? periodType : null,
+            period && periodType !== 'annee' ? periodValue : null,
+            extra,
+        ], compute);
+    }
+
+    /** Utils.rollupHierarchy of `rows` (cached; shared by treemap and sunburst on one dataset). */
+    cachedHierarchyTree(year, rows) {
+        const { hierarchy, value } = this.config.mapping;
+        return this.cachedAggregate('hierarchy', year, () => Utils.rollupHierarchy(rows, hierarchy, value), {
+            fields: ['hierarchy', 'value'],
         });
     }
 
@@ -1,7 +1,13 @@
 const BUBBLE_CONSTANTS = {
     MAX_RADIUS_PX: 30,
+    // Bubbles smaller than this still catch the pointer within this distance of their centre.
+    MIN_HIT_RADIUS_PX: 6,
+    DIMMED_OPACITY: 0.15,
 };
 
+/** Bubble points array -> `{ key, tree }`: quadtree of its last projection. */
+const BUBBLE_QUADTREES = new WeakMap();
+
 function buildBubblePoints(rows, mapping) {
     const xKey = mapping.x;
     const yKey = mapping.y;
@@ -60,6 +66,72 @@ function buildBubbleScalesForSize(domains, innerWidth, chartHeight, margin) {
     return { x, y, rScale, color };
 }
 
+/** Cache key of the (viewBox) projection of a bubble panel. */
+function bubbleProjectionKey(x, y) {
+    return [x.domain(), x.range(), y.domain(), y.range()].join('|');
+}
+
+/**
+ * d3.quadtree of the indices of `bubbles` at their projected (viewBox) positions. Cached per
+ * points array and projection: points come from AGGREGATION_CACHE, so a panel shown again
+ * reuses its tree.
+ */
+function bubbleQuadtree(bubbles, x, y) {
+    const key = bubbleProjectionKey(x, y);
+    const cached = BUBBLE_QUADTREES.get(bubbles);
+    if (cached && cached.key === key) {
+        return cached.tree;
+    }
+    const tree = d3.quadtree(Array.from(bubbles.keys()), (i) => x(bubbles[i].x), (i) => y(bubbles[i].y));
+    BUBBLE_QUADTREES.set(bubbles, { key, tree });
+    return tree;
+}
+
+/**
+ * Topmost bubble whose circle contains the viewBox point (px, py). Every centre within
+ * MAX_RADIUS_PX is a candidate, since a large bubble can cover a point closer to a small
+ * bubble's centre; bubbles are drawn in array order, so the highest index is on top.
+ */
+function findBubbleAt(tree, bubbles, rScale, px, py) {
+    const reach = Math.max(BUBBLE_CONSTANTS.MAX_RADIUS_PX, BUBBLE_CONSTANTS.MIN_HIT_RADIUS_PX);
+    const cx = tree.x();
+    const cy = tree.y();
+    let top = -1;
+    tree.visit((node, x0, y0, x1, y1) => {
+        if (!node.length) {
+            for (let leaf = node; leaf; leaf = leaf.next) {
+                const i = leaf.data;
+                const hitRadius = Math.max(rScale(bubbles[i].r), BUBBLE_CONSTANTS.MIN_HIT_RADIUS_PX);
+                if (i > top && Math.hypot(cx(i) - px, cy(i) - py) <= hitRadius) {
+                    top = i;
+                }
+            }
+        }
+        return x0 > px + reach || y0 > py + reach || x1 < px - reach || y1 < py - reach;
+    });
+    return top < 0 ? null : bubbles[top];
+}
+
+/** Bubbles whose centre lies in the viewBox rectangle `[[x0, y0], [x1, y1]]`. */
+function bubblesInExtent(tree, bubbles, [[x0, y0], [x1, y1]]) {
+    const found = [];
+    const px = tree.x();
+    const py = tree.y();
+    tree.visit((node, nx0, ny0, nx1, ny1) => {
+        if (!node.length) {
+            for (let leaf = node; leaf; leaf = leaf.next) {
+                const cx = px(leaf.data);
+                const cy = py(leaf.data);
+                if (cx >= x0 && cx <= x1 && cy >= y0 && cy <= y1) {
+                    found.push(bubbles[leaf.data]);
+                }
+            }
+        }
+        return nx0 > x1 || ny0 > y1 || nx1 < x0 || ny1 < y0;
+    });
+    return found;
+}
+
 class BubbleWidget extends BaseWidget {
 
     initLayout() {
@@ -69,43 +141,35 @@ class BubbleWidget extends BaseWidget {
     }
 
     update() {
-        this.vizWrapper.innerHTML = '';
-
-        const mapping = this.config.mapping || {};
         const anchorYear = this.state.year;
         const years = Utils.calendarYearsForYoYChart(anchorYear, this.state.yoy);
         const rowSlices = years.map((y) => Utils.extractRowsForCalendarYear(this.rawData, y));
         const anyData = rowSlices.some((r) => r.length > 0);
 
         if (!anyData) {
-            const empty = document.createElement('div');
-            empty.className = 'sub-chart';
-            empty.innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée pour cette année.</p>';
-            this.vizWrapper.appendChild(empty);
+            this.showVizHint('Aucune donnée pour cette année.');
             return;
         }
 
-        const allPoints = rowSlices.flatMap((rows) => buildBubblePoints(rows, mapping));
-        const domains = bubbleDomainsFromPoints(allPoints);
+        const pointsByYear = years.map((year, i) => this.cachedAggregate(
+            'bubble-points',
+            year,
+            () => this.buildBubbleData(rowSlices[i]),
+            { fields: ['x', 'y', 'r', 'category'], period: false }
+        ));
+        const domains = bubbleDomainsFromPoints(pointsByYear.flat());
 
-        years.forEach((year) => {
-            const data = Utils.extractRowsForCalendarYear(this.rawData, year);
-            const container = document.createElement('div');
-            container.className = 'sub-chart';
+        const panels = this.syncPanels(years.map((year) => this.yoyPanelKey(year)), (el) => this.createBubblePanel(el));
+        panels.forEach(({ scaffold }, i) => {
+            const year = years[i];
             const suffix = Utils.formatYoYChartTitleSuffix(this.state.yoy, year, anchorYear);
-            container.innerHTML =
-                `<h4>${year}${suffix}</h4><div class="bubble-chart" style="height:${Utils.CHART_LAYOUT.STANDARD_PLOT_HEIGHT}px;"></div>`;
-            this.vizWrapper.appendChild(container);
-
-            const mount = container.querySelector('.bubble-chart');
-            if (!data.length) {
-                mount.innerHTML =
-                    '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée pour cette année.</p>';
+            scaffold.title.textContent = `${year}${suffix}`;
+
+            if (!rowSlices[i].length) {
+                this.setPanelHint(scaffold, 'Aucune donnée pour cette année.');
                 return;
             }
-
-            this.drawBubbleChart(mount, data, domains);
+            this.drawBubbleChart(scaffold, pointsByYear[i], domains);
         });
     }
 
@@ -113,25 +177,45 @@ class BubbleWidget extends BaseWidget {
         return buildBubblePoints(data, this.config.mapping || {});
     }
 
-    drawBubbleChart(domNode, data, sharedDomains) {
-        const bubbles = this.buildBubbleData(data);
-        if (!bubbles.length) {
-            domNode.innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée exploitable.</p>';
+    /**
+     * Panel scaffold: axes, the svg mark layer, the brush and the hover ring, with the pointer
+     * and brush handlers attached once. `scaffold.view` holds what the last draw projected.
+     */
+    createBubblePanel(el) {
+        const scaffold = this.createChartPanel(el, {
+            mountClass: 'bubble-chart',
+            mountStyle: `height:${Utils.CHART_LAYOUT.STANDARD_PLOT_HEIGHT}px;`,
+        });
+        scaffold.xAxis = scaffold.svg.append('g');
+        scaffold.yAxis = scaffold.svg.append('g');
+        scaffold.layer = scaffold.svg.append('g').attr('class', 'bubble-layer');
+        scaffold.brushLayer = scaffold.svg.append('g').attr('class', 'bubble-brush');
+        scaffold.hover = scaffold.svg.append('circle')
+            .attr('class', 'bubble-hover')
+            .attr('fill', 'none')
+            .attr('stroke', UI_THEME.textMuted)
+            .attr('stroke-width', 1.5)
+            .attr('pointer-events', 'none')
+            .attr('display', 'none');
+        scaffold.view = null;
+        this.attachBubbleInteractions(scaffold);
+        return scaffold;
+    }
+
+    /** `bubbles`: buildBubbleData() result of one year slice. */
+    drawBubbleChart(scaffold, bubbles, sharedDomains) {
+        const domains = bubbles.length ? sharedDomains || bubbleDomainsFromPoints(bubbles) : null;
+        if (!domains) {
+            scaffold.view = null;
+            this.setPanelHint(scaffold, 'Aucune donnée exploitable.');
             return;
         }
+        this.setPanelHint(scaffold, null);
 
         const margin = { top: 30, right: 30, bottom: 40, left: 50 };
         const L = Utils.CHART_LAYOUT;
         const chartHeight = L.STANDARD_PLOT_HEIGHT;
-        const innerWidth = domNode.clientWidth || L.DEFAULT_INNER_WIDTH;
-
-        const domains = sharedDomains || bubbleDomainsFromPoints(bubbles);
-        if (!domains) {
-            domNode.innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée exploitable.</p>';
-            return;
-        }
+        const innerWidth = scaffold.mount.clientWidth || L.DEFAULT_INNER_WIDTH;
 
         const { x, y, rScale, color } = buildBubbleScalesForSize(
             domains,
@@ -140,43 +224,128 @@ class BubbleWidget extends BaseWidget {
             margin
         );
 
-        const svg = d3.select(domNode)
-            .append('svg')
-            .attr('viewBox', [0, 0, innerWidth, chartHeight]);
+        const svg = scaffold.svg.attr('viewBox', [0, 0, innerWidth, chartHeight]);
 
-        svg.append('g')
+        scaffold.xAxis
             .attr('transform', `translate(0,${chartHeight - margin.bottom})`)
             .call(d3.axisBottom(x).ticks(6))
             .call((g) => g.select('.domain').attr('stroke', UI_THEME.axisDomain))
             .call((g) => g.selectAll('line').attr('stroke', UI_THEME.gridMajor));
 
-        svg.append('g')
+        scaffold.yAxis
             .attr('transform', `translate(${margin.left},0)`)
             .call(d3.axisLeft(y).ticks(5))
             .call((g) => g.select('.domain').remove())
             .call((g) => g.selectAll('line').attr('stroke', UI_THEME.gridMajor).attr('stroke-dasharray', '2,2'));
 
-        svg.append('g')
-            .attr('class', 'bubble-layer')
-            .selectAll('circle')
-            .data(bubbles)
-            .join('circle')
-            .attr('cx', (d) => x(d.x))
-            .attr('cy', (d) => y(d.y))
-            .attr('r', (d) => rScale(d.r))
-            .attr('fill', (d) => color(d.category))
-            .attr('fill-opacity', 0.7)
-            .attr('stroke', UI_THEME.white)
-            .attr('stroke-width', 1)
-            .append('title')
-            .text((d) => {
-                const mapping = this.config.mapping || {};
-                const xKey = mapping.x;
-                const yKey = mapping.y;
-                const rKey = mapping.r;
-                const categoryKey = mapping.category;
-                const catLabel = categoryKey ? d.raw[categoryKey] : d.category;
-                return `${xKey}: ${d.raw[xKey]}\n${yKey}: ${d.raw[yKey]}\n${rKey}: ${d.raw[rKey]}\nCategory: ${catLabel}`;
+        // A brush over other bubbles or another projection no longer applies.
+        const previous = scaffold.view;
+        const unchanged = previous && previous.bubbles === bubbles && previous.key === bubbleProjectionKey(x, y);
+        // Brushed bubbles (null: no selection); the others are dimmed.
+        const view = { bubbles, x, y, rScale, key: bubbleProjectionKey(x, y), selected: unchanged ? previous.selected : null };
+        scaffold.view = view;
+
+        // Bubbles on canvas above the mark budget; the svg then keeps only the axes.
+        if (this.resolveRenderer(bubbles.length) === WIDGET_RENDERER.CANVAS) {
+            scaffold.layer.selectAll('circle').remove();
+            view.paint = () => this.paintMarkCanvas(svg.node(), innerWidth, chartHeight, (ctx) => {
+                ctx.strokeStyle = UI_THEME.white;
+                ctx.lineWidth = 1;
+                for (const d of bubbles) {
+                    const dimmed = view.selected && !view.selected.has(d);
+                    ctx.beginPath();
+                    ctx.arc(x(d.x), y(d.y), rScale(d.r), 0, 2 * Math.PI);
+                    ctx.globalAlpha = dimmed ? BUBBLE_CONSTANTS.DIMMED_OPACITY : 0.7;
+                    ctx.fillStyle = color(d.category);
+                    ctx.fill();
+                    ctx.globalAlpha = dimmed ? BUBBLE_CONSTANTS.DIMMED_OPACITY : 1;
+                    ctx.stroke();
+                }
+            });
+        } else {
+            this.hideMarkCanvas(svg.node());
+            // Joined by index: bubbles keep their array (drawing) order, which hit testing relies on.
+            const circles = scaffold.layer
+                .selectAll('circle')
+                .data(bubbles)
+                .join((enter) => enter.append('circle')
+                    .attr('fill-opacity', 0.7)
+                    .attr('stroke', UI_THEME.white)
+                    .attr('stroke-width', 1))
+                .attr('cx', (d) => x(d.x))
+                .attr('cy', (d) => y(d.y))
+                .attr('r', (d) => rScale(d.r))
+                .attr('fill', (d) => color(d.category));
+            view.paint = () => circles.classed('bubble-dimmed', (d) => !!view.selected && !view.selected.has(d));
+        }
+
+        scaffold.hover.attr('display', 'none');
+        scaffold.brush.extent([[margin.left, margin.top], [innerWidth - margin.right, chartHeight - margin.bottom]]);
+        scaffold.brushLayer.call(scaffold.brush);
+        if (!unchanged && d3.brushSelection(scaffold.brushLayer.node())) {
+            // Ends the brush with a null selection, which repaints the marks.
+            scaffold.brushLayer.call(scaffold.brush.move, null);
+            return;
+        }
+        svg.attr('data-selected-count', view.selected ? view.selected.size : null);
+        view.paint();
+    }
+
+    /**
+     * One pointer handler per panel: the bubble under the pointer is found in a quadtree of the
+     * projected points (built on first use per view) and drives the shared tooltip and the hover
+     * ring; a d3.brush over the plot selects the bubbles it encloses (cleared: no selection).
+     */
+    attachBubbleInteractions(scaffold) {
+        const { svg, hover } = scaffold;
+        const quadtree = (view) => bubbleQuadtree(view.bubbles, view.x, view.y);
+
+        scaffold.brush = d3.brush()
+            .on('start', () => this.hideTooltip())
+            .on('end', ({ selection }) => {
+                const view = scaffold.view;
+                if (!view) {
+                    return;
+                }
+                view.selected = selection ? new Set(bubblesInExtent(quadtree(view), view.bubbles, selection)) : null;
+                svg.attr('data-selected-count', view.selected ? view.selected.size : null);
+                view.paint();
             });
+
+        const clearHover = () => {
+            hover.attr('display', 'none');
+            this.hideTooltip();
+        };
+
+        svg
+            .on('pointermove', (event) => {
+                const view = scaffold.view;
+                if (event.buttons || !view) {
+                    return;
+                }
+                const [px, py] = d3.pointer(event, svg.node());
+                const d = findBubbleAt(quadtree(view), view.bubbles, view.rScale, px, py);
+                if (!d) {
+                    clearHover();
+                    return;
+                }
+                hover
+                    .attr('display', null)
+                    .attr('cx', view.x(d.x))
+                    .attr('cy', view.y(d.y))
+                    .attr('r', view.rScale(d.r) + 2);
+                this.showTooltip(event, this.bubbleTooltipText(d));
+            })
+            .on('pointerleave', clearHover);
+    }
+
+    bubbleTooltipText(d) {
+        const mapping = this.config.mapping || {};
+        const xKey = mapping.x;
+        const yKey = mapping.y;
+        const rKey = mapping.r;
+        const categoryKey = mapping.category;
+        const catLabel = categoryKey ? d.raw[categoryKey] : d.category;
+        return `${xKey}: ${d.raw[xKey]}\n${yKey}: ${d.raw[yKey]}\n${rKey}: ${d.raw[rKey]}\nCategory: ${catLabel}`;
     }
 }
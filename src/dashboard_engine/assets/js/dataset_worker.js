@@ -0,0 +1,245 @@
+/**
+ * Off-main-thread dataset decoding and parsing (generate(decode_in_worker=True), which sets
+ * config.decode_in_worker). Widget aggregation stays on the main thread.
+ *
+ * datasetWorkerMain is serialized with Function.prototype.toString into a Blob URL worker,
+ * so it works from file:// and must not reference anything outside its own body.
+ *
+ * Request:  { jobs: [{ index, encoding, payload, dateColumns }] }
+ * Response: one message per job, with every typed array transferred (not copied):
+ *   { index, csv: { names, rows, codes: Uint32Array[], dictionaries: string[][] }, monthIndex }
+ *   { index, columnar: ArrayBuffer, monthIndex }
+ *   { index, error }
+ * `monthIndex` maps a date column to a Uint16Array (year * 12 + month - 1, 0 = dropped row),
+ * the same layout as generate(parse_dates=True), read by Utils.rowsFromMonthIndex.
+ */
+function datasetWorkerMain() {
+    const ENCODING = { GZIP_BASE64: 'gzip-base64', COLUMNAR_V1: 'columnar-v1' };
+    const MONTH_INDEX_MAX_YEAR = Math.floor(0xFFFF / 12);
+    const QUOTE = 34;
+    const NEWLINE = 10;
+    const RETURN = 13;
+    const COMMA = 44;
+
+    function gunzipBase64(b64) {
+        const binary = Uint8Array.from(atob(b64.trim()), (c) => c.charCodeAt(0));
+        const stream = new Blob([binary]).stream().pipeThrough(new DecompressionStream('gzip'));
+        return new Response(stream);
+    }
+
+    /** Growable per-column dictionary codes. */
+    class ColumnBuilder {
+        constructor(name) {
+            this.name = name;
+            this.lookup = new Map();
+            this.dictionary = [];
+            this.codes = new Uint32Array(1024);
+        }
+
+        add(value, row) {
+            let code = this.lookup.get(value);
+            if (code === undefined) {
+                code = this.dictionary.length;
+                this.lookup.set(value, code);
+                this.dictionary.push(value);
+            }
+            if (row === this.codes.length) {
+                const grown = new Uint32Array(this.codes.length * 2);
+                grown.set(this.codes);
+                this.codes = grown;
+            }
+            this.codes[row] = code;
+        }
+    }
+
+    /**
+     * Parse CSV text straight into dictionary-coded columns. Quoting and newline rules follow
+     * d3.csvParse (d3-dsv parseRows), and missing fields become "" as in its row objects.
+     */
+    function parseCsvColumns(text) {
+        let N = text.length;
+        if (text.charCodeAt(N - 1) === NEWLINE) --N;
+        if (text.charCodeAt(N - 1) === RETURN) --N;
+        const EOF = {};
+        const EOL = {};
+        let I = 0;
+        let eof = N <= 0;
+        let eol = false;
+
+        function token() {
+            if (eof) return EOF;
+            if (eol) {
+                eol = false;
+                return EOL;
+            }
+            const j = I;
+            let i;
+            let c;
+            if (text.charCodeAt(j) === QUOTE) {
+                while ((I++ < N && text.charCodeAt(I) !== QUOTE) || text.charCodeAt(++I) === QUOTE);
+                if ((i = I) >= N) eof = true;
+                else if ((c = text.charCodeAt(I++)) === NEWLINE) eol = true;
+                else if (c === RETURN) {
+                    eol = true;
+                    if (text.charCodeAt(I) === NEWLINE) ++I;
+                }
+                return text.slice(j + 1, i - 1).replace(/""/g, '"');
+            }
+            while (I < N) {
+                if ((c = text.charCodeAt((i = I++))) === NEWLINE) eol = true;
+                else if (c === RETURN) {
+                    eol = true;
+                    if (text.charCodeAt(I) === NEWLINE) ++I;
+                } else if (c !== COMMA) continue;
+                return text.slice(j, i);
+            }
+            eof = true;
+            return text.slice(j, N);
+        }
+
+        let builders = null;
+        let rows = 0;
+        const fields = [];
+        let t;
+        while ((t = token()) !== EOF) {
+            fields.length = 0;
+            while (t !== EOL && t !== EOF) {
+                fields.push(t);
+                t = token();
+            }
+            if (!builders) {
+                builders = fields.map((name) => new ColumnBuilder(name));
+                continue;
+            }
+            for (let c = 0; c < builders.length; c++) builders[c].add(fields[c] || '', rows);
+            rows++;
+        }
+        builders = builders || [];
+        return {
+            names: builders.map((b) => b.name),
+            rows,
+            codes: builders.map((b) => b.codes.slice(0, rows)),
+            dictionaries: builders.map((b) => b.dictionary),
+        };
+    }
+
+    /** Month index code of a date cell, mirroring BaseWidget.processData; null if not encodable. */
+    function monthCode(value) {
+        if (!value) return 0;
+        const parts = String(value).split('-');
+        if (parts.length < 2) return 0;
+        const year = +parts[0];
+        const month = +parts[1];
+        if (!year || !month) return 0;
+        if (!Number.isInteger(year) || !Number.isInteger(month)) return null;
+        if (month < 1 || month > 12 || year < 1 || year > MONTH_INDEX_MAX_YEAR) return null;
+        return year * 12 + month - 1;
+    }
+
+    /** Month index of a dictionary-coded column (each distinct date is parsed once). */
+    function monthIndexFromCodes(codes, dictionary) {
+        const byCode = new Int32Array(dictionary.length);
+        for (let k = 0; k < dictionary.length; k++) {
+            const code = monthCode(dictionary[k]);
+            if (code === null) return null;
+            byCode[k] = code;
+        }
+        const out = new Uint16Array(codes.length);
+        for (let r = 0; r < codes.length; r++) out[r] = byCode[codes[r]];
+        return out;
+    }
+
+    function columnarDateColumns(buffer) {
+        const bytes = new Uint8Array(buffer);
+        const headerLength = new DataView(buffer).getUint32(4, true);
+        const header = JSON.parse(new TextDecoder().decode(bytes.subarray(8, 8 + headerLength)));
+        const dataStart = Math.ceil((8 + headerLength) / 8) * 8;
+        const CODE_ARRAYS = { uint8: Uint8Array, uint16: Uint16Array, uint32: Uint32Array };
+        const byName = new Map();
+        header.columns.forEach((col) => {
+            if (col.kind !== 'dict') return;
+            const Codes = CODE_ARRAYS[col.codeType];
+            byName.set(col.name, {
+                codes: new Codes(buffer, dataStart + col.offset, col.length / Codes.BYTES_PER_ELEMENT),
+                dictionary: col.dictionary,
+            });
+        });
+        return byName;
+    }
+
+    async function decodeJob(job) {
+        const monthIndex = {};
+        const transfer = [];
+        const addMonthIndexes = (lookupColumn) => {
+            job.dateColumns.forEach((name) => {
+                const column = lookupColumn(name);
+                const index = column && monthIndexFromCodes(column.codes, column.dictionary);
+                if (index) {
+                    monthIndex[name] = index;
+                    transfer.push(index.buffer);
+                }
+            });
+        };
+
+        if (job.encoding === ENCODING.COLUMNAR_V1) {
+            const buffer = await gunzipBase64(job.payload).arrayBuffer();
+            const columns = columnarDateColumns(buffer);
+            addMonthIndexes((name) => columns.get(name));
+            transfer.push(buffer);
+            return { message: { index: job.index, columnar: buffer, monthIndex }, transfer };
+        }
+
+        let text;
+        if (!job.encoding) text = job.payload;
+        else if (job.encoding === ENCODING.GZIP_BASE64) text = await gunzipBase64(job.payload).text();
+        else throw new Error('Unknown data-csv-encoding: ' + job.encoding);
+
+        const csv = parseCsvColumns(text);
+        // d3.csvParse: with duplicate header names the last column wins.
+        addMonthIndexes((name) => {
+            const c = csv.names.lastIndexOf(name);
+            return c < 0 ? null : { codes: csv.codes[c], dictionary: csv.dictionaries[c] };
+        });
+        csv.codes.forEach((codes) => transfer.push(codes.buffer));
+        return { message: { index: job.index, csv, monthIndex }, transfer };
+    }
+
+    self.onmessage = async (event) => {
+        for (const job of event.data.jobs) {
+            try {
+                const { message, transfer } = await decodeJob(job);
+                self.postMessage(message, transfer);
+            } catch (e) {
+                self.postMessage({ index: job.index, error: String((e && e.message) || e) });
+            }
+        }
+    };
+}
+
+/**
+ * Row objects (as d3.csvParse builds them) from the worker's dictionary-coded columns.
+ */
+function rowsFromWorkerColumns(csv) {
+    const rows = new Array(csv.rows);
+    for (let r = 0; r < csv.rows; r++) rows[r] = {};
+    csv.names.forEach((name, c) => {
+        const codes = csv.codes[c];
+        const dictionary = csv.dictionaries[c];
+        for (let r = 0; r < csv.rows; r++) rows[r][name] = dictionary[codes[r]];
+    });
+    rows.columns = csv.names;
+    return rows;
+}
+
+/**
+ * Start the dataset worker from a Blob URL (throws where workers are unavailable).
+ */
+function createDatasetWorker() {
+    const source = `(${datasetWorkerMain.toString()})();`;
+    const url = URL.createObjectURL(new Blob([source], { type: 'text/javascript' }));
+    try {
+        return new Worker(url);
+    } finally {
+        URL.revokeObjectURL(url);
+    }
+}
@@ -31,8 +31,52 @@ const DIRECTED_CHORD_CONSTANTS = {
     LABEL_FONT_PX: 11,
     LABEL_STROKE: '#fff',
     LABEL_STROKE_WIDTH: 2.5,
+    /** Page-level <style> holding the hover focus rules (ensureDirectedChordFocusRules). */
+    FOCUS_STYLE_ID: 'directed-chord-focus-rules',
 };
 
+/** Group indexes already covered by the focus stylesheet. */
+let directedChordFocusRuleCount = 0;
+
+/**
+ * Hover focus is pure CSS keyed on classes. The svg root gets `chord-focus` plus either
+ * `chord-focus-g<i>` (group i: its arc and every ribbon leaving or entering it) or
+ * `chord-focus-a<i>` (arc i only; the end groups of a hovered ribbon). Ribbons carry
+ * `chord-src-<i>` / `chord-tgt-<i>` and arcs `chord-grp-<i>`, so the group -> incident-ribbon
+ * index is built once with the layout and a hover is one class write on the root.
+ * Per-group rules are added to one page-level stylesheet, up to `groupCount` groups.
+ */
+function ensureDirectedChordFocusRules(groupCount) {
+    const C = DIRECTED_CHORD_CONSTANTS;
+    let style = document.getElementById(C.FOCUS_STYLE_ID);
+    if (!style) {
+        style = document.createElement('style');
+        style.id = C.FOCUS_STYLE_ID;
+        style.textContent = [
+            `.directed-chord-svg.chord-focus .directed-chord-ribbon { fill-opacity: ${C.RIBBON_DIM_OPACITY}; }`,
+            `.directed-chord-svg.chord-focus .directed-chord-arc { fill-opacity: ${C.ARC_DIM_OPACITY}; }`,
+            `.directed-chord-svg.chord-focus .directed-chord-ribbon.is-hovered { fill-opacity: ${C.RIBBON_FOCUS_OPACITY}; }`,
+            '',
+        ].join('\n');
+        document.head.appendChild(style);
+        directedChordFocusRuleCount = 0;
+    }
+    if (groupCount <= directedChordFocusRuleCount) {
+        return;
+    }
+    const rules = [];
+    for (let i = directedChordFocusRuleCount; i < groupCount; i++) {
+        rules.push(
+            `.directed-chord-svg.chord-focus-g${i} .chord-src-${i}, .directed-chord-svg.chord-focus-g${i} .chord-tgt-${i} ` +
+                `{ fill-opacity: ${C.RIBBON_FOCUS_OPACITY}; }`,
+            `.directed-chord-svg.chord-focus-g${i} .chord-grp-${i}, .directed-chord-svg.chord-focus-a${i} .chord-grp-${i} ` +
+                `{ fill-opacity: ${C.ARC_FOCUS_OPACITY}; }`
+        );
+    }
+    style.appendChild(document.createTextNode(`${rules.join('\n')}\n`));
+    directedChordFocusRuleCount = groupCount;
+}
+
 /**
  * Build a square flow matrix and ordered node labels from flat rows.
  * @param {Array<object>} rows
@@ -91,47 +135,41 @@ class DirectedChordWidget extends BaseWidget {
      */
     getChordRows(year) {
         if (!this._summable) {
-            return this.rawData.filter((d) => d.year === year);
+            return this.getYearData(year);
         }
         return this.getFilteredData(year);
     }
 
     update() {
-        this.vizWrapper.innerHTML = '';
         const mapping = this.config.mapping || {};
         const sourceKey = mapping.source;
         const targetKey = mapping.target;
         const valueKey = mapping.value;
         const year = this.state.year;
 
+        const [{ scaffold }] = this.syncPanels(['N'], (el) => this.createChordPanel(el));
+
         const rows = this.getChordRows(year);
-        const built = buildDirectedChordMatrix(rows, sourceKey, targetKey, valueKey);
+        const built = this.cachedAggregate(
+            'chord-matrix',
+            year,
+            () => buildDirectedChordMatrix(rows, sourceKey, targetKey, valueKey),
+            { fields: ['source', 'target', 'value'], period: this._summable }
+        );
         if (!built) {
-            const wrap = document.createElement('div');
-            wrap.className = 'sub-chart';
-            wrap.innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:80px;">Aucune donnée pour cette période.</p>';
-            this.vizWrapper.appendChild(wrap);
+            this.setPanelHint(scaffold, 'Aucune donnée pour cette période.');
             return;
         }
 
         const { labels, matrix } = built;
         const hasFlow = matrix.some((row) => row.some((v) => v > 0));
         if (!hasFlow) {
-            const wrap = document.createElement('div');
-            wrap.className = 'sub-chart';
-            wrap.innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:80px;">Aucun flux à afficher.</p>';
-            this.vizWrapper.appendChild(wrap);
+            this.setPanelHint(scaffold, 'Aucun flux à afficher.');
             return;
         }
 
         if (typeof d3.chordDirected !== 'function') {
-            const wrap = document.createElement('div');
-            wrap.className = 'sub-chart';
-            wrap.innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:80px;">d3.chordDirected indisponible (D3 7 requis).</p>';
-            this.vizWrapper.appendChild(wrap);
+            this.setPanelHint(scaffold, 'd3.chordDirected indisponible (D3 7 requis).');
             return;
         }
 
@@ -144,22 +182,15 @@ class DirectedChordWidget extends BaseWidget {
             chords = chordLayout(matrix);
         } catch (e) {
             console.error('DirectedChordWidget: chord layout failed', e);
-            const wrap = document.createElement('div');
-            wrap.className = 'sub-chart';
-            wrap.innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:80px;">Données insuffisantes pour le diagramme.</p>';
-            this.vizWrapper.appendChild(wrap);
+            this.setPanelHint(scaffold, 'Données insuffisantes pour le diagramme.');
             return;
         }
 
         if (!chords.groups || !chords.groups.length) {
-            const wrap = document.createElement('div');
-            wrap.className = 'sub-chart';
-            wrap.innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:80px;">Aucun flux à afficher.</p>';
-            this.vizWrapper.appendChild(wrap);
+            this.setPanelHint(scaffold, 'Aucun flux à afficher.');
             return;
         }
+        this.setPanelHint(scaffold, null);
 
         const L = Utils.CHART_LAYOUT;
         const width = this.vizWrapper.clientWidth || L.DEFAULT_INNER_WIDTH;
@@ -190,18 +221,12 @@ class DirectedChordWidget extends BaseWidget {
             Math.max(0, ribbonTargetR - 0.5)
         );
 
-        const wrap = document.createElement('div');
-        wrap.className = 'sub-chart';
-        wrap.style.textAlign = 'center';
-        this.vizWrapper.appendChild(wrap);
-
-        const svg = d3
-            .select(wrap)
-            .append('svg')
-            .attr('class', 'directed-chord-svg')
+        const svg = scaffold.svg
             .attr('viewBox', `${-width / 2} ${-height / 2} ${width} ${height}`)
             .attr('width', width)
             .attr('height', height);
+        // Marks below are rejoined: drop a focus that refers to the previous group indexes.
+        scaffold.setFocus(null, null);
 
         const color = d3.scaleOrdinal(UI_THEME.schemeTableau10).domain(labels);
 
@@ -217,112 +242,72 @@ class DirectedChordWidget extends BaseWidget {
             .headRadius(() => headRadius)
             .padAngle(Math.min(0.028, 0.65 / outerRadius));
 
-        const gMain = svg.append('g').attr('class', 'directed-chord-root');
-
-        const gArcs = gMain.append('g').attr('class', 'directed-chord-arcs');
-
-        const arcPaths = gArcs
+        // Arcs and labels are keyed by group name, ribbons by source -> target names (stored
+        // on the layout objects: bound marks keep the keys of the slice they were drawn from).
+        // The index classes are rewritten since indexes follow the sorted labels of this slice.
+        chords.groups.forEach((g) => { g.key = labels[g.index]; });
+        chords.forEach((c) => { c.key = `${labels[c.source.index]}\u0000${labels[c.target.index]}`; });
+        scaffold.arcs
             .selectAll('path')
-            .data(chords.groups)
-            .join('path')
-            .attr('class', 'directed-chord-arc')
+            .data(chords.groups, (d) => d.key)
+            .join((enter) => enter.append('path')
+                .attr('stroke', UI_THEME.white)
+                .attr('stroke-width', 1)
+                .style('cursor', 'default'))
+            .attr('class', (d) => `directed-chord-arc chord-grp-${d.index}`)
             .attr('fill', (d) => color(labels[d.index]))
-            .attr('stroke', UI_THEME.white)
-            .attr('stroke-width', 1)
             .attr('data-group-index', (d) => d.index)
-            .attr('d', arc)
-            .style('cursor', 'default')
-            .each(function (d) {
-                const idx = d.index;
-                let inflow = 0;
-                let outflow = 0;
-                for (let ri = 0; ri < matrix.length; ri++) {
-                    inflow += matrix[ri][idx] || 0;
-                }
-                const outRow = matrix[idx] || [];
-                for (let cj = 0; cj < outRow.length; cj++) {
-                    outflow += outRow[cj] || 0;
-                }
-                d3.select(this)
-                    .append('title')
-                    .text(
-                        `${labels[idx]}\nSortant (Σ): ${Utils.fmtNumber.format(outflow)}\nEntrant (Σ): ${Utils.fmtNumber.format(inflow)}`
-                    );
-            });
+            .attr('d', arc);
 
-        const gRibbons = gMain
-            .append('g')
-            .attr('class', 'directed-chord-ribbons')
-            .attr('fill-opacity', DIRECTED_CHORD_CONSTANTS.RIBBON_FOCUS_OPACITY);
+        this.bindTooltip(svg, '.directed-chord-arc', (d) => {
+            const idx = d.index;
+            let inflow = 0;
+            let outflow = 0;
+            for (let ri = 0; ri < matrix.length; ri++) {
+                inflow += matrix[ri][idx] || 0;
+            }
+            const outRow = matrix[idx] || [];
+            for (let cj = 0; cj < outRow.length; cj++) {
+                outflow += outRow[cj] || 0;
+            }
+            return `${labels[idx]}\nSortant (Σ): ${Utils.fmtNumber.format(outflow)}\nEntrant (Σ): ${Utils.fmtNumber.format(inflow)}`;
+        });
 
-        const ribbonPaths = gRibbons
+        scaffold.ribbons
             .selectAll('path')
-            .data(chords)
-            .join('path')
-            .attr('class', 'directed-chord-ribbon')
+            .data(chords, (d) => d.key)
+            .join((enter) => enter.append('path').attr('stroke', 'none'))
+            .attr('class', (d) => `directed-chord-ribbon chord-src-${d.source.index} chord-tgt-${d.target.index}`)
             .attr('fill', (d) => color(labels[d.source.index]))
-            .attr('stroke', 'none')
             .attr('data-source-index', (d) => d.source.index)
             .attr('data-target-index', (d) => d.target.index)
-            .attr('d', ribbon)
-            .each(function (d) {
-                const sName = labels[d.source.index];
-                const tName = labels[d.target.index];
-                const v = matrix[d.source.index][d.target.index];
-                d3.select(this)
-                    .append('title')
-                    .text(`Flux: ${sName} → ${tName}\nVolume: ${Utils.fmtNumber.format(v)}`);
-            });
+            .attr('d', ribbon);
 
-        const resetHighlight = () => {
-            ribbonPaths
-                .attr('fill-opacity', DIRECTED_CHORD_CONSTANTS.RIBBON_FOCUS_OPACITY)
-                .style('filter', null);
-            arcPaths.attr('fill-opacity', DIRECTED_CHORD_CONSTANTS.ARC_FOCUS_OPACITY).style('filter', null);
-        };
+        this.bindTooltip(svg, '.directed-chord-ribbon', (d) => {
+            const sName = labels[d.source.index];
+            const tName = labels[d.target.index];
+            const v = matrix[d.source.index][d.target.index];
+            return `Flux: ${sName} → ${tName}\nVolume: ${Utils.fmtNumber.format(v)}`;
+        });
 
-        arcPaths
-            .on('mouseenter', function (_event, d) {
-                const idx = d.index;
-                ribbonPaths.each(function (r) {
-                    const el = d3.select(this);
-                    const hit = r.source.index === idx || r.target.index === idx;
-                    el.attr('fill-opacity', hit ? DIRECTED_CHORD_CONSTANTS.RIBBON_FOCUS_OPACITY : DIRECTED_CHORD_CONSTANTS.RIBBON_DIM_OPACITY);
-                });
-                arcPaths.attr('fill-opacity', (a) => (a.index === idx ? DIRECTED_CHORD_CONSTANTS.ARC_FOCUS_OPACITY : DIRECTED_CHORD_CONSTANTS.ARC_DIM_OPACITY));
-            })
-            .on('mouseleave', resetHighlight);
-
-        ribbonPaths
-            .on('mouseenter', function (_event, d) {
-                const si = d.source.index;
-                const ti = d.target.index;
-                ribbonPaths.each(function (r) {
-                    const el = d3.select(this);
-                    const hit = r.source.index === si && r.target.index === ti;
-                    el.attr('fill-opacity', hit ? DIRECTED_CHORD_CONSTANTS.RIBBON_FOCUS_OPACITY : DIRECTED_CHORD_CONSTANTS.RIBBON_DIM_OPACITY);
-                });
-                arcPaths.attr('fill-opacity', (a) => (a.index === si || a.index === ti ? DIRECTED_CHORD_CONSTANTS.ARC_FOCUS_OPACITY : DIRECTED_CHORD_CONSTANTS.ARC_DIM_OPACITY));
-            })
-            .on('mouseleave', resetHighlight);
+        ensureDirectedChordFocusRules(labels.length);
 
         const labelR = outerRadius + DIRECTED_CHORD_CONSTANTS.LABEL_RADIUS_OFFSET;
-        const gLabels = gMain.append('g').attr('class', 'directed-chord-labels');
-        gLabels
+        scaffold.labels
             .selectAll('text')
-            .data(chords.groups)
-            .join('text')
-            .attr('class', 'directed-chord-group-label')
+            .data(chords.groups, (d) => d.key)
+            .join((enter) => enter.append('text')
+                .attr('class', 'directed-chord-group-label')
+                .attr('dy', '0.35em')
+                .attr('text-anchor', 'middle')
+                .attr('font-size', `${DIRECTED_CHORD_CONSTANTS.LABEL_FONT_PX}px`)
+                .attr('font-weight', '500')
+                .attr('fill', UI_THEME.textMuted)
+                .attr('stroke', DIRECTED_CHORD_CONSTANTS.LABEL_STROKE)
+                .attr('stroke-width', DIRECTED_CHORD_CONSTANTS.LABEL_STROKE_WIDTH)
+                .attr('paint-order', 'stroke fill')
+                .style('pointer-events', 'none'))
             .attr('data-group-index', (d) => d.index)
-            .attr('dy', '0.35em')
-            .attr('text-anchor', 'middle')
-            .attr('font-size', `${DIRECTED_CHORD_CONSTANTS.LABEL_FONT_PX}px`)
-            .attr('font-weight', '500')
-            .attr('fill', UI_THEME.textMuted)
-            .attr('stroke', DIRECTED_CHORD_CONSTANTS.LABEL_STROKE)
-            .attr('stroke-width', DIRECTED_CHORD_CONSTANTS.LABEL_STROKE_WIDTH)
-            .attr('paint-order', 'stroke fill')
-            .style('pointer-events', 'none')
             .text((d) => labels[d.index])
             .attr('transform', (d) => {
                 const a = (d.startAngle + d.endAngle) / 2;
@@ -333,4 +318,57 @@ class DirectedChordWidget extends BaseWidget {
                 return `translate(${x},${y}) rotate(${upsideDown ? deg + 180 : deg})`;
             });
     }
+
+    /** Single panel (no title): arc, ribbon and label layers, with the hover focus attached once. */
+    createChordPanel(el) {
+        el.style.textAlign = 'center';
+        const scaffold = this.createChartPanel(el, { title: false });
+        scaffold.hint.style.paddingTop = '80px';
+        scaffold.svg.attr('class', 'directed-chord-svg');
+
+        const gMain = scaffold.svg.append('g').attr('class', 'directed-chord-root');
+        scaffold.arcs = gMain.append('g').attr('class', 'directed-chord-arcs');
+        scaffold.ribbons = gMain
+            .append('g')
+            .attr('class', 'directed-chord-ribbons')
+            .attr('fill-opacity', DIRECTED_CHORD_CONSTANTS.RIBBON_FOCUS_OPACITY);
+        scaffold.labels = gMain.append('g').attr('class', 'directed-chord-labels');
+        scaffold.setFocus = this.attachChordFocus(scaffold.svg);
+        return scaffold;
+    }
+
+    /**
+     * Hover focus: one class write on the svg root (plus the hovered ribbon's own class).
+     * Returns `setFocus(focusClasses, ribbonEl)`.
+     */
+    attachChordFocus(svg) {
+        const svgNode = svg.node();
+        let hoveredRibbon = null;
+        const setFocus = (focusClasses, ribbonEl) => {
+            if (hoveredRibbon !== ribbonEl) {
+                if (hoveredRibbon) hoveredRibbon.classList.remove('is-hovered');
+                if (ribbonEl) ribbonEl.classList.add('is-hovered');
+                hoveredRibbon = ribbonEl;
+            }
+            svgNode.setAttribute('class', focusClasses ? `directed-chord-svg chord-focus ${focusClasses}` : 'directed-chord-svg');
+        };
+
+        svg
+            .on('pointerover', (event) => {
+                const arcEl = event.target.closest('.directed-chord-arc');
+                if (arcEl) {
+                    setFocus(`chord-focus-g${d3.select(arcEl).datum().index}`, null);
+                    return;
+                }
+                const ribbonEl = event.target.closest('.directed-chord-ribbon');
+                if (ribbonEl) {
+                    const { source, target } = d3.select(ribbonEl).datum();
+                    setFocus(`chord-focus-a${source.index} chord-focus-a${target.index}`, ribbonEl);
+                    return;
+                }
+                setFocus(null, null);
+            })
+            .on('pointerleave', () => setFocus(null, null));
+        return setFocus;
+    }
 }
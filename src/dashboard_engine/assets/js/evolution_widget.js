@@ -7,21 +7,32 @@ class EvolutionWidget extends BaseWidget {
     }
 
     update() {
-        this.vizWrapper.innerHTML = '';
-        const container = document.createElement('div');
-        container.className = 'sub-chart';
-        const L = Utils.CHART_LAYOUT;
-        container.innerHTML = `<div style="height:${L.STANDARD_PLOT_HEIGHT}px"></div>`;
-        this.vizWrapper.appendChild(container);
-
         const yearN = this.state.year;
         const yearN1 = yearN - 1;
 
-        const rawN = this.rawData.filter((d) => d.year === yearN);
+        const rawN = this.getYearData(yearN);
         const yoyYears = Utils.calendarYearsForYoYChart(yearN, this.state.yoy);
-        const rawN1 = yoyYears.length > 1 ? this.rawData.filter((d) => d.year === yearN1) : [];
+        const rawN1 = yoyYears.length > 1 ? this.getYearData(yearN1) : [];
+
+        const [{ scaffold }] = this.syncPanels(['N'], (el) => this.createEvolutionPanel(el));
+        this.drawLineChart(scaffold, rawN, rawN1);
+    }
 
-        this.drawLineChart(container.querySelector('div'), rawN, rawN1);
+    /** Single panel (no title): axes, one group per series, the % labels and the legend. */
+    createEvolutionPanel(el) {
+        const scaffold = this.createChartPanel(el, {
+            mountStyle: `height:${Utils.CHART_LAYOUT.STANDARD_PLOT_HEIGHT}px`,
+            title: false,
+        });
+        const { svg } = scaffold;
+        return {
+            ...scaffold,
+            xAxis: svg.append("g"),
+            yAxis: svg.append("g"),
+            series: svg.append("g"),
+            labels: svg.append("g").style("font-size", "10px").style("font-weight", "bold"),
+            legend: this.createLegend(svg),
+        };
     }
 
     /**
@@ -42,107 +53,127 @@ class EvolutionWidget extends BaseWidget {
         return { mapN, mapN1, dataLineN, dataLineN1, yMax };
     }
 
-    drawLineChart(domNode, dataN, dataN1) {
+    drawLineChart(scaffold, dataN, dataN1) {
         const L = Utils.CHART_LAYOUT;
-        const width = domNode.clientWidth || L.DEFAULT_INNER_WIDTH;
+        const width = scaffold.mount.clientWidth || L.DEFAULT_INNER_WIDTH;
         const height = L.STANDARD_PLOT_HEIGHT;
         const margin = { top: 30, right: 30, bottom: 30, left: 50 };
 
-        const { mapN, mapN1, dataLineN, dataLineN1, yMax } = this.buildMonthlySeries(dataN, dataN1);
+        const { mapN, mapN1, dataLineN, dataLineN1, yMax } = this.cachedAggregate(
+            'monthly-series',
+            this.state.year,
+            () => this.buildMonthlySeries(dataN, dataN1),
+            { fields: ['value'], period: false, extra: this.state.yoy }
+        );
 
         const x = d3.scaleLinear().domain([1, 12]).range([margin.left, width - margin.right]);
         const y = d3.scaleLinear().domain([0, yMax]).nice().range([height - margin.bottom, margin.top]);
 
-        const svg = d3.select(domNode).append("svg").attr("viewBox", [0, 0, width, height]);
-        this.drawAxes(svg, x, y, height, margin);
+        scaffold.svg.attr("viewBox", [0, 0, width, height]);
+        this.drawAxes(scaffold, x, y, height, margin);
 
         const line = d3.line().x(d => x(d[0])).y(d => y(d[1]));
-        
+
+        // N-1 first so the N line is drawn on top of it.
+        const series = [];
         if (mapN1.size > 0) {
-            this.drawSeries(svg, dataLineN1, line, x, y, { 
-                color: UI_THEME.primary, dash: "5,5", width: 2, opacity: 0.6, label: `Année ${this.state.year - 1}` 
+            series.push({
+                key: 'N1', data: dataLineN1,
+                color: UI_THEME.primary, dash: "5,5", width: 2, opacity: 0.6, label: `Année ${this.state.year - 1}`
             });
         }
-        
         if (mapN.size > 0) {
-            this.drawSeries(svg, dataLineN, line, x, y, { 
-                color: UI_THEME.primary, dash: null, width: 3, opacity: 1, label: `Année ${this.state.year}` 
+            series.push({
+                key: 'N', data: dataLineN,
+                color: UI_THEME.primary, dash: null, width: 3, opacity: 1, label: `Année ${this.state.year}`
             });
-            
-            if (mapN1.size > 0) this.drawEvolutionLabels(svg, dataLineN, mapN1, x, y);
         }
-
-        this.drawLegend(svg, width, margin);
+        scaffold.series
+            .selectAll("g.evolution-series")
+            .data(series, s => s.key)
+            .join(enter => {
+                const g = enter.append("g").attr("class", "evolution-series");
+                g.append("path").attr("fill", "none");
+                return g;
+            })
+            .each((opts, i, nodes) => this.drawSeries(d3.select(nodes[i]), scaffold.svg, line, x, y, opts));
+
+        const labelled = mapN.size > 0 && mapN1.size > 0 ? dataLineN : [];
+        this.drawEvolutionLabels(scaffold.labels, labelled, mapN1, x, y);
+
+        this.drawLegend(scaffold.legend, width, margin);
     }
 
-    drawAxes(svg, x, y, height, margin) {
-        svg.append("g").attr("transform", `translate(0,${height - margin.bottom})`)
+    drawAxes(scaffold, x, y, height, margin) {
+        scaffold.xAxis.attr("transform", `translate(0,${height - margin.bottom})`)
             .call(d3.axisBottom(x).ticks(12).tickFormat(m => Utils.moisFR[m - 1] ? Utils.moisFR[m - 1].substring(0, 3) : m))
             .call(g => g.select(".domain").attr("stroke", UI_THEME.axisDomain))
             .call(g => g.selectAll("line").attr("stroke", UI_THEME.gridMajor));
 
-        svg.append("g").attr("transform", `translate(${margin.left},0)`)
+        scaffold.yAxis.attr("transform", `translate(${margin.left},0)`)
             .call(d3.axisLeft(y).ticks(5).tickFormat(d => Utils.fmtNumber.format(d)))
             .call(g => g.select(".domain").remove())
             .call(g => g.selectAll("line").attr("stroke", UI_THEME.gridMajor).attr("stroke-dasharray", "2,2"));
     }
 
-    drawSeries(svg, data, lineGen, x, y, opts) {
-        svg.append("path").datum(data)
-            .attr("fill", "none")
+    /** Update one series group (its line and month dots, joined by month). */
+    drawSeries(group, svg, lineGen, x, y, opts) {
+        group.select("path").datum(opts.data)
             .attr("stroke", opts.color)
             .attr("stroke-width", opts.width)
             .attr("stroke-dasharray", opts.dash)
             .attr("opacity", opts.opacity)
             .attr("d", lineGen);
-        
+
         const className = `dot-${opts.dash ? 'N1' : 'N'}`;
 
-        svg.selectAll(`.${className}`)
-            .data(data).join("circle")
-            .attr("class", className)
+        group.selectAll(`.${className}`)
+            .data(opts.data, d => d[0])
+            .join(enter => enter.append("circle")
+                .attr("class", className)
+                .attr("r", 4)
+                .attr("fill", UI_THEME.white)
+                .attr("stroke-width", 2)
+                .style("cursor", "pointer"))
             .attr("cx", d => x(d[0]))
             .attr("cy", d => y(d[1]))
-            .attr("r", 4)
-            .attr("fill", UI_THEME.white)
             .attr("stroke", opts.color)
-            .attr("stroke-width", 2)
-            .style("cursor", "pointer")
             .on("mouseover", function() { d3.select(this).attr("r", 6).attr("fill", opts.color); })
-            .on("mouseout", function() { d3.select(this).attr("r", 4).attr("fill", UI_THEME.white); })
-            .append("title")
-            .text(d => `${opts.label} - ${Utils.moisFR[d[0] - 1]}\nVal: ${Utils.fmtNumber.format(d[1])}`);
+            .on("mouseout", function() { d3.select(this).attr("r", 4).attr("fill", UI_THEME.white); });
+
+        this.bindTooltip(svg, `circle.${className}`, d => `${opts.label} - ${Utils.moisFR[d[0] - 1]}\nVal: ${Utils.fmtNumber.format(d[1])}`);
     }
 
-    drawEvolutionLabels(svg, dataN, mapN1, x, y) {
-        svg.append("g")
-            .style("font-size", "10px")
-            .style("font-weight", "bold")
+    drawEvolutionLabels(layer, dataN, mapN1, x, y) {
+        layer
             .selectAll("text")
-            .data(dataN)
-            .join("text")
+            .data(dataN, d => d[0])
+            .join(enter => enter.append("text").attr("text-anchor", "middle"))
             .attr("x", d => x(d[0]))
             .attr("y", d => y(d[1]) - 10)
-            .attr("text-anchor", "middle")
             .each(function(d) {
                 const month = d[0];
                 const valN = d[1];
                 const valN1 = mapN1.get(month);
-                
+                const label = d3.select(this);
+
                 if (valN1 && valN1 > 0) {
                     const pct = ((valN - valN1) / valN1) * 100;
                     const symbol = pct > 0 ? "+" : "";
                     const color = pct >= 0 ? UI_THEME.positiveDelta : UI_THEME.negativeDelta;
-                    
-                    d3.select(this)
+
+                    label
                         .text(`${symbol}${Math.round(pct)}%`)
                         .attr("fill", color);
+                } else {
+                    label.text("");
                 }
             });
     }
 
-    drawLegend(svg, width, margin) {
-        const legendG = svg.append("g").attr("transform", `translate(${width - 110}, ${margin.top})`);
+    /** Legend scaffold: backdrop plus an N and an N-1 entry (text + line sample). */
+    createLegend(svg) {
+        const legendG = svg.append("g");
 
         legendG.append("rect")
             .attr("x", -10).attr("y", -10)
@@ -151,12 +182,21 @@ class EvolutionWidget extends BaseWidget {
             .attr("stroke", UI_THEME.axisDomain)
             .attr("rx", 4);
 
-        legendG.append("text").attr("x", 25).attr("y", 5).text(`Année ${this.state.year}`).attr("font-size", "11px").attr("fill", UI_THEME.primary);
-        legendG.append("line").attr("x1", 0).attr("y1", 2).attr("x2", 20).attr("y2", 2).attr("stroke", UI_THEME.primary).attr("stroke-width", 3);
+        const entryN = legendG.append("g");
+        entryN.append("text").attr("x", 25).attr("y", 5).attr("font-size", "11px").attr("fill", UI_THEME.primary);
+        entryN.append("line").attr("x1", 0).attr("y1", 2).attr("x2", 20).attr("y2", 2).attr("stroke", UI_THEME.primary).attr("stroke-width", 3);
 
-        if (this.state.yoy) {
-            legendG.append("text").attr("x", 25).attr("y", 25).text(`Année ${this.state.year - 1}`).attr("font-size", "11px").attr("fill", UI_THEME.primary).attr("opacity", 0.7);
-            legendG.append("line").attr("x1", 0).attr("y1", 22).attr("x2", 20).attr("y2", 22).attr("stroke", UI_THEME.primary).attr("stroke-width", 2).attr("stroke-dasharray", "4,2");
-        }
+        const entryN1 = legendG.append("g");
+        entryN1.append("text").attr("x", 25).attr("y", 25).attr("font-size", "11px").attr("fill", UI_THEME.primary).attr("opacity", 0.7);
+        entryN1.append("line").attr("x1", 0).attr("y1", 22).attr("x2", 20).attr("y2", 22).attr("stroke", UI_THEME.primary).attr("stroke-width", 2).attr("stroke-dasharray", "4,2");
+
+        return { g: legendG, entryN, entryN1 };
+    }
+
+    drawLegend(legend, width, margin) {
+        legend.g.attr("transform", `translate(${width - 110}, ${margin.top})`);
+        legend.entryN.select("text").text(`Année ${this.state.year}`);
+        legend.entryN1.attr("display", this.state.yoy ? null : "none")
+            .select("text").text(`Année ${this.state.year - 1}`);
     }
-}
\ No newline at end of file
+}
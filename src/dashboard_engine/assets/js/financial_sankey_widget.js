@@ -57,18 +57,40 @@ class FinancialSankeyWidget extends BaseWidget {
         return { nodes, links };
     }
 
-    drawSankey(domNode, data) {
+    /** Panel scaffold: sankey container with link, node and label layers. */
+    createFinancialSankeyPanel(el) {
         const width = Utils.CHART_LAYOUT.DEFAULT_INNER_WIDTH;
         const height = Utils.CHART_LAYOUT.SANKEY_VIEW_HEIGHT;
+        const scaffold = this.createChartPanel(el, { mountClass: 'sankey-container', mountStyle: 'width:100%;' });
 
-        const { nodes, links } = this.buildGraphFromData(data);
-        const palette = UI_THEME.financialSankey;
-
-        const svg = d3.select(domNode).append("svg")
+        scaffold.svg
             .attr("viewBox", [0, 0, width, height])
             .style("width", "100%")
             .style("height", "100%");
 
+        scaffold.links = scaffold.svg.append("g")
+            .attr("class", "sankey-links")
+            .attr("fill", "none");
+        scaffold.nodes = scaffold.svg.append("g").attr("class", "sankey-nodes");
+        scaffold.labels = scaffold.svg.append("g")
+            .style("font", "11px sans-serif")
+            .style("font-weight", "600")
+            .style("fill", UI_THEME.textMuted);
+        return scaffold;
+    }
+
+    drawSankey(scaffold, data, year) {
+        const width = Utils.CHART_LAYOUT.DEFAULT_INNER_WIDTH;
+        const height = Utils.CHART_LAYOUT.SANKEY_VIEW_HEIGHT;
+
+        const { nodes, links } = this.cachedAggregate(
+            'financial-sankey-graph',
+            year,
+            () => this.buildGraphFromData(data),
+            { fields: ['source', 'target', 'value', 'type'] }
+        );
+        const palette = UI_THEME.financialSankey;
+
         const sankeyGenerator = sankey()
             .nodeWidth(FIN_SANKEY_CONSTANTS.NODE_WIDTH)
             .nodePadding(FIN_SANKEY_CONSTANTS.NODE_PADDING)
@@ -80,24 +102,22 @@ class FinancialSankeyWidget extends BaseWidget {
             links: links.map(d => Object.assign({}, d))
         });
 
-        svg.append("g")
-            .attr("fill", "none")
+        scaffold.links
             .selectAll("path")
-            .data(finalLinks)
-            .join("path")
+            .data(finalLinks, d => `${d.source.name}\u0000${d.target.name}`)
+            .join(enter => enter.append("path").attr("stroke-opacity", 0.6))
             .attr("d", sankeyLinkHorizontal())
             .attr("stroke-width", d => Math.max(1, d.width))
             .attr("stroke", d => {
                 const typeStyle = palette[d.targetType] || palette.default;
                 return typeStyle.link;
             })
-            .attr("stroke-opacity", 0.6)
-            .append("title")
-            .text(d => `${d.source.name} → ${d.target.name}\n${Utils.fmtNumber.format(d.value)}`);
+            .attr("data-source", d => d.source.name)
+            .attr("data-target", d => d.target.name);
 
-        svg.append("g")
+        scaffold.nodes
             .selectAll("rect")
-            .data(graphNodes)
+            .data(graphNodes, d => d.name)
             .join("rect")
             .attr("x", d => d.x0)
             .attr("y", d => d.y0)
@@ -109,46 +129,52 @@ class FinancialSankeyWidget extends BaseWidget {
                 const typeStyle = palette[d.type] || palette.default;
                 return typeStyle.node;
             })
-            .append("title")
-            .text(d => `${d.name}\n${Utils.fmtNumber.format(d.value)}`);
+            .attr("data-node", d => d.name);
 
-        svg.append("g")
-            .style("font", "11px sans-serif")
-            .style("font-weight", "600")
-            .style("fill", UI_THEME.textMuted)
+        this.bindTooltip(scaffold.svg, ".sankey-links path", d =>
+            `${d.source.name} → ${d.target.name}\n${Utils.fmtNumber.format(d.value)}`);
+        this.bindTooltip(scaffold.svg, ".sankey-nodes rect", d => `${d.name}\n${Utils.fmtNumber.format(d.value)}`);
+
+        scaffold.labels
             .selectAll("text")
-            .data(graphNodes)
-            .join("text")
+            .data(graphNodes, d => d.name)
+            .join(enter => {
+                const text = enter.append("text").attr("dy", "0.35em");
+                text.append("tspan").attr("class", "sankey-label-name");
+                text.append("tspan")
+                    .attr("class", "sankey-label-value")
+                    .attr("fill-opacity", 0.6)
+                    .attr("font-weight", "normal");
+                return text;
+            })
             .attr("x", d => d.x0 < width / 2 ? d.x1 + 6 : d.x0 - 6)
             .attr("y", d => (d.y1 + d.y0) / 2)
-            .attr("dy", "0.35em")
             .attr("text-anchor", d => d.x0 < width / 2 ? "start" : "end")
-            .text(d => d.name)
-            .append("tspan")
-            .attr("fill-opacity", 0.6)
-            .attr("font-weight", "normal")
-            .text(d => ` ${Utils.fmtNumber.format(d.value)}`);
+            .call(text => text.select("tspan.sankey-label-name").text(d => d.name))
+            .call(text => text.select("tspan.sankey-label-value").text(d => ` ${Utils.fmtNumber.format(d.value)}`));
     }
 
     update() {
-        this.vizWrapper.innerHTML = '';
         const anchorYear = this.state.year;
         const yearsToShow = Utils.calendarYearsForYoYChart(anchorYear, this.state.yoy);
+        const panels = this.syncPanels(
+            yearsToShow.map((year) => this.yoyPanelKey(year)),
+            (el) => this.createFinancialSankeyPanel(el)
+        );
 
-        yearsToShow.forEach((year) => {
+        panels.forEach(({ scaffold }, i) => {
+            const year = yearsToShow[i];
             const data = this.getFilteredData(year);
-            const container = document.createElement('div');
-            container.className = 'sub-chart';
 
             const ySuffix = Utils.formatYoYChartTitleSuffix(this.state.yoy, year, anchorYear);
-            container.innerHTML = `<h4>Année ${year}${ySuffix}</h4><div class="sankey-container" style="width:100%;"></div>`;
-            this.vizWrapper.appendChild(container);
+            scaffold.title.textContent = `Année ${year}${ySuffix}`;
 
             if (data.length === 0) {
-                container.querySelector('.sankey-container').innerHTML = '<p class="hint">Aucune donnée</p>';
+                this.setPanelHint(scaffold, 'Aucune donnée');
                 return;
             }
-            this.drawSankey(container.querySelector('.sankey-container'), data);
+            this.setPanelHint(scaffold, null);
+            this.drawSankey(scaffold, data, year);
         });
     }
-}
\ No newline at end of file
+}
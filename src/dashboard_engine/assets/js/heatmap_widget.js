@@ -28,12 +28,12 @@ function buildHeatmapMatrix(rows, mapping) {
 }
 
 /**
- * Shared color domain across multiple year slices so comparable cells use the same scale.
+ * Shared color domain across multiple year matrices so comparable cells use the same scale.
  */
-function heatmapValueExtentFromSlices(rowsByYear, mapping) {
+function heatmapValueExtentFromMatrices(matrices) {
     const merged = [];
-    for (const rows of rowsByYear) {
-        merged.push(...buildHeatmapMatrix(rows, mapping).cells);
+    for (const matrix of matrices) {
+        merged.push(...matrix.cells);
     }
     if (!merged.length) {
         return [0, 1];
@@ -41,6 +41,23 @@ function heatmapValueExtentFromSlices(rowsByYear, mapping) {
     return d3.extent(merged, (d) => d.value);
 }
 
+/**
+ * Domain value of the band of `scale` (d3.scaleBand) covering `position`, or undefined in the
+ * padding between bands and outside the range.
+ */
+function heatmapBandAt(scale, position) {
+    const domain = scale.domain();
+    if (!domain.length) {
+        return undefined;
+    }
+    const index = Math.floor((position - scale(domain[0])) / scale.step());
+    const value = domain[index];
+    if (value === undefined || position - scale(value) > scale.bandwidth()) {
+        return undefined;
+    }
+    return value;
+}
+
 class HeatmapWidget extends BaseWidget {
 
     initLayout() {
@@ -50,43 +67,36 @@ class HeatmapWidget extends BaseWidget {
     }
 
     update() {
-        this.vizWrapper.innerHTML = '';
-
-        const mapping = this.config.mapping || {};
         const anchorYear = this.state.year;
         const years = Utils.calendarYearsForYoYChart(anchorYear, this.state.yoy);
         const rowSlices = years.map((y) => Utils.extractRowsForCalendarYear(this.rawData, y));
         const anyData = rowSlices.some((r) => r.length > 0);
 
         if (!anyData) {
-            const empty = document.createElement('div');
-            empty.className = 'sub-chart';
-            empty.innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée pour cette année.</p>';
-            this.vizWrapper.appendChild(empty);
+            this.showVizHint('Aucune donnée pour cette année.');
             return;
         }
 
-        const colorDomain = heatmapValueExtentFromSlices(rowSlices, mapping);
+        const matrices = years.map((year, i) => this.cachedAggregate(
+            'heatmap-matrix',
+            year,
+            () => this.buildHeatmapData(rowSlices[i]),
+            { fields: ['x', 'y', 'value'], period: false }
+        ));
+        const colorDomain = heatmapValueExtentFromMatrices(matrices);
         const color = d3.scaleSequential(UI_THEME.heatmapInterpolator).domain(colorDomain);
 
-        years.forEach((year) => {
-            const data = Utils.extractRowsForCalendarYear(this.rawData, year);
-            const container = document.createElement('div');
-            container.className = 'sub-chart';
+        const panels = this.syncPanels(years.map((year) => this.yoyPanelKey(year)), (el) => this.createHeatmapPanel(el));
+        panels.forEach(({ scaffold }, i) => {
+            const year = years[i];
             const suffix = Utils.formatYoYChartTitleSuffix(this.state.yoy, year, anchorYear);
-            container.innerHTML =
-                `<h4>${year}${suffix}</h4><div class="heatmap-chart" style="height:${Utils.CHART_LAYOUT.STANDARD_PLOT_HEIGHT}px;"></div>`;
-            this.vizWrapper.appendChild(container);
-
-            const mount = container.querySelector('.heatmap-chart');
-            if (!data.length) {
-                mount.innerHTML =
-                    '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée pour cette année.</p>';
+            scaffold.title.textContent = `${year}${suffix}`;
+
+            if (!rowSlices[i].length) {
+                this.setPanelHint(scaffold, 'Aucune donnée pour cette année.');
                 return;
             }
-
-            this.drawHeatmap(mount, data, color);
+            this.drawHeatmap(scaffold, matrices[i], color);
         });
     }
 
@@ -94,66 +104,89 @@ class HeatmapWidget extends BaseWidget {
         return buildHeatmapMatrix(data, this.config.mapping || {});
     }
 
-    drawHeatmap(domNode, data, sharedColorScale) {
-        const { cells, xValues, yValues } = this.buildHeatmapData(data);
+    createHeatmapPanel(el) {
+        const scaffold = this.createChartPanel(el, {
+            mountClass: 'heatmap-chart',
+            mountStyle: `height:${Utils.CHART_LAYOUT.STANDARD_PLOT_HEIGHT}px;`,
+        });
+        scaffold.xAxis = scaffold.svg.append('g');
+        scaffold.yAxis = scaffold.svg.append('g');
+        scaffold.cells = scaffold.svg.append('g').attr('class', 'heatmap-layer');
+        scaffold.x = d3.scaleBand().padding(0.05);
+        scaffold.y = d3.scaleBand().padding(0.05);
+        return scaffold;
+    }
+
+    /** Draw `matrix` (buildHeatmapData() of one year slice) into a panel scaffold. */
+    drawHeatmap(scaffold, matrix, sharedColorScale) {
+        const { cells, xValues, yValues } = matrix;
         if (!cells.length) {
-            domNode.innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée exploitable.</p>';
+            this.setPanelHint(scaffold, 'Aucune donnée exploitable.');
             return;
         }
+        this.setPanelHint(scaffold, null);
 
         const L = Utils.CHART_LAYOUT;
-        const width = domNode.clientWidth || L.DEFAULT_INNER_WIDTH;
+        const width = scaffold.mount.clientWidth || L.DEFAULT_INNER_WIDTH;
         const height = L.STANDARD_PLOT_HEIGHT;
         const margin = { top: 30, right: 30, bottom: 40, left: 70 };
 
-        const x = d3.scaleBand()
-            .domain(xValues)
-            .range([margin.left, width - margin.right])
-            .padding(0.05);
-
-        const y = d3.scaleBand()
-            .domain(yValues)
-            .range([margin.top, height - margin.bottom])
-            .padding(0.05);
+        const x = scaffold.x.domain(xValues).range([margin.left, width - margin.right]);
+        const y = scaffold.y.domain(yValues).range([margin.top, height - margin.bottom]);
 
         const vExtent = d3.extent(cells, (d) => d.value);
         const color =
             sharedColorScale ||
             d3.scaleSequential(UI_THEME.heatmapInterpolator).domain(vExtent);
 
-        const svg = d3.select(domNode)
-            .append('svg')
-            .attr('viewBox', [0, 0, width, height]);
+        scaffold.svg.attr('viewBox', [0, 0, width, height]);
 
-        svg.append('g')
+        scaffold.xAxis
             .attr('transform', `translate(0,${height - margin.bottom})`)
             .call(d3.axisBottom(x))
             .selectAll('text')
             .attr('transform', 'rotate(-30)')
             .style('text-anchor', 'end');
 
-        svg.append('g')
+        scaffold.yAxis
             .attr('transform', `translate(${margin.left},0)`)
             .call(d3.axisLeft(y));
 
-        svg.append('g')
-            .attr('class', 'heatmap-layer')
+        const m = this.config.mapping || {};
+        const cellText = (d) => `${m.x}: ${d.raw[m.x]}\n${m.y}: ${d.raw[m.y]}\n${m.value}: ${d.raw[m.value]}`;
+
+        // Cells on canvas above the mark budget; the svg then keeps only the axes.
+        if (this.resolveRenderer(cells.length) === WIDGET_RENDERER.CANVAS) {
+            scaffold.cells.selectAll('rect').remove();
+            const bandWidth = x.bandwidth();
+            const bandHeight = y.bandwidth();
+            this.paintMarkCanvas(scaffold.svg.node(), width, height, (ctx) => {
+                for (const d of cells) {
+                    ctx.fillStyle = color(d.value);
+                    ctx.fillRect(x(d.x), y(d.y), bandWidth, bandHeight);
+                }
+            });
+            // Later cells paint over earlier ones at the same position: the last one is shown.
+            const cellAt = new Map(cells.map((d) => [`${d.x}\u0000${d.y}`, d]));
+            this.bindCanvasTooltip(scaffold.svg, (px, py) => {
+                const xv = heatmapBandAt(x, px);
+                const yv = heatmapBandAt(y, py);
+                return xv === undefined || yv === undefined ? null : cellAt.get(`${xv}\u0000${yv}`) || null;
+            }, cellText);
+            return;
+        }
+        this.hideMarkCanvas(scaffold.svg.node());
+        this.bindCanvasTooltip(scaffold.svg, null);
+
+        scaffold.cells
             .selectAll('rect')
-            .data(cells)
+            .data(cells, (d) => `${d.x}\u0000${d.y}`)
             .join('rect')
             .attr('x', (d) => x(d.x))
             .attr('y', (d) => y(d.y))
             .attr('width', x.bandwidth())
             .attr('height', y.bandwidth())
-            .attr('fill', (d) => color(d.value))
-            .append('title')
-            .text((d) => {
-                const m = this.config.mapping || {};
-                const xKey = m.x;
-                const yKey = m.y;
-                const valueKey = m.value;
-                return `${xKey}: ${d.raw[xKey]}\n${yKey}: ${d.raw[yKey]}\n${valueKey}: ${d.raw[valueKey]}`;
-            });
+            .attr('fill', (d) => color(d.value));
+        this.bindTooltip(scaffold.svg, '.heatmap-layer rect', cellText);
     }
 }
@@ -10,25 +10,33 @@ class HorizonWidget extends BaseWidget {
     }
 
     update() {
-        this.vizWrapper.innerHTML = '';
-        
         const year = this.state.year;
-        const data = this.rawData.filter(d => !d.year || d.year === year);
+        const data = Utils.extractRowsForCalendarYear(this.rawData, year);
 
-        const container = document.createElement('div');
-        container.className = 'sub-chart';
-        container.style.flex = "1 1 100%"; 
-        
-        container.innerHTML = `<h4>Analyse temporelle - Année ${year}</h4>
-                               <div class="horizon-wrapper" style="width:100%;"></div>`;
-        this.vizWrapper.appendChild(container);
+        const [{ scaffold }] = this.syncPanels(['N'], (el) => this.createHorizonPanel(el));
+        scaffold.title.textContent = `Analyse temporelle - Année ${year}`;
 
         if (data.length === 0) {
-            container.querySelector('.horizon-wrapper').innerHTML = '<p class="hint">Aucune donnée pour cette année</p>';
+            this.setPanelHint(scaffold, 'Aucune donnée pour cette année');
             return;
         }
+        this.setPanelHint(scaffold, null);
+        this.drawRidgeline(scaffold, data);
+    }
 
-        this.drawRidgeline(container.querySelector('.horizon-wrapper'), data);
+    /** Full-width panel: one group per row (keyed by the y value) above the x axis. */
+    createHorizonPanel(el) {
+        el.style.flex = "1 1 100%";
+        const scaffold = this.createChartPanel(el, { mountClass: 'horizon-wrapper', mountStyle: 'width:100%;' });
+        scaffold.svg
+            .style("width", "100%")
+            .style("height", "auto");
+        scaffold.rows = scaffold.svg.append("g");
+        scaffold.xAxis = scaffold.svg.append("g");
+        // Clip path ids: unique per panel, then per row group.
+        scaffold.uid = `ridge-${Math.random().toString(36).substr(2, 5)}`;
+        scaffold.clipCount = 0;
+        return scaffold;
     }
 
     /**
@@ -63,11 +71,11 @@ class HorizonWidget extends BaseWidget {
         };
     }
 
-    drawRidgeline(domNode, data) {
-        const { x: xCol, y: yCol, value: valCol } = this.config.mapping;
+    drawRidgeline(scaffold, data) {
+        const { x: xCol, value: valCol } = this.config.mapping;
         const model = this.buildRidgelineModel(data);
 
-        const width = domNode.clientWidth || Utils.CHART_LAYOUT.DEFAULT_INNER_WIDTH;
+        const width = scaffold.mount.clientWidth || Utils.CHART_LAYOUT.DEFAULT_INNER_WIDTH;
         const totalHeight = model.groupKeys.length * model.rowHeight;
 
         const x = d3.scaleLinear()
@@ -84,55 +92,81 @@ class HorizonWidget extends BaseWidget {
             .y0(model.rowHeight)
             .y1(d => y(+d[valCol]));
 
-        const uid = `ridge-${Math.random().toString(36).substr(2, 5)}`;
-        const svg = d3.select(domNode).append("svg")
-            .attr("viewBox", [0, 0, width, totalHeight + model.margin.bottom])
-            .style("width", "100%")
-            .style("height", "auto");
+        const svg = scaffold.svg
+            .attr("viewBox", [0, 0, width, totalHeight + model.margin.bottom]);
 
         const color = d3.scaleSequential(d3.interpolateRgb(UI_THEME.white, model.colorBase))
                         .domain([-0.5, model.bands]);
 
-        model.groupKeys.forEach((key, index) => {
-            const groupData = model.groups.get(key).sort((a, b) => +a[xCol] - +b[xCol]);
-            const g = svg.append("g").attr("transform", `translate(0, ${index * model.rowHeight})`);
-
-            g.append("defs").append("clipPath")
-                .attr("id", `${uid}-${index}`)
-                .append("rect")
-                .attr("x", model.margin.left)
-                .attr("y", 0)
-                .attr("width", width - model.margin.left - model.margin.right)
-                .attr("height", model.rowHeight);
-
-            const clipG = g.append("g").attr("clip-path", `url(#${uid}-${index})`);
-
-            for (let i = 0; i < model.bands; i++) {
-                clipG.append("path")
-                    .datum(groupData)
-                    .attr("fill", color(i))
-                    .attr("d", area)
-                    .attr("transform", `translate(0, ${i * model.rowHeight})`);
-            }
-
-            g.append("text")
-                .attr("x", model.margin.left - 10)
-                .attr("y", model.rowHeight / 2)
-                .attr("dy", "0.35em")
-                .attr("text-anchor", "end")
-                .attr("font-size", "10px")
-                .text(key);
-            
-            if (model.xAxisMode === "weekly") {
-                const gridHours = [24, 48, 72, 96, 120, 144];
-                gridHours.forEach(t => {
-                    g.append("line")
-                        .attr("x1", x(t)).attr("x2", x(t))
-                        .attr("y1", 0).attr("y2", model.rowHeight)
-                        .attr("stroke", "rgba(0,0,0,0.05)");
+        // Band layers on canvas above the mark budget (one path per group row and band); the
+        // svg then keeps the group labels, grid lines and axis.
+        const onCanvas = this.resolveRenderer(model.groupKeys.length * model.bands) === WIDGET_RENDERER.CANVAS;
+        const plotWidth = width - model.margin.left - model.margin.right;
+        const groupRows = model.groupKeys.map(key => model.groups.get(key).sort((a, b) => +a[xCol] - +b[xCol]));
+
+        if (onCanvas) {
+            this.paintMarkCanvas(svg.node(), width, totalHeight + model.margin.bottom, (ctx) => {
+                area.context(ctx);
+                groupRows.forEach((groupData, index) => {
+                    ctx.save();
+                    ctx.translate(0, index * model.rowHeight);
+                    ctx.beginPath();
+                    ctx.rect(model.margin.left, 0, plotWidth, model.rowHeight);
+                    ctx.clip();
+                    for (let i = 0; i < model.bands; i++) {
+                        ctx.save();
+                        ctx.translate(0, i * model.rowHeight);
+                        ctx.beginPath();
+                        area(groupData);
+                        ctx.fillStyle = color(i);
+                        ctx.fill();
+                        ctx.restore();
+                    }
+                    ctx.restore();
                 });
-            }
-        });
+                area.context(null);
+            });
+        } else {
+            this.hideMarkCanvas(svg.node());
+        }
+
+        const gridHours = model.xAxisMode === "weekly" ? [24, 48, 72, 96, 120, 144] : [];
+        scaffold.rows
+            .selectAll("g.horizon-row")
+            .data(model.groupKeys, key => key)
+            .join(enter => {
+                const g = enter.append("g").attr("class", "horizon-row");
+                g.each((_, i, nodes) => {
+                    const clipId = `${scaffold.uid}-${scaffold.clipCount++}`;
+                    const row = d3.select(nodes[i]);
+                    row.append("defs").append("clipPath").attr("id", clipId).append("rect");
+                    row.append("g").attr("class", "horizon-bands").attr("clip-path", `url(#${clipId})`);
+                });
+                g.append("text")
+                    .attr("dy", "0.35em")
+                    .attr("text-anchor", "end")
+                    .attr("font-size", "10px");
+                g.append("g").attr("class", "horizon-grid");
+                return g;
+            })
+            .attr("transform", (key, index) => `translate(0, ${index * model.rowHeight})`)
+            .each((key, index, nodes) => {
+                const g = d3.select(nodes[index]);
+                this.drawHorizonBands(g, onCanvas ? null : groupRows[index], area, color, model, plotWidth);
+
+                g.select("text")
+                    .attr("x", model.margin.left - 10)
+                    .attr("y", model.rowHeight / 2)
+                    .text(key);
+
+                g.select("g.horizon-grid")
+                    .selectAll("line")
+                    .data(gridHours)
+                    .join("line")
+                    .attr("x1", t => x(t)).attr("x2", t => x(t))
+                    .attr("y1", 0).attr("y2", model.rowHeight)
+                    .attr("stroke", "rgba(0,0,0,0.05)");
+            });
 
         let xAxis = d3.axisBottom(x).ticks(width / 60);
         
@@ -144,9 +178,30 @@ class HorizonWidget extends BaseWidget {
                 .tickFormat((d, i) => days[i] || "");
         }
 
-        svg.append("g")
+        scaffold.xAxis
             .attr("transform", `translate(0, ${totalHeight})`)
             .call(xAxis)
             .call(g => g.select(".domain").remove());
     }
-}
\ No newline at end of file
+
+    /**
+     * SVG band layers of one group row, clipped to the plot width. `groupData` null (canvas
+     * mode) removes them.
+     */
+    drawHorizonBands(g, groupData, area, color, model, plotWidth) {
+        g.select("clipPath rect")
+            .attr("x", model.margin.left)
+            .attr("y", 0)
+            .attr("width", plotWidth)
+            .attr("height", model.rowHeight);
+
+        const bandPath = groupData ? area(groupData) : null;
+        g.select("g.horizon-bands")
+            .selectAll("path")
+            .data(groupData ? d3.range(model.bands) : [])
+            .join("path")
+            .attr("fill", i => color(i))
+            .attr("d", bandPath)
+            .attr("transform", i => `translate(0, ${i * model.rowHeight})`);
+    }
+}
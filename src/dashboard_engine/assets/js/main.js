@@ -29,6 +29,8 @@ const APP_CONSTANTS = {
     CONFIG_ELEMENT_ID: 'dashboard-config',
     DASHBOARD_CONTAINER_ID: 'dashboard-container',
     DEV_ZONE_ID: 'dev-zone',
+    PERF_OVERLAY_ID: 'dashboard-perf-overlay',
+    PERF_URL_PARAM: 'perf',
     EXPORT_BUTTON_ID: 'btn-export',
     DATASET_ID_PREFIX: 'dataset-',
     CSV_MIME: 'text/csv;charset=utf-8;',
@@ -83,12 +85,13 @@ function safeParseJSON(text) {
 
 const CSV_ENCODING = {
     GZIP_BASE64: 'gzip-base64',
+    COLUMNAR_V1: 'columnar-v1',
 };
 
 /**
- * Decompress gzip+base64 payload to CSV text (async; requires DecompressionStream).
+ * Decompress a gzip+base64 payload into a Response (async; requires DecompressionStream).
  */
-async function decodeGzipBase64ToCsvText(b64) {
+function gunzipBase64(b64) {
     if (typeof DecompressionStream === 'undefined') {
         throw new Error(
             'Compressed datasets require DecompressionStream (modern Chromium, Firefox, Safari).'
@@ -96,7 +99,197 @@ async function decodeGzipBase64ToCsvText(b64) {
     }
     const binary = Uint8Array.from(atob(b64.trim()), (c) => c.charCodeAt(0));
     const stream = new Blob([binary]).stream().pipeThrough(new DecompressionStream('gzip'));
-    return new Response(stream).text();
+    return new Response(stream);
+}
+
+/**
+ * Decompress gzip+base64 payload to CSV text (async; requires DecompressionStream).
+ */
+async function decodeGzipBase64ToCsvText(b64) {
+    return gunzipBase64(b64).text();
+}
+
+const COLUMNAR_V1 = {
+    MAGIC: 'DCOL',
+    ALIGNMENT: 8,
+    NUMERIC_ARRAYS: { float64: Float64Array, int32: Int32Array },
+    CODE_ARRAYS: { uint8: Uint8Array, uint16: Uint16Array, uint32: Uint32Array },
+};
+
+/**
+ * Decode a columnar-v1 buffer (see dashboard_engine/columnar.py) into the row objects
+ * d3.csvParse would return (with `columns`). Numeric columns are typed-array views on the
+ * buffer; text columns are dictionary codes resolved against the string table.
+ * Pure function, suitable for table-driven tests.
+ */
+function decodeColumnarV1(buffer) {
+    const bytes = new Uint8Array(buffer);
+    const magic = String.fromCharCode(bytes[0], bytes[1], bytes[2], bytes[3]);
+    if (magic !== COLUMNAR_V1.MAGIC) {
+        throw new Error('Invalid columnar-v1 payload (bad magic)');
+    }
+    const headerLength = new DataView(buffer).getUint32(4, true);
+    const header = JSON.parse(new TextDecoder().decode(bytes.subarray(8, 8 + headerLength)));
+    const align = COLUMNAR_V1.ALIGNMENT;
+    const dataStart = Math.ceil((8 + headerLength) / align) * align;
+    const n = header.rows;
+
+    const rows = new Array(n);
+    for (let r = 0; r < n; r++) rows[r] = {};
+
+    // Column-major fill: every row object gets its keys in the same order (one hidden class).
+    header.columns.forEach((col) => {
+        const byteOffset = dataStart + col.offset;
+        if (col.kind === 'dict') {
+            const Codes = COLUMNAR_V1.CODE_ARRAYS[col.codeType];
+            const codes = new Codes(buffer, byteOffset, col.length / Codes.BYTES_PER_ELEMENT);
+            const table = col.dictionary;
+            for (let r = 0; r < n; r++) rows[r][col.name] = table[codes[r]];
+            return;
+        }
+        const Values = COLUMNAR_V1.NUMERIC_ARRAYS[col.kind];
+        if (!Values) throw new Error('Unknown columnar-v1 column kind: ' + col.kind);
+        const values = new Values(buffer, byteOffset, col.length / Values.BYTES_PER_ELEMENT);
+        for (let r = 0; r < n; r++) rows[r][col.name] = values[r];
+    });
+
+    rows.columns = header.columns.map((col) => col.name);
+    return rows;
+}
+
+/**
+ * Decompress a gzip+base64 columnar-v1 payload into row objects (async).
+ */
+async function decodeColumnarV1Base64(b64) {
+    return decodeColumnarV1(await gunzipBase64(b64).arrayBuffer());
+}
+
+/**
+ * Attach the month indexes embedded by generate(parse_dates=True) to their datasets as
+ * `dataset.monthIndex[column]` (Uint16Array, one entry per row; see Utils.rowsFromMonthIndex).
+ */
+async function attachMonthIndexes(datasets) {
+    const nodes = document.querySelectorAll('script[data-month-index-for]');
+    for (const el of nodes) {
+        const dataset = datasets[+el.dataset.monthIndexFor];
+        if (!dataset) continue;
+        const codes = new Uint16Array(await gunzipBase64(el.textContent).arrayBuffer());
+        if (codes.length !== dataset.length) {
+            console.warn('Ignoring month index with a row count mismatch:', el.dataset.dateColumn);
+            continue;
+        }
+        if (!dataset.monthIndex) dataset.monthIndex = {};
+        dataset.monthIndex[el.dataset.dateColumn] = codes;
+    }
+}
+
+// generate() inserts one backslash after the '<' of '</script' and '<!--' (and of those already
+// preceded by backslashes) so dataset text cannot end its <script> early
+// (dashboard_engine/script_escape.py); nothing else is escaped.
+const SCRIPT_SAFE_ESCAPE_RE = /<\\(\\*)(\/script|!--)/gi;
+
+/**
+ * Reverse escape_script_text(): remove the backslash generate() inserted.
+ */
+function decodeScriptSafeText(text) {
+    return text.indexOf('<\\') === -1 ? text : text.replace(SCRIPT_SAFE_ESCAPE_RE, '<$1$2');
+}
+
+/**
+ * Payload text of an embedded dataset <script>: unescaped exactly, then trimmed so leading and
+ * trailing blank lines never reach d3.csvParse (transforms.iter_csv_records mirrors this).
+ */
+function datasetPayloadText(el) {
+    return decodeScriptSafeText(el.textContent).trim();
+}
+
+/**
+ * Decode one embedded dataset <script> on the main thread.
+ */
+async function decodeDatasetElement(el) {
+    const raw = datasetPayloadText(el);
+    const enc = el.dataset.csvEncoding;
+    const csvParse = (text) => DashboardPerf.time('csv-parse', el.id, () => d3.csvParse(text));
+    if (!enc) {
+        // Synchronous path when compress_data=False (default); avoids deferring widget init.
+        return csvParse(raw);
+    }
+    if (enc === CSV_ENCODING.GZIP_BASE64) {
+        return csvParse(await decodeGzipBase64ToCsvText(raw));
+    }
+    if (enc === CSV_ENCODING.COLUMNAR_V1) {
+        return decodeColumnarV1Base64(raw);
+    }
+    throw new Error('Unknown data-csv-encoding: ' + enc);
+}
+
+/**
+ * mapping.date columns per dataset index that have no month index embedded in the page
+ * (generate(parse_dates=True)); the dataset worker computes those.
+ */
+function workerDateColumns(config) {
+    const byIndex = new Map();
+    (Array.isArray(config.widgets) ? config.widgets : []).forEach((w) => {
+        const dateCol = w && w.mapping && w.mapping.date;
+        if (!dateCol) return;
+        const index = w.datasetIndex || 0;
+        const embedded = document.querySelector(
+            `script[data-month-index-for="${index}"][data-date-column="${CSS.escape(dateCol)}"]`
+        );
+        if (embedded) return;
+        if (!byIndex.has(index)) byIndex.set(index, new Set());
+        byIndex.get(index).add(dateCol);
+    });
+    return byIndex;
+}
+
+/**
+ * Decode every dataset in a Web Worker (see dataset_worker.js). Resolves with the same row
+ * arrays as the main-thread path, plus `monthIndex` for the requested date columns; rejects
+ * when workers are unavailable or any dataset fails, so the caller can fall back.
+ */
+function decodeDatasetsInWorker(nodes, dateColumnsByIndex) {
+    return new Promise((resolve, reject) => {
+        if (typeof createDatasetWorker !== 'function') {
+            reject(new Error('dataset_worker.js is not in the bundle'));
+            return;
+        }
+        const worker = createDatasetWorker();
+        const datasets = new Array(nodes.length);
+        let pending = nodes.length;
+        const finish = (err) => {
+            worker.terminate();
+            if (err) reject(err);
+            else resolve(datasets);
+        };
+        worker.onerror = (event) => {
+            event.preventDefault();
+            finish(new Error(event.message || 'Dataset worker error'));
+        };
+        worker.onmessage = (event) => {
+            const msg = event.data;
+            if (msg.error) {
+                finish(new Error(msg.error));
+                return;
+            }
+            const rows = msg.columnar ? decodeColumnarV1(msg.columnar) : rowsFromWorkerColumns(msg.csv);
+            if (Object.keys(msg.monthIndex).length) rows.monthIndex = msg.monthIndex;
+            datasets[msg.index] = rows;
+            if (--pending === 0) finish();
+        };
+        if (!pending) {
+            finish();
+            return;
+        }
+        worker.postMessage({
+            jobs: nodes.map((el, index) => ({
+                index,
+                encoding: el.dataset.csvEncoding || '',
+                payload: datasetPayloadText(el),
+                dateColumns: Array.from(dateColumnsByIndex.get(index) || []),
+            })),
+        });
+    });
 }
 
 function validateWidgetConfig(config) {
@@ -123,31 +316,41 @@ async function init() {
         console.error("Missing #dashboard-config element in DOM.");
         return;
     }
-    const config = safeParseJSON(configNode.textContent);
+    const config = DashboardPerf.time('config-parse', 'config', () => safeParseJSON(configNode.textContent));
 
     const urlParams = new URLSearchParams(window.location.search);
     if (config.dev_mode && urlParams.has('dev')) {
         const devZone = document.getElementById(APP_CONSTANTS.DEV_ZONE_ID);
         if (devZone) devZone.style.display = 'flex';
     }
+    if (config.dev_mode && urlParams.has(APP_CONSTANTS.PERF_URL_PARAM)) {
+        mountPerfOverlay();
+    }
+    if (Number.isInteger(config.aggregation_cache_size)) {
+        AGGREGATION_CACHE.resize(config.aggregation_cache_size);
+    }
 
-    const datasets = [];
-    let i = 0;
-    while (document.getElementById(`${APP_CONSTANTS.DATASET_ID_PREFIX}${i}`)) {
-        const el = document.getElementById(`${APP_CONSTANTS.DATASET_ID_PREFIX}${i}`);
-        const raw = el.textContent.trim();
-        const enc = el.dataset.csvEncoding;
-        if (!enc) {
-            // Synchronous path when compress_data=False (default); avoids deferring widget init.
-            datasets.push(d3.csvParse(raw));
-        } else if (enc === CSV_ENCODING.GZIP_BASE64) {
-            const text = await decodeGzipBase64ToCsvText(raw);
-            datasets.push(d3.csvParse(text));
-        } else {
-            throw new Error('Unknown data-csv-encoding: ' + enc);
+    const datasetNodes = [];
+    for (let i = 0; document.getElementById(`${APP_CONSTANTS.DATASET_ID_PREFIX}${i}`); i++) {
+        datasetNodes.push(document.getElementById(`${APP_CONSTANTS.DATASET_ID_PREFIX}${i}`));
+    }
+    let datasets = null;
+    if (config.decode_in_worker) {
+        try {
+            datasets = await DashboardPerf.timeAsync(
+                'dataset-decode', 'worker', () => decodeDatasetsInWorker(datasetNodes, workerDateColumns(config))
+            );
+        } catch (e) {
+            console.warn('Dataset worker failed, decoding on the main thread:', e);
+        }
+    }
+    if (!datasets) {
+        datasets = [];
+        for (const el of datasetNodes) {
+            datasets.push(await DashboardPerf.timeAsync('dataset-decode', el.id, () => decodeDatasetElement(el)));
         }
-        i++;
     }
+    await attachMonthIndexes(datasets);
     window.GLOBAL_DATASETS = datasets;
 
     const btnExport = document.getElementById(APP_CONSTANTS.EXPORT_BUTTON_ID);
@@ -182,28 +385,168 @@ async function init() {
 
     const validWidgets = validateWidgetConfig(config);
 
-    validWidgets.forEach(wConfig => {
-        const box = document.createElement('div');
-        box.className = 'chart-box';
-        container.appendChild(box);
+    if (config.lazy_widgets && typeof IntersectionObserver !== 'undefined') {
+        mountWidgetsLazily(container, validWidgets, config.widgets);
+        return;
+    }
+    validWidgets.forEach((wConfig) => {
+        mountWidget(createChartBox(container, config.widgets.indexOf(wConfig)), wConfig);
+    });
+}
+
+function formatPerfStat(label, stat) {
+    const avg = stat.totalMs / stat.count;
+    return `${label.padEnd(28)} ${String(stat.count).padStart(4)}x  avg ${avg.toFixed(1).padStart(7)}ms  max ${stat.maxMs.toFixed(1).padStart(7)}ms`;
+}
 
-        const WidgetClass = resolveWidgetClass(wConfig.type);
-        const datasetIndex = wConfig.datasetIndex || 0;
-        const dataset = window.GLOBAL_DATASETS[datasetIndex] || [];
+function formatPerfSummary(perf) {
+    const lines = Object.entries(perf.stages).map(([stage, stat]) => formatPerfStat(stage, stat));
+    const cache = AGGREGATION_CACHE.stats();
+    lines.push(`aggregation cache: ${cache.hits} hits / ${cache.misses} misses, ${cache.size}/${cache.maxEntries} entries`);
+    Object.entries(perf.widgets).forEach(([key, widget]) => {
+        lines.push('', key);
+        Object.entries(widget.stages).forEach(([stage, stat]) => lines.push(formatPerfStat(`  ${stage}`, stat)));
+    });
+    return lines.join('\n');
+}
 
-        try {
-            new WidgetClass(box, dataset, wConfig);
-        } catch (e) {
-            console.error("Failed to initialize widget:", wConfig.type, e);
-            box.innerHTML = `<p class="error">Erreur lors du rendu du widget: ${wConfig.type}</p>`;
-            document.dispatchEvent(new CustomEvent(APP_CONSTANTS.WIDGET_CRASH_EVENT, {
-                detail: { type: wConfig.type, error: e },
-            }));
+/**
+ * dev_mode + ?perf: fixed panel with the DashboardPerf aggregates (refreshed at most once per
+ * frame) and a button copying window.__DASHBOARD_PERF__.summary() as JSON.
+ */
+function mountPerfOverlay() {
+    const panel = document.createElement('div');
+    panel.id = APP_CONSTANTS.PERF_OVERLAY_ID;
+    panel.className = 'perf-overlay';
+
+    const copyButton = document.createElement('button');
+    copyButton.type = 'button';
+    copyButton.textContent = 'Copier JSON';
+    copyButton.addEventListener('click', () => {
+        const json = JSON.stringify(DashboardPerf.summary(), null, 2);
+        if (navigator.clipboard) navigator.clipboard.writeText(json).catch(() => console.log(json));
+        else console.log(json);
+    });
+    const body = document.createElement('pre');
+    panel.append(copyButton, body);
+    document.body.appendChild(panel);
+
+    let scheduled = false;
+    const render = () => {
+        scheduled = false;
+        body.textContent = formatPerfSummary(DashboardPerf);
+    };
+    DashboardPerf.subscribe(() => {
+        if (scheduled) return;
+        scheduled = true;
+        requestAnimationFrame(render);
+    });
+    render();
+}
+
+/**
+ * Append a chart-box for config.widgets[index] (the index tags its DashboardPerf measures).
+ */
+function createChartBox(container, index) {
+    const box = document.createElement('div');
+    box.className = 'chart-box';
+    box.dataset.widgetIndex = index;
+    container.appendChild(box);
+    return box;
+}
+
+/**
+ * Instantiate and render one widget in its chart-box (errors are shown in the box).
+ */
+function mountWidget(box, wConfig) {
+    const WidgetClass = resolveWidgetClass(wConfig.type);
+    const datasetIndex = wConfig.datasetIndex || 0;
+    const dataset = window.GLOBAL_DATASETS[datasetIndex] || [];
+    const index = box.dataset.widgetIndex;
+
+    try {
+        const tag = `${wConfig.type}#${index}`;
+        DashboardPerf.time('widget-construct', tag, () => new WidgetClass(box, dataset, wConfig), {
+            type: wConfig.type,
+            index,
+        });
+    } catch (e) {
+        console.error("Failed to initialize widget:", wConfig.type, e);
+        box.innerHTML = `<p class="error">Erreur lors du rendu du widget: ${wConfig.type}</p>`;
+        document.dispatchEvent(new CustomEvent(APP_CONSTANTS.WIDGET_CRASH_EVENT, {
+            detail: { type: wConfig.type, error: e },
+        }));
+    }
+}
+
+const LAZY_WIDGETS = {
+    ROOT_MARGIN: '200px 0px',
+    PENDING_CLASS: 'chart-box-pending',
+    IDLE_TIMEOUT_MS: 50,
+};
+
+/**
+ * Let the browser paint and handle input before the next widget is built.
+ */
+function yieldToBrowser() {
+    if (typeof scheduler !== 'undefined' && typeof scheduler.yield === 'function') {
+        return scheduler.yield();
+    }
+    if (typeof requestIdleCallback === 'function') {
+        return new Promise((resolve) => requestIdleCallback(() => resolve(), { timeout: LAZY_WIDGETS.IDLE_TIMEOUT_MS }));
+    }
+    return new Promise((resolve) => setTimeout(resolve, 0));
+}
+
+/**
+ * config.lazy_widgets: boxes start as title-only placeholders; a widget is instantiated when
+ * its box comes within ROOT_MARGIN of the viewport, one widget per task (yieldToBrowser in
+ * between), so the first chart paints without waiting for the rest of the dashboard.
+ */
+function mountWidgetsLazily(container, widgetConfigs, allWidgetConfigs) {
+    const configByBox = new Map();
+    const queue = [];
+    let draining = false;
+
+    const drain = async () => {
+        if (draining) return;
+        draining = true;
+        while (queue.length) {
+            const box = queue.shift();
+            box.classList.remove(LAZY_WIDGETS.PENDING_CLASS);
+            mountWidget(box, configByBox.get(box));
+            if (queue.length) await yieldToBrowser();
         }
+        draining = false;
+    };
+
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach((entry) => {
+            if (!entry.isIntersecting) return;
+            observer.unobserve(entry.target);
+            queue.push(entry.target);
+        });
+        drain();
+    }, { rootMargin: LAZY_WIDGETS.ROOT_MARGIN });
+
+    widgetConfigs.forEach((wConfig) => {
+        const box = createChartBox(container, allWidgetConfigs.indexOf(wConfig));
+        configByBox.set(box, wConfig);
+        box.classList.add(LAZY_WIDGETS.PENDING_CLASS);
+        const title = document.createElement('h2');
+        title.className = 'chart-title';
+        title.textContent = wConfig.title || '';
+        const header = document.createElement('div');
+        header.className = 'chart-header';
+        header.appendChild(title);
+        box.appendChild(header);
+        observer.observe(box);
     });
 }
 
 window.UI_THEME = UI_THEME;
+window.decodeColumnarV1 = decodeColumnarV1;
+window.decodeScriptSafeText = decodeScriptSafeText;
 
 init().catch((err) => {
     console.error('Dashboard bootstrap failed:', err);
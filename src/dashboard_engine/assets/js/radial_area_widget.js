@@ -11,24 +11,45 @@ class RadialAreaWidget extends BaseWidget {
     }
 
     update() {
-        this.vizWrapper.innerHTML = '';
-
-        const container = document.createElement('div');
-        container.className = 'sub-chart';
-        const L = Utils.CHART_LAYOUT;
-        container.innerHTML = `<div style="height:${L.SQUARE_VIEW_SIZE}px"></div>`;
-        this.vizWrapper.appendChild(container);
+        const [{ scaffold }] = this.syncPanels(['N'], (el) => this.createRadialPanel(el));
 
         const year = this.state.year;
-        const data = this.rawData.filter(d => !d.year || d.year === year);
+        const data = Utils.extractRowsForCalendarYear(this.rawData, year);
 
         if (!data.length) {
-            container.querySelector('div').innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée pour cette année.</p>';
+            this.setPanelHint(scaffold, 'Aucune donnée pour cette année.');
             return;
         }
 
-        this.drawRadialArea(container.querySelector('div'), data);
+        this.drawRadialArea(scaffold, data);
+    }
+
+    /** Single panel (no title): the three area/line paths, radial ticks and angular ticks. */
+    createRadialPanel(el) {
+        const scaffold = this.createChartPanel(el, {
+            mountStyle: `height:${Utils.CHART_LAYOUT.SQUARE_VIEW_SIZE}px`,
+            title: false,
+        });
+        scaffold.svg
+            .attr("style", "width: 100%; height: auto; font: 10px sans-serif;")
+            .attr("stroke-linejoin", "round")
+            .attr("stroke-linecap", "round");
+
+        const areaLayer = scaffold.svg.append("g").attr("class", "radial-area-layer");
+        scaffold.extentArea = areaLayer.append("path")
+            .attr("fill", "lightsteelblue")
+            .attr("fill-opacity", 0.2);
+        scaffold.rangeArea = areaLayer.append("path")
+            .attr("fill", "steelblue")
+            .attr("fill-opacity", 0.2);
+        scaffold.avgLine = areaLayer.append("path")
+            .attr("fill", "none")
+            .attr("stroke", UI_THEME.radialSeriesStroke)
+            .attr("stroke-width", 1.5);
+
+        scaffold.radialAxis = scaffold.svg.append("g").attr("text-anchor", "middle");
+        scaffold.angularAxis = scaffold.svg.append("g");
+        return scaffold;
     }
 
     /**
@@ -114,25 +135,27 @@ class RadialAreaWidget extends BaseWidget {
         return { points, timeUnit };
     }
 
-    drawRadialArea(domNode, data) {
-        const { points, timeUnit } = this.buildRadialStats(data);
+    drawRadialArea(scaffold, data) {
+        const { points, timeUnit } = this.cachedAggregate(
+            'radial-stats',
+            this.state.year,
+            () => this.buildRadialStats(data),
+            { fields: ['value'], period: false, extra: (this.config.options || {}).timeUnit || 'month' }
+        );
         if (!points.length) {
-            domNode.innerHTML = '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée exploitable.</p>';
+            this.setPanelHint(scaffold, 'Aucune donnée exploitable.');
             return;
         }
+        this.setPanelHint(scaffold, null);
 
-        const width = domNode.clientWidth || Utils.CHART_LAYOUT.SQUARE_VIEW_SIZE;
+        const width = scaffold.mount.clientWidth || Utils.CHART_LAYOUT.SQUARE_VIEW_SIZE;
         const height = width;
         const margin = RADIAL_CONSTANTS.MARGIN;
         const innerRadius = width / 5;
         const outerRadius = width / 2 - margin;
 
-        const svg = d3.select(domNode)
-            .append("svg")
-            .attr("viewBox", [-width / 2, -height / 2, width, height])
-            .attr("style", "width: 100%; height: auto; font: 10px sans-serif;")
-            .attr("stroke-linejoin", "round")
-            .attr("stroke-linecap", "round");
+        const svg = scaffold.svg
+            .attr("viewBox", [-width / 2, -height / 2, width, height]);
 
         const x = d3.scaleUtc()
             .domain([new Date(Date.UTC(2000, 0, 1)), new Date(Date.UTC(2001, 0, 1)) - 1])
@@ -150,55 +173,46 @@ class RadialAreaWidget extends BaseWidget {
             .curve(d3.curveLinearClosed)
             .angle(d => x(d.date));
 
-        const areaLayer = svg.append("g").attr("class", "radial-area-layer");
-
-        areaLayer.append("path")
-            .attr("fill", "lightsteelblue")
-            .attr("fill-opacity", 0.2)
+        scaffold.extentArea
             .attr("d", area
                 .innerRadius(d => y(d.minmin))
                 .outerRadius(d => y(d.maxmax))
                 (points));
 
-        areaLayer.append("path")
-            .attr("fill", "steelblue")
-            .attr("fill-opacity", 0.2)
+        scaffold.rangeArea
             .attr("d", area
                 .innerRadius(d => y(d.min))
                 .outerRadius(d => y(d.max))
                 (points));
 
-        areaLayer.append("path")
-            .attr("fill", "none")
-            .attr("stroke", UI_THEME.radialSeriesStroke)
-            .attr("stroke-width", 1.5)
+        scaffold.avgLine
             .attr("d", line
                 .radius(d => y(d.avg))
                 (points));
 
         const radialTicks = y.ticks(4).reverse();
         const valueUnit = (this.config.options && this.config.options.valueUnit) || "";
-        const gRadial = svg.append("g")
-            .attr("text-anchor", "middle");
-
-        gRadial.selectAll("g")
-            .data(radialTicks)
-            .join("g")
-            .call(g => g.append("circle")
-                .attr("fill", "none")
-                .attr("stroke", "currentColor")
-                .attr("stroke-opacity", 0.2)
-                .attr("r", y))
-            .call(g => g.append("text")
-                .attr("y", d => -y(d))
-                .attr("dy", "0.35em")
-                .attr("stroke", UI_THEME.white)
-                .attr("stroke-width", 5)
-                .attr("fill", "currentColor")
-                .attr("paint-order", "stroke")
-                .text(d => `${d.toFixed(0)}${valueUnit}`)
-                .clone(true)
-                .attr("y", d => y(d)));
+        const tickLabel = d => `${d.toFixed(0)}${valueUnit}`;
+
+        scaffold.radialAxis.selectAll("g")
+            .data(radialTicks, d => d)
+            .join(enter => enter.append("g")
+                .call(g => g.append("circle")
+                    .attr("fill", "none")
+                    .attr("stroke", "currentColor")
+                    .attr("stroke-opacity", 0.2))
+                .call(g => g.append("text")
+                    .attr("class", "radial-tick-above")
+                    .attr("dy", "0.35em")
+                    .attr("stroke", UI_THEME.white)
+                    .attr("stroke-width", 5)
+                    .attr("fill", "currentColor")
+                    .attr("paint-order", "stroke")
+                    .clone(true)
+                    .attr("class", "radial-tick-below")))
+            .call(g => g.select("circle").attr("r", y))
+            .call(g => g.select("text.radial-tick-above").attr("y", d => -y(d)).text(tickLabel))
+            .call(g => g.select("text.radial-tick-below").attr("y", d => y(d)).text(tickLabel));
 
         const formatter =
             timeUnit === "weekday"
@@ -207,26 +221,27 @@ class RadialAreaWidget extends BaseWidget {
                     ? d => d.getUTCDate().toString()
                     : d3.utcFormat("%b");
 
-        svg.append("g")
+        scaffold.angularAxis
             .selectAll("g")
-            .data(x.ticks())
-            .join("g")
-            .call(g => g.append("path")
-                .attr("stroke", UI_THEME.black)
-                .attr("stroke-opacity", 0.2)
+            .data(x.ticks(), d => +d)
+            .join(enter => enter.append("g")
+                .call(g => g.append("path")
+                    .attr("stroke", UI_THEME.black)
+                    .attr("stroke-opacity", 0.2))
+                .call(g => g.append("text")
+                    .attr("text-anchor", "middle")
+                    .attr("alignment-baseline", "middle")))
+            .call(g => g.select("path")
                 .attr("d", d => `
                     M${d3.pointRadial(x(d), innerRadius)}
                     L${d3.pointRadial(x(d), outerRadius)}
                 `))
-            .call(g => g.append("text")
+            .call(g => g.select("text")
                 .attr("transform", d => {
                     const labelRadius = Math.max(innerRadius - 15, 0);
                     const [ax, ay] = d3.pointRadial(x(d), labelRadius);
                     return `translate(${ax},${ay})`;
                 })
-                .attr("text-anchor", "middle")
-                .attr("alignment-baseline", "middle")
                 .text(formatter));
     }
 }
-
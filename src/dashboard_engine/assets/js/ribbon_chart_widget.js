@@ -140,9 +140,7 @@ function ribbonColumnRankFromTop(column) {
  * @see d3.curveBumpX (horizontal tangents, y stays between endpoints).
  */
 function ribbonBumpLink() {
-    const curve =
-        typeof d3.curveBumpX === 'function' ? d3.curveBumpX : d3.curveHorizontalLink;
-    return d3.link(curve).x((d) => d.x).y((d) => d.y);
+    return d3.link(d3.curveBumpX).x((d) => d.x).y((d) => d.y);
 }
 
 /**
@@ -176,8 +174,6 @@ class RibbonChartWidget extends BaseWidget {
     }
 
     update() {
-        this.vizWrapper.innerHTML = '';
-
         const L = Utils.CHART_LAYOUT;
         if (this.state.yoy) {
             this.chartWidth = this.vizWrapper.clientWidth || L.DEFAULT_INNER_WIDTH;
@@ -188,67 +184,83 @@ class RibbonChartWidget extends BaseWidget {
         const anchorYear = this.state.year;
         const yearsToShow = Utils.calendarYearsForYoYChart(anchorYear, this.state.yoy);
         const periodType = this.state.periodType;
+        const panels = this.syncPanels(
+            yearsToShow.map((year) => this.yoyPanelKey(year)),
+            (el) => this.createRibbonPanel(el)
+        );
 
-        yearsToShow.forEach((year) => {
-            const container = document.createElement('div');
-            container.className = 'sub-chart';
+        panels.forEach(({ scaffold }, i) => {
+            const year = yearsToShow[i];
             const ySuffix = Utils.formatYoYChartTitleSuffix(this.state.yoy, year, anchorYear);
-            container.innerHTML =
-                `<h4>Année ${year}${ySuffix}</h4><div class="ribbon-chart-mount" style="height:${L.STANDARD_PLOT_HEIGHT}px"></div>`;
-            this.vizWrapper.appendChild(container);
+            scaffold.title.textContent = `Année ${year}${ySuffix}`;
 
             const data = Utils.extractRowsForCalendarYear(this.rawData, year);
             if (!data.length) {
-                container.querySelector('.ribbon-chart-mount').innerHTML =
-                    '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée pour cette année.</p>';
+                this.setPanelHint(scaffold, 'Aucune donnée pour cette année.');
                 return;
             }
 
-            this.drawRibbonChart(container.querySelector('.ribbon-chart-mount'), data, periodType);
+            this.drawRibbonChart(scaffold, data, periodType, year);
+        });
+    }
+
+    /** Panel scaffold: svg layers in paint order (guides, flows, nodes, legend, labels, axis). */
+    createRibbonPanel(el) {
+        const scaffold = this.createChartPanel(el, {
+            mountClass: 'ribbon-chart-mount',
+            mountStyle: `height:${Utils.CHART_LAYOUT.STANDARD_PLOT_HEIGHT}px`,
         });
+        const svg = scaffold.svg.attr('class', 'ribbon-chart-svg');
+        scaffold.guides = svg.append('g').attr('class', 'ribbon-chart-guides');
+        scaffold.flows = svg.append('g').attr('class', 'ribbon-chart-flows');
+        scaffold.nodes = svg.append('g').attr('class', 'ribbon-chart-nodes');
+        scaffold.legend = svg.append('g').attr('class', 'ribbon-chart-category-legend');
+        scaffold.labels = svg.append('g').attr('class', 'ribbon-chart-node-labels');
+        scaffold.xAxis = svg.append('g');
+        scaffold.x = d3.scalePoint().padding(0.35);
+        scaffold.y = d3.scaleLinear();
+        return scaffold;
     }
 
-    drawRibbonChart(domNode, data, periodType) {
+    drawRibbonChart(scaffold, data, periodType, year) {
         const mapping = this.config.mapping || {};
-        const { xValues, categories, seriesByCategory } = buildRibbonStackedSeries(
-            data,
-            mapping,
-            periodType
+        // Calendar-year rows (undated included): keyed by period type only, not the period value.
+        const { xValues, categories, columns } = this.cachedAggregate(
+            'ribbon-series',
+            year,
+            () => {
+                const built = buildRibbonStackedSeries(data, mapping, periodType);
+                return { ...built, columns: buildRibbonColumnStacks(built.xValues, built.categories, built.seriesByCategory) };
+            },
+            { fields: ['value', 'category'], period: false, extra: ['calendar', periodType] }
         );
 
         if (!categories.length) {
-            domNode.innerHTML =
-                '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée exploitable.</p>';
+            this.setPanelHint(scaffold, 'Aucune donnée exploitable.');
             return;
         }
+        this.setPanelHint(scaffold, null);
 
-        const columns = buildRibbonColumnStacks(xValues, categories, seriesByCategory);
         const maxTotal = d3.max(columns, (c) => c.total) || 1;
 
         const L = Utils.CHART_LAYOUT;
-        const width = this.chartWidth || domNode.clientWidth || L.DEFAULT_INNER_WIDTH;
+        const width = this.chartWidth || scaffold.mount.clientWidth || L.DEFAULT_INNER_WIDTH;
         const height = L.STANDARD_PLOT_HEIGHT;
         const margin = { top: 24, right: 24, bottom: 36, left: 96 };
         const nodeHalf = RIBBON_CHART_CONSTANTS.NODE_WIDTH / 2;
 
-        const x = d3
-            .scalePoint()
+        const x = scaffold.x
             .domain(xValues)
-            .range([margin.left + nodeHalf, width - margin.right - nodeHalf])
-            .padding(0.35);
+            .range([margin.left + nodeHalf, width - margin.right - nodeHalf]);
 
-        const y = d3
-            .scaleLinear()
+        const y = scaffold.y
             .domain([0, maxTotal])
             .nice()
             .range([height - margin.bottom, margin.top]);
 
         const color = d3.scaleOrdinal(UI_THEME.schemeTableau10).domain(categories);
 
-        const svg = d3
-            .select(domNode)
-            .append('svg')
-            .attr('class', 'ribbon-chart-svg')
+        scaffold.svg
             .attr('viewBox', [0, 0, width, height])
             .attr('data-period-type', periodType)
             .attr('data-category-count', categories.length);
@@ -274,35 +286,32 @@ class RibbonChartWidget extends BaseWidget {
             });
         }
 
-        const gGuides = svg.append('g').attr('class', 'ribbon-chart-guides');
-        gGuides
+        scaffold.guides
             .selectAll('line')
-            .data(xValues)
-            .join('line')
-            .attr('class', 'ribbon-chart-guide')
+            .data(xValues, (xv) => xv)
+            .join((enter) => enter.append('line')
+                .attr('class', 'ribbon-chart-guide')
+                .attr('stroke', UI_THEME.gridMajor)
+                .attr('stroke-dasharray', RIBBON_CHART_CONSTANTS.GUIDE_DASH)
+                .attr('stroke-width', 1))
             .attr('x1', (xv) => x(xv))
             .attr('x2', (xv) => x(xv))
             .attr('y1', margin.top)
-            .attr('y2', height - margin.bottom)
-            .attr('stroke', UI_THEME.gridMajor)
-            .attr('stroke-dasharray', RIBBON_CHART_CONSTANTS.GUIDE_DASH)
-            .attr('stroke-width', 1);
+            .attr('y2', height - margin.bottom);
 
-        const gFlows = svg.append('g').attr('class', 'ribbon-chart-flows');
-        gFlows
+        scaffold.flows
             .selectAll('path')
-            .data(flowLinks)
-            .join('path')
-            .attr('class', 'ribbon-chart-flow')
+            .data(flowLinks, (d) => `${d.category}|${d.sourceX}`)
+            .join((enter) => enter.append('path')
+                .attr('class', 'ribbon-chart-flow')
+                .attr('fill-opacity', RIBBON_CHART_CONSTANTS.RIBBON_FLOW_OPACITY)
+                .attr('stroke', 'none'))
             .attr('d', (d) => d.d)
             .attr('data-category', (d) => d.category)
             .attr('data-source-x', (d) => d.sourceX)
             .attr('data-target-x', (d) => d.targetX)
-            .attr('fill', (d) => color(d.category))
-            .attr('fill-opacity', RIBBON_CHART_CONSTANTS.RIBBON_FLOW_OPACITY)
-            .attr('stroke', 'none')
-            .append('title')
-            .text((d) => d.category);
+            .attr('fill', (d) => color(d.category));
+        this.bindTooltip(scaffold.svg, '.ribbon-chart-flow', (d) => d.category);
 
         const nodeData = [];
         columns.forEach((col) => {
@@ -325,24 +334,23 @@ class RibbonChartWidget extends BaseWidget {
                 });
             });
         });
+        const nodeKey = (d) => `${d.category}|${d.x}`;
 
-        const gNodes = svg.append('g').attr('class', 'ribbon-chart-nodes');
-        gNodes
+        scaffold.nodes
             .selectAll('rect')
-            .data(nodeData)
-            .join('rect')
-            .attr('class', 'ribbon-chart-node')
+            .data(nodeData, nodeKey)
+            .join((enter) => enter.append('rect')
+                .attr('class', 'ribbon-chart-node')
+                .attr('width', RIBBON_CHART_CONSTANTS.NODE_WIDTH)
+                .attr('stroke', UI_THEME.white)
+                .attr('stroke-width', RIBBON_CHART_CONSTANTS.NODE_STROKE_WIDTH))
             .attr('x', (d) => d.xCenter - nodeHalf)
             .attr('y', (d) => d.yTop)
-            .attr('width', RIBBON_CHART_CONSTANTS.NODE_WIDTH)
             .attr('height', (d) => Math.max(0, d.height))
             .attr('fill', (d) => color(d.category))
-            .attr('stroke', UI_THEME.white)
-            .attr('stroke-width', RIBBON_CHART_CONSTANTS.NODE_STROKE_WIDTH)
             .attr('data-category', (d) => d.category)
-            .attr('data-x', (d) => d.x)
-            .append('title')
-            .text((d) => `${d.category}: ${Utils.fmtNumber.format(d.value)}`);
+            .attr('data-x', (d) => d.x);
+        this.bindTooltip(scaffold.svg, '.ribbon-chart-node', (d) => `${d.category}: ${Utils.fmtNumber.format(d.value)}`);
 
         const firstColumn = columns[0];
         const swatchHalf = RIBBON_CHART_CONSTANTS.LEGEND_SWATCH_SIZE / 2;
@@ -360,53 +368,51 @@ class RibbonChartWidget extends BaseWidget {
             .filter(Boolean)
             .sort((a, b) => a.yCenter - b.yCenter);
 
-        const gLegend = svg.append('g').attr('class', 'ribbon-chart-category-legend');
-        gLegend
+        scaffold.legend
             .selectAll('rect')
-            .data(legendData)
-            .join('rect')
-            .attr('class', 'ribbon-chart-category-swatch')
-            .attr('x', RIBBON_CHART_CONSTANTS.LEGEND_SWATCH_X)
+            .data(legendData, (d) => d.category)
+            .join((enter) => enter.append('rect')
+                .attr('class', 'ribbon-chart-category-swatch')
+                .attr('x', RIBBON_CHART_CONSTANTS.LEGEND_SWATCH_X)
+                .attr('width', RIBBON_CHART_CONSTANTS.LEGEND_SWATCH_SIZE)
+                .attr('height', RIBBON_CHART_CONSTANTS.LEGEND_SWATCH_SIZE)
+                .attr('stroke', UI_THEME.white)
+                .attr('stroke-width', 0.75)
+                .attr('rx', 1))
             .attr('y', (d) => d.yCenter - swatchHalf)
-            .attr('width', RIBBON_CHART_CONSTANTS.LEGEND_SWATCH_SIZE)
-            .attr('height', RIBBON_CHART_CONSTANTS.LEGEND_SWATCH_SIZE)
-            .attr('fill', (d) => color(d.category))
-            .attr('stroke', UI_THEME.white)
-            .attr('stroke-width', 0.75)
-            .attr('rx', 1);
+            .attr('fill', (d) => color(d.category));
 
-        gLegend
+        scaffold.legend
             .selectAll('text')
-            .data(legendData)
-            .join('text')
-            .attr('class', 'ribbon-chart-category-label')
-            .attr('x', RIBBON_CHART_CONSTANTS.LEGEND_TEXT_X)
+            .data(legendData, (d) => d.category)
+            .join((enter) => enter.append('text')
+                .attr('class', 'ribbon-chart-category-label')
+                .attr('x', RIBBON_CHART_CONSTANTS.LEGEND_TEXT_X)
+                .attr('dy', '0.35em')
+                .attr('text-anchor', 'start')
+                .attr('fill', UI_THEME.textMuted)
+                .attr('font-size', '11px')
+                .attr('font-weight', '500')
+                .style('pointer-events', 'none'))
             .attr('y', (d) => d.yCenter)
-            .attr('dy', '0.35em')
-            .attr('text-anchor', 'start')
-            .attr('fill', UI_THEME.textMuted)
-            .attr('font-size', '11px')
-            .attr('font-weight', '500')
-            .style('pointer-events', 'none')
             .text((d) => d.category);
 
-        const gLabels = svg.append('g').attr('class', 'ribbon-chart-node-labels');
-        gLabels
+        scaffold.labels
             .selectAll('text')
-            .data(nodeData.filter((d) => d.height >= RIBBON_CHART_CONSTANTS.MIN_LABEL_HEIGHT))
-            .join('text')
-            .attr('class', 'ribbon-chart-node-label')
+            .data(nodeData.filter((d) => d.height >= RIBBON_CHART_CONSTANTS.MIN_LABEL_HEIGHT), nodeKey)
+            .join((enter) => enter.append('text')
+                .attr('class', 'ribbon-chart-node-label')
+                .attr('dy', '0.35em')
+                .attr('text-anchor', 'middle')
+                .attr('fill', UI_THEME.white)
+                .attr('font-size', '11px')
+                .attr('font-weight', '600')
+                .style('pointer-events', 'none'))
             .attr('x', (d) => d.xCenter)
             .attr('y', (d) => d.yTop + d.height / 2)
-            .attr('dy', '0.35em')
-            .attr('text-anchor', 'middle')
-            .attr('fill', UI_THEME.white)
-            .attr('font-size', '11px')
-            .attr('font-weight', '600')
-            .style('pointer-events', 'none')
             .text((d) => Utils.fmtNumber.format(d.value));
 
-        svg.append('g')
+        scaffold.xAxis
             .attr('transform', `translate(0,${height - margin.bottom})`)
             .call(
                 d3
@@ -5,14 +5,14 @@ const SANKEY_CONSTANTS = {
     LABEL_FONT_PX: 10,
 };
 
+/** Inner HTML of a sub-chart `<h4>`: period label plus the removable filter badge. */
 function renderSankeySubChartTitleHtml(label, suffix, currentFilter) {
-    let html = `<h4>${label}${suffix}`;
+    let html = `${label}${suffix}`;
     if (currentFilter) {
         html += ` <span style="color:${UI_THEME.filterActive}; font-size:0.8em; cursor:pointer;" title="Cliquez pour retirer le filtre">
                     (Filtre: ${currentFilter} ✖)
                 </span>`;
     }
-    html += '</h4>';
     return html;
 }
 
@@ -28,11 +28,15 @@ class SankeyWidget extends BaseWidget {
             this.state.currentFilter = null;
         }
 
-        this.vizWrapper.innerHTML = '';
         const anchorYear = this.state.year;
         const yearsToShow = Utils.calendarYearsForYoYChart(anchorYear, this.state.yoy);
+        const panels = this.syncPanels(
+            yearsToShow.map((year) => this.yoyPanelKey(year)),
+            (el) => this.createSankeyPanel(el)
+        );
 
-        yearsToShow.forEach((year) => {
+        panels.forEach(({ scaffold }, i) => {
+            const year = yearsToShow[i];
             let data = this.getFilteredData(year);
 
             if (this.state.currentFilter) {
@@ -42,32 +46,59 @@ class SankeyWidget extends BaseWidget {
                 data = data.filter(row => pathCols.some(col => col && row[col] === val));
             }
 
-            const container = document.createElement('div');
-            container.className = 'sub-chart';
-
             const label = Utils.labelForPeriod(this.state.periodType, year, this.state.periodValue);
             const suffix = Utils.formatYoYChartTitleSuffix(this.state.yoy, year, anchorYear);
-
-            const htmlTitle = renderSankeySubChartTitleHtml(label, suffix, this.state.currentFilter);
-
-            container.innerHTML = `${htmlTitle}<div style="width:100%; min-height:${SANKEY_CONSTANTS.SUB_CHART_MIN_HEIGHT_PX}px;"></div>`;
-            this.vizWrapper.appendChild(container);
+            scaffold.title.innerHTML = renderSankeySubChartTitleHtml(label, suffix, this.state.currentFilter);
 
             if (this.state.currentFilter) {
-                container.querySelector('h4 span').addEventListener('click', (e) => {
+                scaffold.title.querySelector('span').addEventListener('click', (e) => {
                     e.stopPropagation();
-                    this.state.currentFilter = null;
-                    this.update();
+                    this.applyControl('filter', () => {
+                        this.state.currentFilter = null;
+                    });
                 });
             }
 
             if (data.length === 0) {
-                container.querySelector('div').innerHTML = '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée pour ce filtre.</p>';
+                this.setPanelHint(scaffold, 'Aucune donnée pour ce filtre.');
                 return;
             }
+            this.setPanelHint(scaffold, null);
+            this.drawSankey(scaffold, data, year);
+        });
+    }
 
-            this.drawSankey(container.querySelector('div'), data);
+    /** Panel scaffold: fixed-size svg with link, node and label layers. */
+    createSankeyPanel(el) {
+        const width = Utils.CHART_LAYOUT.DEFAULT_INNER_WIDTH;
+        const height = Utils.CHART_LAYOUT.SANKEY_VIEW_HEIGHT;
+        const scaffold = this.createChartPanel(el, {
+            mountStyle: `width:100%; min-height:${SANKEY_CONSTANTS.SUB_CHART_MIN_HEIGHT_PX}px;`,
         });
+
+        scaffold.svg
+            .attr("viewBox", [0, 0, width, height])
+            .attr("preserveAspectRatio", "xMidYMid meet")
+            .style("width", "100%")
+            .style("height", "100%")
+            .on("click", (e) => {
+                if (e.target.tagName === 'svg') {
+                    this.applyControl('filter', () => {
+                        this.state.currentFilter = null;
+                    });
+                }
+            });
+
+        scaffold.links = scaffold.svg.append("g")
+            .attr("class", "sankey-links")
+            .attr("fill", "none")
+            .attr("stroke-opacity", 0.5);
+        scaffold.nodes = scaffold.svg.append("g").attr("class", "sankey-nodes");
+        scaffold.labels = scaffold.svg.append("g")
+            .attr("font-size", SANKEY_CONSTANTS.LABEL_FONT_PX)
+            .attr("font-family", "sans-serif")
+            .style("pointer-events", "none");
+        return scaffold;
     }
 
     /**
@@ -117,34 +148,31 @@ class SankeyWidget extends BaseWidget {
         };
     }
 
-    drawSankey(domNode, data) {
+    drawSankey(scaffold, data, year) {
         const width = Utils.CHART_LAYOUT.DEFAULT_INNER_WIDTH;
         const height = Utils.CHART_LAYOUT.SANKEY_VIEW_HEIGHT;
 
-        const { nodes, links } = this.buildGraphFromData(data);
-
-        const svg = d3.select(domNode).append("svg")
-            .attr("viewBox", [0, 0, width, height])
-            .attr("preserveAspectRatio", "xMidYMid meet")
-            .style("width", "100%")
-            .style("height", "100%");
-
-        svg.on("click", (e) => {
-            if (e.target.tagName === 'svg') {
-                this.state.currentFilter = null;
-                this.update();
-            }
-        });
-
-        if (nodes.length === 0) return;
-
-        const sankeyGen = sankey()
-            .nodeId(d => d.id)
-            .nodeWidth(SANKEY_CONSTANTS.NODE_WIDTH)
-            .nodePadding(SANKEY_CONSTANTS.NODE_PADDING)
-            .extent([[1, 5], [width - 1, height - 5]]);
-
-        const graph = sankeyGen({ nodes, links });
+        const { nodes, links } = this.cachedAggregate(
+            'sankey-graph',
+            year,
+            () => this.buildGraphFromData(data),
+            { fields: ['path', 'source', 'target', 'value'], extra: this.state.currentFilter }
+        );
+
+        let graph = { nodes: [], links: [] };
+        if (nodes.length > 0) {
+            const sankeyGen = sankey()
+                .nodeId(d => d.id)
+                .nodeWidth(SANKEY_CONSTANTS.NODE_WIDTH)
+                .nodePadding(SANKEY_CONSTANTS.NODE_PADDING)
+                .extent([[1, 5], [width - 1, height - 5]]);
+
+            // The layout mutates its input: lay out copies of the (cached) graph.
+            graph = sankeyGen({
+                nodes: nodes.map(d => Object.assign({}, d)),
+                links: links.map(d => Object.assign({}, d))
+            });
+        }
 
         const levelTotals = new Map();
         graph.nodes.forEach(n => {
@@ -154,52 +182,48 @@ class SankeyWidget extends BaseWidget {
 
         const getNameFromId = (id) => id.split('##')[0];
 
-        svg.append("g")
-            .attr("fill", "none")
-            .attr("stroke-opacity", 0.5)
+        scaffold.links
             .selectAll("path")
-            .data(graph.links)
-            .join("path")
+            .data(graph.links, d => `${d.source.id}->${d.target.id}`)
+            .join(enter => enter.append("path")
+                .style("cursor", "pointer")
+                .on("click", (e, d) => {
+                    e.stopPropagation();
+                    this.handleFilterChange(getNameFromId(d.source.id));
+                }))
             .attr("d", sankeyLinkHorizontal())
             .attr("stroke", d => this.colorScale(getNameFromId(d.source.id)))
-            .attr("stroke-width", d => Math.max(1, d.width))
-            .style("cursor", "pointer")
-            .on("click", (e, d) => {
-                e.stopPropagation();
-                this.handleFilterChange(getNameFromId(d.source.id));
-            })
-            .append("title")
-            .text(d => `${getNameFromId(d.source.id)} → ${getNameFromId(d.target.id)}\n${Utils.fmtNumber.format(d.value)}`);
-
-        svg.append("g")
+            .attr("stroke-width", d => Math.max(1, d.width));
+
+        scaffold.nodes
             .selectAll("rect")
-            .data(graph.nodes)
-            .join("rect")
+            .data(graph.nodes, d => d.id)
+            .join(enter => enter.append("rect")
+                .attr("stroke", UI_THEME.black)
+                .attr("stroke-opacity", 0.1)
+                .style("cursor", "pointer")
+                .on("click", (e, d) => {
+                    e.stopPropagation();
+                    this.handleFilterChange(d.name);
+                }))
             .attr("x", d => d.x0)
             .attr("y", d => d.y0)
             .attr("height", d => d.y1 - d.y0)
             .attr("width", d => d.x1 - d.x0)
             .attr("fill", d => this.colorScale(d.name))
-            .attr("stroke", UI_THEME.black)
-            .attr("stroke-opacity", 0.1)
-            .style("cursor", "pointer")
-            .on("click", (e, d) => {
-                e.stopPropagation();
-                this.handleFilterChange(d.name);
-            })
-            .append("title")
-            .text(d => {
-                const totalLevel = levelTotals.get(Math.round(d.x0)) || d.value;
-                const pct = totalLevel > 0 ? ((d.value / totalLevel) * 100).toFixed(1) : 0;
-                return `${d.name}\nTotal: ${Utils.fmtNumber.format(d.value)} (${pct}%)\n(Cliquez pour isoler)`;
-            });
+            .attr("data-node", d => d.name);
+
+        this.bindTooltip(scaffold.svg, ".sankey-links path", d =>
+            `${getNameFromId(d.source.id)} → ${getNameFromId(d.target.id)}\n${Utils.fmtNumber.format(d.value)}`);
+        this.bindTooltip(scaffold.svg, ".sankey-nodes rect", d => {
+            const totalLevel = levelTotals.get(Math.round(d.x0)) || d.value;
+            const pct = totalLevel > 0 ? ((d.value / totalLevel) * 100).toFixed(1) : 0;
+            return `${d.name}\nTotal: ${Utils.fmtNumber.format(d.value)} (${pct}%)\n(Cliquez pour isoler)`;
+        });
 
-        svg.append("g")
-            .attr("font-size", SANKEY_CONSTANTS.LABEL_FONT_PX)
-            .attr("font-family", "sans-serif")
-            .style("pointer-events", "none")
+        scaffold.labels
             .selectAll("text")
-            .data(graph.nodes)
+            .data(graph.nodes, d => d.id)
             .join("text")
             .attr("x", d => d.x0 < width / 2 ? d.x1 + 6 : d.x0 - 6)
             .attr("y", d => (d.y1 + d.y0) / 2)
@@ -209,7 +233,8 @@ class SankeyWidget extends BaseWidget {
     }
 
     handleFilterChange(newValue) {
-        this.state.currentFilter = (this.state.currentFilter === newValue) ? null : newValue;
-        this.update();
+        this.applyControl('filter', () => {
+            this.state.currentFilter = (this.state.currentFilter === newValue) ? null : newValue;
+        });
     }
 }
@@ -1,3 +1,21 @@
+/**
+ * Layer of `stackedSeries` (d3.stack layers, or their 100% rescaling) drawn at (`px`, `py`), with
+ * the stack bounds interpolated linearly between the two surrounding months of `xPositions`.
+ * Null outside the plotted months and above the top layer.
+ */
+function stackedAreaLayerAt(stackedSeries, xPositions, y, px, py) {
+    const last = xPositions.length - 1;
+    if (last < 0 || px < xPositions[0] || px > xPositions[last]) {
+        return null;
+    }
+    const i = Math.min(d3.bisectRight(xPositions, px), last);
+    const i0 = Math.max(i - 1, 0);
+    const span = xPositions[i] - xPositions[i0];
+    const t = span > 0 ? (px - xPositions[i0]) / span : 0;
+    const at = (layer, bound) => y(layer[i0][bound] + t * (layer[i][bound] - layer[i0][bound]));
+    return stackedSeries.find(layer => py <= at(layer, 0) && py >= at(layer, 1)) || null;
+}
+
 class StackedAreaWidget extends BaseWidget {
 
     initLayout() {
@@ -26,10 +44,9 @@ class StackedAreaWidget extends BaseWidget {
             </label>
         `;
         const input = toggleGroup.querySelector('input');
-        input.onchange = (e) => {
+        input.onchange = (e) => this.applyControl('normalized', () => {
             this.state.normalized = e.target.checked;
-            this.update();
-        };
+        });
 
         this.controlsDiv.appendChild(toggleGroup);
     }
@@ -74,8 +91,6 @@ class StackedAreaWidget extends BaseWidget {
     }
 
     update() {
-        this.vizWrapper.innerHTML = '';
-
         // When YoY is enabled, use a single width reference for all sub-charts (N and N-1)
         // so that their diagrams share the exact same dimensions. For a single year view,
         // we let each chart compute its own width from its container to avoid overflow.
@@ -88,34 +103,50 @@ class StackedAreaWidget extends BaseWidget {
 
         const anchorYear = this.state.year;
         const yearsToShow = Utils.calendarYearsForYoYChart(anchorYear, this.state.yoy);
+        const panels = this.syncPanels(
+            yearsToShow.map((year) => this.yoyPanelKey(year)),
+            (el) => this.createStackedAreaPanel(el)
+        );
 
-        yearsToShow.forEach((year) => {
-            const container = document.createElement('div');
-            container.className = 'sub-chart';
+        panels.forEach(({ scaffold }, i) => {
+            const year = yearsToShow[i];
             const ySuffix = Utils.formatYoYChartTitleSuffix(this.state.yoy, year, anchorYear);
-            container.innerHTML = `<h4>Année ${year}${ySuffix}</h4><div style="height:${L.STANDARD_PLOT_HEIGHT}px"></div>`;
-            this.vizWrapper.appendChild(container);
+            scaffold.title.textContent = `Année ${year}${ySuffix}`;
 
-            const data = this.rawData.filter(d => d.year === year);
+            const data = this.getYearData(year);
             if (!data.length) {
-                container.querySelector('div').innerHTML =
-                    '<p class="hint" style="text-align:center; padding-top:100px;">Aucune donnée pour cette année.</p>';
+                this.setPanelHint(scaffold, 'Aucune donnée pour cette année.');
                 return;
             }
-
-            this.drawStackedArea(container.querySelector('div'), data);
+            this.setPanelHint(scaffold, null);
+            this.drawStackedArea(scaffold, data, year);
         });
     }
 
-    drawStackedArea(domNode, data) {
+    createStackedAreaPanel(el) {
+        const scaffold = this.createChartPanel(el, { mountStyle: `height:${Utils.CHART_LAYOUT.STANDARD_PLOT_HEIGHT}px` });
+        scaffold.xAxis = scaffold.svg.append("g");
+        scaffold.yAxis = scaffold.svg.append("g");
+        scaffold.layers = scaffold.svg.append("g");
+        scaffold.x = d3.scaleLinear().domain([1, 12]);
+        scaffold.y = d3.scaleLinear();
+        return scaffold;
+    }
+
+    drawStackedArea(scaffold, data, year) {
         const { value } = this.config.mapping;
 
         const L = Utils.CHART_LAYOUT;
-        const width = this.chartWidth || domNode.clientWidth || L.DEFAULT_INNER_WIDTH;
+        const width = this.chartWidth || scaffold.mount.clientWidth || L.DEFAULT_INNER_WIDTH;
         const height = L.STANDARD_PLOT_HEIGHT;
         const margin = { top: 30, right: 30, bottom: 30, left: 50 };
 
-        const { xValues, categories, seriesByCategory } = this.buildStackedSeries(data);
+        const { xValues, categories, seriesByCategory } = this.cachedAggregate(
+            'stacked-series',
+            year,
+            () => this.buildStackedSeries(data),
+            { fields: ['value', 'category'], period: false }
+        );
         const stackedInput = xValues.map((month, idx) => {
             const row = { month };
             categories.forEach((cat, cIdx) => {
@@ -148,29 +179,26 @@ class StackedAreaWidget extends BaseWidget {
             });
         }
 
-        const x = d3.scaleLinear()
-            .domain([1, 12])
-            .range([margin.left, width - margin.right]);
+        const x = scaffold.x.range([margin.left, width - margin.right]);
 
         // IMPORTANT: for stacked areas, the Y domain must be based on the stacked
         // total (max of y1 across all layers), not the max of a single category.
         const stackedMax = d3.max(stackedSeries, layer => d3.max(layer, d => d[1])) || 0;
         const yDomainMax = this.state.normalized ? 1 : (stackedMax || 1);
 
-        const y = d3.scaleLinear()
+        const y = scaffold.y
             .domain([0, yDomainMax])
             .nice()
             .range([height - margin.bottom, margin.top]);
 
         const color = d3.scaleOrdinal(UI_THEME.schemeTableau10).domain(categories);
 
-        const svg = d3.select(domNode)
-            .append("svg")
+        scaffold.svg
             .attr("viewBox", [0, 0, width, height])
             .attr("data-normalized", this.state.normalized ? "true" : "false");
 
         // Axes.
-        svg.append("g")
+        scaffold.xAxis
             .attr("transform", `translate(0,${height - margin.bottom})`)
             .call(
                 d3.axisBottom(x)
@@ -180,7 +208,7 @@ class StackedAreaWidget extends BaseWidget {
             .call(g => g.select(".domain").attr("stroke", UI_THEME.axisDomain))
             .call(g => g.selectAll("line").attr("stroke", UI_THEME.gridMajor));
 
-        svg.append("g")
+        scaffold.yAxis
             .attr("transform", `translate(${margin.left},0)`)
             .call(
                 d3.axisLeft(y)
@@ -198,30 +226,55 @@ class StackedAreaWidget extends BaseWidget {
             .y1(d => y(d[1]))
             .curve(d3.curveMonotoneX);
 
-        const groups = svg.append("g")
+        const layerPoints = (layer) => layer.map((d, idx) => {
+            const dataPoint = this.state.normalized
+                ? { month: xValues[idx] }
+                : d.data;
+            return [d[0], d[1], dataPoint];
+        });
+
+        const layerText = layer => this.state.normalized
+            ? `${layer.key} (100% stacked mode)`
+            : `${layer.key}`;
+
+        // Layers on canvas above the mark budget (one mark per layer and month).
+        if (this.resolveRenderer(categories.length * xValues.length) === WIDGET_RENDERER.CANVAS) {
+            scaffold.layers.selectAll("path").remove();
+            this.paintMarkCanvas(scaffold.svg.node(), width, height, (ctx) => {
+                area.context(ctx);
+                ctx.strokeStyle = UI_THEME.white;
+                ctx.lineWidth = 0.5;
+                stackedSeries.forEach(layer => {
+                    ctx.beginPath();
+                    area(layerPoints(layer));
+                    ctx.globalAlpha = 0.8;
+                    ctx.fillStyle = color(layer.key);
+                    ctx.fill();
+                    ctx.globalAlpha = 1;
+                    ctx.stroke();
+                });
+                area.context(null);
+            });
+            const xPositions = xValues.map(month => x(month));
+            this.bindCanvasTooltip(scaffold.svg, (px, py) => stackedAreaLayerAt(stackedSeries, xPositions, y, px, py), layerText);
+            return;
+        }
+        this.hideMarkCanvas(scaffold.svg.node());
+        this.bindCanvasTooltip(scaffold.svg, null);
+
+        // One path per category, keyed so a year or mode switch only updates `d`.
+        scaffold.layers
             .selectAll("path")
-            .data(stackedSeries)
-            .join("path")
-            .attr("class", "stacked-area-layer")
+            .data(stackedSeries, layer => layer.key)
+            .join(enter => enter.append("path")
+                .attr("class", "stacked-area-layer")
+                .attr("fill-opacity", 0.8)
+                .attr("stroke", UI_THEME.white)
+                .attr("stroke-width", 0.5))
             // Color is bound to the series key (category) and does not change
             // between absolute and 100% stacked modes.
             .attr("fill", layer => color(layer.key))
-            .attr("fill-opacity", 0.8)
-            .attr("stroke", UI_THEME.white)
-            .attr("stroke-width", 0.5)
-            .attr("d", layer => area(layer.map((d, idx) => {
-                const dataPoint = this.state.normalized
-                    ? { month: xValues[idx] }
-                    : d.data;
-                return [d[0], d[1], dataPoint];
-            })))
-            .append("title")
-            .text((layer, layerIndex, nodes) => {
-                const key = categories[layerIndex] || "series";
-                return this.state.normalized
-                    ? `${key} (100% stacked mode)`
-                    : `${key}`;
-            });
+            .attr("d", layer => area(layerPoints(layer)));
+        this.bindTooltip(scaffold.svg, "path.stacked-area-layer", layerText);
     }
 }
-
@@ -10,6 +10,11 @@ function sunburstLabelVisible(d) {
     return d.y1 <= 3 && d.y0 >= 1 && (d.y1 - d.y0) * (d.x1 - d.x0) > 0.03;
 }
 
+/** Join key of a partition node: the names from the root down to it. */
+function sunburstNodeKey(d) {
+    return d.ancestors().map((node) => node.data.name).reverse().join('\u0000');
+}
+
 function sunburstLabelTransform(d, radius) {
     const x = (d.x0 + d.x1) / 2 * 180 / Math.PI;
     const y = (d.y0 + d.y1) / 2 * radius;
@@ -32,39 +37,62 @@ class SunburstWidget extends BaseWidget {
     }
 
     update() {
-        this.vizWrapper.innerHTML = '';
-        this.chartControllers = [];
-        this.updateBreadcrumbs(['Total']);
+        this.updateBreadcrumbs([SUNBURST_CONSTANTS.BREADCRUMB_ROOT_LABEL]);
 
         const anchorYear = this.state.year;
         const yearsToShow = Utils.calendarYearsForYoYChart(anchorYear, this.state.yoy);
-        const sq = Utils.CHART_LAYOUT.SQUARE_VIEW_SIZE;
+        const panels = this.syncPanels(
+            yearsToShow.map((year) => this.yoyPanelKey(year)),
+            (el) => this.createSunburstPanel(el)
+        );
 
-        yearsToShow.forEach((year) => {
+        this.chartControllers = [];
+        panels.forEach(({ scaffold }, i) => {
+            const year = yearsToShow[i];
             const data = this.getFilteredData(year);
-            const container = document.createElement('div');
-            container.className = 'sub-chart';
 
             const label = Utils.labelForPeriod(this.state.periodType, year, this.state.periodValue);
             const suffix = Utils.formatYoYChartTitleSuffix(this.state.yoy, year, anchorYear);
-
-            container.innerHTML = `<h4 style="display:flex; justify-content:center; align-items:center;">
-                ${label}${suffix}
-            </h4>
-            <div class="sunburst-container" style="height:${sq}px; display:flex; justify-content:center; align-items:center;"></div>`;
-
-            this.vizWrapper.appendChild(container);
+            scaffold.title.textContent = `${label}${suffix}`;
 
             if (data.length === 0) {
-                container.querySelector('.sunburst-container').innerHTML = '<p class="hint">No data available</p>';
+                this.setPanelHint(scaffold, 'No data available');
                 return;
             }
+            this.setPanelHint(scaffold, null);
 
-            const controller = this.drawZoomableSunburst(container.querySelector('.sunburst-container'), data);
-            if (controller) {
-                this.chartControllers.push(controller);
-            }
+            this.chartControllers.push(this.drawZoomableSunburst(scaffold, data, this.cachedHierarchyTree(year, data)));
+        });
+    }
+
+    /** Panel scaffold: arc and label layers plus the centre circle that zooms out. */
+    createSunburstPanel(el) {
+        const size = Utils.CHART_LAYOUT.SQUARE_VIEW_SIZE;
+        const scaffold = this.createChartPanel(el, {
+            mountClass: 'sunburst-container',
+            mountStyle: `height:${size}px; display:flex; justify-content:center; align-items:center;`,
         });
+        scaffold.title.setAttribute('style', 'display:flex; justify-content:center; align-items:center;');
+
+        scaffold.svg
+            .attr('viewBox', [-size / 2, -size / 2, size, size])
+            .style('font', '10px sans-serif');
+        scaffold.arcs = scaffold.svg.append('g').attr('class', 'sunburst-arcs');
+        scaffold.labels = scaffold.svg.append('g')
+            .attr('pointer-events', 'none')
+            .attr('text-anchor', 'middle')
+            .style('user-select', 'none');
+        scaffold.parent = scaffold.svg.append('circle')
+            .attr('r', size / 6)
+            .attr('fill', 'none')
+            .attr('pointer-events', 'all')
+            .on('click', (event, p) => {
+                const targetNode = p.parent || scaffold.root;
+                const pathNames = targetNode.ancestors().reverse().map((node) => node.data.name);
+                this.broadcastZoom(pathNames);
+            });
+        scaffold.root = null;
+        return scaffold;
     }
 
     updateBreadcrumbs(pathNames) {
@@ -93,28 +121,16 @@ class SunburstWidget extends BaseWidget {
 
     /**
      * Build hierarchical tree data from flat rows and mapping configuration.
-     * Pure computation to facilitate table-driven tests.
+     * Pure computation to facilitate table-driven tests; `tree` is a precomputed
+     * Utils.rollupHierarchy of `data` (see BaseWidget.cachedHierarchyTree).
      */
-    buildHierarchy(data) {
+    buildHierarchy(data, tree) {
         const { hierarchy, value } = this.config.mapping;
-
-        const rolls = d3.rollup(
-            data,
-            (v) => d3.sum(v, (d) => +d[value]),
-            ...hierarchy.map((col) => (d) => d[col] || 'N/A')
-        );
-
-        const makeTree = (name, val) => {
-            if (val instanceof Map) return { name, children: Array.from(val, ([n, v]) => makeTree(n, v)) };
-            return { name, value: val };
-        };
-
-        const treeData = makeTree('Total', rolls);
-        return d3.hierarchy(treeData);
+        return d3.hierarchy(tree || Utils.rollupHierarchy(data, hierarchy, value));
     }
 
-    _prepareSunburstPartitionRoot(data) {
-        const root = this.buildHierarchy(data);
+    _prepareSunburstPartitionRoot(data, tree) {
+        const root = this.buildHierarchy(data, tree);
         root.sum((d) => d.value);
         root.sort((a, b) => b.value - a.value);
         const partition = d3.partition().size([2 * Math.PI, root.height + 1]);
@@ -133,66 +149,50 @@ class SunburstWidget extends BaseWidget {
             .outerRadius((d) => Math.max(d.y0 * radius, d.y1 * radius - 1));
     }
 
-    _sunburstAppendPaths(svg, root, arc) {
+    /** Arc paths of `root`, joined by their path of names so a redraw keeps existing arcs. */
+    _sunburstJoinPaths(scaffold, root, arc) {
         const format = Utils.fmtNumber;
         const totalValue = root.value;
 
-        const path = svg.append('g')
+        const path = scaffold.arcs
             .selectAll('path')
-            .data(root.descendants().slice(1))
-            .join('path')
+            .data(root.descendants().slice(1), sunburstNodeKey)
+            .join((enter) => enter.append('path')
+                .attr('stroke', 'white')
+                .attr('stroke-width', '1px'))
+            .attr('data-name', (d) => d.data.name)
+            .attr('data-depth', (d) => d.depth)
             .attr('fill', (d) => this.colorScale(d.data.name))
             .attr('fill-opacity', (d) => (sunburstArcVisible(d.current) ? (d.children ? 0.8 : 0.6) : 0))
             .attr('pointer-events', (d) => (sunburstArcVisible(d.current) ? 'auto' : 'none'))
             .attr('d', (d) => arc(d.current))
-            .attr('stroke', 'white')
-            .attr('stroke-width', '1px');
-
-        path.filter((d) => d.children)
-            .style('cursor', 'pointer')
+            .style('cursor', (d) => (d.children ? 'pointer' : null))
             .on('click', (event, d) => {
+                if (!d.children) return;
                 const pathNames = d.ancestors().reverse().map((node) => node.data.name);
                 this.broadcastZoom(pathNames);
             });
 
-        path.append('title')
-            .text((d) => {
-                const pathStr = d.ancestors().reverse().slice(1).map((n) => n.data.name).join(' > ');
-                const realVal = d.value;
-                const ratioStr = totalValue > 0 ? `${((realVal / totalValue) * 100).toFixed(1)}%` : '0%';
-                return `${pathStr} ${format.format(realVal)} (${ratioStr})`;
-            });
+        this.bindTooltip(scaffold.svg, '.sunburst-arcs path', (d) => {
+            const pathStr = d.ancestors().reverse().slice(1).map((n) => n.data.name).join(' > ');
+            const realVal = d.value;
+            const ratioStr = totalValue > 0 ? `${((realVal / totalValue) * 100).toFixed(1)}%` : '0%';
+            return `${pathStr} ${format.format(realVal)} (${ratioStr})`;
+        });
 
         return path;
     }
 
-    _sunburstAppendLabels(svg, root, radius) {
-        return svg.append('g')
-            .attr('pointer-events', 'none')
-            .attr('text-anchor', 'middle')
-            .style('user-select', 'none')
+    _sunburstJoinLabels(scaffold, root, radius) {
+        return scaffold.labels
             .selectAll('text')
-            .data(root.descendants().slice(1))
-            .join('text')
-            .attr('dy', '0.35em')
+            .data(root.descendants().slice(1), sunburstNodeKey)
+            .join((enter) => enter.append('text').attr('dy', '0.35em'))
             .attr('fill-opacity', (d) => +sunburstLabelVisible(d.current))
             .attr('transform', (d) => sunburstLabelTransform(d.current, radius))
             .text((d) => d.data.name);
     }
 
-    _sunburstAppendCenterParent(svg, root, radius) {
-        return svg.append('circle')
-            .datum(root)
-            .attr('r', radius)
-            .attr('fill', 'none')
-            .attr('pointer-events', 'all')
-            .on('click', (event, p) => {
-                const targetNode = p.parent || root;
-                const pathNames = targetNode.ancestors().reverse().map((node) => node.data.name);
-                this.broadcastZoom(pathNames);
-            });
-    }
-
     _sunburstRunZoomTransition(svg, root, path, label, parent, arc, radius, targetNode) {
         parent.datum(targetNode.parent || root);
 
@@ -241,21 +241,21 @@ class SunburstWidget extends BaseWidget {
         return { node: currentNode, match };
     }
 
-    drawZoomableSunburst(domNode, data) {
-        const width = Utils.CHART_LAYOUT.SQUARE_VIEW_SIZE;
-        const height = Utils.CHART_LAYOUT.SQUARE_VIEW_SIZE;
-        const radius = width / 6;
+    drawZoomableSunburst(scaffold, data, tree) {
+        const radius = Utils.CHART_LAYOUT.SQUARE_VIEW_SIZE / 6;
 
-        const root = this._prepareSunburstPartitionRoot(data);
+        const root = this._prepareSunburstPartitionRoot(data, tree);
         const arc = this._sunburstCreateArc(radius);
 
-        const svg = d3.select(domNode).append('svg')
-            .attr('viewBox', [-width / 2, -height / 2, width, height])
-            .style('font', '10px sans-serif');
+        // A zoom still running would keep tweening the previous hierarchy's nodes.
+        scaffold.arcs.selectAll('path').interrupt();
+        scaffold.labels.selectAll('text').interrupt();
+        scaffold.root = root;
 
-        const path = this._sunburstAppendPaths(svg, root, arc);
-        const label = this._sunburstAppendLabels(svg, root, radius);
-        const parent = this._sunburstAppendCenterParent(svg, root, radius);
+        const { svg, parent } = scaffold;
+        const path = this._sunburstJoinPaths(scaffold, root, arc);
+        const label = this._sunburstJoinLabels(scaffold, root, radius);
+        parent.datum(root);
 
         return (pathNames) => {
             const { node, match } = this._sunburstResolvePathToNode(root, pathNames);
@@ -3,9 +3,9 @@ const TREEMAP_CONSTANTS = {
     PADDING_INNER: 1,
 };
 
-function renderTreemapSubChartShellHtml(label, suffix) {
+function renderTreemapSubChartShellHtml() {
     return `
-                <h4 style="text-align:center; margin: 0 0 10px 0; min-height: 20px; cursor: pointer;" title="Click to zoom out">${label}${suffix}</h4>
+                <h4 style="text-align:center; margin: 0 0 10px 0; min-height: 20px; cursor: pointer;" title="Click to zoom out"></h4>
                 <div class="treemap-container" style="flex: 1; min-height: 0; position:relative; overflow:hidden;"></div>
             `;
 }
@@ -43,43 +43,34 @@ class NestedTreemapWidget extends BaseWidget {
     }
 
     update() {
-        this.vizWrapper.innerHTML = '';
-        this.charts = {};
         this.updateBreadcrumbs(['Total']);
 
         const anchorYear = this.state.year;
         const yearsToShow = Utils.calendarYearsForYoYChart(anchorYear, this.state.yoy);
+        const panels = this.syncPanels(
+            yearsToShow.map((year) => this.yoyPanelKey(year)),
+            (el) => this.createTreemapPanel(el)
+        );
 
-        yearsToShow.forEach((year) => {
+        this.charts = {};
+        panels.forEach(({ scaffold }, i) => {
+            const year = yearsToShow[i];
             const rawData = this.getFilteredData(year);
-            const container = document.createElement('div');
-            container.className = 'sub-chart';
-
-            container.style.flex = '1';
-            container.style.display = 'flex';
-            container.style.flexDirection = 'column';
-            container.style.minWidth = '0';
-            container.style.height = '100%';
 
             const label = Utils.labelForPeriod(this.state.periodType, year, this.state.periodValue);
             const suffix = Utils.formatYoYChartTitleSuffix(this.state.yoy, year, anchorYear);
-
-            container.innerHTML = renderTreemapSubChartShellHtml(label, suffix);
-
-            this.vizWrapper.appendChild(container);
-
-            const domNode = container.querySelector('.treemap-container');
+            scaffold.title.textContent = `${label}${suffix}`;
 
             if (rawData.length === 0) {
-                this.showNoData(domNode);
+                this.showNoData(scaffold);
                 return;
             }
 
-            const fullRoot = this.buildHierarchy(rawData);
+            const fullRoot = this.buildHierarchy(rawData, this.cachedHierarchyTree(year, rawData));
 
             this.charts[year] = {
                 fullRoot,
-                domNode,
+                scaffold,
                 currentPath: ['Total'],
             };
 
@@ -87,29 +78,42 @@ class NestedTreemapWidget extends BaseWidget {
         });
     }
 
-    showNoData(domNode) {
-        domNode.innerHTML =
-            `<div style="height:100%; display:flex; align-items:center; justify-content:center; background:${UI_THEME.emptyStatePanelBg}; color:${UI_THEME.emptyStateMutedText}; font-style:italic;">No data available for this selection</div>`;
+    /** Panel scaffold: title, the clipped svg (cells joined by path) and the empty state. */
+    createTreemapPanel(el) {
+        el.style.flex = '1';
+        el.style.display = 'flex';
+        el.style.flexDirection = 'column';
+        el.style.minWidth = '0';
+        el.style.height = '100%';
+        el.innerHTML = renderTreemapSubChartShellHtml();
+
+        const domNode = el.querySelector('.treemap-container');
+        const empty = document.createElement('div');
+        empty.setAttribute('style',
+            `height:100%; display:none; align-items:center; justify-content:center; background:${UI_THEME.emptyStatePanelBg}; color:${UI_THEME.emptyStateMutedText}; font-style:italic;`);
+        empty.textContent = 'No data available for this selection';
+        domNode.appendChild(empty);
+
+        const L = Utils.CHART_LAYOUT;
+        const uid = `treemap-${Math.random().toString(36).substr(2, 5)}`;
+        const { svg, group } = this._treemapAppendClipSvg(domNode, L.TREEMAP_WIDTH, L.TREEMAP_HEIGHT, uid);
+        return { title: el.querySelector('h4'), domNode, empty, svg, group, uid, cellCount: 0 };
+    }
+
+    /** Empty state: the svg is detached (kept in the scaffold) so the panel holds no cells. */
+    showNoData(scaffold) {
+        scaffold.svg.remove();
+        scaffold.empty.style.display = 'flex';
     }
 
     /**
      * Build hierarchical data for the treemap based on the mapping configuration.
-     * Pure computation to facilitate table-driven testing.
+     * Pure computation to facilitate table-driven testing; `tree` is a precomputed
+     * Utils.rollupHierarchy of `rawData` (see BaseWidget.cachedHierarchyTree).
      */
-    buildHierarchy(rawData) {
+    buildHierarchy(rawData, tree) {
         const { hierarchy: hierarchyCols, value } = this.config.mapping;
-        const rolls = d3.rollup(
-            rawData,
-            (v) => d3.sum(v, (d) => +d[value]),
-            ...hierarchyCols.map((col) => (d) => d[col] || 'N/A')
-        );
-
-        const makeTree = (name, val) => {
-            if (val instanceof Map) return { name, children: Array.from(val, ([n, v]) => makeTree(n, v)) };
-            return { name, value: val };
-        };
-
-        return d3.hierarchy(makeTree('Total', rolls))
+        return d3.hierarchy(tree || Utils.rollupHierarchy(rawData, hierarchyCols, value))
             .sum((d) => d.value)
             .sort((a, b) => b.value - a.value);
     }
@@ -159,14 +163,39 @@ class NestedTreemapWidget extends BaseWidget {
         return { svg, group };
     }
 
-    _treemapAppendCells(group, renderRoot, breadcrumbPath, uid, formatNum) {
-        const cell = group.selectAll('g')
-            .data(renderRoot.descendants())
-            .join('g')
+    /**
+     * Cells of `renderRoot`, joined by their full path of names (breadcrumb + local) so a zoom
+     * or redraw keeps the cells present in both views. Rect and clip ids are set once per cell.
+     */
+    _treemapJoinCells(scaffold, renderRoot, breadcrumbPath, formatNum) {
+        // Stored on the node: the key of a bound cell must not depend on the new breadcrumb.
+        renderRoot.each((d) => {
+            d.cellKey = breadcrumbPath.concat(d.ancestors().reverse().map((n) => n.data.name).slice(1)).join('\u0000');
+        });
+
+        const cell = scaffold.group.selectAll('g.treemap-cell')
+            .data(renderRoot.descendants(), (d) => d.cellKey)
+            .join((enter) => enter.append('g')
+                .attr('class', 'treemap-cell')
+                .each((d, i, nodes) => {
+                    const leafUid = `leaf-${scaffold.uid}-${scaffold.cellCount++}`;
+                    const g = d3.select(nodes[i]);
+                    g.append('rect')
+                        .attr('id', leafUid)
+                        .attr('stroke', UI_THEME.white);
+                    g.append('clipPath')
+                        .attr('id', `clip-${leafUid}`)
+                        .append('use')
+                        .attr('xlink:href', `#${leafUid}`);
+                    g.append('text')
+                        .attr('clip-path', `url(#clip-${leafUid})`)
+                        .attr('x', 4)
+                        .attr('y', 12)
+                        .style('pointer-events', 'none');
+                }))
             .attr('transform', (d) => `translate(${d.x0},${d.y0})`);
 
-        cell.append('rect')
-            .attr('id', (d, i) => (d.leafUid = `leaf-${uid}-${i}`))
+        cell.select('rect')
             .attr('width', (d) => Math.max(0, d.x1 - d.x0))
             .attr('height', (d) => Math.max(0, d.y1 - d.y0))
             .attr('fill', (d) => {
@@ -174,7 +203,6 @@ class NestedTreemapWidget extends BaseWidget {
                 return this.colorScale(d.data.name);
             })
             .attr('fill-opacity', (d) => (d.children ? 0.6 : 0.8))
-            .attr('stroke', UI_THEME.white)
             .style('cursor', (d) => (d.children ? 'pointer' : 'default'))
             .on('click', (e, d) => {
                 if (!d.children) return;
@@ -184,16 +212,7 @@ class NestedTreemapWidget extends BaseWidget {
                 this.broadcastZoom(fullPath);
             });
 
-        cell.append('clipPath')
-            .attr('id', (d) => (d.clipUid = `clip-${d.leafUid}`))
-            .append('use')
-            .attr('xlink:href', (d) => `#${d.leafUid}`);
-
-        cell.append('text')
-            .attr('clip-path', (d) => `url(#${d.clipUid})`)
-            .attr('x', 4)
-            .attr('y', 12)
-            .style('pointer-events', 'none')
+        cell.select('text')
             .selectAll('tspan')
             .data((d) => {
                 if ((d.x1 - d.x0) < 30 || (d.y1 - d.y0) < 15) return [];
@@ -208,35 +227,30 @@ class NestedTreemapWidget extends BaseWidget {
             .style('font-weight', (d, i) => (i === 0 ? 'bold' : 'normal'))
             .text((d) => d);
 
-        cell.append('title')
-            .text((d) => {
-                const total = renderRoot.value;
-                const pct = total > 0 ? ((d.value / total) * 100).toFixed(1) : 0;
-                const prefix = breadcrumbPath.slice(1).join(' > ');
-                const local = d.ancestors().reverse().map((n) => n.data.name).join(' > ');
-                const fullStr = prefix ? `${prefix} > ${local}` : local;
-                return `${fullStr}\nValue: ${formatNum.format(d.value)}\nShare (view): ${pct}%`;
-            });
+        this.bindTooltip(scaffold.svg, '.treemap-cell', (d) => {
+            const total = renderRoot.value;
+            const pct = total > 0 ? ((d.value / total) * 100).toFixed(1) : 0;
+            const prefix = breadcrumbPath.slice(1).join(' > ');
+            const local = d.ancestors().reverse().map((n) => n.data.name).join(' > ');
+            const fullStr = prefix ? `${prefix} > ${local}` : local;
+            return `${fullStr}\nValue: ${formatNum.format(d.value)}\nShare (view): ${pct}%`;
+        });
     }
 
     renderChart(year, sourceNode, breadcrumbPath) {
         const chartInfo = this.charts[year];
         if (!chartInfo) return;
 
-        const { domNode } = chartInfo;
+        const { scaffold } = chartInfo;
         const L = Utils.CHART_LAYOUT;
-        const width = L.TREEMAP_WIDTH;
-        const height = L.TREEMAP_HEIGHT;
-        const uid = `chart-${year}`;
         const formatNum = Utils.fmtNumber;
 
         const renderRoot = this._treemapBuildRenderRoot(sourceNode);
-        domNode.innerHTML = '';
-
-        this._treemapApplyPaddingLayout(renderRoot, width, height);
+        scaffold.empty.style.display = 'none';
+        if (!scaffold.svg.node().parentNode) scaffold.domNode.appendChild(scaffold.svg.node());
 
-        const { group } = this._treemapAppendClipSvg(domNode, width, height, uid);
-        this._treemapAppendCells(group, renderRoot, breadcrumbPath, uid, formatNum);
+        this._treemapApplyPaddingLayout(renderRoot, L.TREEMAP_WIDTH, L.TREEMAP_HEIGHT);
+        this._treemapJoinCells(scaffold, renderRoot, breadcrumbPath, formatNum);
     }
 
     updateBreadcrumbs(pathNames) {
@@ -286,7 +300,7 @@ class NestedTreemapWidget extends BaseWidget {
             if (pathFound) {
                 this.renderChart(year, targetNode, pathNames);
             } else {
-                this.showNoData(chart.domNode);
+                this.showNoData(chart.scaffold);
             }
         });
     }
@@ -14,6 +14,121 @@ const MONTH_LABELS_FR = [
 
 const NUMBER_FORMAT_FR = new Intl.NumberFormat(UTILS_CONSTANTS.NUMBER_LOCALE, { maximumFractionDigits: 0 });
 
+/** Calendar indexes per rows array (see Utils.calendarIndex). */
+const CALENDAR_INDEX_CACHE = new WeakMap();
+
+/**
+ * Year -> month -> row range index over rows carrying numeric `year` / `month`.
+ * Row positions are stored once in `order`, grouped by (year, month); each range keeps the
+ * original row order. Slices (year, period, calendar year) are materialized on first use and
+ * cached, so a selector change costs O(rows in slice) once, then O(1). Rows are treated as
+ * read-only, and so are the returned slices.
+ */
+class CalendarIndex {
+    constructor(rows) {
+        this.rows = rows;
+        const counts = new Map();
+        const undated = [];
+        rows.forEach((d, i) => {
+            if (!d.year) {
+                undated.push(i);
+                return;
+            }
+            let months = counts.get(d.year);
+            if (!months) counts.set(d.year, (months = new Map()));
+            months.set(d.month, (months.get(d.month) || 0) + 1);
+        });
+
+        this.years = Array.from(counts.keys()).sort((a, b) => a - b);
+        this.undated = Uint32Array.from(undated);
+        this.ranges = new Map();
+        const cursors = new Map();
+        let offset = 0;
+        this.years.forEach((year) => {
+            const months = new Map();
+            const yearStart = offset;
+            Array.from(counts.get(year).keys()).sort((a, b) => a - b).forEach((month) => {
+                const end = offset + counts.get(year).get(month);
+                months.set(month, { start: offset, end });
+                cursors.set(`${year}|${month}`, { next: offset });
+                offset = end;
+            });
+            this.ranges.set(year, { start: yearStart, end: offset, months });
+        });
+
+        this.order = new Uint32Array(offset);
+        rows.forEach((d, i) => {
+            if (!d.year) return;
+            this.order[cursors.get(`${d.year}|${d.month}`).next++] = i;
+        });
+        this.slices = new Map();
+    }
+
+    /** Rows at the given positions (ascending positions keep the original row order). */
+    rowsAt(positions) {
+        return Array.from(positions, (i) => this.rows[i]);
+    }
+
+    cached(key, build) {
+        if (!this.slices.has(key)) this.slices.set(key, build());
+        return this.slices.get(key);
+    }
+
+    /** Rows of `year` whose month matches `monthFilter` (every month when omitted). */
+    rowsForMonths(year, key, monthFilter) {
+        return this.cached(`${year}|${key}`, () => {
+            const range = this.ranges.get(year);
+            if (!range) return [];
+            const parts = Array.from(range.months)
+                .filter(([month]) => !monthFilter || monthFilter(month))
+                .map(([, r]) => this.order.subarray(r.start, r.end));
+            if (parts.length === 1) return this.rowsAt(parts[0]);
+            const merged = new Uint32Array(parts.reduce((n, p) => n + p.length, 0));
+            let at = 0;
+            parts.forEach((p) => {
+                merged.set(p, at);
+                at += p.length;
+            });
+            return this.rowsAt(merged.sort());
+        });
+    }
+
+    rowsForYear(year) {
+        return this.rowsForMonths(year, 'annee');
+    }
+
+    /**
+     * Rows of `year` in the selected period (same semantics as BaseWidget.getFilteredData).
+     */
+    rowsForPeriod(year, periodType, periodValue) {
+        switch (periodType) {
+            case 'annee':
+                return this.rowsForYear(year);
+            case 'mois':
+                return this.rowsForMonths(year, `mois|${periodValue}`, (m) => m === periodValue);
+            case 'trimestre':
+                return this.rowsForMonths(year, `trimestre|${periodValue}`, (m) => Utils.getQuarter(m) === periodValue);
+            case 'semestre':
+                return this.rowsForMonths(year, `semestre|${periodValue}`, (m) => Utils.getSemester(m) === periodValue);
+            default:
+                return this.rowsForMonths(year, `${periodType}|none`, () => false);
+        }
+    }
+
+    /** Rows of `year` plus rows without a year, in original order. */
+    rowsForCalendarYear(year) {
+        if (!this.undated.length) return this.rowsForYear(year);
+        return this.cached(`${year}|calendar`, () => {
+            const range = this.ranges.get(year);
+            const dated = range ? this.order.subarray(range.start, range.end) : new Uint32Array(0);
+            const merged = new Uint32Array(dated.length + this.undated.length);
+            merged.set(dated);
+            merged.set(this.undated, dated.length);
+            return this.rowsAt(merged.sort());
+        });
+    }
+}
+
 const Utils = {
     moisFR: MONTH_LABELS_FR,
     fmtNumber: NUMBER_FORMAT_FR,
@@ -68,11 +183,74 @@ const Utils = {
         return row[colName];
     },
 
+    /**
+     * Rows with numeric `year` / `month` for `dateCol`, read from the month index embedded by
+     * generate(parse_dates=True) (`data.monthIndex[dateCol]`: year * 12 + month - 1, 0 when
+     * the date is invalid). Returns null when the dataset has no index for that column.
+     * The first indexed column of a dataset annotates its row objects in place (no copy) and is
+     * recorded as `data.calendarColumn`; other columns, or CSVs with their own year / month
+     * columns, get shallow copies with their own year / month (see BaseWidget.processData). Results
+     * are cached on the dataset, so widgets sharing it share one array (treat as read-only).
+     */
+    rowsFromMonthIndex(data, dateCol) {
+        const codes = dateCol && data.monthIndex && data.monthIndex[dateCol];
+        if (!codes) return null;
+        if (!data.calendarRows) data.calendarRows = new Map();
+        if (data.calendarRows.has(dateCol)) return data.calendarRows.get(dateCol);
+
+        const columns = data.columns || [];
+        const inPlace = !data.calendarColumn && !columns.includes('year') && !columns.includes('month');
+        if (inPlace) data.calendarColumn = dateCol;
+
+        const rows = [];
+        for (let i = 0; i < data.length; i++) {
+            const code = codes[i];
+            if (!code) continue;
+            const row = inPlace ? data[i] : { ...data[i] };
+            row.year = Math.floor(code / 12);
+            row.month = (code % 12) + 1;
+            rows.push(row);
+        }
+        data.calendarRows.set(dateCol, rows);
+        return rows;
+    },
+
+    /**
+     * Shared CalendarIndex of a rows array, built on first use.
+     */
+    calendarIndex(rows) {
+        let index = CALENDAR_INDEX_CACHE.get(rows);
+        if (!index) {
+            index = new CalendarIndex(rows);
+            CALENDAR_INDEX_CACHE.set(rows, index);
+        }
+        return index;
+    },
+
+    /**
+     * Plain `{ name, children }` / `{ name, value }` tree summing `valueCol` over the
+     * `hierarchyCols` levels (missing labels become 'N/A'), rooted at 'Total'. Shared by the
+     * treemap and sunburst widgets, which build their d3.hierarchy from it.
+     */
+    rollupHierarchy(rows, hierarchyCols, valueCol) {
+        const rolls = d3.rollup(
+            rows,
+            (v) => d3.sum(v, (d) => +d[valueCol]),
+            ...hierarchyCols.map((col) => (d) => d[col] || 'N/A')
+        );
+
+        const makeTree = (name, val) => {
+            if (val instanceof Map) return { name, children: Array.from(val, ([n, v]) => makeTree(n, v)) };
+            return { name, value: val };
+        };
+        return makeTree('Total', rolls);
+    },
+
     /**
      * Rows must include numeric `year` from BaseWidget.processData.
      */
     extractRowsForCalendarYear(rows, year) {
-        return rows.filter((d) => !d.year || d.year === year);
+        return Utils.calendarIndex(rows).rowsForCalendarYear(year);
     },
 
     /**
@@ -95,3 +273,171 @@ const Utils = {
         return plotYear === anchorYear ? YEAR_COMPARE_LABELS.N_SUFFIX : YEAR_COMPARE_LABELS.N1_SUFFIX;
     },
 };
+
+/**
+ * Page-level memo of widget aggregations (rollups, stacked series, chord matrices...), shared
+ * by every widget: two widgets reading the same columns of one dataset for the same period
+ * compute it once, and switching back to a recently viewed period is a lookup. Keys are
+ * compared as JSON; the least recently used entry is evicted past `maxEntries` (0 disables
+ * caching). Cached values are shared, so callers must treat them as read-only.
+ */
+const AGGREGATION_CACHE_DEFAULT_SIZE = 64;
+
+class AggregationCache {
+    constructor(maxEntries = AGGREGATION_CACHE_DEFAULT_SIZE) {
+        this.maxEntries = maxEntries;
+        this.entries = new Map();
+        this.hits = 0;
+        this.misses = 0;
+        this.evictions = 0;
+    }
+
+    /** Cached value for `keyParts`, or `compute()` stored under it. */
+    get(keyParts, compute) {
+        const key = JSON.stringify(keyParts);
+        if (this.entries.has(key)) {
+            const value = this.entries.get(key);
+            // Re-insert so Map iteration order stays least- to most-recently used.
+            this.entries.delete(key);
+            this.entries.set(key, value);
+            this.hits += 1;
+            return value;
+        }
+        this.misses += 1;
+        const value = compute();
+        if (this.maxEntries > 0) {
+            this.entries.set(key, value);
+            this.trim();
+        }
+        return value;
+    }
+
+    resize(maxEntries) {
+        this.maxEntries = Math.max(0, maxEntries);
+        this.trim();
+    }
+
+    trim() {
+        while (this.entries.size > this.maxEntries) {
+            this.entries.delete(this.entries.keys().next().value);
+            this.evictions += 1;
+        }
+    }
+
+    clear() {
+        this.entries.clear();
+    }
+
+    stats() {
+        const lookups = this.hits + this.misses;
+        return {
+            hits: this.hits,
+            misses: this.misses,
+            evictions: this.evictions,
+            size: this.entries.size,
+            maxEntries: this.maxEntries,
+            hitRate: lookups ? this.hits / lookups : 0,
+        };
+    }
+}
+
+const AGGREGATION_CACHE = new AggregationCache();
+
+/**
+ * User Timing hooks read by benchmarks/bench_browser.py: with `?perf` in the page URL, every
+ * measure is named `dashboard:<stage>:<tag>` and carries `detail = { stage, tag, ... }`, so a
+ * harness (or the DevTools performance panel) can collect them with
+ * performance.getEntriesByType('measure'). Without it no entry is added to the performance
+ * timeline, which the page never clears.
+ *
+ * Each measure is also aggregated in place (exposed as window.__DASHBOARD_PERF__): `stages`
+ * and `widgets` hold `{ count, totalMs, maxMs, lastMs }` per stage, `entries` the most recent
+ * raw measures. `summary()` returns all of it (plus AGGREGATION_CACHE stats) as JSON-ready
+ * data for a field report.
+ */
+const DASHBOARD_PERF_MAX_ENTRIES = 500;
+
+function addPerfStat(stats, key, duration) {
+    const stat = stats[key] || (stats[key] = { count: 0, totalMs: 0, maxMs: 0, lastMs: 0 });
+    stat.count += 1;
+    stat.totalMs += duration;
+    stat.maxMs = Math.max(stat.maxMs, duration);
+    stat.lastMs = duration;
+}
+
+const DashboardPerf = {
+    PREFIX: 'dashboard:',
+    enabled: typeof performance !== 'undefined' && typeof performance.measure === 'function',
+    // Same URL parameter as APP_CONSTANTS.PERF_URL_PARAM (main.js loads after this file).
+    userTiming: typeof location !== 'undefined' && new URLSearchParams(location.search).has('perf'),
+    entries: [],
+    stages: {},
+    // `<type>#<index>` -> { type, index, stages: { <stage> | control:<control>: stat } }
+    widgets: {},
+    listeners: [],
+
+    /** Run `fn` and record its duration (also when it throws). */
+    time(stage, tag, fn, detail) {
+        if (!this.enabled) return fn();
+        const start = performance.now();
+        try {
+            return fn();
+        } finally {
+            this.record(stage, tag, start, detail);
+        }
+    },
+
+    /** Await `fn()` and record its duration. */
+    async timeAsync(stage, tag, fn, detail) {
+        if (!this.enabled) return fn();
+        const start = performance.now();
+        try {
+            return await fn();
+        } finally {
+            this.record(stage, tag, start, detail);
+        }
+    },
+
+    record(stage, tag, start, detail) {
+        const end = performance.now();
+        if (this.userTiming) {
+            performance.measure(`${this.PREFIX}${stage}:${tag}`, { start, end, detail: { stage, tag, ...detail } });
+        }
+        this.aggregate({ stage, tag, start, duration: end - start, ...detail });
+    },
+
+    aggregate(entry) {
+        this.entries.push(entry);
+        if (this.entries.length > DASHBOARD_PERF_MAX_ENTRIES) this.entries.shift();
+        addPerfStat(this.stages, entry.stage, entry.duration);
+        if (entry.type !== undefined) {
+            const key = `${entry.type}#${entry.index ?? ''}`;
+            const widget = this.widgets[key] || (this.widgets[key] = { type: entry.type, index: entry.index, stages: {} });
+            addPerfStat(widget.stages, entry.control ? `control:${entry.control}` : entry.stage, entry.duration);
+        }
+        this.listeners.forEach((listener) => listener(entry));
+    },
+
+    /** Call `listener(entry)` after every recorded measure. */
+    subscribe(listener) {
+        this.listeners.push(listener);
+    },
+
+    summary() {
+        return {
+            userAgent: navigator.userAgent,
+            hardwareConcurrency: navigator.hardwareConcurrency ?? null,
+            deviceMemory: navigator.deviceMemory ?? null,
+            stages: this.stages,
+            widgets: this.widgets,
+            aggregationCache: AGGREGATION_CACHE.stats(),
+            entries: this.entries,
+        };
+    },
+};
+
+window.CalendarIndex = CalendarIndex;
+window.AggregationCache = AggregationCache;
+window.AGGREGATION_CACHE = AGGREGATION_CACHE;
+window.DashboardPerf = DashboardPerf;
+window.__DASHBOARD_PERF__ = DashboardPerf;
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Process-wide cache for generator assets, assembled JS bundles and Jinja templates.
+
+Every entry remembers the modification stamp of the files it was built from and is
+rebuilt as soon as one of them changes on disk, so editing an asset during development
+never serves stale content. Hit / miss counters are kept per cache kind.
+"""
+from __future__ import unicode_literals
+
+import io
+import os
+import threading
+
+CACHE_KINDS = ("assets", "bundles", "templates", "environments")
+
+
+def _file_stamp(path):
+    """Cheap change detector for a file: (mtime, size)."""
+    st = os.stat(path)
+    return (getattr(st, "st_mtime_ns", st.st_mtime), st.st_size)
+
+
+class AssetCache(object):
+    """Thread-safe cache shared by every ``DashboardGenerator`` of the process."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._assets = {}
+        self._bundles = {}
+        self._templates = {}
+        self._environments = {}
+        self._counters = {}
+        self.clear()
+
+    def clear(self):
+        """Drop every cached entry and reset the counters."""
+        with self._lock:
+            self._assets.clear()
+            self._bundles.clear()
+            self._templates.clear()
+            self._environments.clear()
+            self._counters = dict((kind, {"hits": 0, "misses": 0}) for kind in CACHE_KINDS)
+
+    def stats(self):
+        """Return a copy of the hit / miss counters, e.g. ``{"assets": {"hits": 3, "misses": 1}, ...}``."""
+        with self._lock:
+            return dict((kind, dict(c)) for kind, c in self._counters.items())
+
+    def _count(self, kind, hit):
+        self._counters[kind]["hits" if hit else "misses"] += 1
+
+    def read_text(self, path):
+        """Return the UTF-8 content of ``path``, re-reading it only when it changed."""
+        stamp = _file_stamp(path)
+        with self._lock:
+            cached = self._assets.get(path)
+            if cached is not None and cached[0] == stamp:
+                self._count("assets", True)
+                return cached[1]
+            with io.open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            self._assets[path] = (stamp, content)
+            self._count("assets", False)
+            return content
+
+    def get_bundle(self, key, paths, build):
+        """Return the bundle cached under ``key``; ``build()`` runs when missing or stale.
+
+        :param key: hashable bundle identity.
+        :param paths: files the bundle is assembled from (checked for changes on each call).
+        :param build: zero-argument callable returning the bundle text.
+        """
+        stamps = tuple(_file_stamp(p) for p in paths)
+        with self._lock:
+            cached = self._bundles.get(key)
+            if cached is not None and cached[0] == stamps:
+                self._count("bundles", True)
+                return cached[1]
+            content = build()
+            self._bundles[key] = (stamps, content)
+            self._count("bundles", False)
+            return content
+
+    def get_environment(self, assets_path, factory):
+        """Return the Jinja environment for ``assets_path`` (one per directory and process)."""
+        with self._lock:
+            env = self._environments.get(assets_path)
+            self._count("environments", env is not None)
+            if env is None:
+                env = factory()
+                self._environments[assets_path] = env
+            return env
+
+    def get_template(self, env, assets_path, name):
+        """Return the compiled template ``name``, recompiling it when the file changed."""
+        stamp = _file_stamp(os.path.join(assets_path, name))
+        key = (assets_path, name)
+        with self._lock:
+            cached = self._templates.get(key)
+            if cached is not None and cached[0] == stamp:
+                self._count("templates", True)
+                return cached[1]
+            template = env.get_template(name)
+            self._templates[key] = (stamp, template)
+            self._count("templates", False)
+            return template
+
+
+SHARED_ASSET_CACHE = AssetCache()
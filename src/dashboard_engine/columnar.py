@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""``columnar-v1`` dataset encoding: typed numeric columns + dictionary-coded text columns.
+
+Layout (little-endian, gzip-compressed then base64-encoded in the page)::
+
+    b"DCOL" | uint32 header length | UTF-8 JSON header | zero padding to 8 bytes
+    data section: column buffers, each zero-padded to a multiple of 8 bytes
+
+The JSON header is ``{"version": 1, "rows": n, "columns": [...]}``; each column entry holds
+``name``, ``kind`` (``"float64"``, ``"int32"`` or ``"dict"``), ``offset`` (from the start of
+the data section) / ``length`` of its buffer in bytes and, for ``"dict"`` columns,
+``codeType`` (``"uint8"``, ``"uint16"``, ``"uint32"``) and the ``dictionary`` string table. main.js decodes it back to the row objects
+``d3.csvParse`` would produce, except that numeric columns hold numbers instead of their
+text (widgets coerce with ``+d[col]`` anyway). Only the columns the caller names as numeric
+(mapping ``value`` / ``x`` / ``y`` / ``r``) can become numeric; every other column stays
+dictionary-coded text, so identifiers such as ``"007"`` or ``"0x1F"`` keep their exact text.
+"""
+from __future__ import unicode_literals
+
+import array
+import json
+import math
+import struct
+import sys
+
+from .datasets import iter_gzip_base64_chunks
+from .transforms import iter_csv_records, js_number
+
+COLUMNAR_V1_MAGIC = b"DCOL"
+COLUMNAR_V1_VERSION = 1
+COLUMNAR_ALIGNMENT = 8
+
+# Numeric columns with at most this many distinct values stay dictionary-coded as well:
+# one-byte codes plus a short string table are smaller than a typed array.
+COLUMNAR_NUMERIC_MIN_DISTINCT = 256
+
+_INT32_MIN, _INT32_MAX = -(1 << 31), (1 << 31) - 1
+_CODE_TYPES = (("uint8", "B", 1 << 8), ("uint16", "H", 1 << 16), ("uint32", "I", 1 << 32))
+
+
+class _ColumnBuilder(object):
+    """Accumulates one CSV column as dictionary codes and, for numeric columns, as numbers."""
+
+    def __init__(self, name, numeric=False):
+        self.name = name
+        self.dictionary = {}
+        self.codes = array.array("I")
+        self.numbers = array.array("d") if numeric else None
+        self.numeric = numeric
+        self.integral = True
+
+    def add(self, text):
+        code = self.dictionary.get(text)
+        if code is None:
+            code = self.dictionary[text] = len(self.dictionary)
+        self.codes.append(code)
+        if self.numeric:
+            number = js_number(text)
+            # Empty cells would read back as 0 instead of "": keep such columns as text.
+            if not text.strip() or math.isnan(number) or math.isinf(number):
+                self.numeric = False
+                self.numbers = None
+                return
+            self.numbers.append(number)
+            if self.integral and not (number == int(number) and _INT32_MIN <= number <= _INT32_MAX):
+                self.integral = False
+
+    def encode(self):
+        """Return ``(header_entry, payload_bytes)``; the caller adds ``offset`` / ``length``."""
+        if self.numeric and len(self.dictionary) > COLUMNAR_NUMERIC_MIN_DISTINCT:
+            if self.integral:
+                values = array.array("i")
+                values.extend(int(n) for n in self.numbers)
+                return {"name": self.name, "kind": "int32"}, _le_bytes(values)
+            return {"name": self.name, "kind": "float64"}, _le_bytes(self.numbers)
+
+        for code_type, typecode, limit in _CODE_TYPES:
+            if len(self.dictionary) <= limit:
+                break
+        codes = self.codes if typecode == "I" else array.array(typecode, self.codes)
+        table = [None] * len(self.dictionary)
+        for text, code in self.dictionary.items():
+            table[code] = text
+        entry = {"name": self.name, "kind": "dict", "codeType": code_type, "dictionary": table}
+        return entry, _le_bytes(codes)
+
+
+def _le_bytes(values):
+    """Raw little-endian bytes of an ``array.array``."""
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes() if hasattr(values, "tobytes") else values.tostring()
+
+
+def _padding(size):
+    return b"\0" * (-size % COLUMNAR_ALIGNMENT)
+
+
+def iter_columnar_v1_bytes(dataset, numeric_columns=()):
+    """Encode a dataset (CSV string or streaming source) as ``columnar-v1`` byte chunks.
+
+    The CSV is read in one streaming pass; only the per-column codes / numbers are kept.
+
+    :param numeric_columns: columns widgets read as numbers; only these may be typed arrays.
+    """
+    header, rows = iter_csv_records(dataset)
+    builders = [_ColumnBuilder(name, name in numeric_columns) for name in (header or [])]
+    width = len(builders)
+    n_rows = 0
+    for row in rows:
+        # d3.csvParse fills missing fields with "" and ignores extra ones.
+        for i in range(width):
+            builders[i].add(row[i] if i < len(row) else "")
+        n_rows += 1
+
+    encoded = [b.encode() for b in builders]
+    offset = 0
+    for entry, payload in encoded:
+        entry["offset"] = offset
+        entry["length"] = len(payload)
+        offset += len(payload) + len(_padding(len(payload)))
+    header_json = json.dumps(
+        {"version": COLUMNAR_V1_VERSION, "rows": n_rows, "columns": [e for e, _ in encoded]},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+    preamble = COLUMNAR_V1_MAGIC + struct.pack("<I", len(header_json)) + header_json
+    yield preamble + _padding(len(preamble))
+    for _, payload in encoded:
+        yield payload + _padding(len(payload))
+
+
+def iter_columnar_v1_base64(dataset, numeric_columns=()):
+    """``columnar-v1`` bytes, gzip-compressed and base64-encoded chunk by chunk."""
+    return iter_gzip_base64_chunks(iter_columnar_v1_bytes(dataset, numeric_columns))
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""Per-dashboard D3 subset: which d3 sub-packages each inlined JS file needs.
+
+The JS bundle imports only the sub-packages of the files it contains (bare specifiers such as
+``"d3-scale"``) and merges them into the ``d3`` namespace the widgets use. The page import map
+resolves those specifiers to jsDelivr, or to the vendored copies in ``assets/vendor/d3/`` with
+``generate(offline=True)``.
+"""
+from __future__ import unicode_literals
+
+# Versions shipped with d3 7.9. d3-selection must stay on the version d3-transition resolves on
+# the CDN: transitions patch that module's ``selection.prototype``
+# (tests/test_d3_module_loading_e2e.py runs a sunburst transition against both import maps).
+D3_PACKAGE_VERSIONS = {
+    "d3-array": "3.2.4",
+    "d3-axis": "3.0.0",
+    "d3-brush": "3.0.0",
+    "d3-chord": "3.0.1",
+    "d3-color": "3.1.0",
+    "d3-dispatch": "3.0.1",
+    "d3-drag": "3.0.0",
+    "d3-dsv": "3.0.1",
+    "d3-ease": "3.0.1",
+    "d3-format": "3.1.0",
+    "d3-hierarchy": "3.1.2",
+    "d3-interpolate": "3.0.1",
+    "d3-path": "3.1.0",
+    "d3-quadtree": "3.0.1",
+    "d3-scale": "4.0.2",
+    "d3-scale-chromatic": "3.1.0",
+    "d3-selection": "3.0.0",
+    "d3-shape": "3.2.0",
+    "d3-time": "3.1.0",
+    "d3-time-format": "4.1.0",
+    "d3-timer": "3.0.1",
+    "d3-transition": "3.0.1",
+    "internmap": "2.0.3",
+}
+
+# Direct imports of each package (vendored copies keep them as bare specifiers).
+D3_PACKAGE_DEPENDENCIES = {
+    "d3-array": ("internmap",),
+    "d3-brush": ("d3-dispatch", "d3-drag", "d3-interpolate", "d3-selection", "d3-transition"),
+    "d3-chord": ("d3-path",),
+    "d3-drag": ("d3-dispatch", "d3-selection"),
+    "d3-interpolate": ("d3-color",),
+    "d3-scale": ("d3-array", "d3-format", "d3-interpolate", "d3-time", "d3-time-format"),
+    "d3-scale-chromatic": ("d3-color", "d3-interpolate"),
+    "d3-shape": ("d3-path",),
+    "d3-time": ("d3-array",),
+    "d3-time-format": ("d3-time",),
+    "d3-transition": (
+        "d3-color",
+        "d3-dispatch",
+        "d3-ease",
+        "d3-interpolate",
+        "d3-selection",
+        "d3-timer",
+    ),
+}
+
+# d3 sub-packages used through ``d3.*`` by each JS asset (kept in sync with the JS sources;
+# tests/test_d3_packages.py checks every ``d3.<name>`` reference against this table).
+JS_FILE_D3_PACKAGES = {
+    "js/utils.js": ("d3-array",),
+    "js/base_widget.js": ("d3-selection",),
+    "js/dataset_worker.js": (),
+    "js/main.js": ("d3-dsv", "d3-scale-chromatic"),
+    "js/bubble_widget.js": ("d3-array", "d3-axis", "d3-brush", "d3-quadtree", "d3-scale", "d3-selection"),
+    "js/directed_chord_widget.js": ("d3-array", "d3-chord", "d3-scale", "d3-selection", "d3-shape"),
+    "js/evolution_widget.js": ("d3-array", "d3-axis", "d3-scale", "d3-selection", "d3-shape"),
+    "js/financial_sankey_widget.js": ("d3-array", "d3-selection"),
+    "js/heatmap_widget.js": ("d3-array", "d3-axis", "d3-scale", "d3-selection"),
+    "js/horizon_widget.js": (
+        "d3-array",
+        "d3-axis",
+        "d3-interpolate",
+        "d3-scale",
+        "d3-selection",
+        "d3-shape",
+    ),
+    "js/radial_area_widget.js": ("d3-array", "d3-scale", "d3-selection", "d3-shape", "d3-time-format"),
+    "js/ribbon_chart_widget.js": ("d3-array", "d3-axis", "d3-scale", "d3-selection", "d3-shape"),
+    "js/sankey_widget.js": ("d3-scale", "d3-selection"),
+    "js/stacked_area_widget.js": ("d3-array", "d3-axis", "d3-scale", "d3-selection", "d3-shape"),
+    # selection.transition() comes from d3-transition.
+    "js/sunburst_widget.js": (
+        "d3-array",
+        "d3-hierarchy",
+        "d3-interpolate",
+        "d3-scale",
+        "d3-selection",
+        "d3-shape",
+        "d3-transition",
+    ),
+    "js/treemap_widget.js": ("d3-array", "d3-hierarchy", "d3-scale", "d3-selection"),
+}
+
+D3_CDN_URL_TEMPLATE = "https://cdn.jsdelivr.net/npm/{name}@{version}/+esm"
+D3_VENDOR_PATH_TEMPLATE = "vendor/d3/{name}.min.js"
+
+
+def d3_packages_for(js_files):
+    """Sorted d3 sub-packages imported by a bundle made of ``js_files``."""
+    packages = set()
+    for js_file in js_files:
+        if js_file not in JS_FILE_D3_PACKAGES:
+            raise KeyError("No d3 package list for JS asset {!r} (see JS_FILE_D3_PACKAGES)".format(js_file))
+        packages.update(JS_FILE_D3_PACKAGES[js_file])
+    return sorted(packages)
+
+
+def with_d3_dependencies(packages):
+    """Sorted closure of ``packages`` over :data:`D3_PACKAGE_DEPENDENCIES`."""
+    closure = set()
+    pending = list(packages)
+    while pending:
+        name = pending.pop()
+        if name not in closure:
+            closure.add(name)
+            pending.extend(D3_PACKAGE_DEPENDENCIES.get(name, ()))
+    return sorted(closure)
+
+
+def d3_cdn_url(name):
+    return D3_CDN_URL_TEMPLATE.format(name=name, version=D3_PACKAGE_VERSIONS[name])
+
+
+def d3_vendor_path(name):
+    return D3_VENDOR_PATH_TEMPLATE.format(name=name)
+
+
+def _module_alias(name):
+    """``"d3-scale-chromatic"`` -> ``"d3ScaleChromatic"``."""
+    head, _, rest = name.partition("-")
+    return head + "".join(part.capitalize() for part in rest.split("-") if part)
+
+
+def d3_import_block(packages):
+    """ES module prelude importing ``packages`` and merging them into a ``d3`` namespace."""
+    aliases = [_module_alias(name) for name in packages]
+    lines = [
+        'import * as {} from "{}";\n'.format(alias, name) for alias, name in zip(aliases, packages)
+    ]
+    lines.append("const d3 = Object.assign({}" + "".join(", " + alias for alias in aliases) + ");\n")
+    return "".join(lines)
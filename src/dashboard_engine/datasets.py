@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""Streaming dataset sources for the generator.
+
+Besides in-memory CSV strings, ``datasets_list`` entries may be file paths (``os.PathLike``,
+read through ``mmap``), binary file objects, or iterables of CSV chunks (``str`` or UTF-8
+``bytes``). Those sources are read lazily, chunk by chunk, while the template renders: the
+full dataset is never materialised, neither as raw bytes nor as gzip / base64 output.
+"""
+from __future__ import unicode_literals
+
+import base64
+import codecs
+import io
+import mmap
+import os
+import zlib
+
+try:  # pragma: no cover - trivial compatibility shim
+    basestring  # type: ignore[name-defined]
+except NameError:  # Python 3
+    basestring = str  # type: ignore[assignment]
+
+# Bytes read per step from files / file objects.
+DATASET_READ_CHUNK_BYTES = 1 << 20
+
+# Same level as the in-memory gzip path (generator._gzip_compress_bytes).
+GZIP_COMPRESS_LEVEL = 9
+
+# zlib window bits producing a gzip container (header + CRC32 trailer) instead of raw zlib.
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+_BINARY_TYPES = (bytes, bytearray)
+
+
+def is_dataset_path(dataset):
+    """True for ``os.PathLike`` objects (plain ``str`` entries are always CSV text)."""
+    return hasattr(dataset, "__fspath__")
+
+
+def is_dataset_fileobj(dataset):
+    """True for readable file-like objects."""
+    return callable(getattr(dataset, "read", None))
+
+
+def is_dataset_stream(dataset):
+    """True when ``dataset`` must be consumed chunk by chunk (path, file object or iterable)."""
+    if isinstance(dataset, basestring) or isinstance(dataset, _BINARY_TYPES):
+        return False
+    if is_dataset_path(dataset) or is_dataset_fileobj(dataset):
+        return True
+    return hasattr(dataset, "__iter__")
+
+
+def dataset_path(dataset):
+    """Return the filesystem path of an ``os.PathLike`` dataset as ``str``."""
+    return dataset.__fspath__()
+
+
+def _iter_mmap_bytes(path, chunk_size):
+    with io.open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return  # mmap cannot map an empty file
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for start in range(0, size, chunk_size):
+                yield mapped[start:start + chunk_size]
+        finally:
+            mapped.close()
+
+
+def _iter_fileobj_bytes(fileobj, chunk_size):
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            return
+        if isinstance(chunk, basestring):
+            chunk = chunk.encode("utf-8")
+        yield bytes(chunk)
+
+
+def _iter_chunk_bytes(chunks):
+    for idx, chunk in enumerate(chunks):
+        if isinstance(chunk, _BINARY_TYPES):
+            yield bytes(chunk)
+        elif isinstance(chunk, basestring):
+            yield chunk.encode("utf-8")
+        else:
+            raise TypeError(
+                "CSV chunk #{0} must be str or bytes, not {1}".format(idx, type(chunk).__name__)
+            )
+
+
+def iter_dataset_bytes(dataset, chunk_size=None):
+    """Yield the UTF-8 bytes of a streaming dataset in bounded chunks."""
+    if chunk_size is None:
+        chunk_size = DATASET_READ_CHUNK_BYTES
+    if is_dataset_path(dataset):
+        return _iter_mmap_bytes(dataset_path(dataset), chunk_size)
+    if is_dataset_fileobj(dataset):
+        return _iter_fileobj_bytes(dataset, chunk_size)
+    return _iter_chunk_bytes(dataset)
+
+
+def iter_utf8_text(byte_chunks):
+    """Decode UTF-8 byte chunks incrementally (multi-byte characters may span chunks)."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in byte_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_dataset_text(dataset, chunk_size=None):
+    """Yield a streaming dataset as decoded CSV text chunks."""
+    return iter_utf8_text(iter_dataset_bytes(dataset, chunk_size))
+
+
+class Base64ChunkEncoder(object):
+    """Incremental base64: emits text for whole 3-byte groups and keeps the remainder."""
+
+    def __init__(self):
+        self._pending = b""
+
+    def encode(self, data):
+        if self._pending:
+            data = self._pending + data
+        cut = len(data) - len(data) % 3
+        self._pending = data[cut:]
+        return _b64_text(data[:cut])
+
+    def flush(self):
+        out = _b64_text(self._pending)
+        self._pending = b""
+        return out
+
+
+def _b64_text(data):
+    if not data:
+        return ""
+    return base64.b64encode(data).decode("ascii")
+
+
+def iter_gzip_base64_chunks(byte_chunks, compresslevel=GZIP_COMPRESS_LEVEL):
+    """Gzip then base64-encode byte chunks incrementally (``zlib.compressobj`` pipeline).
+
+    The concatenated output is a valid gzip stream encoded as a single base64 string.
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, _GZIP_WBITS)
+    encoder = Base64ChunkEncoder()
+    for chunk in byte_chunks:
+        text = encoder.encode(compressor.compress(chunk))
+        if text:
+            yield text
+    text = encoder.encode(compressor.flush()) + encoder.flush()
+    if text:
+        yield text
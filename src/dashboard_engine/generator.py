@@ -2,14 +2,63 @@
 from __future__ import unicode_literals
 
 import base64
+import functools
 import gzip
 import io
 import json
+import multiprocessing
 import os
+import sys
+import time
+import uuid
+import warnings
 from datetime import datetime
 
 import jinja2
 
+try:  # pragma: no cover - Python 2.7 needs the "futures" backport
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:  # pragma: no cover
+    ProcessPoolExecutor = None
+
+from .cache import SHARED_ASSET_CACHE
+from .columnar import iter_columnar_v1_base64
+from .d3_packages import (
+    d3_cdn_url,
+    d3_import_block,
+    d3_packages_for,
+    d3_vendor_path,
+    with_d3_dependencies,
+)
+from .datasets import (
+    dataset_path,
+    is_dataset_path,
+    is_dataset_stream,
+    iter_dataset_bytes,
+    iter_dataset_text,
+    iter_gzip_base64_chunks,
+)
+from .markdown_html import render_widget_descriptions
+from .script_escape import iter_script_safe_chunks, script_safe_json
+from .stats import (
+    NULL_STATS,
+    PHASE_ASSETS,
+    PHASE_DATASET_NORMALIZATION,
+    PHASE_DATASET_TRANSFORMS,
+    PHASE_JS_BUNDLE,
+    PHASE_RENDER,
+    PHASE_VALIDATION,
+    GenerationStats,
+    resolve_stats,
+)
+from .transforms import (
+    month_index_columns,
+    numeric_columns_by_dataset,
+    preaggregate_datasets,
+    prune_dataset_columns,
+    referenced_date_columns_by_dataset,
+)
+
 # Cross-version string base type (Python 2.7 / 3.x)
 try:  # pragma: no cover - trivial compatibility shim
     basestring  # type: ignore[name-defined]
@@ -23,6 +72,10 @@ JS_MANDATORY_PATHS = (
 )
 JS_MAIN_PATH = "js/main.js"
 
+# Dataset decoding worker, inlined when the config sets ``decode_in_worker`` (see generate()).
+JS_DATASET_WORKER_PATH = "js/dataset_worker.js"
+CONFIG_DECODE_IN_WORKER_KEY = "decode_in_worker"
+
 # One widget implementation file per dashboard widget type (kept in sync with main.js WidgetRegistry).
 WIDGET_TYPE_TO_JS_FILE = {
     "sankey": "js/sankey_widget.js",
@@ -41,22 +94,40 @@ WIDGET_TYPE_TO_JS_FILE = {
 
 WIDGET_TYPES_USING_D3_SANKEY = frozenset({"sankey", "financial_sankey"})
 
-D3_CDN_IMPORT = 'import * as d3 from "https://cdn.jsdelivr.net/npm/d3@7/+esm";\n'
+D3_SANKEY_CDN_URL = "https://cdn.jsdelivr.net/npm/d3-sankey@0.12/+esm"
+
 D3_SANKEY_CDN_IMPORT = (
-    'import { sankey, sankeyLinkHorizontal, sankeyJustify, sankeyLeft } '
-    'from "https://cdn.jsdelivr.net/npm/d3-sankey@0.12/+esm";\n'
+    'import {{ sankey, sankeyLinkHorizontal, sankeyJustify, sankeyLeft }} '
+    'from "{}";\n'.format(D3_SANKEY_CDN_URL)
 )
 
+# generate(offline=True): self-contained minified ESM build of d3-sankey (no imports of its own)
+# mapped over its CDN URL by the import map. Vendored d3 sub-packages live in assets/vendor/d3/
+# (see d3_packages.py).
+VENDOR_D3_SANKEY_MODULE = (D3_SANKEY_CDN_URL, "vendor/d3-sankey.min.js")
+
 # Encoding marker stored on <script> and read by main.js (dataset API uses data-csv-encoding).
 CSV_ENCODING_GZIP_BASE64 = "gzip-base64"
+CSV_ENCODING_COLUMNAR_V1 = "columnar-v1"
+
+# Values of generate(dataset_format=...): CSV text (optionally gzip'd) or the binary columnar layout.
+DATASET_FORMAT_CSV = "csv"
+DATASET_FORMAT_COLUMNAR_V1 = CSV_ENCODING_COLUMNAR_V1
+DATASET_FORMATS = (DATASET_FORMAT_CSV, DATASET_FORMAT_COLUMNAR_V1)
+
+# Dataset payloads are emitted by the template in slices of this many characters, so streamed
+# renders never hold a second full-size copy of a large CSV.
+DATASET_PAYLOAD_CHUNK_CHARS = 1 << 20
 
 
 def _gzip_compress_bytes(data_bytes):
-    """Compress bytes with gzip (stdlib only); supports Python 2.7 (no gzip.compress)."""
-    if hasattr(gzip, "compress"):
-        return gzip.compress(data_bytes, compresslevel=9)
+    """Compress bytes with gzip (stdlib only, Python 2.7 too).
+
+    ``mtime=0`` leaves the header timestamp empty, so the same bytes always give the same payload
+    (as the ``zlib.compressobj`` path of the streamed datasets does).
+    """
     buf = io.BytesIO()
-    with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=9) as gz:
+    with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=9, mtime=0) as gz:
         gz.write(data_bytes)
     return buf.getvalue()
 
@@ -68,16 +139,145 @@ def _dataset_csv_to_bytes(csv_string):
     return csv_string.encode("utf-8")
 
 
-def normalize_dataset_for_template(csv_string, compress_data):
-    """Return a template-ready dataset dict: {encoding, payload} (pure, for tests)."""
+def normalize_dataset_for_template(
+    dataset, compress_data, dataset_format=DATASET_FORMAT_CSV, numeric_columns=()
+):
+    """Return a template-ready dataset dict: {encoding, payload} (pure, for tests).
+
+    Streaming sources (paths, file objects, chunk iterables) get a lazy payload: an iterator
+    of text chunks consumed once by the template, through the incremental gzip + base64
+    pipeline when ``compress_data`` is set. ``columnar-v1`` payloads are always gzip'd
+    (``compress_data`` is ignored) and type-encode only ``numeric_columns``.
+    """
+    if dataset_format == DATASET_FORMAT_COLUMNAR_V1:
+        payload = iter_columnar_v1_base64(dataset, numeric_columns)
+        return {"encoding": CSV_ENCODING_COLUMNAR_V1, "payload": payload}
+    if is_dataset_stream(dataset):
+        if compress_data:
+            payload = iter_gzip_base64_chunks(iter_dataset_bytes(dataset))
+            return {"encoding": CSV_ENCODING_GZIP_BASE64, "payload": payload}
+        return {"encoding": None, "payload": iter_dataset_text(dataset)}
     if compress_data:
-        raw = _dataset_csv_to_bytes(csv_string)
+        raw = _dataset_csv_to_bytes(dataset)
         compressed = _gzip_compress_bytes(raw)
         b64 = base64.b64encode(compressed)
         if isinstance(b64, bytes):
             b64 = b64.decode("ascii")
         return {"encoding": CSV_ENCODING_GZIP_BASE64, "payload": b64}
-    return {"encoding": None, "payload": csv_string}
+    return {"encoding": None, "payload": dataset}
+
+
+def _encode_month_index(codes):
+    """gzip + base64 of a uint16 ``array.array`` in little-endian order (read as a Uint16Array)."""
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        codes = type(codes)(codes.typecode, codes)
+        codes.byteswap()
+    raw = codes.tobytes() if hasattr(codes, "tobytes") else codes.tostring()
+    b64 = base64.b64encode(_gzip_compress_bytes(raw))
+    if isinstance(b64, bytes):
+        b64 = b64.decode("ascii")
+    return b64
+
+
+def build_month_indexes(widgets, datasets_list):
+    """Per dataset, the pre-parsed ``mapping.date`` columns to embed (pure, for tests).
+
+    :return: one list per dataset of ``{"column", "payload"}`` dicts, ``payload`` being the
+        gzip + base64 month index (``year * 12 + month - 1``, ``0`` for rows processData
+        drops). One-shot streams cannot be read a second time and are skipped with a warning.
+    """
+    date_columns = referenced_date_columns_by_dataset(widgets)
+    indexes = []
+    for idx, dataset in enumerate(datasets_list):
+        columns = date_columns.get(idx)
+        if not columns:
+            indexes.append([])
+            continue
+        if is_dataset_stream(dataset) and not is_dataset_path(dataset):
+            warnings.warn(
+                "datasets_list[{}] is a one-shot stream: its dates are parsed in the browser "
+                "(parse_dates=True needs a CSV string or a file path)".format(idx),
+                UserWarning,
+            )
+            indexes.append([])
+            continue
+        indexes.append([
+            {"column": column, "payload": _encode_month_index(codes)}
+            for column, codes in month_index_columns(dataset, columns).items()
+        ])
+    return indexes
+
+
+def _iter_payload_slices(payload, chunk_size):
+    if isinstance(payload, basestring):
+        for start in range(0, len(payload), chunk_size):
+            yield payload[start:start + chunk_size]
+        return
+    for chunk in payload:
+        yield chunk
+
+
+def iter_payload_chunks(payload, chunk_size=None):
+    """Yield a dataset payload as bounded, script-safe text slices (registered as the
+    ``payload_chunks`` filter).
+
+    Slices are ``Markup``: Jinja does not HTML-escape them (the browser would not unescape
+    ``<script>`` contents); only ``</script`` / ``<!--`` are neutralised, see script_escape.py.
+    """
+    if chunk_size is None:
+        chunk_size = DATASET_PAYLOAD_CHUNK_CHARS
+    return iter_script_safe_chunks(_iter_payload_slices(payload, chunk_size))
+
+
+# generate() keyword options a generate_many() job may override (batch-wide defaults otherwise).
+BATCH_RENDER_OPTIONS = (
+    "compress_data",
+    "js_bundle_mode",
+    "prune_columns",
+    "preaggregate",
+    "dataset_format",
+    "parse_dates",
+    "decode_in_worker",
+    "offline",
+)
+
+# Keys accepted in a generate_many() job dict (besides the required config / datasets_list).
+BATCH_JOB_OPTIONAL_KEYS = frozenset(("filename",) + BATCH_RENDER_OPTIONS)
+BATCH_DEFAULT_FILENAME = "dashboard_{index}.html"
+
+# Jobs handed to each pool worker per IPC round-trip (many small dashboards per batch).
+BATCH_POOL_CHUNKSIZE = 4
+
+_clock = getattr(time, "perf_counter", time.time)
+
+# os.replace() is Python 3 only; os.rename() also overwrites on POSIX.
+_replace_file = getattr(os, "replace", os.rename)
+
+
+def _is_path_like(obj):
+    """True for str paths and os.PathLike objects (pathlib.Path on Python 3)."""
+    return isinstance(obj, basestring) or hasattr(obj, "__fspath__")
+
+
+def _dump_stream_to_path(stream, path):
+    """Write a template stream to ``path`` as UTF-8 through a temporary file in the same directory.
+
+    The temporary file is renamed over ``path`` only once the whole page has rendered, so a
+    dataset failing mid-render (e.g. a stream yielding neither text nor bytes) leaves no
+    truncated dashboard behind.
+    """
+    path = path.__fspath__() if hasattr(path, "__fspath__") else path
+    tmp_path = "{}.{}.tmp".format(path, uuid.uuid4().hex)
+    # os.open() with 0o666 keeps the umask-derived permissions a plain open() would give.
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    fd = os.open(tmp_path, flags, 0o666)
+    try:
+        with io.open(fd, "wb") as f:
+            stream.dump(f, encoding="utf-8")
+        _replace_file(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
 
 
 class DashboardGenerator(object):
@@ -87,16 +287,31 @@ class DashboardGenerator(object):
         self.root_path = os.path.dirname(os.path.abspath(__file__))
         self.assets_path = os.path.join(self.root_path, "assets")
 
-        self.env = jinja2.Environment(
+        # Shared by every generator of the process: templates compile once per assets dir.
+        self.env = SHARED_ASSET_CACHE.get_environment(self.assets_path, self._create_environment)
+
+    def _create_environment(self):
+        env = jinja2.Environment(
             loader=jinja2.FileSystemLoader(self.assets_path),
             autoescape=jinja2.select_autoescape(["html", "xml"]),
         )
+        env.filters["payload_chunks"] = iter_payload_chunks
+        return env
+
+    @staticmethod
+    def cache_stats():
+        """Hit / miss counters of the process-wide asset, bundle and template cache."""
+        return SHARED_ASSET_CACHE.stats()
+
+    @staticmethod
+    def clear_cache():
+        """Empty the process-wide cache (mainly for tests and long-lived dev servers)."""
+        SHARED_ASSET_CACHE.clear()
 
     def _read_asset(self, filename):
-        """Read a text asset from the bundled assets directory."""
+        """Read a text asset from the bundled assets directory (cached, mtime-checked)."""
         asset_path = os.path.join(self.assets_path, filename)
-        with io.open(asset_path, "r", encoding="utf-8") as f:
-            return f.read()
+        return SHARED_ASSET_CACHE.read_text(asset_path)
 
     @staticmethod
     def _build_full_config(config):
@@ -109,7 +324,9 @@ class DashboardGenerator(object):
         return full_config
 
     @staticmethod
-    def _build_context(config, full_config, datasets_normalized, css_content, js_content):
+    def _build_context(
+        config, full_config, datasets_normalized, css_content, js_content, import_map_json=None
+    ):
         """Build the Jinja2 template context (pure, for tests)."""
         title = config.get("title", "Dashboard")
         subtitle = config.get("subtitle", "")
@@ -118,11 +335,12 @@ class DashboardGenerator(object):
         return {
             "title": title,
             "subtitle": subtitle,
-            "config_json": json.dumps(full_config),
+            "config_json": script_safe_json(full_config),
             "datasets": datasets_normalized,
             "css_content": css_content,
             "js_content": js_content,
             "include_dev_markup": include_dev_markup,
+            "import_map_json": import_map_json,
         }
 
     @staticmethod
@@ -162,21 +380,44 @@ class DashboardGenerator(object):
                 seen.add(rel)
                 widget_paths.append(rel)
 
+        if config.get(CONFIG_DECODE_IN_WORKER_KEY):
+            widget_paths.insert(0, JS_DATASET_WORKER_PATH)
         ordered = list(JS_MANDATORY_PATHS) + widget_paths + [JS_MAIN_PATH]
         return ordered, need_sankey
 
     @classmethod
     def collect_js_asset_paths_full_bundle(cls):
-        """All widget modules + d3-sankey import (stable bundle size for V8 coverage on E2E HTML)."""
-        widget_paths = sorted(WIDGET_TYPE_TO_JS_FILE.values())
+        """All widget modules, the dataset worker and the d3-sankey import (stable bundle size for
+        V8 coverage on E2E HTML)."""
+        widget_paths = sorted(list(WIDGET_TYPE_TO_JS_FILE.values()) + [JS_DATASET_WORKER_PATH])
         ordered = list(JS_MANDATORY_PATHS) + widget_paths + [JS_MAIN_PATH]
         return ordered, True
 
+    @staticmethod
+    def _canonical_js_asset_order(js_files):
+        """Mandatory files, then widget modules sorted by path, then main (order-independent)."""
+        fixed = set(JS_MANDATORY_PATHS) | {JS_MAIN_PATH}
+        widget_paths = sorted(p for p in set(js_files) if p not in fixed)
+        return list(JS_MANDATORY_PATHS) + widget_paths + [JS_MAIN_PATH]
+
+    def _get_js_bundle(self, js_files, include_d3_sankey):
+        """Return the assembled JS bundle from the shared cache.
+
+        Bundles are keyed by the set of JS files (i.e. the widget types of the config) and the
+        d3-sankey flag, and assembled in canonical order so the output does not depend on the
+        order of ``config["widgets"]`` or on which config populated the cache first.
+        """
+        ordered = self._canonical_js_asset_order(js_files)
+        key = (self.assets_path, frozenset(ordered), bool(include_d3_sankey))
+        paths = [os.path.join(self.assets_path, p) for p in ordered]
+        return SHARED_ASSET_CACHE.get_bundle(
+            key, paths, lambda: self._build_js_content(ordered, include_d3_sankey)
+        )
+
     def _build_js_content(self, js_files, include_d3_sankey):
-        """Concatenate JS assets and prepend D3 (+ optional d3-sankey) imports."""
-        js_content_parts = [D3_CDN_IMPORT]
-        if include_d3_sankey:
-            js_content_parts.append(D3_SANKEY_CDN_IMPORT)
+        """Concatenate JS assets and prepend the d3 sub-package (+ optional d3-sankey) imports."""
+        js_content_parts = [D3_SANKEY_CDN_IMPORT] if include_d3_sankey else []
+        js_content_parts.append(d3_import_block(d3_packages_for(js_files)))
 
         for js_file in js_files:
             content = self._read_asset(js_file)
@@ -184,6 +425,40 @@ class DashboardGenerator(object):
 
         return "".join(js_content_parts)
 
+    def _import_map(self, js_files, include_d3_sankey, offline):
+        """Return the page import map (JSON) for the bundle built from ``js_files``.
+
+        Online, it maps the bare d3 sub-package specifiers of the bundle to jsDelivr. Offline,
+        those packages (and their own d3 dependencies) and d3-sankey resolve to the vendored
+        copies inlined as base64 ``data:`` URLs; the result is cached like JS bundles.
+        :raises IOError: when a vendored file is missing from ``assets/vendor/``.
+        """
+        d3_packages = d3_packages_for(js_files)
+        if not offline:
+            imports = dict((name, d3_cdn_url(name)) for name in d3_packages)
+            return json.dumps({"imports": imports}, sort_keys=True)
+
+        modules = [(name, d3_vendor_path(name)) for name in with_d3_dependencies(d3_packages)]
+        if include_d3_sankey:
+            modules.append(VENDOR_D3_SANKEY_MODULE)
+        paths = [os.path.join(self.assets_path, rel) for _, rel in modules]
+        for (_, rel), path in zip(modules, paths):
+            if not os.path.isfile(path):
+                raise IOError(
+                    "offline=True needs the vendored module {!r} (missing {}); "
+                    "see assets/vendor/README.md".format(rel, path)
+                )
+
+        def build():
+            imports = {}
+            for (specifier, _), path in zip(modules, paths):
+                source = SHARED_ASSET_CACHE.read_text(path).encode("utf-8")
+                imports[specifier] = "data:text/javascript;base64," + base64.b64encode(source).decode("ascii")
+            return json.dumps({"imports": imports}, sort_keys=True)
+
+        key = ("importmap", self.assets_path, frozenset(d3_packages), bool(include_d3_sankey))
+        return SHARED_ASSET_CACHE.get_bundle(key, paths, build)
+
     @staticmethod
     def _validate_inputs(config, datasets_list):
         """Validate public API inputs early to surface clear errors."""
@@ -194,15 +469,113 @@ class DashboardGenerator(object):
             raise TypeError("datasets_list must be a list or tuple of CSV strings")
 
         for idx, dataset in enumerate(datasets_list):
-            if not isinstance(dataset, basestring):
+            if isinstance(dataset, basestring):
+                continue
+            if not is_dataset_stream(dataset):
                 raise TypeError(
-                    "datasets_list[{}] must be a string containing CSV data".format(idx)
+                    "datasets_list[{}] must be a string containing CSV data, a file path, "
+                    "a binary file object or an iterable of CSV chunks".format(idx)
+                )
+            if is_dataset_path(dataset) and not os.path.isfile(dataset_path(dataset)):
+                raise IOError(
+                    "datasets_list[{}]: CSV file not found: {}".format(idx, dataset_path(dataset))
                 )
 
-    def _normalize_datasets(self, datasets_list, compress_data):
-        return [
-            normalize_dataset_for_template(ds, compress_data) for ds in datasets_list
-        ]
+    def _normalize_datasets(
+        self,
+        datasets_list,
+        compress_data,
+        dataset_format=DATASET_FORMAT_CSV,
+        stats=NULL_STATS,
+        widgets=(),
+    ):
+        numeric_columns = numeric_columns_by_dataset(widgets)
+        normalized = []
+        for index, ds in enumerate(datasets_list):
+            normalize = functools.partial(
+                normalize_dataset_for_template,
+                compress_data=compress_data,
+                dataset_format=dataset_format,
+                numeric_columns=numeric_columns.get(index, ()),
+            )
+            normalized.append(stats.normalize_dataset(index, ds, normalize))
+        return normalized
+
+    def _prepare_render(
+        self,
+        config,
+        datasets_list,
+        compress_data,
+        js_bundle_mode,
+        prune_columns=False,
+        preaggregate=False,
+        dataset_format=DATASET_FORMAT_CSV,
+        parse_dates=False,
+        decode_in_worker=False,
+        offline=False,
+        stats=NULL_STATS,
+    ):
+        """Validate inputs and return ``(template, context)`` shared by every render entrypoint.
+
+        :param stats: collector from :func:`~dashboard_engine.stats.resolve_stats` (phases are
+            recorded on it; the no-op collector when stats are not requested).
+        """
+        with stats.phase(PHASE_VALIDATION):
+            self._validate_inputs(config, datasets_list)
+            if dataset_format not in DATASET_FORMATS:
+                raise ValueError(
+                    "dataset_format must be one of {}, not {!r}".format(
+                        ", ".join(repr(f) for f in DATASET_FORMATS), dataset_format
+                    )
+                )
+            if js_bundle_mode not in ("auto", "full"):
+                raise ValueError(
+                    "js_bundle_mode must be 'auto' or 'full', not {!r}".format(js_bundle_mode)
+                )
+        with stats.phase(PHASE_DATASET_TRANSFORMS):
+            if preaggregate:
+                widgets, datasets_list = preaggregate_datasets(self._widgets_list(config), datasets_list)
+                config = dict(config, widgets=widgets)
+            if prune_columns:
+                datasets_list = prune_dataset_columns(self._widgets_list(config), datasets_list)
+            if decode_in_worker:
+                config = dict(config, **{CONFIG_DECODE_IN_WORKER_KEY: True})
+            if self._widgets_list(config):
+                config = dict(config, widgets=render_widget_descriptions(self._widgets_list(config)))
+            month_indexes = []
+            if parse_dates:
+                month_indexes = build_month_indexes(self._widgets_list(config), datasets_list)
+
+        with stats.phase(PHASE_ASSETS):
+            css_content = self._read_asset("style.css")
+            template = SHARED_ASSET_CACHE.get_template(self.env, self.assets_path, "skeleton.html")
+        with stats.phase(PHASE_JS_BUNDLE):
+            if js_bundle_mode == "full":
+                js_files, include_d3_sankey = self.collect_js_asset_paths_full_bundle()
+            else:
+                js_files, include_d3_sankey = self.collect_js_asset_paths(config)
+            js_content = self._get_js_bundle(js_files, include_d3_sankey)
+            import_map_json = self._import_map(js_files, include_d3_sankey, offline)
+
+        with stats.phase(PHASE_DATASET_NORMALIZATION):
+            datasets_normalized = self._normalize_datasets(
+                datasets_list,
+                compress_data,
+                dataset_format,
+                stats=stats,
+                widgets=self._widgets_list(config),
+            )
+            for ds, months in zip(datasets_normalized, month_indexes):
+                ds["month_indexes"] = months
+        context = self._build_context(
+            config=config,
+            full_config=self._build_full_config(config),
+            datasets_normalized=datasets_normalized,
+            css_content=css_content,
+            js_content=js_content,
+            import_map_json=import_map_json,
+        )
+        return template, context
 
     def generate(
         self,
@@ -210,40 +583,335 @@ class DashboardGenerator(object):
         datasets_list,
         compress_data=False,
         js_bundle_mode="auto",
+        prune_columns=False,
+        preaggregate=False,
+        dataset_format=DATASET_FORMAT_CSV,
+        parse_dates=False,
+        decode_in_worker=False,
+        offline=False,
+        stats=None,
+        on_phase=None,
     ):
         """Generate a standalone HTML dashboard.
 
         :param config: dashboard configuration dictionary.
-        :param datasets_list: list of CSV strings used by the widgets.
+        :param datasets_list: list of datasets used by the widgets. Each entry is a CSV
+            string, a file path (``os.PathLike``, read via mmap), a binary file object or
+            an iterable of CSV chunks (``str`` / UTF-8 ``bytes``). Non-string entries are
+            streamed chunk by chunk and consumed once.
         :param compress_data: if True, gzip-compress each CSV (stdlib) and embed as base64;
             the client decompresses with DecompressionStream('gzip') before d3.csvParse.
         :param js_bundle_mode: ``\"auto\"`` (default) inlines only mandatory JS plus widgets
             declared in ``config``. ``\"full\"`` inlines every widget module and d3-sankey so
             Playwright-generated HTML matches a stable bundle shape for V8 coverage tooling.
+        :param prune_columns: if True, keep only the CSV columns named in the ``mapping`` of the
+            widgets reading each dataset (one streaming pass per dataset). Datasets read by a
+            widget without ``mapping`` are kept whole; datasets no widget reads are embedded
+            empty, with a ``UserWarning``.
+        :param preaggregate: if True, datasets read by summing widgets (evolution, stacked_area,
+            ribbon_chart, sunburst, nested_treemap, sankey, financial_sankey, directed_chord)
+            are replaced by ``sum(value)`` per year-month and mapping dimensions, computed in one
+            streaming pass. One derived dataset is appended per distinct mapping signature and
+            ``datasetIndex`` is rewritten in the embedded config; charts are unchanged.
+        :param dataset_format: ``"csv"`` (default) embeds CSV text, gzip'd when
+            ``compress_data`` is set. ``"columnar-v1"`` embeds a gzip'd binary layout with
+            typed numeric columns and dictionary-coded text columns (see
+            :mod:`dashboard_engine.columnar`), decoded by main.js into the same row objects.
+        :param parse_dates: if True, each ``mapping.date`` column is parsed once in Python into
+            a compact month index (``year * 12 + month - 1``, uint16, gzip + base64) embedded
+            next to its dataset; ``BaseWidget.processData`` then reads year / month from it
+            instead of splitting strings and copying every row.
+        :param decode_in_worker: if True, main.js hands every dataset payload to a Web Worker
+            (base64 + gzip decoding, CSV parsing into dictionary-coded columns, month indexes
+            for ``mapping.date`` columns) and only builds row objects on the main thread.
+            Widget aggregation is not moved: it still runs on the main thread. Falls back to
+            main-thread decoding when workers are unavailable.
+        :param offline: if True, the d3 sub-packages and d3-sankey are inlined from the
+            vendored ESM builds in ``assets/vendor/`` (import map of ``data:`` URLs), so the
+            page makes no network request. Raises ``IOError`` if a vendored file is missing.
+        :param stats: optional :class:`~dashboard_engine.stats.GenerationStats` filled with the
+            wall time and traced peak memory of each phase (validation, dataset transforms,
+            assets, JS bundle, dataset normalisation, render), per-dataset sizes (raw,
+            compressed and base64 bytes, rows, ratio, seconds) and the output size. Read it
+            with ``stats.as_dict()`` or ``stats.to_json()``. As in :meth:`generate_many`,
+            ``True`` collects into a fresh instance (reported through ``on_phase``) and
+            ``False`` is the same as None.
+        :param on_phase: optional callable receiving each phase record
+            ``{"name", "seconds", "peak_bytes"}`` as the phase ends.
         :return: rendered HTML string.
         """
-        self._validate_inputs(config, datasets_list)
+        stats = resolve_stats(stats, on_phase)
+        with stats.tracking():
+            template, context = self._prepare_render(
+                config,
+                datasets_list,
+                compress_data,
+                js_bundle_mode,
+                prune_columns,
+                preaggregate,
+                dataset_format,
+                parse_dates,
+                decode_in_worker,
+                offline,
+                stats=stats,
+            )
+            with stats.phase(PHASE_RENDER):
+                html = template.render(context)
+        if stats is not NULL_STATS:
+            stats.output_bytes = len(html.encode("utf-8"))
+        return html
+
+    def generate_to_file(
+        self,
+        path_or_fileobj,
+        config,
+        datasets_list,
+        compress_data=False,
+        js_bundle_mode="auto",
+        prune_columns=False,
+        preaggregate=False,
+        dataset_format=DATASET_FORMAT_CSV,
+        parse_dates=False,
+        decode_in_worker=False,
+        offline=False,
+        stats=None,
+        on_phase=None,
+    ):
+        """Stream the dashboard HTML to a file instead of building it in memory.
+
+        Output is identical to :meth:`generate`, but the page is written piece by piece
+        through ``Template.stream()`` and dataset payloads are emitted in
+        ``DATASET_PAYLOAD_CHUNK_CHARS`` slices, so peak memory no longer grows with the
+        size of the rendered HTML.
+
+        :param path_or_fileobj: output path (str / ``os.PathLike``, written as UTF-8) or an
+            open writable file object. Text streams receive ``str`` chunks; any other file
+            object (e.g. opened in ``"wb"`` mode, ``io.BytesIO``) receives UTF-8 bytes. A path
+            is written through a temporary file renamed on success, so a failed render leaves
+            any existing file untouched; a file object may hold a partial page.
+        :param config: dashboard configuration dictionary.
+        :param datasets_list: see :meth:`generate`.
+        :param compress_data: see :meth:`generate`.
+        :param js_bundle_mode: see :meth:`generate`.
+        :param prune_columns: see :meth:`generate`.
+        :param preaggregate: see :meth:`generate`.
+        :param dataset_format: see :meth:`generate`.
+        :param parse_dates: see :meth:`generate`.
+        :param decode_in_worker: see :meth:`generate`.
+        :param offline: see :meth:`generate`.
+        :param stats: see :meth:`generate` (``output_bytes`` is only set for path outputs).
+        :param on_phase: see :meth:`generate`.
+        """
+        stats = resolve_stats(stats, on_phase)
+        with stats.tracking():
+            template, context = self._prepare_render(
+                config,
+                datasets_list,
+                compress_data,
+                js_bundle_mode,
+                prune_columns,
+                preaggregate,
+                dataset_format,
+                parse_dates,
+                decode_in_worker,
+                offline,
+                stats=stats,
+            )
+            with stats.phase(PHASE_RENDER):
+                stream = template.stream(context)
+                if _is_path_like(path_or_fileobj):
+                    _dump_stream_to_path(stream, path_or_fileobj)
+                elif isinstance(path_or_fileobj, io.TextIOBase):
+                    stream.dump(path_or_fileobj)
+                else:
+                    stream.dump(path_or_fileobj, encoding="utf-8")
+        if _is_path_like(path_or_fileobj) and stats is not NULL_STATS:
+            stats.output_bytes = os.path.getsize(path_or_fileobj)
+
+    def generate_many(
+        self,
+        jobs,
+        output_dir,
+        workers=None,
+        compress_data=False,
+        js_bundle_mode="auto",
+        prune_columns=False,
+        preaggregate=False,
+        dataset_format=DATASET_FORMAT_CSV,
+        parse_dates=False,
+        decode_in_worker=False,
+        offline=False,
+        stats=False,
+    ):
+        """Render many dashboards to ``output_dir``, spread over a process pool.
+
+        Each worker process warms the shared asset / template cache on its first job, then
+        streams its dashboards to disk with :meth:`generate_to_file`. Gzip at
+        ``compresslevel=9`` is CPU-bound, so throughput scales with ``workers``.
+
+        A job that fails to render does not abort the batch: its result carries the error and
+        every other job still runs. Invalid job dicts are rejected before anything renders.
+
+        :param jobs: iterable of dicts with ``config`` and ``datasets_list`` keys, plus optional
+            ``filename`` (default ``dashboard_{index}.html``) and any ``BATCH_RENDER_OPTIONS``
+            entry overriding the batch-wide defaults below. With more than one worker, datasets
+            must be picklable: CSV strings or file paths (preferred for large inputs, since
+            only the path crosses the process boundary).
+        :param output_dir: directory receiving the HTML files (created if missing).
+        :param workers: number of processes; ``None`` uses every CPU, ``1`` renders in-process.
+        :param compress_data: default for jobs without their own ``compress_data``.
+        :param js_bundle_mode: default for jobs without their own ``js_bundle_mode``.
+        :param prune_columns: default for jobs without their own ``prune_columns``.
+        :param preaggregate: default for jobs without their own ``preaggregate``.
+        :param dataset_format: default for jobs without their own ``dataset_format``.
+        :param parse_dates: default for jobs without their own ``parse_dates``.
+        :param decode_in_worker: default for jobs without their own ``decode_in_worker``.
+        :param offline: default for jobs without their own ``offline``.
+        :param stats: if True, each result also carries the job's
+            :class:`~dashboard_engine.stats.GenerationStats` breakdown under ``"stats"``
+            (``as_dict()`` form).
+        :return: one stats dict per job, in input order:
+            ``{"index", "filename", "path", "seconds", "bytes", "error"}``. ``error`` is None on
+            success; for a failed job it is ``"<ExceptionType>: <message>"`` and ``bytes`` is None.
+        """
+        defaults = {
+            "compress_data": compress_data,
+            "js_bundle_mode": js_bundle_mode,
+            "prune_columns": prune_columns,
+            "preaggregate": preaggregate,
+            "dataset_format": dataset_format,
+            "parse_dates": parse_dates,
+            "decode_in_worker": decode_in_worker,
+            "offline": offline,
+        }
+        if isinstance(stats, GenerationStats):
+            raise TypeError(
+                "generate_many(stats=...) takes True or False; each job's GenerationStats is "
+                "returned under its result's \"stats\" key"
+            )
+        tasks = self._build_batch_tasks(jobs, output_dir, defaults)
+        for task in tasks:
+            task["stats"] = bool(stats)
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        if workers < 1:
+            raise ValueError("workers must be >= 1, not {!r}".format(workers))
+
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir)
+
+        workers = min(workers, len(tasks))
+        if workers <= 1 or ProcessPoolExecutor is None:
+            return [_run_batch_task(task) for task in tasks]
+
+        for task in tasks:
+            _check_batch_datasets_picklable(task)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_run_batch_task, tasks, chunksize=BATCH_POOL_CHUNKSIZE))
+
+    @staticmethod
+    def _build_batch_tasks(jobs, output_dir, defaults):
+        """Validate job dicts and resolve per-job options into flat, picklable tasks.
 
-        if js_bundle_mode not in ("auto", "full"):
-            raise ValueError(
-                "js_bundle_mode must be 'auto' or 'full', not {!r}".format(js_bundle_mode)
+        :param defaults: batch-wide value of every ``BATCH_RENDER_OPTIONS`` entry.
+        """
+        tasks = []
+        seen_filenames = set()
+        for index, job in enumerate(jobs):
+            if not isinstance(job, dict):
+                raise TypeError("jobs[{}] must be a dict".format(index))
+            missing = {"config", "datasets_list"} - set(job)
+            if missing:
+                raise ValueError(
+                    "jobs[{}] is missing required keys: {}".format(index, ", ".join(sorted(missing)))
+                )
+            unknown = set(job) - BATCH_JOB_OPTIONAL_KEYS - {"config", "datasets_list"}
+            if unknown:
+                raise ValueError(
+                    "jobs[{}] has unknown keys: {}".format(index, ", ".join(sorted(unknown)))
+                )
+            DashboardGenerator._validate_inputs(job["config"], job["datasets_list"])
+
+            filename = job.get("filename") or BATCH_DEFAULT_FILENAME.format(index=index)
+            if filename in seen_filenames:
+                raise ValueError("jobs[{}]: duplicate output filename {!r}".format(index, filename))
+            seen_filenames.add(filename)
+
+            tasks.append({
+                "index": index,
+                "filename": filename,
+                "path": os.path.join(output_dir, filename),
+                "config": job["config"],
+                "datasets_list": job["datasets_list"],
+                "options": dict((name, job.get(name, defaults[name])) for name in BATCH_RENDER_OPTIONS),
+            })
+        return tasks
+
+
+def _check_batch_datasets_picklable(task):
+    """Pool workers receive pickled tasks: reject one-shot streams early with a clear error."""
+    for idx, dataset in enumerate(task["datasets_list"]):
+        if isinstance(dataset, basestring) or is_dataset_path(dataset):
+            continue
+        raise TypeError(
+            "jobs[{}].datasets_list[{}]: only CSV strings and file paths can be sent to "
+            "worker processes (use workers=1 for file objects or iterators)".format(
+                task["index"], idx
             )
-        if js_bundle_mode == "full":
-            js_files, include_d3_sankey = self.collect_js_asset_paths_full_bundle()
-        else:
-            js_files, include_d3_sankey = self.collect_js_asset_paths(config)
-        css_content = self._read_asset("style.css")
-        js_content = self._build_js_content(js_files, include_d3_sankey)
-
-        full_config = self._build_full_config(config)
-        datasets_normalized = self._normalize_datasets(datasets_list, compress_data)
-        context = self._build_context(
-            config=config,
-            full_config=full_config,
-            datasets_normalized=datasets_normalized,
-            css_content=css_content,
-            js_content=js_content,
         )
 
-        template = self.env.get_template("skeleton.html")
-        return template.render(context)
+
+# Set once _warm_worker_caches() has run in this process.
+_worker_caches_warm = False
+
+
+def _warm_worker_caches():
+    """Load the stylesheet, mandatory JS and the template once per process.
+
+    Called lazily from :func:`_run_batch_task`: the Python 2.7 ``futures`` backport has no
+    pool ``initializer``.
+    """
+    global _worker_caches_warm
+    if _worker_caches_warm:
+        return
+    gen = DashboardGenerator()
+    gen._read_asset("style.css")
+    for js_file in JS_MANDATORY_PATHS + (JS_MAIN_PATH,):
+        gen._read_asset(js_file)
+    SHARED_ASSET_CACHE.get_template(gen.env, gen.assets_path, "skeleton.html")
+    _worker_caches_warm = True
+
+
+def _run_batch_task(task):
+    """Render one batch task to disk and report its timing / size (module-level: picklable).
+
+    Render errors are reported in the result rather than raised, so one bad job does not
+    discard the rest of the batch.
+    """
+    _warm_worker_caches()
+    stats = GenerationStats() if task.get("stats") else None
+    start = _clock()
+    result = {
+        "index": task["index"],
+        "filename": task["filename"],
+        "path": task["path"],
+        "error": None,
+    }
+    try:
+        DashboardGenerator().generate_to_file(
+            task["path"],
+            task["config"],
+            task["datasets_list"],
+            stats=stats,
+            **task["options"]
+        )
+    except Exception as exc:
+        result["seconds"] = _clock() - start
+        result["bytes"] = None
+        result["error"] = "{}: {}".format(type(exc).__name__, exc)
+        return result
+    result["seconds"] = _clock() - start
+    result["bytes"] = os.path.getsize(task["path"])
+    if stats is not None:
+        result["stats"] = stats.as_dict()
+    return result
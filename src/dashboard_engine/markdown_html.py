@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""Build-time Markdown rendering for widget ``description`` fields.
+
+Covers the Markdown the dashboards use, with the showdown options the browser used to apply
+(``simpleLineBreaks``, ``openLinksInNewWindow``, ``emoji``): paragraphs, headings, lists,
+block quotes, fenced code, rules, emphasis, code spans, links, images and ``:shortcode:``
+emoji. Inline HTML is kept, then the whole output is sanitised against a tag / attribute
+allow-list so a config cannot inject scripts or event handlers into the page.
+"""
+from __future__ import unicode_literals
+
+import re
+
+try:
+    from html.entities import name2codepoint
+    from html.parser import HTMLParser
+except ImportError:  # pragma: no cover - Python 2.7
+    from htmlentitydefs import name2codepoint  # type: ignore[no-redef]
+    from HTMLParser import HTMLParser  # type: ignore[no-redef]
+
+try:  # pragma: no cover - trivial compatibility shim
+    basestring  # type: ignore[name-defined]
+except NameError:  # Python 3
+    basestring = str  # type: ignore[assignment]
+
+ALLOWED_TAGS = frozenset((
+    "a", "b", "blockquote", "br", "code", "del", "em", "h1", "h2", "h3", "h4", "h5", "h6",
+    "hr", "i", "img", "li", "ol", "p", "pre", "s", "span", "strong", "sub", "sup", "table",
+    "tbody", "td", "th", "thead", "tr", "u", "ul",
+))
+ALLOWED_ATTRIBUTES = {
+    "a": ("href", "title"),
+    "img": ("src", "alt", "title"),
+    "td": ("align",),
+    "th": ("align",),
+}
+URL_ATTRIBUTES = frozenset(("href", "src"))
+URL_SCHEMES = frozenset(("http", "https", "mailto"))
+VOID_TAGS = frozenset(("br", "hr", "img"))
+# Dropped together with everything inside them.
+DROP_CONTENT_TAGS = frozenset((
+    "script", "style", "iframe", "object", "embed", "template", "noscript", "textarea", "title",
+))
+# openLinksInNewWindow.
+LINK_TARGET_ATTRIBUTES = (("target", "_blank"), ("rel", "noopener noreferrer"))
+
+EMOJI_SHORTCODES = {
+    "+1": "\U0001F44D",
+    "-1": "\U0001F44E",
+    "arrow_down": "⬇️",
+    "arrow_right": "➡️",
+    "arrow_up": "⬆️",
+    "bar_chart": "\U0001F4CA",
+    "bulb": "\U0001F4A1",
+    "calendar": "\U0001F4C6",
+    "chart_with_downwards_trend": "\U0001F4C9",
+    "chart_with_upwards_trend": "\U0001F4C8",
+    "heavy_check_mark": "✔️",
+    "information_source": "ℹ️",
+    "memo": "\U0001F4DD",
+    "smile": "\U0001F604",
+    "star": "⭐",
+    "warning": "⚠️",
+    "white_check_mark": "✅",
+    "x": "❌",
+}
+
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_HEADING_RE = re.compile(r"^ {0,3}(#{1,6})\s*(.*?)\s*#*\s*$")
+_HR_RE = re.compile(r"^ {0,3}([-*_])(?:\s*\1){2,}\s*$")
+_LIST_ITEM_RE = re.compile(r"^( *)([-*+]|\d{1,9}[.)])\s+(.*)$")
+_QUOTE_RE = re.compile(r"^ {0,3}>\s?(.*)$")
+
+_PLACEHOLDER_RE = re.compile("\x00(\\d+)\x00")
+_CODE_SPAN_RE = re.compile(r"(`+)(.+?)\1")
+_AUTOLINK_RE = re.compile(r"<((?:https?|mailto):[^\s<>]+)>")
+_RAW_TAG_RE = re.compile(r"</?[A-Za-z][A-Za-z0-9-]*(?:\s[^<>]*)?/?>")
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(\s*<?([^\s)>]*)>?(?:\s+\"([^\"]*)\")?\s*\)")
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(\s*<?([^\s)>]*)>?(?:\s+\"([^\"]*)\")?\s*\)")
+_BARE_AMPERSAND_RE = re.compile(r"&(?!#?[A-Za-z0-9]+;)")
+_STRONG_RE = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1")
+_EM_STAR_RE = re.compile(r"\*(?=\S)(.+?)(?<=\S)\*")
+_EM_UNDERSCORE_RE = re.compile(r"(?<![A-Za-z0-9_])_(?=\S)(.+?)(?<=\S)_(?![A-Za-z0-9_])")
+_EMOJI_RE = re.compile(r":([a-z0-9_+-]+):")
+_URL_SCHEME_RE = re.compile(r"^([a-z][a-z0-9+.-]*):")
+_URL_IGNORED_CHARS_RE = re.compile(r"[\x00-\x20]+")
+
+
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def is_safe_url(url):
+    """True for relative URLs and the schemes in :data:`URL_SCHEMES` (no ``javascript:``)."""
+    match = _URL_SCHEME_RE.match(_URL_IGNORED_CHARS_RE.sub("", url).lower())
+    return match is None or match.group(1) in URL_SCHEMES
+
+
+def _render_inline(text):
+    """Inline Markdown of one line; inline HTML tags are kept for the sanitiser."""
+    stash = []
+
+    def keep(html):
+        stash.append(html)
+        return "\x00{}\x00".format(len(stash) - 1)
+
+    def link_open(url, title):
+        title_attr = ' title="{}"'.format(_escape(title)) if title else ""
+        return keep('<a href="{}"{}>'.format(_escape(url), title_attr))
+
+    text = _CODE_SPAN_RE.sub(lambda m: keep("<code>{}</code>".format(_escape(m.group(2).strip()))), text)
+    text = _AUTOLINK_RE.sub(lambda m: link_open(m.group(1), None) + _escape(m.group(1)) + keep("</a>"), text)
+    text = _RAW_TAG_RE.sub(lambda m: keep(m.group(0)), text)
+    text = _IMAGE_RE.sub(
+        lambda m: keep('<img src="{}" alt="{}"{} />'.format(
+            _escape(m.group(2)),
+            _escape(m.group(1)),
+            ' title="{}"'.format(_escape(m.group(3))) if m.group(3) else "",
+        )),
+        text,
+    )
+    text = _LINK_RE.sub(lambda m: link_open(m.group(2), m.group(3)) + m.group(1) + keep("</a>"), text)
+
+    text = _BARE_AMPERSAND_RE.sub("&amp;", text).replace("<", "&lt;").replace(">", "&gt;")
+    text = _STRONG_RE.sub(r"<strong>\2</strong>", text)
+    text = _EM_STAR_RE.sub(r"<em>\1</em>", text)
+    text = _EM_UNDERSCORE_RE.sub(r"<em>\1</em>", text)
+    text = _EMOJI_RE.sub(lambda m: EMOJI_SHORTCODES.get(m.group(1), m.group(0)), text)
+    return _PLACEHOLDER_RE.sub(lambda m: stash[int(m.group(1))], text)
+
+
+def _render_lines(lines):
+    """simpleLineBreaks: every newline inside a block becomes ``<br />``."""
+    return "<br />\n".join(_render_inline(line.strip()) for line in lines)
+
+
+def _starts_block(line):
+    return bool(
+        _FENCE_RE.match(line)
+        or _HEADING_RE.match(line)
+        or _HR_RE.match(line)
+        or _QUOTE_RE.match(line)
+        or _LIST_ITEM_RE.match(line)
+    )
+
+
+def _render_list(lines, start):
+    """Render the list starting at ``lines[start]``; returns ``(html, next_index)``."""
+    first = _LIST_ITEM_RE.match(lines[start])
+    indent = len(first.group(1))
+    ordered = first.group(2)[0].isdigit()
+    items = []
+    i = start
+    while i < len(lines):
+        line = lines[i]
+        match = _LIST_ITEM_RE.match(line)
+        if match and len(match.group(1)) <= indent:
+            if match.group(2)[0].isdigit() != ordered:
+                break
+            items.append([match.group(3)])
+        elif line.strip() and (match or line.startswith(" ") or not _starts_block(line)):
+            items[-1].append(line[min(len(line) - len(line.lstrip(" ")), indent + 4):])
+        elif not line.strip():
+            following = next((l for l in lines[i + 1:] if l.strip()), None)
+            nested = following is not None and following.startswith(" " * (indent + 2))
+            follow_match = following is not None and _LIST_ITEM_RE.match(following)
+            if not (nested or (follow_match and len(follow_match.group(1)) <= indent)):
+                break
+        else:
+            break
+        i += 1
+
+    parts = []
+    for body in items:
+        text_lines = []
+        while len(text_lines) < len(body) and not (
+            text_lines and _LIST_ITEM_RE.match(body[len(text_lines)])
+        ):
+            text_lines.append(body[len(text_lines)])
+        rest = body[len(text_lines):]
+        parts.append("<li>{}{}</li>".format(_render_lines(text_lines), render_blocks(rest) if rest else ""))
+    tag = "ol" if ordered else "ul"
+    return "<{0}>\n{1}\n</{0}>".format(tag, "\n".join(parts)), i
+
+
+def render_blocks(lines):
+    """Block-level Markdown of ``lines`` (list of str, no newlines) to HTML."""
+    out = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            i += 1
+            continue
+
+        fence = _FENCE_RE.match(line)
+        if fence:
+            marker = fence.group(1)
+            code = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith(marker):
+                code.append(lines[i])
+                i += 1
+            out.append("<pre><code>{}</code></pre>".format(_escape("\n".join(code))))
+            i += 1
+            continue
+
+        if _HR_RE.match(line):
+            out.append("<hr />")
+            i += 1
+            continue
+
+        heading = _HEADING_RE.match(line)
+        if heading:
+            level = len(heading.group(1))
+            out.append("<h{0}>{1}</h{0}>".format(level, _render_inline(heading.group(2))))
+            i += 1
+            continue
+
+        if _QUOTE_RE.match(line):
+            quoted = []
+            while i < len(lines) and _QUOTE_RE.match(lines[i]):
+                quoted.append(_QUOTE_RE.match(lines[i]).group(1))
+                i += 1
+            out.append("<blockquote>\n{}\n</blockquote>".format(render_blocks(quoted)))
+            continue
+
+        if _LIST_ITEM_RE.match(line):
+            html, i = _render_list(lines, i)
+            out.append(html)
+            continue
+
+        paragraph = []
+        while i < len(lines) and lines[i].strip() and not (paragraph and _starts_block(lines[i])):
+            paragraph.append(lines[i])
+            i += 1
+        out.append("<p>{}</p>".format(_render_lines(paragraph)))
+    return "\n".join(out)
+
+
+class _Sanitizer(HTMLParser):
+    """Re-serialise HTML keeping only allow-listed tags, attributes and URL schemes."""
+
+    def __init__(self):
+        try:
+            HTMLParser.__init__(self, convert_charrefs=False)
+        except TypeError:  # pragma: no cover - Python 2.7
+            HTMLParser.__init__(self)
+        self.out = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def _attributes(self, tag, attrs):
+        allowed = ALLOWED_ATTRIBUTES.get(tag, ())
+        kept = []
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES and not is_safe_url(value):
+                continue
+            kept.append((name, value))
+        if tag == "a":
+            kept.extend(LINK_TARGET_ATTRIBUTES)
+        return "".join(' {}="{}"'.format(name, _escape(value)) for name, value in kept)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        if tag in VOID_TAGS:
+            self.out.append("<{}{} />".format(tag, self._attributes(tag, attrs)))
+            return
+        self.out.append("<{}{}>".format(tag, self._attributes(tag, attrs)))
+        self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.out.append("</{}>".format(open_tag))
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(_escape(data))
+
+    def handle_entityref(self, name):
+        if not self.dropping:
+            self.out.append("&{};".format(name) if name in name2codepoint else "&amp;" + _escape(name))
+
+    def handle_charref(self, name):
+        if not self.dropping:
+            self.out.append("&#{};".format(name))
+
+    def result(self):
+        self.close()
+        return "".join(self.out) + "".join("</{}>".format(tag) for tag in reversed(self.open_tags))
+
+
+def sanitize_html(html):
+    """Keep only :data:`ALLOWED_TAGS` / :data:`ALLOWED_ATTRIBUTES`; links open in a new tab."""
+    parser = _Sanitizer()
+    parser.feed(html)
+    return parser.result()
+
+
+def markdown_to_html(text):
+    """Render Markdown ``text`` to sanitised HTML (empty string for empty input)."""
+    lines = text.replace("\x00", "").replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return sanitize_html(render_blocks(lines))
+
+
+def render_widget_descriptions(widgets):
+    """Copy of ``widgets`` with each Markdown ``description`` replaced by ``descriptionHtml``.
+
+    Widgets without a description are returned as-is (same objects).
+    :raises TypeError: when a description is not a string.
+    """
+    rendered = []
+    for idx, widget in enumerate(widgets):
+        if not isinstance(widget, dict) or not widget.get("description"):
+            rendered.append(widget)
+            continue
+        description = widget["description"]
+        if not isinstance(description, basestring):
+            raise TypeError("widgets[{}].description must be a string".format(idx))
+        widget = dict(widget, descriptionHtml=markdown_to_html(description))
+        del widget["description"]
+        rendered.append(widget)
+    return rendered
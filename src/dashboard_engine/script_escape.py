@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Raw text embedding inside ``<script>`` elements (datasets, config JSON).
+
+Script contents are not HTML-escaped: the browser does not decode character references there,
+so ``textContent`` returns the bytes exactly as written. Only two sequences can change how the
+element is parsed: ``</script`` (ends it) and ``<!--`` (enters the "script data escaped" state).
+The encoder inserts one backslash after the ``<`` of ``<\\*/script`` and ``<\\*!--`` (any number
+of backslashes, case-insensitive), so the output never contains either sequence and
+``decodeScriptSafeText`` in main.js reverses it by removing that backslash. Text without such a
+sequence is emitted unchanged (the common case: CSV and base64 payloads).
+"""
+from __future__ import unicode_literals
+
+import json
+import re
+
+from markupsafe import Markup
+
+_SCRIPT_BREAK_RE = re.compile(r"<(\\*)(/script|!--)", re.IGNORECASE)
+
+# Tail of a chunk that may become a _SCRIPT_BREAK_RE match once the next chunk is appended.
+_SCRIPT_BREAK_PREFIX_RE = re.compile(r"<\\*(?:/(?:s(?:c(?:r(?:i(?:p)?)?)?)?)?|!-?)?\Z", re.IGNORECASE)
+
+
+def escape_script_text(text):
+    """Return ``text`` safe to place verbatim inside a ``<script>`` element (see module doc)."""
+    if "<" not in text:
+        return text
+    return _SCRIPT_BREAK_RE.sub(r"<\\\1\2", text)
+
+
+def iter_script_safe_chunks(chunks):
+    """Escape an iterable of text chunks as :func:`escape_script_text` would escape their
+    concatenation, yielding ``Markup`` so Jinja autoescape leaves them alone.
+
+    A chunk ending in the start of a sequence (``"...</scr"``) keeps that tail for the next one.
+    """
+    pending = ""
+    for chunk in chunks:
+        if pending:
+            chunk = pending + chunk
+            pending = ""
+        cut = chunk.rfind("<")
+        if cut != -1 and _SCRIPT_BREAK_PREFIX_RE.match(chunk, cut):
+            chunk, pending = chunk[:cut], chunk[cut:]
+        if chunk:
+            yield Markup(escape_script_text(chunk))
+    if pending:
+        yield Markup(escape_script_text(pending))
+
+
+def script_safe_json(obj, **kwargs):
+    """``json.dumps(obj)`` with every ``<`` written as ``\\u003c`` (JSON.parse restores it)."""
+    return json.dumps(obj, **kwargs).replace("<", "\\u003c")
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""Opt-in instrumentation of one ``generate()`` call: phase timings, peak memory, dataset sizes.
+
+Pass a :class:`GenerationStats` as ``generate(..., stats=...)`` (or only an ``on_phase``
+callback) and read it back with :meth:`GenerationStats.as_dict` / :meth:`GenerationStats.to_json`.
+Peak memory comes from ``tracemalloc`` (Python heap allocations, started for the duration of
+the call unless already tracing); it is ``None`` on interpreters without ``tracemalloc``.
+"""
+from __future__ import unicode_literals
+
+import contextlib
+import json
+import time
+
+try:  # pragma: no cover - Python 2.7 has no tracemalloc
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+from .datasets import is_dataset_stream, iter_dataset_bytes
+
+try:  # pragma: no cover - trivial compatibility shim
+    basestring  # type: ignore[name-defined]
+except NameError:  # Python 3
+    basestring = str  # type: ignore[assignment]
+
+# Phase names, in the order generate() runs them.
+PHASE_VALIDATION = "validation"
+PHASE_DATASET_TRANSFORMS = "dataset_transforms"
+PHASE_ASSETS = "assets"
+PHASE_JS_BUNDLE = "js_bundle"
+PHASE_DATASET_NORMALIZATION = "dataset_normalization"
+PHASE_RENDER = "render"
+PHASES = (
+    PHASE_VALIDATION,
+    PHASE_DATASET_TRANSFORMS,
+    PHASE_ASSETS,
+    PHASE_JS_BUNDLE,
+    PHASE_DATASET_NORMALIZATION,
+    PHASE_RENDER,
+)
+
+_clock = getattr(time, "perf_counter", time.time)
+
+
+def _utf8_len(text):
+    if isinstance(text, (bytes, bytearray)):
+        return len(text)
+    if getattr(text, "isascii", None) and text.isascii():
+        return len(text)
+    return len(text.encode("utf-8"))
+
+
+def _newline_count(text):
+    return text.count(b"\n" if isinstance(text, (bytes, bytearray)) else "\n")
+
+
+def _rows_from_lines(newlines, ends_with_newline, size):
+    """Data rows of a CSV with ``newlines`` line breaks (header excluded, quoted newlines counted)."""
+    lines = newlines + (1 if size and not ends_with_newline else 0)
+    return max(lines - 1, 0)
+
+
+class GenerationStats(object):
+    """Collects the breakdown of one generation; see the module docstring.
+
+    :param on_phase: optional callable receiving each phase record
+        (``{"name", "seconds", "peak_bytes"}``) as soon as the phase ends.
+    :param trace_memory: set to False to skip ``tracemalloc`` (it slows allocations down).
+    """
+
+    def __init__(self, on_phase=None, trace_memory=True):
+        self.on_phase = on_phase
+        self.trace_memory = bool(trace_memory) and tracemalloc is not None
+        self.phases = []
+        self.datasets = []
+        self.total_seconds = None
+        self.peak_bytes = None
+        self.output_bytes = None
+
+    @contextlib.contextmanager
+    def tracking(self):
+        """Wrap a whole generation: total wall time and overall traced peak."""
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        start = _clock()
+        try:
+            yield self
+        finally:
+            self.total_seconds = _clock() - start
+            if self.trace_memory:
+                peaks = [p["peak_bytes"] for p in self.phases if p["peak_bytes"] is not None]
+                self.peak_bytes = max(peaks) if peaks else None
+            if started_tracing:
+                tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the enclosed block and record its traced memory peak under ``name``."""
+        if self.trace_memory and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        start = _clock()
+        yield
+        record = {
+            "name": name,
+            "seconds": _clock() - start,
+            "peak_bytes": tracemalloc.get_traced_memory()[1] if self.trace_memory else None,
+        }
+        self.phases.append(record)
+        if self.on_phase is not None:
+            self.on_phase(record)
+
+    def normalize_dataset(self, index, dataset, normalize):
+        """Return ``normalize(dataset)`` and record the sizes of dataset ``index``.
+
+        Streaming datasets are encoded lazily while the template renders; their entry is
+        complete once the payload has been consumed (``seconds`` counts that time too).
+        """
+        entry = {
+            "index": index,
+            "encoding": None,
+            "raw_bytes": 0,
+            "compressed_bytes": None,
+            "base64_bytes": None,
+            "rows": 0,
+            "ratio": None,
+            "seconds": 0.0,
+        }
+        self.datasets.append(entry)
+        if is_dataset_stream(dataset):
+            dataset = self._counted_bytes(entry, iter_dataset_bytes(dataset))
+        else:
+            size = _utf8_len(dataset)
+            entry["raw_bytes"] = size
+            entry["rows"] = _rows_from_lines(_newline_count(dataset), dataset[-1:] in ("\n", b"\n"), size)
+        start = _clock()
+        normalized = normalize(dataset)
+        entry["seconds"] += _clock() - start
+        entry["encoding"] = normalized["encoding"]
+        payload = normalized["payload"]
+        if isinstance(payload, basestring):
+            if normalized["encoding"] is not None:
+                self._record_base64(entry, len(payload), payload[-2:])
+            return normalized
+        return dict(normalized, payload=self._timed_payload(entry, payload))
+
+    @staticmethod
+    def _counted_bytes(entry, byte_chunks):
+        newlines = 0
+        last = b""
+        for chunk in byte_chunks:
+            entry["raw_bytes"] += len(chunk)
+            newlines += chunk.count(b"\n")
+            if chunk:
+                last = chunk[-1:]
+            yield chunk
+        entry["rows"] = _rows_from_lines(newlines, last == b"\n", entry["raw_bytes"])
+
+    @classmethod
+    def _timed_payload(cls, entry, chunks):
+        """Pass lazy payload chunks through, adding the time spent producing them to ``entry``."""
+        chars = 0
+        tail = ""
+        iterator = iter(chunks)
+        while True:
+            start = _clock()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                entry["seconds"] += _clock() - start
+                break
+            entry["seconds"] += _clock() - start
+            chars += len(chunk)
+            tail = (tail + chunk)[-2:]
+            yield chunk
+        if entry["encoding"] is not None:
+            cls._record_base64(entry, chars, tail)
+
+    @staticmethod
+    def _record_base64(entry, chars, tail):
+        entry["base64_bytes"] = chars
+        entry["compressed_bytes"] = chars * 3 // 4 - (len(tail) - len(tail.rstrip("=")))
+        if entry["compressed_bytes"]:
+            entry["ratio"] = float(entry["raw_bytes"]) / entry["compressed_bytes"]
+
+    def as_dict(self):
+        """JSON-serialisable breakdown of the generation."""
+        return {
+            "total_seconds": self.total_seconds,
+            "peak_bytes": self.peak_bytes,
+            "output_bytes": self.output_bytes,
+            "phases": [dict(p) for p in self.phases],
+            "datasets": [dict(d) for d in self.datasets],
+        }
+
+    def to_json(self, **kwargs):
+        """:meth:`as_dict` as a JSON string (``json.dumps`` keyword arguments pass through)."""
+        kwargs.setdefault("sort_keys", True)
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+class _NullStats(object):
+    """Stand-in used when no stats are requested: every hook is a no-op."""
+
+    @contextlib.contextmanager
+    def tracking(self):
+        yield self
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        yield
+
+    @staticmethod
+    def normalize_dataset(index, dataset, normalize):
+        return normalize(dataset)
+
+
+NULL_STATS = _NullStats()
+
+
+def resolve_stats(stats, on_phase):
+    """The collector for a ``generate(stats=..., on_phase=...)`` call.
+
+    :param stats: a :class:`GenerationStats` to fill, True for a fresh one, or None / False.
+    :param on_phase: callback set on the collector (a fresh one when ``stats`` is None / False).
+    """
+    if stats is True:
+        stats = GenerationStats()
+    elif stats is False:
+        stats = None
+    if stats is not None:
+        if not isinstance(stats, GenerationStats):
+            raise TypeError(
+                "stats must be a bool or a GenerationStats instance, not {}".format(type(stats).__name__)
+            )
+        if on_phase is not None:
+            stats.on_phase = on_phase
+        return stats
+    if on_phase is not None:
+        return GenerationStats(on_phase=on_phase)
+    return NULL_STATS
@@ -0,0 +1,510 @@
+# -*- coding: utf-8 -*-
+"""Config-driven CSV transforms applied before embedding (single streaming pass each).
+
+Widgets only read the columns named in their ``mapping`` and never look below the
+(year, month) granularity; these helpers use the dashboard config to drop unused columns
+and to pre-aggregate rows before the data reaches the page.
+"""
+from __future__ import unicode_literals
+
+import array
+import csv
+import io
+import itertools
+import math
+import re
+import sys
+import warnings
+from collections import OrderedDict
+
+from .datasets import is_dataset_path, is_dataset_stream, iter_dataset_text
+
+try:  # pragma: no cover - trivial compatibility shim
+    basestring  # type: ignore[name-defined]
+except NameError:  # Python 3
+    basestring = str  # type: ignore[assignment]
+
+# Python 2.7's csv module reads and writes byte strings only; rows are UTF-8 encoded around it.
+_CSV_NEEDS_BYTES = sys.version_info[0] == 2
+
+# Characters stripped by JavaScript String.prototype.trim().
+_JS_WHITESPACE = (
+    " \t\n\r\x0b\x0c\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006"
+    "\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000\ufeff"
+)
+
+# Rewritten CSV text is yielded once the write buffer reaches this many characters.
+CSV_REWRITE_CHUNK_CHARS = 1 << 20
+
+
+def widget_dataset_index(widget):
+    """Dataset index a widget reads (mirrors ``wConfig.datasetIndex || 0`` in main.js)."""
+    return widget.get("datasetIndex") or 0
+
+
+def mapping_columns(mapping):
+    """Column names referenced by a widget ``mapping`` (string values and lists of strings)."""
+    columns = []
+    for value in mapping.values():
+        if isinstance(value, basestring):
+            columns.append(value)
+        elif isinstance(value, (list, tuple)):
+            columns.extend(v for v in value if isinstance(v, basestring))
+    return columns
+
+
+def referenced_columns_by_dataset(widgets):
+    """Map ``datasetIndex`` -> set of referenced columns, or ``None`` when unknown.
+
+    A widget without a ``mapping`` dict may read anything, so its dataset is kept whole.
+    Datasets absent from the result are not used by any widget.
+    """
+    referenced = {}
+    for widget in widgets:
+        if not isinstance(widget, dict):
+            continue
+        idx = widget_dataset_index(widget)
+        mapping = widget.get("mapping")
+        if not isinstance(mapping, dict):
+            referenced[idx] = None
+            continue
+        if idx in referenced and referenced[idx] is None:
+            continue
+        referenced.setdefault(idx, set()).update(mapping_columns(mapping))
+    return referenced
+
+
+# Mapping keys whose column widgets read as numbers (``+d[col]``); columnar-v1 stores only these
+# columns as typed arrays. Every other column keeps its exact text ("007", "0x1F").
+NUMERIC_MAPPING_KEYS = ("value", "x", "y", "r")
+
+# Per widget type, numeric-looking mapping keys that are category labels instead (band axes).
+WIDGET_LABEL_MAPPING_KEYS = {
+    "heatmap": ("x", "y"),
+    "horizon": ("y",),
+}
+
+
+def numeric_columns_by_dataset(widgets):
+    """Map ``datasetIndex`` -> set of columns widgets read as numbers (see ``NUMERIC_MAPPING_KEYS``)."""
+    numeric = {}
+    for widget in widgets:
+        if not isinstance(widget, dict) or not isinstance(widget.get("mapping"), dict):
+            continue
+        labels = WIDGET_LABEL_MAPPING_KEYS.get(widget.get("type"), ())
+        columns = numeric.setdefault(widget_dataset_index(widget), set())
+        for key in NUMERIC_MAPPING_KEYS:
+            column = widget["mapping"].get(key)
+            if key not in labels and isinstance(column, basestring):
+                columns.add(column)
+    return numeric
+
+
+# Mapping keys each widget type groups by (beside year / month) when it sums ``mapping.value``.
+# "path" is a list of columns. Types absent here (heatmap, bubble, horizon, radial_area) plot
+# individual rows or take maxima, so their datasets are never pre-aggregated.
+WIDGET_AGGREGATION_KEYS = {
+    "evolution": (),
+    "stacked_area": ("category",),
+    "ribbon_chart": ("category",),
+    "sunburst": ("hierarchy",),
+    "nested_treemap": ("hierarchy",),
+    "sankey": ("path",),
+    "financial_sankey": ("source", "target", "type"),
+    "directed_chord": ("source", "target"),
+}
+
+# sankey_widget.js skips rows whose value is not > 0 before summing links.
+WIDGET_TYPES_SUMMING_POSITIVE_ONLY = frozenset({"sankey"})
+
+# directed_chord_widget.js skips rows whose value is not Number.isFinite (NaN, +/-Infinity);
+# d3.sum elsewhere keeps infinities, which the derived CSV writes back as "Infinity".
+WIDGET_TYPES_SUMMING_FINITE_ONLY = frozenset({"directed_chord"})
+
+_JS_DECIMAL_RE = re.compile(r"^[+-]?(?:Infinity|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)$")
+_JS_HEX_RE = re.compile(r"^0[xX][0-9a-fA-F]+$")
+
+
+def js_number(text):
+    """Python port of JavaScript unary ``+`` on a CSV field (NaN when not numeric)."""
+    text = text.strip(_JS_WHITESPACE)
+    if not text:
+        return 0.0
+    if _JS_DECIMAL_RE.match(text):
+        return float(text.replace("Infinity", "inf"))
+    if _JS_HEX_RE.match(text):
+        return float(int(text[2:], 16))
+    return float("nan")
+
+
+def js_number_text(number):
+    """Shortest CSV text that JavaScript ``+`` parses back to ``number``."""
+    if math.isnan(number):
+        return "NaN"
+    if math.isinf(number):
+        return "Infinity" if number > 0 else "-Infinity"
+    if number == int(number) and abs(number) < 1e21:
+        return "{:d}".format(int(number))
+    return repr(number)
+
+
+def js_year_month(text):
+    """``(year, month)`` exactly as ``BaseWidget.processData`` derives it, or ``None`` if the row is dropped."""
+    if not text:
+        return None
+    parts = text.split("-")
+    if len(parts) < 2:
+        return None
+    year, month = js_number(parts[0]), js_number(parts[1])
+    if not year or not month or math.isnan(year) or math.isnan(month):
+        return None
+    return year, month
+
+
+# Month index = year * 12 + (month - 1), stored as uint16: covers years 1 to 5461.
+MONTH_INDEX_MAX_YEAR = 0xFFFF // 12
+
+
+def month_index_code(text):
+    """uint16 month index of a date cell, ``0`` when processData drops the row.
+
+    Returns ``None`` when the cell parses to a (year, month) pair the index cannot hold
+    (fractional, month outside 1-12, year beyond ``MONTH_INDEX_MAX_YEAR``).
+    """
+    year_month = js_year_month(text)
+    if year_month is None:
+        return 0
+    year, month = year_month
+    if year != int(year) or month != int(month):
+        return None
+    if not 1 <= month <= 12 or not 1 <= year <= MONTH_INDEX_MAX_YEAR:
+        return None
+    return int(year) * 12 + int(month) - 1
+
+
+def referenced_date_columns_by_dataset(widgets):
+    """Map ``datasetIndex`` -> ordered list of the ``mapping.date`` columns read from it."""
+    referenced = OrderedDict()
+    for widget in widgets:
+        if not isinstance(widget, dict) or not isinstance(widget.get("mapping"), dict):
+            continue
+        date_col = widget["mapping"].get("date")
+        if not isinstance(date_col, basestring):
+            continue
+        columns = referenced.setdefault(widget_dataset_index(widget), [])
+        if date_col not in columns:
+            columns.append(date_col)
+    return referenced
+
+
+def month_index_columns(dataset, date_columns):
+    """Month indexes of ``date_columns`` in one streaming pass over ``dataset``.
+
+    :return: ``OrderedDict(column -> array.array("H"))`` with one entry per CSV row, for
+        the columns present in the header whose every cell fits the index.
+    """
+    header, rows = iter_csv_records(dataset)
+    # Duplicate header names: d3.csvParse keeps the last column.
+    last_position = dict((name, i) for i, name in enumerate(header or []))
+    positions = OrderedDict((col, last_position[col]) for col in date_columns if col in last_position)
+    codes = OrderedDict((col, array.array("H")) for col in positions)
+    for row in rows:
+        for col in list(codes):
+            pos = positions[col]
+            code = month_index_code(row[pos] if pos < len(row) else "")
+            if code is None:
+                del codes[col]
+            else:
+                codes[col].append(code)
+    return codes
+
+
+def widget_aggregation_signature(widget):
+    """Return ``(date_col, value_col, dims, positive_only, finite_only)`` for a summing widget.
+
+    Returns ``None`` for other widgets and for widgets missing the columns they need (they
+    render as before).
+    """
+    keys = WIDGET_AGGREGATION_KEYS.get(widget.get("type"))
+    mapping = widget.get("mapping")
+    if keys is None or not isinstance(mapping, dict):
+        return None
+    date_col, value_col = mapping.get("date"), mapping.get("value")
+    if not isinstance(date_col, basestring) or not isinstance(value_col, basestring):
+        return None
+
+    dims = []
+    for key in keys:
+        if key == "path":
+            cols = mapping.get("path") or [mapping.get("source"), mapping.get("target")]
+        elif key == "hierarchy":
+            cols = mapping.get("hierarchy")
+        else:
+            cols = [mapping.get(key)]
+        if not isinstance(cols, (list, tuple)):
+            return None
+        dims.extend(c for c in cols if isinstance(c, basestring) and c not in dims)
+    if date_col in dims or value_col in dims or date_col == value_col:
+        return None
+    widget_type = widget.get("type")
+    return (
+        date_col,
+        value_col,
+        tuple(dims),
+        widget_type in WIDGET_TYPES_SUMMING_POSITIVE_ONLY,
+        widget_type in WIDGET_TYPES_SUMMING_FINITE_ONLY,
+    )
+
+
+class _MonthlySum(object):
+    """Streaming ``sum(value)`` grouped by (year, month, *dims) for one mapping signature."""
+
+    def __init__(self, header, signature):
+        self.date_col, self.value_col, self.dims, self.positive_only, self.finite_only = signature
+        position = dict((name, i) for i, name in reversed(list(enumerate(header))))
+        self.missing = [c for c in (self.date_col, self.value_col) + self.dims if c not in position]
+        self.date_pos = position.get(self.date_col)
+        self.value_pos = position.get(self.value_col)
+        self.dim_pos = [position.get(c) for c in self.dims]
+        self.groups = OrderedDict()
+
+    @staticmethod
+    def _field(row, pos):
+        return row[pos] if pos is not None and pos < len(row) else ""
+
+    def add(self, row):
+        year_month = js_year_month(self._field(row, self.date_pos))
+        if year_month is None:
+            return
+        key = year_month + tuple(self._field(row, p) for p in self.dim_pos)
+        value = js_number(self._field(row, self.value_pos))
+        # d3.sum ignores NaN and zero; sankey additionally drops non-positive rows and
+        # directed_chord drops non-finite ones.
+        if self.positive_only:
+            keep = value > 0
+        else:
+            keep = bool(value) and not math.isnan(value)
+        if self.finite_only and math.isinf(value):
+            keep = False
+        self.groups[key] = self.groups.get(key, 0.0) + (value if keep else 0.0)
+
+    def to_csv_text(self):
+        header = [self.date_col] + list(self.dims) + [self.value_col]
+        rows = (
+            ["{}-{}".format(js_number_text(k[0]), js_number_text(k[1]))] + list(k[2:]) + [js_number_text(v)]
+            for k, v in self.groups.items()
+        )
+        return "".join(iter_csv_text(header, rows))
+
+
+def preaggregate_datasets(widgets, datasets_list):
+    """Replace row-level datasets by monthly sums at the granularity each widget plots.
+
+    Every summing widget (see ``WIDGET_AGGREGATION_KEYS``) gets a derived dataset holding
+    ``sum(value)`` per (year-month, dimension columns), shared by widgets with the same
+    mapping signature and computed in one streaming pass over the source. Derived datasets
+    are appended to the list and the widgets' ``datasetIndex`` is rewritten; a source no
+    widget reads any more is embedded empty so other indices keep their meaning.
+
+    :return: ``(widgets, datasets_list)`` copies; the inputs are not modified.
+    :raises ValueError: when a one-shot stream would have to be read twice (it is both
+        aggregated and read raw by a widget that cannot be aggregated).
+    """
+    plans = OrderedDict()  # source index -> OrderedDict(signature -> derived index)
+    raw_readers = set()
+    next_index = len(datasets_list)
+    widgets = list(widgets)
+    for w_pos, widget in enumerate(widgets):
+        if not isinstance(widget, dict):
+            continue
+        idx = widget_dataset_index(widget)
+        signature = widget_aggregation_signature(widget)
+        if signature is None or not isinstance(idx, int) or not 0 <= idx < len(datasets_list):
+            raw_readers.add(idx)
+            continue
+        signatures = plans.setdefault(idx, OrderedDict())
+        if signature not in signatures:
+            signatures[signature] = next_index
+            next_index += 1
+        widgets[w_pos] = dict(widget, datasetIndex=signatures[signature])
+
+    result = list(datasets_list)
+    derived = {}
+    for idx, signatures in plans.items():
+        source = datasets_list[idx]
+        reread = is_dataset_path(source) or not is_dataset_stream(source)
+        if idx in raw_readers and not reread:
+            raise ValueError(
+                "datasets_list[{}] is a one-shot stream read both raw and pre-aggregated; "
+                "pass a CSV string or a file path instead (preaggregate=True)".format(idx)
+            )
+        header, rows = iter_csv_records(source)
+        sums = [(_MonthlySum(header or [], sig), signatures[sig]) for sig in signatures]
+        for row in rows:
+            for agg, _ in sums:
+                agg.add(row)
+        for agg, target in sums:
+            if agg.missing and header is not None:
+                warnings.warn(
+                    "datasets_list[{}] has no column(s) {} used by a widget mapping "
+                    "(preaggregate=True)".format(idx, ", ".join(repr(c) for c in agg.missing)),
+                    UserWarning,
+                )
+            derived[target] = agg.to_csv_text()
+        if idx not in raw_readers:
+            result[idx] = ""
+    return widgets, result + [derived[i] for i in sorted(derived)]
+
+
+def iter_text_lines(text_chunks):
+    """Re-split text chunks into ``\\n``-terminated lines (what ``csv.reader`` consumes)."""
+    pending = ""
+    for chunk in text_chunks:
+        pending += chunk
+        start = 0
+        while True:
+            end = pending.find("\n", start)
+            if end < 0:
+                break
+            yield pending[start:end + 1]
+            start = end + 1
+        pending = pending[start:]
+    if pending:
+        yield pending
+
+
+def iter_dataset_lines(dataset):
+    """CSV lines of a dataset (in-memory string or streaming source)."""
+    if is_dataset_stream(dataset):
+        return iter_text_lines(iter_dataset_text(dataset))
+    return iter_text_lines([dataset])
+
+
+def _is_blank_row(row):
+    """True for a line holding only whitespace (``csv.reader`` yields ``[]`` for empty lines)."""
+    return len(row) <= 1 and not "".join(row).strip(_JS_WHITESPACE)
+
+
+def _iter_trimmed_rows(rows):
+    """Drop trailing blank rows and trailing whitespace of the last field (end of ``trim()``)."""
+    blanks = []
+    previous = None
+    for row in rows:
+        if _is_blank_row(row):
+            blanks.append(row)
+            continue
+        if previous is not None:
+            yield previous
+        for blank in blanks:
+            yield blank
+        blanks = []
+        previous = row
+    if previous is not None:
+        yield previous[:-1] + [previous[-1].rstrip(_JS_WHITESPACE)]
+
+
+def _csv_reader(lines):
+    """``csv.reader`` over text lines, yielding rows of text on Python 2.7 and 3."""
+    if not _CSV_NEEDS_BYTES:
+        return csv.reader(lines)
+    reader = csv.reader(line.encode("utf-8") for line in lines)
+    return ([field.decode("utf-8") for field in row] for row in reader)
+
+
+class _CsvTextBuffer(object):
+    """``csv.writer`` over an in-memory buffer whose content is taken back as text."""
+
+    def __init__(self):
+        self._buf = io.BytesIO() if _CSV_NEEDS_BYTES else io.StringIO()
+        self._writer = csv.writer(self._buf, lineterminator=str("\n"))
+
+    def writerow(self, row):
+        if _CSV_NEEDS_BYTES:
+            row = [f.encode("utf-8") if isinstance(f, basestring) else f for f in row]
+        self._writer.writerow(row)
+
+    def tell(self):
+        return self._buf.tell()
+
+    def drain(self):
+        """Return the buffered text and empty the buffer."""
+        value = self._buf.getvalue()
+        self._buf.seek(0)
+        self._buf.truncate()
+        return value.decode("utf-8") if _CSV_NEEDS_BYTES else value
+
+
+def iter_csv_records(dataset):
+    """Return ``(header, row_iterator)`` for a dataset, as ``d3.csvParse`` sees it.
+
+    Mirrors main.js, which trims the payload before parsing: leading blank lines and
+    whitespace, trailing blank lines and whitespace are ignored. Returns
+    ``(None, iter(()))`` for an empty dataset.
+    """
+    reader = _csv_reader(iter_dataset_lines(dataset))
+    for header in reader:
+        if not _is_blank_row(header):
+            header = [header[0].lstrip(_JS_WHITESPACE)] + header[1:]
+            rows = _iter_trimmed_rows(itertools.chain([header], reader))
+            return next(rows), rows
+    return None, iter(())
+
+
+def iter_csv_text(header, rows, chunk_chars=None):
+    """Serialise rows back to CSV text chunks (``\\n`` line endings, minimal quoting)."""
+    if chunk_chars is None:
+        chunk_chars = CSV_REWRITE_CHUNK_CHARS
+    buf = _CsvTextBuffer()
+    buf.writerow(header)
+    for row in rows:
+        buf.writerow(row)
+        if buf.tell() >= chunk_chars:
+            yield buf.drain()
+    tail = buf.drain()
+    if tail:
+        yield tail
+
+
+def iter_pruned_csv_text(dataset, keep_columns):
+    """Stream a dataset keeping only ``keep_columns`` (original header order preserved)."""
+    header, rows = iter_csv_records(dataset)
+    if header is None:
+        return
+    positions = [i for i, name in enumerate(header) if name in keep_columns]
+    width = len(header)
+
+    def pick(row):
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        return [row[i] for i in positions]
+
+    for chunk in iter_csv_text([header[i] for i in positions], (pick(r) for r in rows)):
+        yield chunk
+
+
+def prune_dataset_columns(widgets, datasets_list):
+    """Return datasets reduced to the columns referenced by widget mappings.
+
+    String inputs come back as strings; streaming inputs as lazy chunk iterators (one pass).
+    Datasets that no widget references are replaced by an empty payload, with a warning
+    unless they were already empty, so the ``datasetIndex`` of the others is unchanged.
+    """
+    referenced = referenced_columns_by_dataset(widgets)
+    pruned = []
+    for idx, dataset in enumerate(datasets_list):
+        if idx not in referenced:
+            if not (isinstance(dataset, basestring) and not dataset):
+                warnings.warn(
+                    "datasets_list[{}] is not referenced by any widget; it is embedded empty "
+                    "(prune_columns=True)".format(idx),
+                    UserWarning,
+                )
+            pruned.append("")
+            continue
+        keep = referenced[idx]
+        if keep is None:
+            pruned.append(dataset)
+            continue
+        chunks = iter_pruned_csv_text(dataset, keep)
+        pruned.append(chunks if is_dataset_stream(dataset) else "".join(chunks))
+    return pruned
@@ -0,0 +1,67 @@
+"""Browser check: widget aggregations are memoised page-wide in AGGREGATION_CACHE (LRU)."""
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.generator import DashboardGenerator
+
+_HIERARCHY_MAPPING = {"date": "mois_annee", "value": "valeur", "hierarchy": ["l1", "l2"]}
+
+
+def _write_dashboard(tmp_path, **config_fields):
+    csv_content = (
+        "mois_annee,l1,l2,valeur\n"
+        "2024-01,A,a1,5\n"
+        "2025-01,A,a1,10\n"
+        "2025-01,B,b1,20\n"
+        "2025-02,A,a2,30\n"
+    )
+    config = dict(
+        {
+            "title": "Cache",
+            "widgets": [
+                {"type": "nested_treemap", "title": "Treemap", "mapping": _HIERARCHY_MAPPING},
+                {"type": "sunburst", "title": "Sunburst", "mapping": _HIERARCHY_MAPPING},
+            ],
+        },
+        **config_fields
+    )
+    out = tmp_path / "dash.html"
+    out.write_text(DashboardGenerator().generate(config, [csv_content]), encoding="utf-8")
+    return out
+
+
+def _cache_stats(page):
+    return page.evaluate("() => window.AGGREGATION_CACHE.stats()")
+
+
+def test_treemap_and_sunburst_share_one_rollup(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path).as_uri())
+    expect(page.locator('select[data-testid="widget-year-select"]')).to_have_count(2)
+
+    # Both widgets show January 2025 and 2024 (YoY): the sunburst reuses the treemap rollups.
+    stats = _cache_stats(page)
+    assert stats["misses"] == 2
+    assert stats["hits"] == 2
+
+
+def test_switching_back_to_a_period_is_a_cache_hit(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path).as_uri())
+    period_select = page.locator(".chart-box").first.locator(".ctrl-period-value select")
+    expect(period_select).to_be_visible()
+
+    period_select.select_option("2")
+    after_switch = _cache_stats(page)
+    period_select.select_option("1")
+    after_return = _cache_stats(page)
+
+    assert after_return["misses"] == after_switch["misses"]
+    assert after_return["hits"] == after_switch["hits"] + 2
+
+
+def test_cache_size_from_config_bounds_the_entries(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path, aggregation_cache_size=1).as_uri())
+    expect(page.locator('select[data-testid="widget-year-select"]')).to_have_count(2)
+
+    stats = _cache_stats(page)
+    assert stats["maxEntries"] == 1
+    assert stats["size"] == 1
+    assert stats["evictions"] > 0
@@ -75,7 +75,7 @@ def test_markdown_rendering(page: Page, generated_report):
     desc_box = page.locator(".widget-description")
     expect(desc_box).to_be_visible()
     
-    # 2. HTML from Showdown (** -> strong, * -> em/i)
+    # 2. HTML rendered at generation time (** -> strong, * -> em/i)
     html_content = desc_box.inner_html()
     
     assert "<strong>Ceci</strong>" in html_content or "<b>Ceci</b>" in html_content
@@ -132,4 +132,44 @@ def test_filtering_logic_ui_feedback(page: Page, generated_report):
 
     # Sub-chart title should mention S2
     chart_title = page.locator(".sub-chart h4").last
-    expect(chart_title).to_contain_text("S2")
\ No newline at end of file
+    expect(chart_title).to_contain_text("S2")
+@pytest.mark.parametrize(
+    "period_type,period_value",
+    [("annee", 1), ("mois", 4), ("trimestre", 1), ("semestre", 2), ("inconnu", 1)],
+)
+def test_calendar_index_matches_linear_filter(page: Page, generated_report, period_type, period_value):
+    """
+    TC05: CalendarIndex slices equal the former linear filters and keep the original row order.
+    """
+    page.goto(generated_report)
+    page.wait_for_function("() => typeof window.CalendarIndex === 'function'")
+
+    result = page.evaluate(
+        """([type, value]) => {
+            const rows = [];
+            for (let i = 0; i < 500; i++) {
+                rows.push(i % 50 === 0 ? { i } : { i, year: 2023 + (i % 3), month: 1 + ((i * 5) % 12) });
+            }
+            const index = new window.CalendarIndex(rows);
+            const ids = (list) => list.map((d) => d.i);
+            const pred = {
+                annee: () => true,
+                mois: (d) => d.month === value,
+                trimestre: (d) => Math.ceil(d.month / 3) === value,
+                semestre: (d) => (d.month <= 6 ? 1 : 2) === value,
+            }[type] || (() => false);
+            return {
+                years: index.years,
+                period: ids(index.rowsForPeriod(2024, type, value)),
+                expectedPeriod: ids(rows.filter((d) => d.year === 2024 && pred(d))),
+                calendar: ids(index.rowsForCalendarYear(2025)),
+                expectedCalendar: ids(rows.filter((d) => !d.year || d.year === 2025)),
+                cached: index.rowsForPeriod(2024, type, value) === index.rowsForPeriod(2024, type, value),
+            };
+        }""",
+        [period_type, period_value],
+    )
+    assert result["years"] == [2023, 2024, 2025]
+    assert result["period"] == result["expectedPeriod"]
+    assert result["calendar"] == result["expectedCalendar"]
+    assert result["cached"]
@@ -0,0 +1,139 @@
+"""Browser check: bubble hover / brush go through a quadtree of projected points, on svg and canvas."""
+import pytest
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.generator import DashboardGenerator
+
+_CSV = (
+    "mois_annee,x_metric,y_metric,r_metric,category\n"
+    "2025-01,1,10,5,A\n"
+    "2025-02,5,20,10,B\n"
+    "2025-03,9,30,15,A\n"
+)
+
+
+def _write_dashboard(tmp_path, renderer):
+    config = {
+        "title": "Bubble hit testing",
+        "widgets": [
+            {
+                "type": "bubble",
+                "title": "Bubbles",
+                "mapping": {
+                    "date": "mois_annee",
+                    "x": "x_metric",
+                    "y": "y_metric",
+                    "r": "r_metric",
+                    "category": "category",
+                },
+                "options": {"renderer": renderer},
+            }
+        ],
+    }
+    out = tmp_path / "dash.html"
+    out.write_text(DashboardGenerator().generate(config, [_CSV]), encoding="utf-8")
+    return out
+
+
+def _screen_point(page, vx, vy):
+    """Viewport position of viewBox point (vx, vy) of the bubble svg."""
+    return page.evaluate(
+        """([vx, vy]) => {
+            const svg = document.querySelector('.bubble-chart svg');
+            const point = new DOMPoint(vx, vy).matrixTransform(svg.getScreenCTM());
+            return [point.x, point.y];
+        }""",
+        [vx, vy],
+    )
+
+
+@pytest.mark.parametrize("renderer", ["svg", "canvas"])
+def test_hover_finds_nearest_bubble_and_shows_shared_tooltip(page: Page, tmp_path, renderer):
+    page.goto(_write_dashboard(tmp_path, renderer).as_uri())
+    svg = page.locator(".bubble-chart svg")
+    expect(svg).to_have_attribute("data-renderer", renderer)
+    assert page.locator(".bubble-chart svg title").count() == 0
+
+    # Largest bubble: x=9 is the right end of the nice()d x domain [1, 9].
+    box = svg.bounding_box()
+    page.mouse.move(box["x"] + 1, box["y"] + 1)
+    tooltip = page.locator(".widget-tooltip")
+    expect(tooltip).to_be_hidden()
+
+    center = page.evaluate(
+        """() => {
+            const svg = document.querySelector('.bubble-chart svg');
+            const [, , width, height] = svg.getAttribute('viewBox').split(',').map(Number);
+            return [width - 30, 30];
+        }"""
+    )
+    x, y = _screen_point(page, *center)
+    page.mouse.move(x, y)
+    expect(tooltip).to_be_visible()
+    expect(tooltip).to_contain_text("x_metric: 9")
+    expect(page.locator(".bubble-hover")).to_be_visible()
+    assert page.locator(".widget-tooltip").count() == 1
+
+    page.mouse.move(box["x"] + 1, box["y"] + 1)
+    expect(tooltip).to_be_hidden()
+
+
+def test_brush_selects_bubbles_and_dims_the_rest(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path, "svg").as_uri())
+    svg = page.locator(".bubble-chart svg")
+    expect(page.locator(".bubble-layer circle")).to_have_count(3)
+
+    width = page.evaluate("() => +document.querySelector('.bubble-chart svg').getAttribute('viewBox').split(',')[2]")
+    # Brush the upper-right quarter of the plot: only the x=9 bubble, whose centre is the plot's
+    # top-right corner (width - 30, 30). Dragging past that corner clamps the selection to the
+    # brush extent, so the corner is inside it; the x=5 bubble sits at width / 2 + 10.
+    start = _screen_point(page, width / 2 + 20, 150)
+    end = _screen_point(page, width + 20, -20)
+    page.mouse.move(*start)
+    page.mouse.down()
+    page.mouse.move(*end, steps=5)
+    page.mouse.up()
+
+    expect(svg).to_have_attribute("data-selected-count", "1")
+    expect(page.locator(".bubble-layer circle.bubble-dimmed")).to_have_count(2)
+
+
+def test_hover_inside_a_large_bubble_ignores_a_closer_small_centre(page: Page, tmp_path):
+    csv = (
+        "mois_annee,x_metric,y_metric,r_metric,category\n"
+        "2025-01,1,10,100,Grande\n"
+        "2025-02,1.1,10,1,Petite\n"
+        "2025-03,9,30,1,Autre\n"
+    )
+    config = {
+        "title": "Overlap",
+        "widgets": [
+            {
+                "type": "bubble",
+                "title": "Bubbles",
+                "mapping": {"date": "mois_annee", "x": "x_metric", "y": "y_metric", "r": "r_metric", "category": "category"},
+                "options": {"renderer": "svg"},
+            }
+        ],
+    }
+    out = tmp_path / "dash.html"
+    out.write_text(DashboardGenerator().generate(config, [csv]), encoding="utf-8")
+    page.goto(out.as_uri())
+    expect(page.locator(".bubble-layer circle")).to_have_count(3)
+
+    # Point 2px inside the large bubble's edge, on the side of the small bubble: nearer to the
+    # small centre than to the large one, but outside the small bubble's hit radius.
+    big, small = page.evaluate(
+        """() => Array.from(document.querySelectorAll('.bubble-layer circle'), (c) =>
+            ['cx', 'cy', 'r'].map((name) => +c.getAttribute(name))).slice(0, 2)"""
+    )
+    distance = ((small[0] - big[0]) ** 2 + (small[1] - big[1]) ** 2) ** 0.5
+    reach = big[2] - 2
+    point = (big[0] + (small[0] - big[0]) * reach / distance, big[1] + (small[1] - big[1]) * reach / distance)
+    to_small = reach - distance
+    assert 6 < to_small < reach
+
+    page.mouse.move(*_screen_point(page, *point))
+    tooltip = page.locator(".widget-tooltip")
+    expect(tooltip).to_be_visible()
+    expect(tooltip).to_contain_text("Grande")
@@ -0,0 +1,114 @@
+"""Browser check: options.renderer paints mark layers on a canvas, axes stay in SVG."""
+import pytest
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.generator import DashboardGenerator
+
+_CSV = (
+    "mois_annee,cat,x,y,r,heure,jour,valeur\n"
+    "2025-01,A,a,p,1,0,Lun,10\n"
+    "2025-02,B,b,q,2,1,Lun,20\n"
+    "2025-03,A,a,q,3,0,Mar,30\n"
+)
+
+_WIDGETS = {
+    "heatmap": {"date": "mois_annee", "x": "x", "y": "y", "value": "valeur"},
+    "bubble": {"date": "mois_annee", "x": "r", "y": "valeur", "r": "r", "category": "cat"},
+    "horizon": {"date": "mois_annee", "x": "heure", "y": "jour", "value": "valeur"},
+    "stacked_area": {"date": "mois_annee", "value": "valeur", "category": "cat"},
+}
+
+_MARK_SELECTORS = {
+    "heatmap": ".heatmap-layer rect",
+    "bubble": ".bubble-layer circle",
+    "horizon": ".viz-wrapper svg path",
+    "stacked_area": "path.stacked-area-layer",
+}
+
+
+def _write_dashboard(tmp_path, widget_type, options):
+    config = {
+        "title": "Renderer",
+        "widgets": [
+            {"type": widget_type, "title": widget_type, "mapping": _WIDGETS[widget_type], "options": options}
+        ],
+    }
+    out = tmp_path / "dash.html"
+    out.write_text(DashboardGenerator().generate(config, [_CSV]), encoding="utf-8")
+    return out
+
+
+def _canvas_has_ink(page):
+    return page.evaluate(
+        """() => Array.from(document.querySelectorAll('canvas.mark-canvas:not([hidden])')).some((canvas) => {
+            const pixels = canvas.getContext('2d').getImageData(0, 0, canvas.width, canvas.height).data;
+            for (let i = 3; i < pixels.length; i += 4) if (pixels[i]) return true;
+            return false;
+        })"""
+    )
+
+
+@pytest.mark.parametrize("widget_type", sorted(_WIDGETS))
+def test_canvas_renderer_keeps_axes_in_svg(page: Page, tmp_path, widget_type):
+    page.goto(_write_dashboard(tmp_path, widget_type, {"renderer": "canvas"}).as_uri())
+    svg = page.locator('svg[data-renderer="canvas"]').first
+    expect(svg).to_be_visible()
+    expect(page.locator(".mark-canvas-host canvas.mark-canvas").first).to_be_visible()
+
+    assert page.locator(_MARK_SELECTORS[widget_type]).count() == 0
+    assert svg.locator("text").count() > 0
+    assert _canvas_has_ink(page)
+
+
+def test_canvas_backing_store_follows_device_pixel_ratio(browser, tmp_path):
+    page = browser.new_page(device_scale_factor=2)
+    page.goto(_write_dashboard(tmp_path, "heatmap", {"renderer": "canvas"}).as_uri())
+    canvas = page.locator("canvas.mark-canvas").first
+    expect(canvas).to_be_visible()
+
+    size = canvas.evaluate("(c) => [c.width, c.height, c.clientWidth, c.clientHeight]")
+    assert abs(size[0] - 2 * size[2]) <= 1
+    assert abs(size[1] - 2 * size[3]) <= 1
+    page.close()
+
+
+def test_auto_renderer_switches_above_the_threshold(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path, "heatmap", {"canvasThreshold": 2}).as_uri())
+    expect(page.locator('svg[data-renderer="canvas"]')).to_have_count(1)
+
+    page.goto(_write_dashboard(tmp_path, "heatmap", {}).as_uri())
+    expect(page.locator('svg[data-renderer="svg"]').first).to_be_visible()
+    expect(page.locator(".heatmap-layer rect")).to_have_count(3)
+
+
+def _tick_centre(page, text):
+    box = page.locator("g.tick").filter(has=page.get_by_text(text, exact=True)).first.bounding_box()
+    return box["x"] + box["width"] / 2, box["y"] + box["height"] / 2
+
+
+@pytest.mark.parametrize(
+    "widget_type, x_tick, y_tick, offset_y, expected",
+    [
+        ("heatmap", "a", "p", 0, "y: p\nvaleur: 10"),
+        # Month 1, just above the baseline: the bottom layer (A, 10 against 0 for B).
+        ("stacked_area", "Jan", "0", -3, "A"),
+    ],
+)
+def test_canvas_marks_keep_their_tooltip(page: Page, tmp_path, widget_type, x_tick, y_tick, offset_y, expected):
+    page.goto(_write_dashboard(tmp_path, widget_type, {"renderer": "canvas"}).as_uri())
+    expect(page.locator('svg[data-renderer="canvas"]').first).to_be_visible()
+
+    x, _ = _tick_centre(page, x_tick)
+    _, y = _tick_centre(page, y_tick)
+    page.mouse.move(x, y + offset_y)
+    expect(page.locator(".widget-tooltip")).to_be_visible()
+    expect(page.locator(".widget-tooltip")).to_contain_text(expected)
+
+
+def test_horizon_auto_threshold_counts_band_paths(page: Page, tmp_path):
+    # 2 rows (Lun, Mar) x 3 bands = 6 band paths, from 3 data rows.
+    page.goto(_write_dashboard(tmp_path, "horizon", {"canvasThreshold": 6}).as_uri())
+    expect(page.locator('svg[data-renderer="svg"]')).to_have_count(1)
+
+    page.goto(_write_dashboard(tmp_path, "horizon", {"canvasThreshold": 5}).as_uri())
+    expect(page.locator('svg[data-renderer="canvas"]')).to_have_count(1)
@@ -1,4 +1,4 @@
-"""Browser check: gzip+base64 datasets decompress and widgets still mount."""
+"""Browser check: gzip+base64 and columnar-v1 datasets decode and widgets still mount."""
 import os
 import sys
 
@@ -12,9 +12,13 @@ if PROJECT_ROOT not in sys.path:
 from dashboard_engine.generator import DashboardGenerator
 
 
-@pytest.mark.parametrize("compress_data", [False, True], ids=["plain_csv", "gzip_base64"])
+@pytest.mark.parametrize(
+    "compress_data,dataset_format",
+    [(False, "csv"), (True, "csv"), (False, "columnar-v1")],
+    ids=["plain_csv", "gzip_base64", "columnar_v1"],
+)
 def test_bubble_dashboard_renders_with_compression_toggle(
-    page: Page, tmp_path, compress_data
+    page: Page, tmp_path, compress_data, dataset_format
 ):
     csv_content = """mois_annee,x_metric,y_metric,r_metric,category
 2025-01,1,1,1,A
@@ -39,7 +43,11 @@ def test_bubble_dashboard_renders_with_compression_toggle(
     }
     gen = DashboardGenerator()
     html = gen.generate(
-        config, [csv_content], compress_data=compress_data, js_bundle_mode="full"
+        config,
+        [csv_content],
+        compress_data=compress_data,
+        js_bundle_mode="full",
+        dataset_format=dataset_format,
     )
     out = tmp_path / "dash.html"
     out.write_text(html, encoding="utf-8")
@@ -48,3 +56,30 @@ def test_bubble_dashboard_renders_with_compression_toggle(
     circles = page.locator("g.bubble-layer circle")
     expect(circles.first).to_be_visible()
     assert circles.count() >= 2
+
+
+def test_columnar_v1_decodes_to_csv_parse_rows(page: Page, tmp_path):
+    rows = ["mois_annee,montant,label"] + [
+        "2025-{:02d},{}.25,cat {}".format(i % 12 + 1, i, i % 3) for i in range(400)
+    ]
+    csv_content = "\n".join(rows) + "\n"
+    gen = DashboardGenerator()
+    # Only mapped value columns are typed: montant becomes a number, label keeps its text.
+    widget = {"type": "evolution", "title": "E", "mapping": {"date": "mois_annee", "value": "montant"}}
+    html = gen.generate(
+        {"title": "Columnar", "widgets": [widget]},
+        [csv_content],
+        js_bundle_mode="full",
+        dataset_format="columnar-v1",
+    )
+    out = tmp_path / "dash.html"
+    out.write_text(html, encoding="utf-8")
+    page.goto(out.as_uri())
+    page.wait_for_function("() => Array.isArray(window.GLOBAL_DATASETS)")
+
+    decoded = page.evaluate(
+        "() => ({ columns: window.GLOBAL_DATASETS[0].columns, rows: window.GLOBAL_DATASETS[0] })"
+    )
+    assert decoded["columns"] == ["mois_annee", "montant", "label"]
+    assert len(decoded["rows"]) == 400
+    assert decoded["rows"][5] == {"mois_annee": "2025-06", "montant": 5.25, "label": "cat 2"}
@@ -0,0 +1,59 @@
+"""Browser check: each widget mounts with only the d3 sub-packages JS_FILE_D3_PACKAGES imports.
+
+Runs every widget type against both import maps: the per-package jsDelivr ``+esm`` URLs and
+the vendored copies of ``generate(offline=True)``. A ``d3.<name>`` from a package missing in
+the table is ``undefined`` at run time, and a second ``d3-selection`` instance leaves
+``selection.transition`` unpatched; both surface as uncaught page errors.
+"""
+import pytest
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.generator import WIDGET_TYPE_TO_JS_FILE, DashboardGenerator
+
+_CSV = (
+    "mois_annee,cat,src,dst,typ,l1,l2,x,y,heure,jour,valeur\n"
+    "2024-01,A,s1,t1,input,g1,h1,a,p,0,Lun,5\n"
+    "2025-01,A,s1,t1,input,g1,h1,a,p,0,Lun,10\n"
+    "2025-02,B,s2,t1,cost,g1,h2,b,q,1,Mar,20\n"
+    "2025-03,A,s1,t2,profit,g2,h3,a,q,2,Lun,30\n"
+)
+
+_MAPPINGS = {
+    "sankey": {"date": "mois_annee", "value": "valeur", "path": ["src", "dst"]},
+    "financial_sankey": {"date": "mois_annee", "source": "src", "target": "dst", "value": "valeur", "type": "typ"},
+    "evolution": {"date": "mois_annee", "value": "valeur"},
+    "sunburst": {"date": "mois_annee", "value": "valeur", "hierarchy": ["l1", "l2"]},
+    "horizon": {"date": "mois_annee", "x": "heure", "y": "jour", "value": "valeur"},
+    "nested_treemap": {"date": "mois_annee", "value": "valeur", "hierarchy": ["l1", "l2"]},
+    "stacked_area": {"date": "mois_annee", "value": "valeur", "category": "cat"},
+    "bubble": {"date": "mois_annee", "x": "heure", "y": "valeur", "r": "valeur", "category": "cat"},
+    "heatmap": {"date": "mois_annee", "x": "x", "y": "y", "value": "valeur"},
+    "radial_area": {"date": "mois_annee", "value": "valeur"},
+    "directed_chord": {"date": "mois_annee", "source": "src", "target": "dst", "value": "valeur"},
+    "ribbon_chart": {"date": "mois_annee", "value": "valeur", "category": "cat"},
+}
+
+
+def test_every_widget_type_is_covered():
+    assert sorted(_MAPPINGS) == sorted(WIDGET_TYPE_TO_JS_FILE)
+
+
+@pytest.mark.parametrize("offline", [False, True], ids=["cdn_import_map", "vendored_import_map"])
+@pytest.mark.parametrize("widget_type", sorted(_MAPPINGS))
+def test_widget_mounts_with_its_declared_d3_packages(page: Page, tmp_path, widget_type, offline):
+    page_errors = []
+    page.on("pageerror", lambda error: page_errors.append(str(error)))
+    config = {
+        "title": "Modules",
+        "widgets": [{"type": widget_type, "title": widget_type, "mapping": _MAPPINGS[widget_type]}],
+    }
+    out = tmp_path / "dash.html"
+    out.write_text(DashboardGenerator().generate(config, [_CSV], offline=offline), encoding="utf-8")
+    page.goto(out.as_uri())
+
+    expect(page.locator(".chart-box svg").first).to_be_visible()
+    if widget_type == "sunburst":
+        # Zooming runs selection.transition(): d3-transition must patch the d3-selection in use.
+        page.locator(".sunburst-arcs path").first.dispatch_event("click")
+        page.wait_for_timeout(1000)
+    assert page_errors == []
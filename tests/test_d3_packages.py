@@ -0,0 +1,130 @@
+"""Per-dashboard d3 subset: package tables stay in sync with the JS sources."""
+import json
+import os
+import re
+
+import pytest
+
+from dashboard_engine.d3_packages import (
+    D3_PACKAGE_DEPENDENCIES,
+    D3_PACKAGE_VERSIONS,
+    JS_FILE_D3_PACKAGES,
+    d3_cdn_url,
+    d3_import_block,
+    d3_packages_for,
+    d3_vendor_path,
+    with_d3_dependencies,
+)
+from dashboard_engine.generator import DashboardGenerator
+
+# Package exporting each d3.<name> the JS sources reference.
+D3_SYMBOL_PACKAGES = {
+    "d3-array": {"bisectRight", "descending", "extent", "flatRollup", "group", "max", "mean", "min", "range", "rollup", "sum"},
+    "d3-axis": {"axisBottom", "axisLeft"},
+    "d3-brush": {"brush", "brushSelection"},
+    "d3-chord": {"chordDirected", "ribbonArrow"},
+    "d3-dsv": {"csvParse"},
+    "d3-hierarchy": {"hierarchy", "partition", "treemap"},
+    "d3-interpolate": {"interpolate", "interpolateRgb"},
+    "d3-quadtree": {"quadtree"},
+    "d3-scale": {
+        "scaleBand", "scaleLinear", "scaleOrdinal", "scalePoint", "scaleRadial",
+        "scaleSequential", "scaleSqrt", "scaleUtc",
+    },
+    "d3-scale-chromatic": {"interpolateInferno", "schemeCategory10", "schemePaired", "schemeTableau10"},
+    "d3-selection": {"pointer", "select"},
+    "d3-shape": {
+        "arc", "area", "areaRadial", "curveBasis", "curveBumpX", "curveLinearClosed",
+        "curveMonotoneX", "line", "lineRadial", "link", "pointRadial", "stack",
+        "stackOffsetNone", "stackOrderNone",
+    },
+    "d3-time-format": {"utcFormat"},
+}
+JS_DIR = os.path.join(os.path.dirname(DashboardGenerator().assets_path), "assets", "js")
+# Bare specifiers of other d3 packages in a minified ES module (``from"d3-path"``).
+_BARE_IMPORT_RE = re.compile(r"""\b(?:from|import)\s*["'](d3-[\w-]+|internmap)["']""")
+_EXPORT_LIST_RE = re.compile(r"\bexport\s*\{([^}]*)\}")
+
+
+def _vendored_module_source(package):
+    path = os.path.join(DashboardGenerator().assets_path, d3_vendor_path(package))
+    if not os.path.isfile(path):
+        pytest.fail("{} is not vendored (see assets/vendor/README.md)".format(d3_vendor_path(package)))
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _d3_names(js_file):
+    with open(os.path.join(JS_DIR, os.path.basename(js_file)), encoding="utf-8") as f:
+        source = f.read()
+    source = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
+    source = re.sub(r"//[^\n]*", "", source)
+    return set(re.findall(r"\bd3\s*\.\s*([A-Za-z_]\w*)", source))
+
+
+def test_every_js_asset_declares_its_d3_packages():
+    assert sorted("js/" + name for name in os.listdir(JS_DIR) if name.endswith(".js")) == sorted(
+        JS_FILE_D3_PACKAGES
+    )
+
+
+@pytest.mark.parametrize("js_file", sorted(JS_FILE_D3_PACKAGES))
+def test_d3_references_are_covered_by_declared_packages(js_file):
+    available = set()
+    for package in JS_FILE_D3_PACKAGES[js_file]:
+        available |= D3_SYMBOL_PACKAGES.get(package, set())
+    assert _d3_names(js_file) <= available
+
+
+def test_package_tables_are_consistent():
+    for package, deps in D3_PACKAGE_DEPENDENCIES.items():
+        assert package in D3_PACKAGE_VERSIONS
+        assert set(deps) <= set(D3_PACKAGE_VERSIONS)
+    for packages in JS_FILE_D3_PACKAGES.values():
+        assert set(packages) <= set(D3_PACKAGE_VERSIONS)
+
+
+def test_heatmap_dashboard_imports_only_its_packages():
+    js_files, _ = DashboardGenerator.collect_js_asset_paths({"widgets": [{"type": "heatmap"}]})
+    assert d3_packages_for(js_files) == [
+        "d3-array", "d3-axis", "d3-dsv", "d3-scale", "d3-scale-chromatic", "d3-selection",
+    ]
+    with pytest.raises(KeyError, match="js/unknown.js"):
+        d3_packages_for(["js/unknown.js"])
+
+
+def test_with_d3_dependencies_is_transitive():
+    assert with_d3_dependencies(["d3-time-format"]) == ["d3-array", "d3-time", "d3-time-format", "internmap"]
+
+
+def test_import_block_builds_d3_namespace():
+    assert d3_import_block(["d3-array", "d3-scale-chromatic"]) == (
+        'import * as d3Array from "d3-array";\n'
+        'import * as d3ScaleChromatic from "d3-scale-chromatic";\n'
+        "const d3 = Object.assign({}, d3Array, d3ScaleChromatic);\n"
+    )
+
+
+def test_generated_page_maps_bundle_packages_to_cdn():
+    config = {"title": "x", "widgets": [{"type": "heatmap", "mapping": {"x": "a", "y": "b", "value": "c"}}]}
+    html = DashboardGenerator().generate(config, ["a,b,c\n1,2,3\n"])
+    imports = json.loads(re.search(r'<script type="importmap">(.*?)</script>', html).group(1))["imports"]
+    assert imports == dict((name, d3_cdn_url(name)) for name in d3_packages_for(
+        DashboardGenerator.collect_js_asset_paths(config)[0]
+    ))
+    assert 'import * as d3Axis from "d3-axis";' in html
+    assert "d3-hierarchy" not in html
+
+
+@pytest.mark.parametrize("package", sorted(D3_PACKAGE_VERSIONS))
+def test_vendored_module_imports_match_declared_dependencies(package):
+    imports = set(_BARE_IMPORT_RE.findall(_vendored_module_source(package)))
+    assert imports == set(D3_PACKAGE_DEPENDENCIES.get(package, ()))
+
+
+@pytest.mark.parametrize("package", sorted(D3_SYMBOL_PACKAGES))
+def test_vendored_module_exports_the_symbols_widgets_use(package):
+    exported = set()
+    for names in _EXPORT_LIST_RE.findall(_vendored_module_source(package)):
+        exported.update(spec.split(" as ")[-1].strip() for spec in names.split(","))
+    assert D3_SYMBOL_PACKAGES[package] <= exported
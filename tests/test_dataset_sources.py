@@ -0,0 +1,123 @@
+"""Table-driven tests for streaming dataset sources (paths, file objects, chunk iterables)."""
+import base64
+import gzip
+import io
+import re
+
+import pytest
+
+from dashboard_engine import datasets as datasets_module
+from dashboard_engine.datasets import (
+    Base64ChunkEncoder,
+    is_dataset_stream,
+    iter_dataset_bytes,
+    iter_dataset_text,
+    iter_gzip_base64_chunks,
+)
+from dashboard_engine.generator import (
+    CSV_ENCODING_GZIP_BASE64,
+    DashboardGenerator,
+    normalize_dataset_for_template,
+)
+
+_CSV = "mois_annee,libellé,valeur\n2025-01,Café,10\n2025-02,Thé,20\n"
+
+
+def _make_source(kind, tmp_path, text=_CSV):
+    raw = text.encode("utf-8")
+    if kind == "path":
+        p = tmp_path / "data.csv"
+        p.write_bytes(raw)
+        return p
+    if kind == "binary_fileobj":
+        return io.BytesIO(raw)
+    if kind == "text_fileobj":
+        return io.StringIO(text)
+    if kind == "str_chunks":
+        return iter([text[:7], text[7:20], text[20:]])
+    if kind == "bytes_chunks":
+        # Split inside the two-byte "é" to exercise incremental decoding.
+        cut = raw.index("é".encode("utf-8")) + 1
+        return iter([raw[:cut], raw[cut:]])
+    raise AssertionError(kind)
+
+
+_SOURCE_KINDS = ["path", "binary_fileobj", "text_fileobj", "str_chunks", "bytes_chunks"]
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("a,b\n1,2", False),
+        (b"a,b", False),
+        (io.BytesIO(b"a"), True),
+        (iter(["a"]), True),
+        (["a,b\n", "1,2"], True),
+        (42, False),
+    ],
+    ids=["str", "bytes", "fileobj", "iterator", "list_of_chunks", "int"],
+)
+def test_is_dataset_stream(value, expected):
+    assert is_dataset_stream(value) is expected
+
+
+@pytest.mark.parametrize("kind", _SOURCE_KINDS)
+def test_iter_dataset_text_roundtrip(kind, tmp_path):
+    assert "".join(iter_dataset_text(_make_source(kind, tmp_path))) == _CSV
+
+
+@pytest.mark.parametrize("kind", _SOURCE_KINDS)
+def test_streamed_gzip_base64_roundtrip(kind, tmp_path):
+    packed = normalize_dataset_for_template(_make_source(kind, tmp_path), True)
+    assert packed["encoding"] == CSV_ENCODING_GZIP_BASE64
+    b64 = "".join(packed["payload"])
+    assert gzip.decompress(base64.b64decode(b64)).decode("utf-8") == _CSV
+
+
+def test_small_read_chunks_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets_module, "DATASET_READ_CHUNK_BYTES", 5)
+    chunks = list(iter_dataset_bytes(_make_source("path", tmp_path)))
+    assert max(len(c) for c in chunks) == 5
+    assert b"".join(chunks) == _CSV.encode("utf-8")
+
+
+def test_empty_file_streams_nothing(tmp_path):
+    p = tmp_path / "empty.csv"
+    p.write_bytes(b"")
+    assert list(iter_dataset_text(p)) == []
+
+
+@pytest.mark.parametrize("split", [0, 1, 2, 3, 4, 7])
+def test_base64_chunk_encoder_matches_one_shot(split):
+    data = b"0123456789abcdef"
+    enc = Base64ChunkEncoder()
+    out = enc.encode(data[:split]) + enc.encode(data[split:]) + enc.flush()
+    assert out == base64.b64encode(data).decode("ascii")
+
+
+def test_gzip_base64_chunks_emit_only_padding_at_end():
+    chunks = list(iter_gzip_base64_chunks(iter([b"x" * 50000, b"y" * 50000])))
+    assert all("=" not in c for c in chunks[:-1])
+    assert gzip.decompress(base64.b64decode("".join(chunks))) == b"x" * 50000 + b"y" * 50000
+
+
+def test_chunk_iterable_rejects_non_text_items():
+    with pytest.raises(TypeError) as ei:
+        list(iter_dataset_bytes(iter(["a,b\n", 3])))
+    assert "chunk #1" in str(ei.value)
+
+
+def test_generate_with_path_matches_string_input(tmp_path):
+    gen = DashboardGenerator()
+    config = {"title": "x", "widgets": []}
+    from_string = gen.generate(config, [_CSV])
+    from_path = gen.generate(config, [_make_source("path", tmp_path)])
+    strip_date = re.compile(r'"generation_date": "\d{8}"')
+    assert strip_date.sub("", from_path) == strip_date.sub("", from_string)
+
+
+def test_missing_dataset_file_fails_before_rendering(tmp_path):
+    gen = DashboardGenerator()
+    with pytest.raises(IOError) as ei:
+        gen.generate({"title": "x"}, [tmp_path / "missing.csv"])
+    assert "CSV file not found" in str(ei.value)
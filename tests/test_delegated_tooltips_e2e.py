@@ -0,0 +1,68 @@
+"""Browser check: marks get their tooltip from one delegated layer instead of per-mark <title> nodes."""
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.generator import DashboardGenerator
+
+_CSV = (
+    "mois_annee,cat,src,dst,x,y,valeur\n"
+    "2024-01,A,s1,t1,a,p,5\n"
+    "2025-01,A,s1,t1,a,p,10\n"
+    "2025-02,B,s2,t1,b,q,20\n"
+)
+
+_WIDGETS = [
+    {"type": "heatmap", "mapping": {"date": "mois_annee", "x": "x", "y": "y", "value": "valeur"}},
+    {"type": "stacked_area", "mapping": {"date": "mois_annee", "value": "valeur", "category": "cat"}},
+    {"type": "ribbon_chart", "mapping": {"date": "mois_annee", "value": "valeur", "category": "cat"}},
+    {"type": "sankey", "mapping": {"date": "mois_annee", "value": "valeur", "path": ["src", "dst"]}},
+    {"type": "directed_chord", "mapping": {"date": "mois_annee", "source": "src", "target": "dst", "value": "valeur"}},
+    {"type": "evolution", "mapping": {"date": "mois_annee", "value": "valeur"}},
+]
+
+
+def _write_dashboard(tmp_path):
+    config = {
+        "title": "Tooltips",
+        "widgets": [dict(widget, title=widget["type"]) for widget in _WIDGETS],
+    }
+    out = tmp_path / "dash.html"
+    out.write_text(DashboardGenerator().generate(config, [_CSV]), encoding="utf-8")
+    return out
+
+
+def test_charts_have_no_title_nodes(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path).as_uri())
+    expect(page.locator('select[data-testid="widget-year-select"]')).to_have_count(len(_WIDGETS))
+    assert page.locator(".viz-wrapper svg title").count() == 0
+
+
+def test_hover_formats_the_hovered_datum(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path).as_uri())
+    tooltip = page.locator(".widget-tooltip")
+
+    page.locator(".heatmap-layer rect").last.hover()
+    expect(tooltip).to_be_visible()
+    expect(tooltip).to_contain_text("valeur:")
+
+    page.locator('.sankey-nodes rect[data-node="s2"]').last.hover()
+    expect(tooltip).to_contain_text("s2")
+    expect(tooltip).to_contain_text("(Cliquez pour isoler)")
+    assert tooltip.count() == 1
+
+    page.locator("header").first.hover()
+    expect(tooltip).to_be_hidden()
+
+
+def test_rebound_marks_show_updated_text(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path).as_uri())
+    box = page.locator(".chart-box", has=page.locator("h2", has_text="stacked_area"))
+    layer = box.locator("path.stacked-area-layer").last
+
+    # Area paths may not cover their bounding-box centre: dispatch the move on the path itself.
+    layer.dispatch_event("pointermove")
+    expect(page.locator(".widget-tooltip")).to_be_visible()
+    expect(page.locator(".widget-tooltip")).not_to_contain_text("100% stacked")
+
+    box.locator(".ctrl-normalized-toggle input").check()
+    layer.dispatch_event("pointermove")
+    expect(page.locator(".widget-tooltip")).to_contain_text("100% stacked mode")
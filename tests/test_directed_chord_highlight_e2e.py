@@ -0,0 +1,64 @@
+"""Browser check: directed chord hover focus is one class on the svg root, resolved by CSS."""
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.generator import DashboardGenerator
+
+# Groups sorted by name: A=0, B=1, C=2. Ribbons A->B, B->C, C->A; A is not incident to B->C.
+_CSV = (
+    "mois_annee,src,dst,valeur\n"
+    "2025-01,A,B,10\n"
+    "2025-01,B,C,20\n"
+    "2025-01,C,A,30\n"
+)
+
+
+def _write_dashboard(tmp_path):
+    config = {
+        "title": "Chord",
+        "widgets": [
+            {
+                "type": "directed_chord",
+                "title": "Chord",
+                "mapping": {"date": "mois_annee", "source": "src", "target": "dst", "value": "valeur"},
+            }
+        ],
+    }
+    out = tmp_path / "dash.html"
+    out.write_text(DashboardGenerator().generate(config, [_CSV]), encoding="utf-8")
+    return out
+
+
+def _fill_opacity(locator):
+    return float(locator.evaluate("(el) => getComputedStyle(el).fillOpacity"))
+
+
+def test_group_hover_focuses_incident_ribbons(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path).as_uri())
+    svg = page.locator("svg.directed-chord-svg")
+    incident = page.locator(".directed-chord-ribbon.chord-src-0")
+    other = page.locator(".directed-chord-ribbon.chord-src-1.chord-tgt-2")
+    expect(other).to_have_count(1)
+
+    # Thin arcs may not cover their bounding-box centre: dispatch the pointer events directly.
+    page.locator(".directed-chord-arc.chord-grp-0").dispatch_event("pointerover")
+    expect(svg).to_have_class("directed-chord-svg chord-focus chord-focus-g0")
+    assert _fill_opacity(incident) > 0.8
+    assert _fill_opacity(page.locator(".directed-chord-ribbon.chord-tgt-0")) > 0.8
+    assert _fill_opacity(other) < 0.2
+    assert _fill_opacity(page.locator(".directed-chord-arc.chord-grp-1")) < 0.5
+
+    svg.dispatch_event("pointerleave")
+    expect(svg).to_have_class("directed-chord-svg")
+    assert _fill_opacity(other) > 0.8
+
+
+def test_ribbon_hover_focuses_the_ribbon_and_its_end_groups(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path).as_uri())
+    ribbon = page.locator(".directed-chord-ribbon.chord-src-1.chord-tgt-2")
+    ribbon.dispatch_event("pointerover")
+
+    expect(ribbon).to_have_class("directed-chord-ribbon chord-src-1 chord-tgt-2 is-hovered")
+    assert _fill_opacity(page.locator(".directed-chord-arc.chord-grp-1")) == 1
+    assert _fill_opacity(page.locator(".directed-chord-arc.chord-grp-2")) == 1
+    assert _fill_opacity(page.locator(".directed-chord-arc.chord-grp-0")) < 0.5
+    assert _fill_opacity(page.locator(".directed-chord-ribbon.chord-src-0")) < 0.2
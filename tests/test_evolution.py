@@ -156,8 +156,11 @@ def test_data_aggregation_accuracy(page: Page, generated_report):
     # January is index 0 (data sorted by month)
     january_dot = dots.nth(0)
     
-    # Tooltip from internal SVG <title>; text_content() reads it
-    tooltip_text = january_dot.text_content()
+    # Tooltip built on hover by the shared tooltip layer
+    january_dot.hover()
+    tooltip = page.locator(".widget-tooltip")
+    expect(tooltip).to_be_visible()
+    tooltip_text = tooltip.text_content()
     
     print(f"January tooltip: '{tooltip_text}'")
     
@@ -233,14 +236,16 @@ def test_evolution_n_minus_1_interactivity(page: Page, generated_report):
 
     container = page.locator(".sub-chart svg")
     
-    # N-1 dots: title text includes prior year (2024 for anchor 2025)
-    dot_n1 = container.locator("circle").filter(has_text="Année 2024").first
+    # N-1 dots (dashed series)
+    dot_n1 = container.locator("circle.dot-N1").first
     
     expect(dot_n1).to_be_visible()
     
-    # Tooltip N-1
-    expect(dot_n1).to_contain_text("Année 2024")  # internal <title>
-    expect(dot_n1).to_contain_text("Val:")
+    # Tooltip N-1: label includes prior year (2024 for anchor 2025)
+    dot_n1.hover()
+    tooltip = page.locator(".widget-tooltip")
+    expect(tooltip).to_contain_text("Année 2024")
+    expect(tooltip).to_contain_text("Val:")
 
 
 def test_evolution_percentage_labels(page: Page, generated_report, csv_data_file):
@@ -102,18 +102,18 @@ def test_financial_semantic_coloring(page: Page, generated_report):
     
     # 1. Check 'Operating Profit' (Type: profit -> Green)
     # We find the rect associated with the text 'Operating Profit'
-    # Since rect and text are siblings in the group, we filter rects by their title content.
-    profit_node = chart_n.locator("rect").filter(has_text="Operating Profit").first
+    # Node rects carry their name in data-node.
+    profit_node = chart_n.locator('rect[data-node="Operating Profit"]').first
     
     # Verify Fill Color
     expect(profit_node).to_have_attribute("fill", "#2e7d32")
     
     # 2. Check 'Tax' (Type: cost -> Red)
-    tax_node = chart_n.locator("rect").filter(has_text="Tax").first
+    tax_node = chart_n.locator('rect[data-node="Tax"]').first
     expect(tax_node).to_have_attribute("fill", "#c62828")
     
     # 3. Check 'Sales' (Root/Input -> default/input color)
-    sales_node = chart_n.locator("rect").filter(has_text="Sales").first
+    sales_node = chart_n.locator('rect[data-node="Sales"]').first
     # According to logic: if !targetLinks (Root) -> PALETTE['input'].node -> #546e7a
     expect(sales_node).to_have_attribute("fill", "#546e7a")
 
@@ -153,8 +153,8 @@ def test_financial_links_rendering(page: Page, generated_report):
     chart_n = page.locator(".sub-chart").last
     
     # D3 Sankey links are paths. We find the one connecting Revenue to Tax.
-    # We use the title tooltip which contains "Revenue -> Tax"
-    link_tax = chart_n.locator("path").filter(has_text="Revenue → Tax").first
+    # Links carry their end node names in data-source / data-target.
+    link_tax = chart_n.locator('path[data-source="Revenue"][data-target="Tax"]').first
     
     expect(link_tax).to_be_visible()
     
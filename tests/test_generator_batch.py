@@ -0,0 +1,101 @@
+"""Batch rendering with DashboardGenerator.generate_many()."""
+import base64
+import gzip
+import io
+import re
+
+import pytest
+
+from dashboard_engine.generator import DashboardGenerator
+
+_DATE_RE = re.compile(r'"generation_date": "\d{8}"')
+
+
+def _job(i, **extra):
+    job = {
+        "config": {"title": "Merchant {0}".format(i), "widgets": [{"type": "bubble", "title": "B"}]},
+        "datasets_list": ["merchant,value\nm{0},{0}\n".format(i)],
+    }
+    job.update(extra)
+    return job
+
+
+@pytest.mark.parametrize("workers", [1, 2], ids=["in_process", "process_pool"])
+def test_generate_many_writes_each_job(tmp_path, workers):
+    gen = DashboardGenerator()
+    jobs = [_job(i) for i in range(5)]
+
+    results = gen.generate_many(jobs, str(tmp_path), workers=workers)
+
+    assert [r["index"] for r in results] == list(range(5))
+    for job, result in zip(jobs, results):
+        assert result["filename"] == "dashboard_{0}.html".format(result["index"])
+        html = io.open(result["path"], encoding="utf-8").read()
+        expected = gen.generate(job["config"], job["datasets_list"])
+        assert _DATE_RE.sub("", html) == _DATE_RE.sub("", expected)
+        assert result["bytes"] == len(html.encode("utf-8"))
+        assert result["seconds"] >= 0
+        assert result["error"] is None
+
+
+def test_per_job_options_override_batch_defaults(tmp_path):
+    jobs = [_job(0, filename="plain.html"), _job(1, filename="packed.html", compress_data=True)]
+
+    results = DashboardGenerator().generate_many(jobs, str(tmp_path / "out"), workers=1)
+
+    plain = io.open(results[0]["path"], encoding="utf-8").read()
+    packed = io.open(results[1]["path"], encoding="utf-8").read()
+    assert "m0,0" in plain
+    b64 = re.search(r'data-csv-encoding="gzip-base64">\s*(\S+)', packed).group(1)
+    assert gzip.decompress(base64.b64decode(b64)).decode("utf-8") == "merchant,value\nm1,1\n"
+
+
+def test_file_path_datasets_are_sent_to_workers(tmp_path):
+    csv_path = tmp_path / "m.csv"
+    csv_path.write_text("merchant,value\nmx,7\n", encoding="utf-8")
+    jobs = [{"config": {"title": "t"}, "datasets_list": [csv_path]} for _ in range(2)]
+
+    results = DashboardGenerator().generate_many(jobs, str(tmp_path / "out"), workers=2)
+
+    for r in results:
+        assert "mx,7" in io.open(r["path"], encoding="utf-8").read()
+
+
+@pytest.mark.parametrize("workers", [1, 2], ids=["in_process", "process_pool"])
+def test_failed_job_is_reported_without_discarding_the_batch(tmp_path, workers):
+    bad_csv = tmp_path / "bad.csv"
+    bad_csv.write_bytes(b"merchant,value\n\xff\xfe,1\n")
+    jobs = [_job(0), {"config": {"title": "Bad"}, "datasets_list": [bad_csv]}, _job(2)]
+
+    results = DashboardGenerator().generate_many(jobs, str(tmp_path / "out"), workers=workers)
+
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert results[1]["error"].startswith("UnicodeDecodeError:")
+    assert results[1]["bytes"] is None
+    assert not (tmp_path / "out" / results[1]["filename"]).exists()
+    for r in (results[0], results[2]):
+        assert r["error"] is None
+        assert "m{0},{0}".format(r["index"]) in io.open(r["path"], encoding="utf-8").read()
+
+
+@pytest.mark.parametrize(
+    "jobs,workers,exc_type,msg",
+    [
+        ([_job(0, filename="a.html"), _job(1, filename="a.html")], 1, ValueError, "duplicate"),
+        ([{"config": {}}], 1, ValueError, "missing required keys: datasets_list"),
+        ([_job(0, colour="red")], 1, ValueError, "unknown keys: colour"),
+        (["nope"], 1, TypeError, "jobs[0] must be a dict"),
+        ([_job(0), _job(1)], 0, ValueError, "workers must be >= 1"),
+        (
+            [_job(0), {"config": {}, "datasets_list": [iter(["a\\n1"])]}],
+            2,
+            TypeError,
+            "only CSV strings and file paths",
+        ),
+    ],
+    ids=["duplicate_filename", "missing_key", "unknown_key", "not_a_dict", "zero_workers", "stream_in_pool"],
+)
+def test_generate_many_rejects_invalid_jobs(tmp_path, jobs, workers, exc_type, msg):
+    with pytest.raises(exc_type) as ei:
+        DashboardGenerator().generate_many(jobs, str(tmp_path), workers=workers)
+    assert msg in str(ei.value)
@@ -0,0 +1,88 @@
+"""Process-wide asset / bundle / template cache used by DashboardGenerator."""
+import os
+
+import pytest
+
+from dashboard_engine.cache import AssetCache
+from dashboard_engine.generator import DashboardGenerator
+
+
+@pytest.fixture
+def clean_cache():
+    DashboardGenerator.clear_cache()
+    yield
+    DashboardGenerator.clear_cache()
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(str(path), (st.st_atime + 10, st.st_mtime + 10))
+
+
+def test_environment_is_shared_between_generators(clean_cache):
+    assert DashboardGenerator().env is DashboardGenerator().env
+    assert DashboardGenerator.cache_stats()["environments"] == {"hits": 1, "misses": 1}
+
+
+def test_second_generate_only_hits_the_cache(clean_cache):
+    config = {"title": "x", "widgets": [{"type": "heatmap", "title": "h"}]}
+    DashboardGenerator().generate(config, ["a\n1"])
+    first = DashboardGenerator.cache_stats()
+    DashboardGenerator().generate(config, ["a\n1"])
+    second = DashboardGenerator.cache_stats()
+
+    for kind in ("assets", "bundles", "templates"):
+        assert second[kind]["misses"] == first[kind]["misses"], kind
+        assert second[kind]["hits"] > first[kind]["hits"], kind
+
+
+def test_bundle_key_ignores_widget_order(clean_cache):
+    gen = DashboardGenerator()
+    a = {"title": "x", "widgets": [{"type": "heatmap"}, {"type": "sankey"}]}
+    b = {"title": "x", "widgets": [{"type": "sankey"}, {"type": "heatmap"}, {"type": "sankey"}]}
+    bundle_a = gen._get_js_bundle(*gen.collect_js_asset_paths(a))
+    bundle_b = gen._get_js_bundle(*gen.collect_js_asset_paths(b))
+
+    assert bundle_a == bundle_b
+    assert DashboardGenerator.cache_stats()["bundles"] == {"hits": 1, "misses": 1}
+    assert bundle_a.index("// --- js/heatmap_widget.js ---") < bundle_a.index(
+        "// --- js/sankey_widget.js ---"
+    )
+
+
+def test_sankey_flag_is_part_of_the_bundle_key(clean_cache):
+    gen = DashboardGenerator()
+    files, _ = gen.collect_js_asset_paths({"widgets": []})
+    assert gen._get_js_bundle(files, False) != gen._get_js_bundle(files, True)
+    assert DashboardGenerator.cache_stats()["bundles"]["misses"] == 2
+
+
+def test_read_text_is_invalidated_by_mtime(tmp_path):
+    cache = AssetCache()
+    asset = tmp_path / "style.css"
+    asset.write_text("a{}", encoding="utf-8")
+
+    assert cache.read_text(str(asset)) == "a{}"
+    assert cache.read_text(str(asset)) == "a{}"
+    asset.write_text("b{}", encoding="utf-8")
+    _bump_mtime(asset)
+    assert cache.read_text(str(asset)) == "b{}"
+    assert cache.stats()["assets"] == {"hits": 1, "misses": 2}
+
+
+def test_bundle_is_rebuilt_when_a_source_changes(tmp_path):
+    cache = AssetCache()
+    part = tmp_path / "part.js"
+    part.write_text("1", encoding="utf-8")
+    calls = []
+
+    def build():
+        calls.append(1)
+        return part.read_text(encoding="utf-8")
+
+    assert cache.get_bundle("k", [str(part)], build) == "1"
+    assert cache.get_bundle("k", [str(part)], build) == "1"
+    part.write_text("2", encoding="utf-8")
+    _bump_mtime(part)
+    assert cache.get_bundle("k", [str(part)], build) == "2"
+    assert len(calls) == 2
@@ -0,0 +1,157 @@
+"""columnar-v1 dataset encoding (generate(dataset_format="columnar-v1"))."""
+import array
+import base64
+import csv
+import gzip
+import io
+import json
+import re
+import struct
+
+import pytest
+
+from dashboard_engine import columnar as columnar_module
+from dashboard_engine.columnar import iter_columnar_v1_base64, iter_columnar_v1_bytes
+from dashboard_engine.generator import (
+    CSV_ENCODING_COLUMNAR_V1,
+    DashboardGenerator,
+    normalize_dataset_for_template,
+)
+from dashboard_engine.transforms import numeric_columns_by_dataset
+
+_TYPECODES = {"float64": "d", "int32": "i", "uint8": "B", "uint16": "H", "uint32": "I"}
+
+
+def _decode(blob):
+    """Reference decoder mirroring decodeColumnarV1 in main.js."""
+    assert blob[:4] == b"DCOL"
+    (header_len,) = struct.unpack("<I", blob[4:8])
+    header = json.loads(blob[8:8 + header_len].decode("utf-8"))
+    data_start = -(-(8 + header_len) // 8) * 8
+    columns = {}
+    for col in header["columns"]:
+        raw = blob[data_start + col["offset"]:data_start + col["offset"] + col["length"]]
+        values = array.array(_TYPECODES[col.get("codeType", col["kind"])], raw)
+        if col["kind"] == "dict":
+            values = [col["dictionary"][c] for c in values]
+        columns[col["name"]] = (col["kind"], list(values))
+    return header, columns
+
+
+def _numeric_csv(n):
+    lines = ["mois_annee,montant,qty,cat"]
+    lines += ["2024-{:02d},{}.5,{},{}".format(i % 12 + 1, i, i * 7, "AB"[i % 2]) for i in range(n)]
+    return "\n".join(lines) + "\n"
+
+
+def test_text_columns_are_dictionary_coded():
+    csv_text = 'a,b\nx,"1, 2"\ny,é\nx,\n'
+    header, columns = _decode(b"".join(iter_columnar_v1_bytes(csv_text)))
+    assert header["rows"] == 3
+    assert columns["a"] == ("dict", ["x", "y", "x"])
+    assert columns["b"] == ("dict", ["1, 2", "é", ""])
+
+
+def test_numeric_columns_become_typed_arrays():
+    numeric = {"montant", "qty"}
+    _, columns = _decode(b"".join(iter_columnar_v1_bytes(_numeric_csv(300), numeric)))
+    assert columns["montant"] == ("float64", [i + 0.5 for i in range(300)])
+    assert columns["qty"] == ("int32", [i * 7 for i in range(300)])
+    assert columns["mois_annee"][0] == "dict"
+    assert columns["cat"][1][:3] == ["A", "B", "A"]
+
+
+@pytest.mark.parametrize(
+    "values,kind",
+    [
+        (["1", "", "2"], "dict"),
+        (["1", "2", "n/a"], "dict"),
+        (["1", "2", "3000000000"], "float64"),
+        (["1", "-2", "0x10"], "int32"),
+    ],
+    ids=["empty_cell", "non_numeric", "beyond_int32", "hex_literal"],
+)
+def test_numeric_kind_selection(monkeypatch, values, kind):
+    monkeypatch.setattr(columnar_module, "COLUMNAR_NUMERIC_MIN_DISTINCT", 0)
+    _, columns = _decode(b"".join(iter_columnar_v1_bytes("v\n" + "\n".join(values) + "\n", {"v"})))
+    assert columns["v"][0] == kind
+
+
+def test_unmapped_numeric_looking_columns_keep_their_text():
+    lines = ["code,hex,montant"] + ["{:03d},0x{:X},{}".format(i, i, i) for i in range(300)]
+    _, columns = _decode(b"".join(iter_columnar_v1_bytes("\n".join(lines) + "\n", {"montant"})))
+    assert columns["code"][0] == "dict"
+    assert columns["code"][1][7] == "007"
+    assert columns["hex"][1][31] == "0x1F"
+    assert columns["montant"] == ("int32", list(range(300)))
+
+
+def test_numeric_columns_come_from_value_x_y_r_mappings():
+    widgets = [
+        {"type": "bubble", "mapping": {"date": "d", "x": "bx", "y": "by", "r": "br", "category": "c"}},
+        {"type": "heatmap", "mapping": {"x": "heure", "y": "jour", "value": "v"}, "datasetIndex": 1},
+        {"type": "horizon", "mapping": {"x": "hx", "y": "hy", "value": "hv"}, "datasetIndex": 1},
+        {"type": "sankey"},
+    ]
+    assert numeric_columns_by_dataset(widgets) == {0: {"bx", "by", "br"}, 1: {"v", "hx", "hv"}}
+
+
+def test_generate_type_encodes_only_mapped_columns():
+    lines = ["mois_annee,code,valeur"] + ["2025-01,{:03d},{}".format(i, i) for i in range(300)]
+    config = {"title": "x", "widgets": [{"type": "evolution", "mapping": {"date": "mois_annee", "value": "valeur"}}]}
+    html = DashboardGenerator().generate(config, ["\n".join(lines) + "\n"], dataset_format="columnar-v1")
+    b64 = re.search(r'data-csv-encoding="columnar-v1">(\S+)</script>', html).group(1)
+    _, columns = _decode(gzip.decompress(base64.b64decode(b64)))
+    assert columns["code"][1][:2] == ["000", "001"]
+    assert columns["valeur"][0] == "int32"
+
+
+def test_rows_match_d3_csv_parse_trimming():
+    # main.js trims the payload: leading / trailing blank lines are not rows, short rows pad with "".
+    header, columns = _decode(b"".join(iter_columnar_v1_bytes("\n  a,b\n1\n\n3,4  \n\n  ")))
+    assert header["rows"] == 3
+    assert columns["a"][1] == ["1", "", "3"]
+    assert columns["b"][1] == ["", "", "4"]
+
+
+@pytest.mark.parametrize("source", ["str", "binary_fileobj", "path"])
+def test_payload_is_gzip_base64_for_every_source(tmp_path, source):
+    csv_text = _numeric_csv(5)
+    if source == "binary_fileobj":
+        dataset = io.BytesIO(csv_text.encode("utf-8"))
+    elif source == "path":
+        dataset = tmp_path / "d.csv"
+        dataset.write_text(csv_text, encoding="utf-8")
+    else:
+        dataset = csv_text
+    packed = normalize_dataset_for_template(dataset, False, "columnar-v1")
+    assert packed["encoding"] == CSV_ENCODING_COLUMNAR_V1
+    blob = gzip.decompress(base64.b64decode("".join(packed["payload"])))
+    assert blob == b"".join(iter_columnar_v1_bytes(csv_text))
+
+
+def test_repetitive_categorical_data_is_smaller_than_gzipped_csv():
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["mois_annee", "pays", "canal", "segment", "produit", "montant"])
+    for i in range(20000):
+        writer.writerow([
+            "2024-{:02d}".format(i % 12 + 1), "FR DE ES IT"[(i % 4) * 3:(i % 4) * 3 + 2],
+            ("web", "store", "phone")[i % 3], "segment-{}".format(i % 5),
+            "produit-{}".format(i % 40), i % 9,
+        ])
+    csv_text = out.getvalue()
+    columnar_b64 = "".join(iter_columnar_v1_base64(csv_text))
+    csv_b64 = base64.b64encode(gzip.compress(csv_text.encode("utf-8"), 9))
+    assert len(columnar_b64) < len(csv_b64)
+
+
+def test_generate_embeds_columnar_marker():
+    html = DashboardGenerator().generate({"title": "x"}, ["a\n1\n"], dataset_format="columnar-v1")
+    assert re.search(r'<script id="dataset-0" type="text/csv" data-csv-encoding="columnar-v1">', html)
+
+
+def test_unknown_dataset_format_is_rejected():
+    with pytest.raises(ValueError) as ei:
+        DashboardGenerator().generate({"title": "x"}, ["a\n1\n"], dataset_format="parquet")
+    assert "dataset_format must be one of" in str(ei.value)
@@ -0,0 +1,128 @@
+"""Pre-parsed month indexes for mapping.date columns (generate(parse_dates=True))."""
+import array
+import base64
+import gzip
+import io
+import re
+import warnings
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.generator import DashboardGenerator, build_month_indexes
+from dashboard_engine.transforms import month_index_code, month_index_columns
+
+_CSV = "mois_annee,valeur,fin\n2024-01,10,2024-03\nbad,5,2024-04\n2025-02-14,20,2025-1.5\n"
+
+
+def _codes(payload):
+    return list(array.array("H", gzip.decompress(base64.b64decode(payload))))
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("2024-01", 2024 * 12),
+        ("2025-12-31", 2025 * 12 + 11),
+        (" 2024 - 3", 2024 * 12 + 2),
+        ("2024", 0),
+        ("", 0),
+        ("2024-00", 0),
+        ("2024-13", None),
+        ("2024-1.5", None),
+        ("9999-01", None),
+    ],
+    ids=["month", "day_suffix", "spaces", "no_month", "empty", "month_zero", "month_13",
+         "fractional", "year_too_large"],
+)
+def test_month_index_code(text, expected):
+    assert month_index_code(text) == expected
+
+
+def test_month_index_columns_skip_unencodable_columns():
+    codes = month_index_columns(_CSV, ["mois_annee", "fin", "absent"])
+    assert list(codes) == ["mois_annee"]
+    assert list(codes["mois_annee"]) == [2024 * 12, 0, 2025 * 12 + 1]
+
+
+def test_build_month_indexes_per_dataset():
+    widgets = [
+        {"type": "evolution", "mapping": {"date": "mois_annee", "value": "valeur"}},
+        {"type": "heatmap", "datasetIndex": 1, "mapping": {"x": "a"}},
+    ]
+    indexes = build_month_indexes(widgets, [_CSV, _CSV])
+    assert [m["column"] for m in indexes[0]] == ["mois_annee"]
+    assert _codes(indexes[0][0]["payload"]) == [2024 * 12, 0, 2025 * 12 + 1]
+    assert indexes[1] == []
+
+
+def test_one_shot_streams_fall_back_to_browser_parsing():
+    widgets = [{"type": "evolution", "mapping": {"date": "mois_annee", "value": "valeur"}}]
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        indexes = build_month_indexes(widgets, [io.BytesIO(_CSV.encode("utf-8"))])
+    assert indexes == [[]]
+    assert "one-shot stream" in str(caught[0].message)
+
+
+def test_generate_embeds_month_index_script():
+    config = {"title": "x", "widgets": [{"type": "evolution", "mapping": {"date": "mois_annee", "value": "valeur"}}]}
+    gen = DashboardGenerator()
+    html = gen.generate(config, [_CSV], parse_dates=True)
+    match = re.search(
+        r'<script type="application/octet-stream" data-month-index-for="0" '
+        r'data-date-column="mois_annee">(.*?)</script>',
+        html,
+    )
+    assert _codes(match.group(1)) == [2024 * 12, 0, 2025 * 12 + 1]
+    assert "application/octet-stream" not in gen.generate(config, [_CSV])
+
+
+@pytest.mark.parametrize("dataset_format", ["csv", "columnar-v1"])
+def test_widgets_read_years_from_month_index(page: Page, tmp_path, dataset_format):
+    config = {
+        "title": "Dates",
+        "widgets": [
+            {"type": "evolution", "title": "A", "mapping": {"date": "mois_annee", "value": "valeur"}},
+            {"type": "stacked_area", "title": "B", "mapping": {"date": "fin", "value": "valeur"}},
+        ],
+    }
+    csv_content = "mois_annee,valeur,fin\n2024-01,10,2023-05\n2025-02,20,2023-06\n"
+    html = DashboardGenerator().generate(
+        config, [csv_content], js_bundle_mode="full", parse_dates=True, dataset_format=dataset_format
+    )
+    out = tmp_path / "dash.html"
+    out.write_text(html, encoding="utf-8")
+    page.goto(out.as_uri())
+
+    year_selects = page.locator('select[data-testid="widget-year-select"]')
+    expect(year_selects.first).to_have_value("2025")
+    assert year_selects.nth(0).locator("option").all_inner_texts() == ["2024", "2025"]
+    assert year_selects.nth(1).locator("option").all_inner_texts() == ["2023"]
+    assert page.evaluate("() => Object.keys(window.GLOBAL_DATASETS[0].monthIndex).sort()") == [
+        "fin",
+        "mois_annee",
+    ]
+
+
+def test_unindexed_date_column_ignores_the_in_place_calendar(page: Page, tmp_path):
+    # "fin" has a cell the month index cannot encode: it is parsed in the browser, from rows
+    # that the "mois_annee" index annotated in place. Its "bad" row must not keep 2025.
+    config = {
+        "title": "Dates",
+        "widgets": [
+            {"type": "evolution", "title": "A", "mapping": {"date": "mois_annee", "value": "valeur"}},
+            {"type": "stacked_area", "title": "B", "mapping": {"date": "fin", "value": "valeur"}},
+        ],
+    }
+    csv_content = "mois_annee,valeur,fin\n2024-01,10,2023-05\n2025-02,20,bad\n2025-03,30,2023-1.5\n"
+    html = DashboardGenerator().generate(config, [csv_content], js_bundle_mode="full", parse_dates=True)
+    out = tmp_path / "dash.html"
+    out.write_text(html, encoding="utf-8")
+    page.goto(out.as_uri())
+
+    year_selects = page.locator('select[data-testid="widget-year-select"]')
+    expect(year_selects).to_have_count(2)
+    assert page.evaluate("() => Object.keys(window.GLOBAL_DATASETS[0].monthIndex)") == ["mois_annee"]
+    assert year_selects.nth(0).locator("option").all_inner_texts() == ["2024", "2025"]
+    assert year_selects.nth(1).locator("option").all_inner_texts() == ["2023"]
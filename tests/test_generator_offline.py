@@ -0,0 +1,108 @@
+"""generate(offline=True): vendored d3 sub-packages / d3-sankey inlined through an import map."""
+import base64
+import json
+import os
+import re
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.d3_packages import D3_PACKAGE_VERSIONS, d3_vendor_path
+from dashboard_engine.generator import D3_SANKEY_CDN_URL, VENDOR_D3_SANKEY_MODULE, DashboardGenerator
+
+_CSV = "mois_annee,src,dst,valeur\n2025-01,A,B,10\n2025-02,A,C,20\n"
+_CONFIG = {
+    "title": "Offline",
+    "widgets": [{"type": "evolution", "title": "A", "mapping": {"date": "mois_annee", "value": "valeur"}}],
+}
+# Upper bound for the first widget to mount from a local file, with no network at all.
+TIME_TO_FIRST_WIDGET_BUDGET_MS = 5000
+
+
+def _vendor_modules():
+    d3_modules = tuple((name, d3_vendor_path(name)) for name in sorted(D3_PACKAGE_VERSIONS))
+    return d3_modules + (VENDOR_D3_SANKEY_MODULE,)
+
+
+def _write_vendor_files(root):
+    for url, rel in _vendor_modules():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("export const source = {!r};\n".format(url), encoding="utf-8")
+
+
+def _data_url_source(url):
+    prefix = "data:text/javascript;base64,"
+    assert url.startswith(prefix)
+    return base64.b64decode(url[len(prefix):]).decode("utf-8")
+
+
+def test_offline_import_map_maps_specifiers_to_vendored_modules(tmp_path):
+    _write_vendor_files(tmp_path)
+    gen = DashboardGenerator()
+    gen.assets_path = str(tmp_path)
+    js_files = ["js/main.js", "js/sunburst_widget.js"]
+
+    imports = json.loads(gen._import_map(js_files, False, offline=True))["imports"]
+    # d3-transition pulls its own dependencies (d3-timer, d3-ease, ...) into the map.
+    assert {"d3-selection", "d3-transition", "d3-timer", "d3-ease"} <= set(imports)
+    assert "d3-chord" not in imports
+    assert D3_SANKEY_CDN_URL not in imports
+    assert _data_url_source(imports["d3-timer"]) == "export const source = 'd3-timer';\n"
+
+    imports = json.loads(gen._import_map(js_files, True, offline=True))["imports"]
+    assert D3_SANKEY_CDN_URL in imports
+
+
+def test_offline_without_vendored_files_raises(tmp_path):
+    gen = DashboardGenerator()
+    gen.assets_path = str(tmp_path)
+    with pytest.raises(IOError, match=r"vendor/d3/d3-color\.min\.js"):
+        gen._import_map(["js/main.js"], False, offline=True)
+
+
+def test_import_map_precedes_module_script(monkeypatch):
+    gen = DashboardGenerator()
+    monkeypatch.setattr(gen, "_import_map", lambda js_files, include_d3_sankey, offline: '{"imports": {}}')
+    html = gen.generate(_CONFIG, [_CSV], offline=True)
+    assert html.index('<script type="importmap">{"imports": {}}</script>') < html.index('<script type="module">')
+
+
+def test_vendored_modules_are_committed():
+    assets_path = DashboardGenerator().assets_path
+    missing = [rel for _, rel in _vendor_modules() if not os.path.isfile(os.path.join(assets_path, rel))]
+    assert missing == [], "build them as described in assets/vendor/README.md"
+
+
+def test_offline_page_has_no_cdn_url():
+    html = DashboardGenerator().generate(_CONFIG, [_CSV], offline=True)
+    assert "cdn.jsdelivr.net" not in html.replace(D3_SANKEY_CDN_URL, "")
+
+
+def test_offline_dashboard_renders_without_network(page: Page, tmp_path):
+    network_requests = []
+    page_errors = []
+    page.on("pageerror", lambda error: page_errors.append(str(error)))
+
+    def block(route):
+        network_requests.append(route.request.url)
+        route.abort()
+
+    page.context.route(re.compile(r"^https?://"), block)
+    config = dict(_CONFIG, widgets=_CONFIG["widgets"] + [
+        {
+            "type": "sankey",
+            "title": "S",
+            "description": "**Source**",
+            "mapping": {"date": "mois_annee", "path": ["src", "dst"], "value": "valeur"},
+        },
+    ])
+    out = tmp_path / "dash.html"
+    out.write_text(DashboardGenerator().generate(config, [_CSV], offline=True), encoding="utf-8")
+    page.goto(out.as_uri())
+
+    expect(page.locator('select[data-testid="widget-year-select"]').first).to_have_value("2025")
+    time_to_first_widget = page.evaluate("() => performance.now()")
+    assert network_requests == []
+    assert page_errors == []
+    assert time_to_first_widget < TIME_TO_FIRST_WIDGET_BUDGET_MS
@@ -0,0 +1,143 @@
+"""Python-side pre-aggregation of datasets (generate(preaggregate=True))."""
+import io
+import json
+import math
+import re
+import warnings
+
+import pytest
+
+from dashboard_engine.generator import DashboardGenerator
+from dashboard_engine.transforms import (
+    js_number,
+    js_year_month,
+    preaggregate_datasets,
+    widget_aggregation_signature,
+)
+
+_TX = (
+    "mois_annee,montant,categorie,marchand,client\n"
+    "2024-01-03,10,Food,A,c1\n"
+    "2024-01-17,5,Food,A,c2\n"
+    "2024-01-20,-4,Food,B,c3\n"
+    "2024-02-01,7,Travel,A,c1\n"
+    "bad-date,100,Food,A,c1\n"
+    "2024-02-11,n/a,Travel,A,c9\n"
+)
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [("12", 12.0), (" 3.5 ", 3.5), ("", 0.0), ("0x1f", 31.0), ("-Infinity", float("-inf")), ("1e3", 1000.0)],
+)
+def test_js_number(text, expected):
+    assert js_number(text) == expected
+
+
+@pytest.mark.parametrize("text", ["abc", "1,5", "inf", "1_000", "12px"])
+def test_js_number_nan(text):
+    assert math.isnan(js_number(text))
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [("2024-01", (2024.0, 1.0)), ("2024-03-15", (2024.0, 3.0)), ("2024", None), ("x-01", None),
+     ("2024-00", None), ("", None)],
+)
+def test_js_year_month(text, expected):
+    assert js_year_month(text) == expected
+
+
+@pytest.mark.parametrize(
+    "widget,expected",
+    [
+        ({"type": "evolution", "mapping": {"date": "d", "value": "v"}}, ("d", "v", (), False, False)),
+        ({"type": "sankey", "mapping": {"date": "d", "value": "v", "path": ["a", "b", "c"]}},
+         ("d", "v", ("a", "b", "c"), True, False)),
+        ({"type": "sankey", "mapping": {"date": "d", "value": "v", "source": "s", "target": "t"}},
+         ("d", "v", ("s", "t"), True, False)),
+        ({"type": "financial_sankey", "mapping": {"date": "d", "value": "v", "source": "s", "target": "t"}},
+         ("d", "v", ("s", "t"), False, False)),
+        ({"type": "directed_chord", "mapping": {"date": "d", "value": "v", "source": "s", "target": "t"}},
+         ("d", "v", ("s", "t"), False, True)),
+        ({"type": "sunburst", "mapping": {"date": "d", "value": "v", "hierarchy": ["a", "b"]}},
+         ("d", "v", ("a", "b"), False, False)),
+        ({"type": "heatmap", "mapping": {"date": "d", "value": "v", "x": "x", "y": "y"}}, None),
+        ({"type": "evolution", "mapping": {"date": "d"}}, None),
+        ({"type": "stacked_area"}, None),
+    ],
+    ids=["evolution", "sankey_path", "sankey_pair", "financial_sankey", "directed_chord", "sunburst", "heatmap",
+         "no_value", "no_mapping"],
+)
+def test_widget_aggregation_signature(widget, expected):
+    assert widget_aggregation_signature(widget) == expected
+
+
+def test_monthly_sums_per_dimension():
+    widgets = [{"type": "stacked_area", "mapping": {"date": "mois_annee", "value": "montant", "category": "categorie"}}]
+    new_widgets, datasets = preaggregate_datasets(widgets, [_TX])
+    assert new_widgets[0]["datasetIndex"] == 1
+    assert widgets[0].get("datasetIndex") is None
+    assert datasets == ["", "mois_annee,categorie,montant\n2024-1,Food,11\n2024-2,Travel,7\n"]
+
+
+def test_sankey_sums_only_positive_values():
+    widgets = [{"type": "sankey", "mapping": {"date": "mois_annee", "value": "montant", "source": "categorie", "target": "marchand"}}]
+    _, datasets = preaggregate_datasets(widgets, [_TX])
+    assert datasets[1] == (
+        "mois_annee,categorie,marchand,montant\n2024-1,Food,A,15\n2024-1,Food,B,0\n2024-2,Travel,A,7\n"
+    )
+
+
+def test_infinite_values_match_each_widget_sum():
+    tx = "mois_annee,montant,client,marchand\n2024-01,10,c1,A\n2024-01,Infinity,c1,A\n2024-01,5,c2,A\n"
+    evo = {"type": "evolution", "mapping": {"date": "mois_annee", "value": "montant"}}
+    chord = {"type": "directed_chord", "mapping": {"date": "mois_annee", "value": "montant",
+                                                   "source": "client", "target": "marchand"}}
+    _, datasets = preaggregate_datasets([evo, chord], [tx])
+    # d3.sum keeps infinities; directed_chord skips rows whose value is not finite.
+    assert datasets[1] == "mois_annee,montant\n2024-1,Infinity\n"
+    assert datasets[2] == "mois_annee,client,marchand,montant\n2024-1,c1,A,10\n2024-1,c2,A,5\n"
+
+
+def test_one_dataset_per_signature_and_raw_readers_keep_source():
+    evo = {"type": "evolution", "mapping": {"date": "mois_annee", "value": "montant"}}
+    heat = {"type": "heatmap", "mapping": {"date": "mois_annee", "x": "client", "y": "marchand", "value": "montant"}}
+    widgets, datasets = preaggregate_datasets([evo, heat, dict(evo, title="again")], [_TX])
+    assert [w.get("datasetIndex") for w in widgets] == [1, None, 1]
+    assert datasets[0] == _TX
+    assert datasets[1] == "mois_annee,montant\n2024-1,11\n2024-2,7\n"
+
+
+def test_one_shot_stream_cannot_be_read_twice():
+    evo = {"type": "evolution", "mapping": {"date": "mois_annee", "value": "montant"}}
+    with pytest.raises(ValueError) as ei:
+        preaggregate_datasets([evo, {"type": "bubble"}], [iter([_TX])])
+    assert "one-shot stream" in str(ei.value)
+
+
+def test_stream_source_is_aggregated_in_one_pass():
+    evo = {"type": "evolution", "mapping": {"date": "mois_annee", "value": "montant"}}
+    chord = {"type": "directed_chord", "mapping": {"date": "mois_annee", "value": "montant",
+                                                   "source": "client", "target": "marchand"}}
+    _, datasets = preaggregate_datasets([evo, chord], [io.BytesIO(_TX.encode("utf-8"))])
+    assert datasets[1] == "mois_annee,montant\n2024-1,11\n2024-2,7\n"
+    assert datasets[2].splitlines()[:2] == ["mois_annee,client,marchand,montant", "2024-1,c1,A,10"]
+
+
+def test_missing_column_warns():
+    evo = {"type": "evolution", "mapping": {"date": "mois_annee", "value": "amount"}}
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        preaggregate_datasets([evo], [_TX])
+    assert "'amount'" in str(caught[0].message)
+
+
+def test_generate_rewrites_embedded_config():
+    config = {"title": "x", "widgets": [{"type": "evolution", "mapping": {"date": "mois_annee", "value": "montant"}}]}
+    html = DashboardGenerator().generate(config, [_TX], preaggregate=True, prune_columns=True)
+    embedded = json.loads(re.search(r'<script id="dashboard-config"[^>]*>(.*?)</script>', html, re.S).group(1))
+    assert embedded["widgets"][0]["datasetIndex"] == 1
+    assert "datasetIndex" not in config["widgets"][0]
+    assert re.search(r'<script id="dataset-0" type="text/csv">\s*</script>', html)
+    assert "2024-1,11\n2024-2,7" in html
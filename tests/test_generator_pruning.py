@@ -0,0 +1,87 @@
+"""Mapping-driven column pruning (generate(prune_columns=True))."""
+import io
+import re
+import warnings
+
+import pytest
+
+from dashboard_engine.generator import DashboardGenerator
+from dashboard_engine.transforms import (
+    iter_pruned_csv_text,
+    prune_dataset_columns,
+    referenced_columns_by_dataset,
+)
+
+_CSV = (
+    "mois_annee,montant,categorie,commentaire,id\n"
+    "2024-01,10,Food,\"long, quoted\",1\n"
+    "2024-02,20,\"Say \"\"hi\"\"\",x,2\n"
+)
+
+
+def _dataset_script(html, index):
+    return re.search(
+        r'<script id="dataset-{0}" type="text/csv"[^>]*>(.*?)</script>'.format(index), html, re.S
+    ).group(1)
+
+
+@pytest.mark.parametrize(
+    "widgets,expected",
+    [
+        ([{"type": "evolution", "mapping": {"date": "mois_annee", "value": "montant"}}],
+         {0: {"mois_annee", "montant"}}),
+        ([{"type": "sunburst", "datasetIndex": 1, "mapping": {"hierarchy": ["a", "b"], "value": "v"}}],
+         {1: {"a", "b", "v"}}),
+        ([{"type": "heatmap", "mapping": {"date": "d"}}, {"type": "bubble"}], {0: None}),
+        ([{"type": "bubble", "datasetIndex": 0, "mapping": {"x": "x"}},
+          {"type": "bubble", "datasetIndex": None, "mapping": {"y": "y"}}],
+         {0: {"x", "y"}}),
+    ],
+    ids=["scalar_mapping", "hierarchy_list", "no_mapping_keeps_all", "merged_per_dataset"],
+)
+def test_referenced_columns_by_dataset(widgets, expected):
+    assert referenced_columns_by_dataset(widgets) == expected
+
+
+def test_pruned_csv_keeps_header_order_and_quoting():
+    out = "".join(iter_pruned_csv_text(_CSV, {"categorie", "mois_annee"}))
+    assert out == 'mois_annee,categorie\n2024-01,Food\n2024-02,"Say ""hi"""\n'
+
+
+@pytest.mark.parametrize(
+    "source",
+    [_CSV, iter([_CSV[:13], _CSV[13:60], _CSV[60:]]), io.BytesIO(_CSV.encode("utf-8"))],
+    ids=["str", "str_chunks", "binary_fileobj"],
+)
+def test_prune_dataset_columns_supports_every_source(source):
+    widgets = [{"type": "evolution", "mapping": {"date": "mois_annee", "value": "montant"}}]
+    [pruned] = prune_dataset_columns(widgets, [source])
+    if not isinstance(pruned, str):
+        pruned = "".join(pruned)
+    assert pruned == "mois_annee,montant\n2024-01,10\n2024-02,20\n"
+
+
+def test_leading_blank_lines_and_short_rows():
+    out = "".join(iter_pruned_csv_text("\n\na,b,c\n1\n", {"a", "c"}))
+    assert out == "a,c\n1,\n"
+
+
+def test_unreferenced_dataset_is_embedded_empty_with_warning():
+    widgets = [{"type": "evolution", "datasetIndex": 1, "mapping": {"date": "mois_annee"}}]
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        pruned = prune_dataset_columns(widgets, [_CSV, _CSV])
+    assert pruned[0] == ""
+    assert pruned[1].startswith("mois_annee\n2024-01\n")
+    assert len(caught) == 1 and "datasets_list[0]" in str(caught[0].message)
+
+
+def test_generate_prunes_embedded_payload():
+    config = {
+        "title": "x",
+        "widgets": [{"type": "evolution", "mapping": {"date": "mois_annee", "value": "montant"}}],
+    }
+    gen = DashboardGenerator()
+    html = gen.generate(config, [_CSV], prune_columns=True)
+    assert _dataset_script(html, 0).strip() == "mois_annee,montant\n2024-01,10\n2024-02,20"
+    assert "commentaire" in _dataset_script(gen.generate(config, [_CSV]), 0)
@@ -0,0 +1,94 @@
+"""Opt-in generation stats: phase timings, peak memory and per-dataset size report."""
+import gzip
+import io
+import json
+
+import pytest
+
+from dashboard_engine.generator import DashboardGenerator
+from dashboard_engine.stats import PHASES, GenerationStats
+
+_CONFIG = {"title": "Stats", "widgets": [{"type": "bubble", "title": "B", "datasetIndex": 0}]}
+_CSV = "mois_annee,label\n" + "".join("2025-{:02d},é{}\n".format(i % 12 + 1, i) for i in range(500))
+
+
+def test_generate_records_every_phase_in_order():
+    seen = []
+    stats = GenerationStats(on_phase=seen.append)
+    html = DashboardGenerator().generate(_CONFIG, [_CSV], stats=stats)
+
+    assert [p["name"] for p in stats.phases] == list(PHASES)
+    assert seen == stats.phases
+    for record in stats.phases:
+        assert record["seconds"] >= 0
+        assert record["peak_bytes"] > 0
+    assert stats.total_seconds >= sum(p["seconds"] for p in stats.phases)
+    assert stats.peak_bytes == max(p["peak_bytes"] for p in stats.phases)
+    assert stats.output_bytes == len(html.encode("utf-8"))
+
+
+def test_on_phase_alone_reports_phases():
+    names = []
+    DashboardGenerator().generate(_CONFIG, [_CSV], on_phase=lambda record: names.append(record["name"]))
+    assert names == list(PHASES)
+
+
+@pytest.mark.parametrize("streamed", [False, True], ids=["string", "stream"])
+def test_dataset_report_for_compressed_csv(streamed):
+    raw = _CSV.encode("utf-8")
+    dataset = io.BytesIO(raw) if streamed else _CSV
+    stats = GenerationStats(trace_memory=False)
+    DashboardGenerator().generate(_CONFIG, [dataset], compress_data=True, stats=stats)
+
+    entry, = stats.datasets
+    assert entry["encoding"] == "gzip-base64"
+    assert entry["raw_bytes"] == len(raw)
+    assert entry["rows"] == 500
+    assert entry["compressed_bytes"] == len(gzip.compress(raw, compresslevel=9))
+    assert entry["base64_bytes"] == 4 * ((entry["compressed_bytes"] + 2) // 3)
+    assert entry["ratio"] == pytest.approx(len(raw) / float(entry["compressed_bytes"]))
+    assert entry["seconds"] > 0
+    assert all(p["peak_bytes"] is None for p in stats.phases)
+
+
+def test_dataset_report_for_plain_csv_without_trailing_newline(tmp_path):
+    stats = GenerationStats()
+    out = tmp_path / "dash.html"
+    DashboardGenerator().generate_to_file(str(out), _CONFIG, [_CSV, "a,b\n1,2"], stats=stats)
+
+    assert [d["rows"] for d in stats.datasets] == [500, 1]
+    assert [d["compressed_bytes"] for d in stats.datasets] == [None, None]
+    assert stats.datasets[1]["raw_bytes"] == 7
+    assert stats.output_bytes == out.stat().st_size
+
+
+def test_to_json_round_trips():
+    stats = GenerationStats()
+    DashboardGenerator().generate(_CONFIG, [_CSV], compress_data=True, stats=stats)
+    report = json.loads(stats.to_json())
+    assert report == stats.as_dict()
+    assert set(report) == {"total_seconds", "peak_bytes", "output_bytes", "phases", "datasets"}
+
+
+def test_stats_argument_is_type_checked():
+    with pytest.raises(TypeError, match="GenerationStats"):
+        DashboardGenerator().generate(_CONFIG, [_CSV], stats="yes")
+    with pytest.raises(TypeError, match="True or False"):
+        DashboardGenerator().generate_many([], ".", workers=1, stats=GenerationStats())
+
+
+@pytest.mark.parametrize("method", ["generate", "generate_to_file"])
+def test_stats_accepts_the_generate_many_bool(method, tmp_path):
+    names = []
+    args = (_CONFIG, [_CSV]) if method == "generate" else (str(tmp_path / "out.html"), _CONFIG, [_CSV])
+    getattr(DashboardGenerator(), method)(*args, stats=True, on_phase=lambda r: names.append(r["name"]))
+    assert names == list(PHASES)
+    getattr(DashboardGenerator(), method)(*args, stats=False)
+
+
+def test_generate_many_attaches_stats(tmp_path):
+    results = DashboardGenerator().generate_many(
+        [{"config": _CONFIG, "datasets_list": [_CSV]}], str(tmp_path), workers=1, stats=True
+    )
+    assert [p["name"] for p in results[0]["stats"]["phases"]] == list(PHASES)
+    assert results[0]["stats"]["output_bytes"] == results[0]["bytes"]
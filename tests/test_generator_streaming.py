@@ -0,0 +1,114 @@
+"""Streaming render: generate_to_file() must write exactly what generate() returns."""
+import io
+
+import pytest
+
+from dashboard_engine import generator as generator_module
+from dashboard_engine.generator import DashboardGenerator, iter_payload_chunks
+
+_CONFIG = {
+    "title": "Stream & <Test>",
+    "widgets": [{"type": "bubble", "title": "B", "datasetIndex": 0}],
+}
+_CSV = "mois_annee,label\n2025-01,R&D <b>\n2025-02,Ops\n"
+
+
+@pytest.fixture
+def frozen_generation_date(monkeypatch):
+    """Pin generation_date so two renders can be compared byte for byte."""
+    original = DashboardGenerator._build_full_config
+
+    def _build(config):
+        full = original(config)
+        full["generation_date"] = "20250101"
+        return full
+
+    monkeypatch.setattr(DashboardGenerator, "_build_full_config", staticmethod(_build))
+
+
+@pytest.mark.parametrize(
+    "payload,chunk_size,expected",
+    [
+        ("", 4, []),
+        ("abc", 4, ["abc"]),
+        ("abcdefgh", 4, ["abcd", "efgh"]),
+        ("abcdefghi", 4, ["abcd", "efgh", "i"]),
+        (iter(["x", "yz"]), 1, ["x", "yz"]),
+    ],
+    ids=["empty", "single_chunk", "exact_multiple", "remainder", "iterable_passthrough"],
+)
+def test_iter_payload_chunks(payload, chunk_size, expected):
+    assert list(iter_payload_chunks(payload, chunk_size)) == expected
+
+
+@pytest.mark.parametrize("compress_data", [False, True], ids=["plain", "gzip_base64"])
+def test_generate_to_path_matches_generate(tmp_path, frozen_generation_date, compress_data):
+    gen = DashboardGenerator()
+    expected = gen.generate(_CONFIG, [_CSV, "a\n1"], compress_data=compress_data)
+
+    out = tmp_path / "dash.html"
+    gen.generate_to_file(str(out), _CONFIG, [_CSV, "a\n1"], compress_data=compress_data)
+
+    assert out.read_bytes() == expected.encode("utf-8")
+
+
+def test_generate_to_pathlike(tmp_path, frozen_generation_date):
+    gen = DashboardGenerator()
+    out = tmp_path / "dash.html"
+    gen.generate_to_file(out, _CONFIG, [_CSV])
+    assert out.read_text(encoding="utf-8") == gen.generate(_CONFIG, [_CSV])
+
+
+@pytest.mark.parametrize("stream_factory", [io.BytesIO, io.StringIO], ids=["binary", "text"])
+def test_generate_to_fileobj(frozen_generation_date, stream_factory):
+    gen = DashboardGenerator()
+    expected = gen.generate(_CONFIG, [_CSV])
+
+    buf = stream_factory()
+    gen.generate_to_file(buf, _CONFIG, [_CSV])
+
+    written = buf.getvalue()
+    if isinstance(written, bytes):
+        written = written.decode("utf-8")
+    assert written == expected
+
+
+def test_large_payload_is_split_but_output_unchanged(monkeypatch, frozen_generation_date):
+    gen = DashboardGenerator()
+    csv_text = "k,v\n" + "".join("row{0},a&b\n".format(i) for i in range(200))
+    expected = gen.generate(_CONFIG, [csv_text])
+
+    monkeypatch.setattr(generator_module, "DATASET_PAYLOAD_CHUNK_CHARS", 7)
+    assert len(list(iter_payload_chunks(csv_text))) > 1
+    buf = io.BytesIO()
+    gen.generate_to_file(buf, _CONFIG, [csv_text])
+
+    assert buf.getvalue().decode("utf-8") == expected
+    assert "row199,a&b\n" in expected
+
+
+def test_generate_to_file_validates_inputs(tmp_path):
+    gen = DashboardGenerator()
+    with pytest.raises(TypeError):
+        gen.generate_to_file(str(tmp_path / "x.html"), "not-a-dict", [])
+    assert not (tmp_path / "x.html").exists()
+
+
+def test_failed_render_keeps_the_existing_file(tmp_path):
+    out = tmp_path / "x.html"
+    out.write_text("previous", encoding="utf-8")
+    # Passes up-front validation (it is iterable) and fails once the template reaches it.
+    bad_stream = iter(["mois_annee,label\n", 42])
+
+    with pytest.raises(TypeError):
+        DashboardGenerator().generate_to_file(out, _CONFIG, [bad_stream])
+
+    assert out.read_text(encoding="utf-8") == "previous"
+    assert [p.name for p in tmp_path.iterdir()] == ["x.html"]
+
+
+def test_path_output_keeps_umask_permissions(tmp_path):
+    out = tmp_path / "x.html"
+    DashboardGenerator().generate_to_file(out, _CONFIG, [_CSV])
+    (tmp_path / "plain.html").write_text("", encoding="utf-8")
+    assert out.stat().st_mode == (tmp_path / "plain.html").stat().st_mode
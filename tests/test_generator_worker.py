@@ -0,0 +1,68 @@
+"""Dataset decoding in a Web Worker (generate(decode_in_worker=True))."""
+import json
+import re
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.generator import JS_DATASET_WORKER_PATH, DashboardGenerator
+
+_CSV = 'mois_annee,valeur,label\n2024-01,10,"a, ""b"""\n2025-02,20,x\nbad,5,\n'
+_CONFIG = {
+    "title": "Worker",
+    "widgets": [{"type": "evolution", "title": "A", "mapping": {"date": "mois_annee", "value": "valeur"}}],
+}
+
+
+def _embedded_config(html):
+    return json.loads(re.search(r'<script id="dashboard-config"[^>]*>(.*?)</script>', html, re.S).group(1))
+
+
+def test_worker_module_bundled_only_when_requested():
+    paths, _ = DashboardGenerator.collect_js_asset_paths(dict(_CONFIG, decode_in_worker=True))
+    assert paths[2] == JS_DATASET_WORKER_PATH
+    assert paths[-1] == "js/main.js"
+    paths, _ = DashboardGenerator.collect_js_asset_paths(_CONFIG)
+    assert JS_DATASET_WORKER_PATH not in paths
+    full_paths, _ = DashboardGenerator.collect_js_asset_paths_full_bundle()
+    assert JS_DATASET_WORKER_PATH in full_paths
+
+
+def test_generate_sets_config_flag():
+    gen = DashboardGenerator()
+    html = gen.generate(_CONFIG, [_CSV], decode_in_worker=True)
+    assert _embedded_config(html)["decode_in_worker"] is True
+    assert "function datasetWorkerMain()" in html
+    html = gen.generate(_CONFIG, [_CSV])
+    assert "decode_in_worker" not in _embedded_config(html)
+    assert "function datasetWorkerMain()" not in html
+
+
+@pytest.mark.parametrize(
+    "compress_data,dataset_format",
+    [(False, "csv"), (True, "csv"), (False, "columnar-v1")],
+    ids=["plain_csv", "gzip_base64", "columnar_v1"],
+)
+def test_worker_datasets_match_main_thread_decode(page: Page, tmp_path, compress_data, dataset_format):
+    # Column values only: month-indexed rows also carry the year / month annotations.
+    read_datasets = (
+        "() => window.GLOBAL_DATASETS.map((d) => ({ columns: d.columns, "
+        "rows: d.map((row) => d.columns.map((c) => row[c])) }))"
+    )
+    decoded = {}
+    for decode_in_worker in (False, True):
+        html = DashboardGenerator().generate(
+            _CONFIG,
+            [_CSV, ""],
+            compress_data=compress_data,
+            dataset_format=dataset_format,
+            decode_in_worker=decode_in_worker,
+        )
+        out = tmp_path / "dash_{}.html".format(decode_in_worker)
+        out.write_text(html, encoding="utf-8")
+        page.goto(out.as_uri())
+        expect(page.locator('select[data-testid="widget-year-select"]')).to_have_value("2025")
+        decoded[decode_in_worker] = page.evaluate(read_datasets)
+
+    assert decoded[True] == decoded[False]
+    assert page.evaluate("() => Object.keys(window.GLOBAL_DATASETS[0].monthIndex)") == ["mois_annee"]
@@ -0,0 +1,90 @@
+"""Browser check: control changes update persistent panel scaffolds instead of rebuilding them."""
+import pytest
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.generator import DashboardGenerator
+
+_CSV = (
+    "mois_annee,cat,src,dst,x,y,heure,valeur\n"
+    "2024-01,A,s1,t1,a,p,0,5\n"
+    "2024-02,B,s1,t2,b,q,1,7\n"
+    "2025-01,A,s1,t1,a,p,0,10\n"
+    "2025-02,B,s2,t1,b,q,1,20\n"
+    "2025-03,A,s2,t2,a,q,2,30\n"
+)
+
+_WIDGETS = {
+    "stacked_area": {"date": "mois_annee", "value": "valeur", "category": "cat"},
+    "ribbon_chart": {"date": "mois_annee", "value": "valeur", "category": "cat"},
+    "bubble": {"date": "mois_annee", "x": "valeur", "y": "valeur", "r": "valeur", "category": "cat"},
+    "heatmap": {"date": "mois_annee", "x": "x", "y": "y", "value": "valeur"},
+    "sankey": {"date": "mois_annee", "value": "valeur", "path": ["src", "dst"]},
+    "financial_sankey": {"date": "mois_annee", "source": "src", "target": "dst", "value": "valeur"},
+    "sunburst": {"date": "mois_annee", "value": "valeur", "hierarchy": ["cat", "src"]},
+}
+
+# One panel whatever the N-1 setting: N-1 is drawn inside it, or the YoY control is hidden.
+_SINGLE_PANEL_WIDGETS = {
+    "evolution": {"date": "mois_annee", "value": "valeur"},
+    "radial_area": {"date": "mois_annee", "value": "valeur"},
+    "horizon": {"date": "mois_annee", "x": "heure", "y": "cat", "value": "valeur"},
+    "directed_chord": {"date": "mois_annee", "source": "src", "target": "dst", "value": "valeur"},
+    "nested_treemap": {"date": "mois_annee", "value": "valeur", "hierarchy": ["cat", "src"]},
+}
+
+# Tags every svg with a marker property; a rebuilt svg would not carry it.
+_MARK_SVGS_JS = "() => document.querySelectorAll('.sub-chart svg').forEach((svg) => { svg.__marker = true; })"
+_MARKED_SVGS_JS = "() => Array.from(document.querySelectorAll('.sub-chart svg'), (svg) => svg.__marker === true)"
+
+
+def _write_dashboard(tmp_path, widget_type, mapping=None):
+    config = {
+        "title": "Incremental",
+        "widgets": [{"type": widget_type, "title": widget_type, "mapping": mapping or _WIDGETS[widget_type]}],
+    }
+    out = tmp_path / "dash.html"
+    out.write_text(DashboardGenerator().generate(config, [_CSV]), encoding="utf-8")
+    return out
+
+
+@pytest.mark.parametrize("widget_type", sorted(_WIDGETS))
+def test_year_switch_reuses_panel_svgs(page: Page, tmp_path, widget_type):
+    page.goto(_write_dashboard(tmp_path, widget_type).as_uri())
+    year_select = page.locator('select[data-testid="widget-year-select"]')
+    expect(year_select).to_have_count(1)
+    page.locator(".ctrl-yoy input").check()
+    expect(page.locator(".sub-chart svg")).to_have_count(2)
+
+    page.evaluate(_MARK_SVGS_JS)
+    year_select.select_option("2024")
+    expect(page.locator(".sub-chart h4").last).to_contain_text("2024")
+
+    assert page.evaluate(_MARKED_SVGS_JS) == [True, True]
+
+
+@pytest.mark.parametrize("widget_type", sorted(_SINGLE_PANEL_WIDGETS))
+def test_year_switch_reuses_the_single_panel_svg(page: Page, tmp_path, widget_type):
+    page.goto(_write_dashboard(tmp_path, widget_type, _SINGLE_PANEL_WIDGETS[widget_type]).as_uri())
+    yoy = page.locator(".ctrl-yoy input")
+    if yoy.is_visible():
+        yoy.uncheck()
+    expect(page.locator(".sub-chart")).to_have_count(1)
+    expect(page.locator(".sub-chart svg").first).to_be_attached()
+
+    page.evaluate(_MARK_SVGS_JS)
+    page.locator('select[data-testid="widget-year-select"]').select_option("2024")
+    expect(page.locator(".sub-chart")).to_have_count(1)
+
+    assert page.evaluate(_MARKED_SVGS_JS)[0] is True
+
+
+def test_yoy_toggle_keeps_the_anchor_panel(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path, "stacked_area").as_uri())
+    page.locator(".ctrl-yoy input").check()
+    expect(page.locator(".sub-chart")).to_have_count(2)
+
+    page.evaluate(_MARK_SVGS_JS)
+    page.locator(".ctrl-yoy input").uncheck()
+    expect(page.locator(".sub-chart")).to_have_count(1)
+    assert page.evaluate(_MARKED_SVGS_JS) == [True]
+    expect(page.locator(".sub-chart h4")).to_have_text("Année 2025")
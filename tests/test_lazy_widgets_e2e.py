@@ -0,0 +1,49 @@
+"""Browser check: config.lazy_widgets mounts widgets only when they scroll near the viewport."""
+import re
+
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.generator import DashboardGenerator
+
+# Tall boxes in a scrolling container, so only the first widget starts near the viewport.
+_SCROLLING_LAYOUT = (
+    "<style>#dashboard-container { overflow-y: auto; } "
+    ".chart-box { flex: 0 0 900px; }</style></head>"
+)
+
+
+def _write_dashboard(tmp_path, lazy_widgets):
+    csv_content = "mois_annee,valeur\n2025-01,10\n2025-02,20\n"
+    config = {
+        "title": "Lazy",
+        "lazy_widgets": lazy_widgets,
+        "widgets": [
+            {"type": "evolution", "title": "Chart {}".format(i), "mapping": {"date": "mois_annee", "value": "valeur"}}
+            for i in range(4)
+        ],
+    }
+    html = DashboardGenerator().generate(config, [csv_content])
+    out = tmp_path / "dash.html"
+    out.write_text(html.replace("</head>", _SCROLLING_LAYOUT, 1), encoding="utf-8")
+    return out
+
+
+def test_lazy_widgets_mount_on_scroll(page: Page, tmp_path):
+    page.set_viewport_size({"width": 1200, "height": 700})
+    page.goto(_write_dashboard(tmp_path, True).as_uri())
+
+    year_selects = page.locator('select[data-testid="widget-year-select"]')
+    expect(year_selects).to_have_count(1)
+    expect(page.locator(".chart-box-pending")).to_have_count(3)
+    expect(page.locator(".chart-box-pending h2").last).to_have_text("Chart 3")
+
+    last_box = page.locator(".chart-box").last
+    last_box.scroll_into_view_if_needed()
+    expect(last_box.locator('select[data-testid="widget-year-select"]')).to_have_count(1)
+    expect(last_box).not_to_have_class(re.compile("chart-box-pending"))
+
+
+def test_eager_mode_mounts_every_widget(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path, False).as_uri())
+    expect(page.locator('select[data-testid="widget-year-select"]')).to_have_count(4)
+    expect(page.locator(".chart-box-pending")).to_have_count(0)
@@ -0,0 +1,93 @@
+"""Build-time Markdown rendering and sanitising of widget descriptions."""
+import json
+import re
+
+import pytest
+
+from dashboard_engine.generator import DashboardGenerator
+from dashboard_engine.markdown_html import (
+    is_safe_url,
+    markdown_to_html,
+    render_widget_descriptions,
+    sanitize_html,
+)
+
+_LINK_ATTRS = 'target="_blank" rel="noopener noreferrer"'
+
+
+@pytest.mark.parametrize(
+    "markdown,expected",
+    [
+        (
+            "**Ceci** est du *Markdown* avec [lien](http://google.com).",
+            '<p><strong>Ceci</strong> est du <em>Markdown</em> avec '
+            '<a href="http://google.com" {}>lien</a>.</p>'.format(_LINK_ATTRS),
+        ),
+        ("Ligne 1\nLigne 2", "<p>Ligne 1<br />\nLigne 2</p>"),
+        ("## Titre", "<h2>Titre</h2>"),
+        ("- a\n- b\n  - c", "<ul>\n<li>a</li>\n<li>b<ul>\n<li>c</li>\n</ul></li>\n</ul>"),
+        ("1. un\n2. deux", "<ol>\n<li>un</li>\n<li>deux</li>\n</ol>"),
+        ("> cité", "<blockquote>\n<p>cité</p>\n</blockquote>"),
+        ("```\n<b> & c\n```", "<pre><code>&lt;b&gt; &amp; c</code></pre>"),
+        ("a `x<y` b", "<p>a <code>x&lt;y</code> b</p>"),
+        ("R&D, a < b, &copy;", "<p>R&amp;D, a &lt; b, &copy;</p>"),
+        ("snake_case_name et _accent_", "<p>snake_case_name et <em>accent</em></p>"),
+        (":warning: :inconnu:", "<p>⚠️ :inconnu:</p>"),
+        (
+            "<strong>Source:</strong> SAP<br><strong>Scope:</strong> Q1",
+            "<p><strong>Source:</strong> SAP<br /><strong>Scope:</strong> Q1</p>",
+        ),
+        ("", ""),
+    ],
+    ids=[
+        "inline", "line_breaks", "heading", "nested_list", "ordered_list", "quote", "fenced_code",
+        "code_span", "ampersands", "underscores", "emoji", "inline_html", "empty",
+    ],
+)
+def test_markdown_to_html(markdown, expected):
+    assert markdown_to_html(markdown) == expected
+
+
+@pytest.mark.parametrize(
+    "html,expected",
+    [
+        ("<script>alert(1)</script>ok", "ok"),
+        ('<img src="x" onerror="alert(1)">', '<img src="x" />'),
+        ('<a href="javascript:alert(1)">x</a>', "<a {}>x</a>".format(_LINK_ATTRS)),
+        ('<a href=" JaVa\tScript:alert(1)">x</a>', "<a {}>x</a>".format(_LINK_ATTRS)),
+        ('<div style="x"><em>kept</em></div>', "<em>kept</em>"),
+        ("<strong>unclosed", "<strong>unclosed</strong>"),
+        ("</em>stray", "stray"),
+    ],
+    ids=["script", "event_handler", "javascript_url", "obfuscated_url", "unknown_tag", "unclosed", "stray_end"],
+)
+def test_sanitize_html(html, expected):
+    assert sanitize_html(html) == expected
+
+
+def test_is_safe_url():
+    assert is_safe_url("https://example.com")
+    assert is_safe_url("/relative#anchor")
+    assert is_safe_url("mailto:a@b.c")
+    assert not is_safe_url("data:text/html,<script>")
+    assert not is_safe_url("vbscript:x")
+
+
+def test_render_widget_descriptions_replaces_markdown():
+    plain = {"type": "sankey"}
+    widgets = [plain, {"type": "evolution", "description": "*x*"}]
+    rendered = render_widget_descriptions(widgets)
+    assert rendered[0] is plain
+    assert rendered[1] == {"type": "evolution", "descriptionHtml": "<p><em>x</em></p>"}
+    assert widgets[1] == {"type": "evolution", "description": "*x*"}
+    with pytest.raises(TypeError, match=r"widgets\[0\]\.description"):
+        render_widget_descriptions([{"description": ["x"]}])
+
+
+def test_generated_page_embeds_html_and_no_markdown_library():
+    config = {"title": "x", "widgets": [{"type": "evolution", "description": "**Source**", "mapping": {}}]}
+    html = DashboardGenerator().generate(config, ["a\n1\n"], js_bundle_mode="full")
+    embedded = json.loads(re.search(r'<script id="dashboard-config"[^>]*>(.*?)</script>', html, re.S).group(1))
+    assert embedded["widgets"][0]["descriptionHtml"] == "<p><strong>Source</strong></p>"
+    assert "description" not in embedded["widgets"][0]
+    assert "showdown" not in html
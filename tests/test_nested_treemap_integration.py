@@ -128,8 +128,10 @@ def test_TC02_nested_treemap_labels_and_overlay(page: Page, treemap_report):
     leaf_a = get_rect_by_name(page, "LeafA", year=2025)
     leaf_a.wait_for(state="attached")
     
-    xpath_title = f"xpath=.//*[local-name()='g'][.//*[local-name()='tspan' and text()='LeafA']]/*[local-name()='title']"
-    tooltip = get_chart_container(page, 2025).locator(xpath_title).text_content()
+    # Tooltip built on hover by the shared tooltip layer
+    leaf_a.hover()
+    expect(page.locator(".widget-tooltip")).to_be_visible()
+    tooltip = page.locator(".widget-tooltip").text_content()
     
     assert "BranchA > SubA > DeepA > LeafA" in tooltip
     assert "100" in tooltip
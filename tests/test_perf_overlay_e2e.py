@@ -0,0 +1,63 @@
+"""Browser check: DashboardPerf aggregates in window.__DASHBOARD_PERF__ and the dev_mode ?perf overlay."""
+from playwright.sync_api import Page, expect
+
+from dashboard_engine.generator import DashboardGenerator
+
+
+def _write_dashboard(tmp_path, dev_mode):
+    csv_content = "mois_annee,valeur\n2024-01,5\n2025-01,10\n2025-02,20\n"
+    config = {
+        "title": "Perf",
+        "dev_mode": dev_mode,
+        "widgets": [
+            {"type": "evolution", "title": "Chart {}".format(i), "mapping": {"date": "mois_annee", "value": "valeur"}}
+            for i in range(2)
+        ],
+    }
+    out = tmp_path / "dash.html"
+    out.write_text(DashboardGenerator().generate(config, [csv_content]), encoding="utf-8")
+    return out
+
+
+def test_measures_are_aggregated_per_stage_and_widget(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path, False).as_uri())
+    expect(page.locator('select[data-testid="widget-year-select"]')).to_have_count(2)
+
+    page.locator('select[data-testid="widget-year-select"]').first.select_option("2024")
+    summary = page.evaluate("() => window.__DASHBOARD_PERF__.summary()")
+
+    assert summary["stages"]["config-parse"]["count"] == 1
+    assert summary["stages"]["dataset-decode"]["count"] == 1
+    assert summary["stages"]["widget-construct"]["count"] == 2
+    first = summary["widgets"]["evolution#0"]["stages"]
+    assert first["widget-update"]["count"] == 2
+    assert first["control:year"]["count"] == 1
+    assert summary["widgets"]["evolution#1"]["stages"]["widget-update"]["count"] == 1
+    assert page.locator("#dashboard-perf-overlay").count() == 0
+
+
+def test_perf_overlay_needs_dev_mode_and_query_param(page: Page, tmp_path):
+    page.goto(_write_dashboard(tmp_path, True).as_uri() + "?perf")
+    overlay = page.locator("#dashboard-perf-overlay")
+    expect(overlay).to_contain_text("evolution#1")
+    expect(overlay).to_contain_text("widget-construct")
+
+    page.goto(_write_dashboard(tmp_path, False).as_uri() + "?perf")
+    expect(page.locator('select[data-testid="widget-year-select"]')).to_have_count(2)
+    expect(overlay).to_have_count(0)
+
+
+def test_user_timing_entries_need_the_query_param(page: Page, tmp_path):
+    read_entries_js = (
+        "() => performance.getEntries().filter((e) => e.name.startsWith('dashboard:'))"
+        ".map((e) => e.entryType)"
+    )
+    page.goto(_write_dashboard(tmp_path, False).as_uri())
+    expect(page.locator('select[data-testid="widget-year-select"]')).to_have_count(2)
+    assert page.evaluate(read_entries_js) == []
+    assert page.evaluate("() => window.__DASHBOARD_PERF__.summary().stages['widget-construct'].count") == 2
+
+    page.goto(_write_dashboard(tmp_path, False).as_uri() + "?perf")
+    expect(page.locator('select[data-testid="widget-year-select"]')).to_have_count(2)
+    entry_types = page.evaluate(read_entries_js)
+    assert entry_types and set(entry_types) == {"measure"}
@@ -0,0 +1,80 @@
+"""Python 2.7 smoke test of the streaming CSV transforms (Dataiku runtime).
+
+Runs the same script under the current interpreter and under Python 2.7 and compares the
+output. The 2.7 interpreter is ``$DASHBOARD_PYTHON27`` or ``python2.7`` on ``PATH``; it needs
+``jinja2``. The test is skipped when no such interpreter is available.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# ASCII-only source (escapes) so Python 2.7 reads it the same way from the command line.
+_SCRIPT = r'''
+from __future__ import unicode_literals
+import json, sys
+from dashboard_engine.generator import DashboardGenerator, build_month_indexes
+from dashboard_engine.transforms import iter_csv_text, preaggregate_datasets, prune_dataset_columns
+
+CSV = (
+    "date,cat,value,extra\n"
+    "2024-01-15,\u00c9lectricit\u00e9,1.5,x\n"
+    "2024-02-03,\"B, \u00e7\",2,\"say \"\"hi\"\"\"\n"
+    "2024-02-10,\u00c9lectricit\u00e9,3,z\n\n"
+)
+WIDGETS = [
+    {"type": "evolution", "datasetIndex": 0, "mapping": {"date": "date", "value": "value", "category": "cat"}},
+    {"type": "sunburst", "datasetIndex": 0, "mapping": {"date": "date", "value": "value", "levels": ["cat", "extra"]}},
+]
+out = {
+    "prune": prune_dataset_columns(WIDGETS, [CSV]),
+    "prune_stream": "".join(prune_dataset_columns(WIDGETS, [iter([CSV.encode("utf-8")])])[0]),
+    "preaggregate": preaggregate_datasets(WIDGETS, [CSV]),
+    "chunks": list(iter_csv_text(["a", "\u00e9"], [["x" * 5, "\u00fc,\""]] * 4, chunk_chars=16)),
+    "month_indexes": build_month_indexes(WIDGETS, [CSV]),
+    "generate": [],
+}
+config = {"title": "t", "widgets": WIDGETS}
+for options in (
+    {"prune_columns": True},
+    {"preaggregate": True},
+    {"parse_dates": True},
+    {"dataset_format": "columnar-v1", "prune_columns": True, "preaggregate": True, "parse_dates": True},
+):
+    html = DashboardGenerator().generate(config, [CSV], **options)
+    out["generate"].append(sorted(options) + [html.startswith("<!DOCTYPE html>")])
+sys.stdout.write(json.dumps(out, sort_keys=True))
+'''
+
+
+def _python27():
+    candidates = [os.environ.get("DASHBOARD_PYTHON27"), shutil.which("python2.7")]
+    for exe in candidates:
+        if not exe:
+            continue
+        probe = subprocess.run(
+            [exe, "-c", "import sys, jinja2; assert sys.version_info[:2] == (2, 7)"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        if probe.returncode == 0:
+            return exe
+    pytest.skip("no Python 2.7 interpreter with jinja2 (set DASHBOARD_PYTHON27)")
+
+
+def _run(python):
+    env = dict(os.environ, PYTHONPATH=SRC_DIR, PYTHONIOENCODING="utf-8")
+    result = subprocess.run([python, "-c", _SCRIPT], env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert result.returncode == 0, result.stderr.decode("utf-8", "replace")
+    return json.loads(result.stdout.decode("utf-8"))
+
+
+def test_python27_transforms_match_python3():
+    py27 = _run(_python27())
+    assert py27 == _run(sys.executable)
+    assert all(flags[-1] for flags in py27["generate"])
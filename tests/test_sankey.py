@@ -100,7 +100,7 @@ def test_TC02_sankey_filtering_interaction(page: Page, sankey_report):
     chart_2025 = page.locator(".sub-chart", has=page.locator("h4", has_text="2025"))
     
     # Click Visa
-    visa_node = chart_2025.locator("rect").filter(has_text="Visa").first
+    visa_node = chart_2025.locator('rect[data-node="Visa"]').first
     visa_node.click()
 
     # Title shows active filter
@@ -123,20 +123,22 @@ def test_TC03_sankey_overlay_percentage_logic(page: Page, sankey_report):
     page.goto(sankey_report)
     chart_2025 = page.locator(".sub-chart", has=page.locator("h4", has_text="2025"))
 
+    def hover_tooltip(node_name):
+        chart_2025.locator(f'rect[data-node="{node_name}"]').first.hover()
+        tooltip = page.locator(".widget-tooltip")
+        expect(tooltip).to_contain_text(node_name)
+        return tooltip.text_content()
+
     # 1. Visa
-    visa_tooltip = chart_2025.locator("rect").filter(has_text="Visa").locator("title").first
-    txt_visa = visa_tooltip.text_content()
+    txt_visa = hover_tooltip("Visa")
     assert "31.0%" in txt_visa, f"Visa share wrong: {txt_visa}"
 
     # 2. CB
-    cb_tooltip = chart_2025.locator("rect").filter(has_text="CB").locator("title").first
-    txt_cb = cb_tooltip.text_content()
+    txt_cb = hover_tooltip("CB")
     assert "34.5%" in txt_cb, f"CB share wrong: {txt_cb}"
 
     # 3. Level 2: Worldline ~62.1%
-    
-    wl_tooltip = chart_2025.locator("rect").filter(has_text="Worldline").locator("title").first
-    txt_wl = wl_tooltip.text_content()
+    txt_wl = hover_tooltip("Worldline")
     assert "62.1%" in txt_wl, f"Worldline share wrong: {txt_wl}"
     
 
@@ -148,15 +150,15 @@ def test_TC04_sankey_color_consistency(page: Page, sankey_report):
 
     # Graph 2024
     chart_2024 = page.locator(".sub-chart", has=page.locator("h4", has_text="2024"))
-    color_mc_24 = chart_2024.locator("rect").filter(has_text="Mastercard").first.get_attribute("fill")
+    color_mc_24 = chart_2024.locator('rect[data-node="Mastercard"]').first.get_attribute("fill")
 
     # Graph 2025
     chart_2025 = page.locator(".sub-chart", has=page.locator("h4", has_text="2025"))
-    color_mc_25 = chart_2025.locator("rect").filter(has_text="Mastercard").first.get_attribute("fill")
+    color_mc_25 = chart_2025.locator('rect[data-node="Mastercard"]').first.get_attribute("fill")
 
     assert color_mc_24 == color_mc_25, f"Mastercard color drift: {color_mc_24} vs {color_mc_25}"
 
-    color_visa_25 = chart_2025.locator("rect").filter(has_text="Visa").first.get_attribute("fill")
+    color_visa_25 = chart_2025.locator('rect[data-node="Visa"]').first.get_attribute("fill")
     assert color_mc_25 != color_visa_25, "Mastercard and Visa must differ"
 
 def test_TC05_sankey_empty_year_message(page: Page, sankey_report):
@@ -81,14 +81,14 @@ def get_sub_chart(page, widget_title, year):
 
 def get_l1_slice(chart, group_name):
     """
-    First path whose title tooltip matches group_name at L1 (excludes ' > ' child titles).
-    Uses XPath local-name() for SVG namespaces.
+    First L1 arc named group_name (arcs carry data-name / data-depth).
     """
-    xpath_selector = (
-        f"xpath=.//*[local-name()='path']"
-        f"[*[local-name()='title'][contains(text(), '{group_name}') and not(contains(text(), ' > '))]]"
-    )
-    return chart.locator(xpath_selector).first
+    return get_slice(chart, group_name, depth=1)
+
+def get_slice(chart, name, depth=None):
+    """First arc named name, optionally at a given depth (1 = first ring)."""
+    depth_selector = f'[data-depth="{depth}"]' if depth is not None else ""
+    return chart.locator(f'path[data-name="{name}"]{depth_selector}').first
 
 def get_arc_area(locator):
     box = locator.bounding_box()
@@ -110,11 +110,11 @@ def test_TC01_sunburst_depth_visibility(page: Page, generated_report):
     expect(l1).to_be_visible()
     
     # 2. L2 child visible
-    l2 = chart.locator("path").filter(has=page.locator("title", has_text="DeepGroup > Lvl2")).first
+    l2 = get_slice(chart, "Lvl2", depth=2)
     expect(l2).to_be_visible()
     
     # 3. L3 hidden before zoom
-    l3 = chart.locator("path").filter(has=page.locator("title", has_text="Lvl2 > Lvl3")).first
+    l3 = get_slice(chart, "Lvl3", depth=3)
     if l3.count() > 0:
         opacity = l3.evaluate("el => getComputedStyle(el).fillOpacity")
         assert float(opacity) < 0.1, "L3 should be hidden before zoom"
@@ -163,8 +163,8 @@ def test_TC03_sunburst_arc_sizes_linear_consistency(page: Page, generated_report
     chart = get_sub_chart(page, "Sunburst LINEAR", 2025)
     
     # Child arcs under SizeGroup
-    big_slice = chart.locator("path").filter(has=page.locator("title", has_text="BigItem")).first
-    small_slice = chart.locator("path").filter(has=page.locator("title", has_text="SmallItem")).first
+    big_slice = get_slice(chart, "BigItem")
+    small_slice = get_slice(chart, "SmallItem")
     
     expect(big_slice).to_be_visible()
     expect(small_slice).to_be_visible()